@@ -1,9 +1,16 @@
-from flask import Flask, render_template, redirect, url_for, session, request, jsonify
+from flask import Flask, Response, abort, render_template, redirect, url_for, session, request, jsonify
 from flask_socketio import SocketIO
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from config import config
+from utils.logging_config import setup_logging
+from utils.metrics import instrument_socketio, render_metrics
+from utils.player_manager import connections
+from utils.room_manager import init_room_store, start_room_reaper
+from utils.server_mode import resolve_async_mode, run_options
+from utils.timer_wheel import start_timer_wheel
 from functools import wraps
+import hmac
 from google.oauth2 import id_token
 from google.auth.transport import requests
 
@@ -12,9 +19,26 @@ from google.auth.transport import requests
 def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    setup_logging(app)
 
-    # Initialize Socket.IO
-    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+    # Initialize Socket.IO (a message queue lets several processes share rooms)
+    socketio = SocketIO(
+        app,
+        cors_allowed_origins="*",
+        async_mode=resolve_async_mode(app.config.get('SOCKETIO_ASYNC_MODE')),
+        message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'))
+
+    # Time every Socket.IO handler registered below (served on /metrics)
+    instrument_socketio(socketio)
+
+    # Room state backend (in-process by default, Redis when configured)
+    init_room_store(app)
+
+    # Evict rooms left idle past their TTL
+    start_room_reaper(app, socketio)
+
+    # One timer wheel drives every room's game clock
+    start_timer_wheel(app, socketio)
 
     # Initialize Rate Limiter
     # Default limits: 200 requests/day, 50 requests/hour per IP
@@ -106,6 +130,7 @@ def create_app(config_name='default'):
     from games.pong.socket_events import register_pong_events
     from games.stickfight.socket_events import register_stickfight_events
     from games.roadfighter.socket_events import register_roadfighter_events
+    from games.poker.hand_history import init_hand_history
 
     # After creating socketio
     register_poker_events(socketio)
@@ -124,6 +149,12 @@ def create_app(config_name='default'):
     register_stickfight_events(socketio)
     register_roadfighter_events(socketio)
 
+    # Poker hand histories, written in batches by a background writer
+    init_hand_history(app, socketio)
+
+    # One disconnect handler cleans up only the rooms the client was in
+    connections.install(socketio)
+
 
     # Login required decorator
     def login_required(f):
@@ -411,6 +442,20 @@ def create_app(config_name='default'):
     def about():
         return render_template("about.html")
 
+    @app.route("/metrics")
+    @limiter.exempt
+    def metrics():
+        """Per-event Socket.IO metrics in Prometheus text format"""
+        # Off unless a token is configured; scrapers send it as a bearer token
+        token = app.config.get('METRICS_TOKEN')
+        if not token:
+            abort(404)
+        supplied = request.headers.get('Authorization', '').encode()
+        if not hmac.compare_digest(supplied, f'Bearer {token}'.encode()):
+            return Response('Unauthorized\n', status=401, mimetype='text/plain',
+                            headers={'WWW-Authenticate': 'Bearer'})
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -431,9 +476,12 @@ def create_app(config_name='default'):
 
 
 if __name__ == "__main__":
+    # Too late to monkey patch here: Flask and Socket.IO are already imported
+    if resolve_async_mode(config['development'].SOCKETIO_ASYNC_MODE) != 'threading':
+        raise SystemExit("Green-thread modes must be started with: python wsgi.py")
     app, socketio = create_app('development')
     print("\n🚀 Starting Futuristic Games Hub...")
-    print("📍 Server running at: http://localhost:5000")
+    print(f"📍 Server running at: http://localhost:5000 ({socketio.async_mode} mode)")
     print("🎮 Games loaded:")
     print("   ✅ Tic-Tac-Toe")
     print("   ✅ Snake & Ladder")
@@ -443,4 +491,4 @@ if __name__ == "__main__":
     print("   ✅ Canvas Battle")
     print("   ✅ Connect 4")
     print()
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000, allow_unsafe_werkzeug=True)
+    socketio.run(app, debug=True, host='0.0.0.0', port=5000, **run_options(socketio))
@@ -19,6 +19,45 @@ class Config:
     RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL', 'memory://')
     RATELIMIT_HEADERS_ENABLED = True
 
+    # Shared state so several server processes can host rooms
+    # ROOM_STORE_URL: where room state lives (redis://host:6379/0, or memory:// for an in-process stand-in)
+    # SOCKETIO_MESSAGE_QUEUE: Socket.IO fan-out between processes (redis://host:6379/0)
+    # Load balancers must keep each client on one process (sticky sessions)
+    ROOM_STORE_URL = os.environ.get('ROOM_STORE_URL')
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+
+    # Socket.IO server mode: threading (one OS thread per client), eventlet or gevent
+    # Green-thread modes need the package installed and the app started through wsgi.py
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+
+    # Idle rooms are evicted after this many seconds, by room state
+    ROOM_TTL_WAITING = int(os.environ.get('ROOM_TTL_WAITING', 30 * 60))
+    ROOM_TTL_PLAYING = int(os.environ.get('ROOM_TTL_PLAYING', 60 * 60))
+    ROOM_TTL_FINISHED = int(os.environ.get('ROOM_TTL_FINISHED', 5 * 60))
+    ROOM_REAP_INTERVAL = int(os.environ.get('ROOM_REAP_INTERVAL', 30))
+
+    # Seconds a freed room code waits before it can be handed out again
+    ROOM_CODE_REUSE_AFTER = int(os.environ.get('ROOM_CODE_REUSE_AFTER', 5 * 60))
+
+    # Game clocks run on one shared timer wheel ticking every TIMER_WHEEL_TICK seconds
+    TIMER_WHEEL_TICK = float(os.environ.get('TIMER_WHEEL_TICK', 0.1))
+    # Seconds a poker player has to act before auto-check/fold (0 turns the clock off)
+    POKER_TURN_SECONDS = int(os.environ.get('POKER_TURN_SECONDS', 30))
+
+    # Poker hand histories (binary, one folder per room); unset turns recording off
+    HAND_HISTORY_DIR = os.environ.get('HAND_HISTORY_DIR')
+    HAND_HISTORY_MAX_BYTES = int(os.environ.get('HAND_HISTORY_MAX_BYTES', 8 * 1024 * 1024))
+
+    # Worker processes for the Connect 4 computer opponent's search
+    CONNECT4_AI_WORKERS = int(os.environ.get('CONNECT4_AI_WORKERS', 2))
+
+    # /metrics is only served when this is set; scrapers send it as a bearer token
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Logging (per-action game detail is logged at DEBUG)
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.environ.get('LOG_FILE')
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
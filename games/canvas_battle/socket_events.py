@@ -1,23 +1,21 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
+import logging
 import random
-import string
 import time
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+
+logger = logging.getLogger(__name__)
 
 # Store active canvas battle rooms
-canvas_rooms = {}
+canvas_rooms = RoomStore('canvas_battle')
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(
-            random.choices(
-                string.ascii_uppercase +
-                string.digits,
-                k=6))
-        if code not in canvas_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('canvas_battle')
 
 
 def register_canvas_battle_events(socketio):
@@ -31,12 +29,6 @@ def register_canvas_battle_events(socketio):
         player_id = request.sid
         time_limit = data.get('time_limit', 60)  # seconds
 
-        print(f"\n{'=' * 60}")
-        print(f"🎨 CREATING CANVAS BATTLE ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Host: {player_name}")
-        print(f"Time limit: {time_limit}s")
-
         canvas_rooms[room_code] = {
             'code': room_code,
             'host': player_id,
@@ -57,10 +49,9 @@ def register_canvas_battle_events(socketio):
             'round_start_time': None
         }
 
-        join_room(room_code)
+        join_game_room('canvas_battle', room_code)
 
-        print(f"✅ Canvas Battle room created")
-        print(f"{'=' * 60}\n")
+        logger.info("Canvas Battle room %s created by %s (%ss)", room_code, player_name, time_limit)
 
         emit('canvas_room_created', {
             'room_code': room_code,
@@ -70,34 +61,24 @@ def register_canvas_battle_events(socketio):
         })
 
     @socketio.on('join_canvas_room')
+    @canvas_rooms.synchronized
     def handle_join_room(data):
         """Join an existing canvas battle room"""
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"🚪 JOINING CANVAS BATTLE ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Player: {player_name}")
-
         if room_code not in canvas_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             emit('canvas_error', {'message': 'Room not found!'})
             return
 
         room = canvas_rooms[room_code]
 
         if room['status'] != 'waiting':
-            print(f"❌ Game already in progress")
-            print(f"{'=' * 60}\n")
             emit('canvas_error', {'message': 'Game already in progress!'})
             return
 
         if len(room['players']) >= 6:
-            print(f"❌ Room is full")
-            print(f"{'=' * 60}\n")
             emit('canvas_error', {'message': 'Room is full! (Max 6 players)'})
             return
 
@@ -111,11 +92,10 @@ def register_canvas_battle_events(socketio):
             'score': 0
         })
 
-        join_room(room_code)
+        join_game_room('canvas_battle', room_code)
 
-        print(f"✅ Player joined")
-        print(f"Total players: {len(room['players'])}")
-        print(f"{'=' * 60}\n")
+        logger.info("%s joined Canvas Battle room %s (%d players)",
+                    player_name, room_code, len(room['players']))
 
         emit('canvas_room_joined', {
             'room_code': room_code,
@@ -129,6 +109,7 @@ def register_canvas_battle_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('canvas_player_ready')
+    @canvas_rooms.synchronized
     def handle_player_ready(data):
         """Mark player as ready"""
         room_code = data.get('room_code', '').upper()
@@ -155,36 +136,27 @@ def register_canvas_battle_events(socketio):
             start_drawing_round(room_code, socketio)
 
     @socketio.on('start_canvas_battle')
+    @canvas_rooms.synchronized
     def handle_start_game(data):
         """Start the canvas battle game"""
         room_code = data.get('room_code', '').upper()
 
-        print(f"\n{'=' * 60}")
-        print(f"🎮 STARTING CANVAS BATTLE - Room: {room_code}")
-
         if room_code not in canvas_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             return
 
         room = canvas_rooms[room_code]
 
         if request.sid != room['host']:
-            print(f"❌ Only host can start")
-            print(f"{'=' * 60}\n")
             emit('canvas_error', {'message': 'Only host can start the game!'})
             return
 
         if len(room['players']) < 2:
-            print(f"❌ Need at least 2 players")
-            print(f"{'=' * 60}\n")
             emit(
                 'canvas_error', {
                     'message': 'Need at least 2 players to start!'})
             return
 
-        print(f"✅ Game starting with {len(room['players'])} players")
-        print(f"{'=' * 60}\n")
+        logger.info("Canvas Battle room %s started with %d players", room_code, len(room['players']))
 
         start_drawing_round(room_code, socketio)
 
@@ -214,8 +186,8 @@ def register_canvas_battle_events(socketio):
             player['canvas_data'] = None
             player['votes'] = 0
 
-        print(
-            f"\n🎨 Round {room['round']}/{room['max_rounds']} - Theme: {room['theme']}")
+        logger.debug("Room %s round %s/%s: theme %r",
+                     room_code, room['round'], room['max_rounds'], room['theme'])
 
         socketio.emit('drawing_round_start', {
             'round': room['round'],
@@ -225,26 +197,17 @@ def register_canvas_battle_events(socketio):
         }, room=room_code)
 
     @socketio.on('submit_canvas')
+    @canvas_rooms.synchronized
     def handle_submit_canvas(data):
         """Submit canvas drawing"""
         room_code = data.get('room_code', '').upper()
         canvas_data = data.get('canvas_data')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"📤 CANVAS SUBMISSION")
-        print(f"Room: {room_code}")
-        print(f"Player ID: {player_id}")
-        print(f"Data size: {len(canvas_data) if canvas_data else 0} bytes")
-
         if room_code not in canvas_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             return
 
         if not canvas_data:
-            print(f"❌ No canvas data provided")
-            print(f"{'=' * 60}\n")
             emit('canvas_error', {'message': 'No drawing data received'})
             return
 
@@ -254,28 +217,23 @@ def register_canvas_battle_events(socketio):
         for player in room['players']:
             if player['id'] == player_id:
                 player['canvas_data'] = canvas_data
-                print(f"✅ {player['name']} submitted drawing")
+                logger.debug("Room %s: %s submitted a drawing (%d bytes)",
+                             room_code, player['name'], len(canvas_data))
                 player_found = True
                 break
 
         if not player_found:
-            print(f"❌ Player not found in room")
-            print(f"{'=' * 60}\n")
             return
 
         # Check if all players submitted
         submitted_count = sum(1 for p in room['players'] if p['canvas_data'])
 
-        print(f"Submissions: {submitted_count}/{len(room['players'])}")
-        print(f"{'=' * 60}\n")
-
         socketio.emit('canvas_submission_update', {
             'submitted': submitted_count,
             'total': len(room['players'])
         }, room=room_code)
 
         if submitted_count == len(room['players']):
-            print(f"✅ All players submitted, starting voting...")
             start_voting_round(room_code, socketio)
 
     def start_voting_round(room_code, socketio):
@@ -293,19 +251,11 @@ def register_canvas_battle_events(socketio):
                     'canvas_data': player['canvas_data']
                 })
             else:
-                print(f"⚠️ {player['name']} has no canvas data!")
+                logger.warning("Room %s: %s has no drawing to vote on", room_code, player['name'])
 
-        print(f"\n{'=' * 60}")
-        print(f"🗳️ VOTING ROUND STARTED")
-        print(f"Room: {room_code}")
-        print(f"Submissions: {len(submissions)}")
-        for i, sub in enumerate(submissions):
-            print(
-                f"  {i + 1}. {sub['player_name']} - {len(sub['canvas_data'])} bytes")
-        print(f"{'=' * 60}\n")
+        logger.debug("Room %s: voting on %d drawings", room_code, len(submissions))
 
         if len(submissions) == 0:
-            print(f"❌ No submissions to vote on!")
             socketio.emit('canvas_error', {
                 'message': 'No drawings were submitted!'
             }, room=room_code)
@@ -317,6 +267,7 @@ def register_canvas_battle_events(socketio):
         }, room=room_code)
 
     @socketio.on('submit_vote')
+    @canvas_rooms.synchronized
     def handle_submit_vote(data):
         """Submit vote for a drawing"""
         room_code = data.get('room_code', '').upper()
@@ -337,7 +288,7 @@ def register_canvas_battle_events(socketio):
         for player in room['players']:
             if player['id'] == voted_for_id:
                 player['votes'] += 1
-                print(f"✅ Vote recorded for {player['name']}")
+                logger.debug("Room %s: vote for %s", room_code, player['name'])
                 break
 
         # Check if all players voted
@@ -347,6 +298,7 @@ def register_canvas_battle_events(socketio):
         }, room=room_code)
 
     @socketio.on('end_voting')
+    @canvas_rooms.synchronized
     def handle_end_voting(data):
         """End voting and show results"""
         room_code = data.get('room_code', '').upper()
@@ -367,9 +319,8 @@ def register_canvas_battle_events(socketio):
             reverse=True
         )
 
-        print(f"\n🏆 Round {room['round']} Results:")
-        for i, player in enumerate(round_results):
-            print(f"{i + 1}. {player['name']}: {player['votes']} votes")
+        logger.debug("Room %s round %s results: %s", room_code, room['round'],
+                     ', '.join(f"{p['name']} {p['votes']}" for p in round_results))
 
         socketio.emit('round_results', {
             'round': room['round'],
@@ -387,6 +338,7 @@ def register_canvas_battle_events(socketio):
             room['status'] = 'waiting'
 
     @socketio.on('next_round')
+    @canvas_rooms.synchronized
     def handle_next_round(data):
         """Start next round"""
         room_code = data.get('room_code', '').upper()
@@ -413,9 +365,8 @@ def register_canvas_battle_events(socketio):
             reverse=True
         )
 
-        print(f"\n🎉 GAME OVER - Final Results:")
-        for i, player in enumerate(final_results):
-            print(f"{i + 1}. {player['name']}: {player['score']} total points")
+        logger.info("Canvas Battle room %s finished: %s", room_code,
+                    ', '.join(f"{p['name']} {p['score']}" for p in final_results))
 
         socketio.emit('game_over', {
             'final_results': [{
@@ -426,6 +377,7 @@ def register_canvas_battle_events(socketio):
         }, room=room_code)
 
     @socketio.on('leave_canvas_room')
+    @canvas_rooms.synchronized
     def handle_leave_room(data):
         """Leave canvas battle room"""
         room_code = data.get('room_code', '').upper()
@@ -439,12 +391,12 @@ def register_canvas_battle_events(socketio):
         # Remove player
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
 
-        leave_room(room_code)
+        leave_game_room('canvas_battle', room_code)
 
         if len(room['players']) == 0:
             # Delete empty room
             del canvas_rooms[room_code]
-            print(f"🗑️ Room {room_code} deleted (empty)")
+            logger.info("Canvas Battle room %s deleted (empty)", room_code)
         else:
             # If host left, assign new host
             if room['host'] == player_id and len(room['players']) > 0:
@@ -455,4 +407,9 @@ def register_canvas_battle_events(socketio):
                 'players': room['players']
             }, room=room_code)
 
-    print("✅ Canvas Battle socket events registered")
+    @connections.on_disconnect('canvas_battle')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
+    logger.debug("Canvas Battle socket events registered")
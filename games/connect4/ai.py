@@ -0,0 +1,226 @@
+"""Connect 4 computer opponent.
+
+``search`` is alpha-beta negamax over the bitboard engine with iterative
+deepening: it searches depth 1, 2, 3, ... until the difficulty's depth
+limit or millisecond budget runs out, and plays the best move of the
+deepest search that finished. Each iteration seeds the next through a
+fixed-size transposition table (one slot per ``key % size``; a slot keeps
+its entry unless the new one is from a later search or at least as deep).
+Moves are tried best-known first, then centre out, which is what makes
+the cut-offs bite.
+
+Scores are from the mover's side: a win is ``WIN`` minus the number of
+stones on the board when it happens, so quicker wins score higher. Below
+the depth limit a position is scored by open threats (empty cells that
+would complete four) and centre control.
+
+The search is CPU-bound pure Python, so games run it in ``worker_pool()``
+processes rather than on Socket.IO's threads.
+"""
+
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import CELLS, H1, HEIGHT, WIDTH
+
+WIN = 1000
+ORDER = (3, 2, 4, 1, 5, 0, 6)
+TABLE_SIZE = 1 << 18
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Search limits per difficulty. Easy also picks at random among moves
+# within ``slack`` of the best, so it makes the odd mistake.
+DIFFICULTIES = {
+    'easy': {'depth': 2, 'ms': 100, 'slack': 8},
+    'medium': {'depth': 6, 'ms': 400, 'slack': 0},
+    'hard': {'depth': CELLS, 'ms': 1500, 'slack': 0},
+}
+
+BOTTOM = sum(1 << column * H1 for column in range(WIDTH))
+BOARD_MASK = BOTTOM * ((1 << HEIGHT) - 1)
+CENTER = ((1 << HEIGHT) - 1) << (WIDTH // 2) * H1
+
+
+class Timeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    """Fixed-size table of (key, depth, value, flag, move, generation)"""
+
+    __slots__ = ('size', 'slots', 'generation')
+
+    def __init__(self, size=TABLE_SIZE):
+        self.size = size
+        self.slots = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        """Entries from earlier searches become replaceable"""
+        self.generation += 1
+
+    def get(self, key):
+        entry = self.slots[key % self.size]
+        return entry if entry is not None and entry[0] == key else None
+
+    def put(self, key, depth, value, flag, move):
+        index = key % self.size
+        old = self.slots[index]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.slots[index] = (key, depth, value, flag, move, self.generation)
+
+
+def threats(stones, mask):
+    """Empty cells where ``stones`` would complete four in a row"""
+    found = (stones << 1) & (stones << 2) & (stones << 3)
+    for shift in (H1, HEIGHT, H1 + 1):
+        pair = (stones << shift) & (stones << 2 * shift)
+        found |= pair & (stones << 3 * shift)
+        found |= pair & (stones >> shift)
+        pair = (stones >> shift) & (stones >> 2 * shift)
+        found |= pair & (stones << shift)
+        found |= pair & (stones >> 3 * shift)
+    return found & (BOARD_MASK ^ mask)
+
+
+def evaluate(board):
+    """Heuristic score for the player to move"""
+    mine = board.bits[board.turn]
+    theirs = board.bits[board.turn ^ 1]
+    mask = mine | theirs
+    score = 4 * (bin(threats(mine, mask)).count('1') - bin(threats(theirs, mask)).count('1'))
+    return score + bin(mine & CENTER).count('1') - bin(theirs & CENTER).count('1')
+
+
+class Search:
+    """One move's search: node count, deadline and the shared table"""
+
+    def __init__(self, board, table, deadline):
+        self.board = board
+        self.table = table
+        self.deadline = deadline
+        self.nodes = 0
+
+    def moves(self, first=None):
+        board = self.board
+        ordered = [first] if first is not None else []
+        ordered += [c for c in ORDER if c != first and board.can_play(c)]
+        return ordered
+
+    def negamax(self, depth, alpha, beta):
+        board = self.board
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise Timeout
+        if board.is_full():
+            return 0
+        mask = board.mask
+        if threats(board.bits[board.turn], mask) & (mask + BOTTOM):
+            return WIN - board.moves - 1  # wins with this move
+        if depth == 0:
+            return evaluate(board)
+
+        key = board.key()
+        entry = self.table.get(key)
+        best_move = None
+        if entry is not None:
+            best_move = entry[4]
+            if entry[1] >= depth:
+                value, flag = entry[2], entry[3]
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        best = -WIN
+        for column in self.moves(best_move):
+            board.play(column)
+            score = -self.negamax(depth - 1, -beta, -alpha)
+            board.undo(column)
+            if score > best:
+                best, best_move = score, column
+            if best > alpha:
+                alpha = best
+                if alpha >= beta:
+                    break
+
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.table.put(key, depth, best, flag, best_move)
+        return best
+
+    def root(self, depth, first, slack=0):
+        """(score, column) for every move searched to ``depth``. Scores more
+        than ``slack`` below the best are only upper bounds."""
+        board = self.board
+        scores = []
+        alpha = -WIN
+        for column in self.moves(first):
+            board.play(column)
+            score = -self.negamax(depth - 1, -WIN, slack + 1 - alpha)
+            board.undo(column)
+            scores.append((score, column))
+            alpha = max(alpha, score)
+        return scores
+
+
+def search(board, depth=CELLS, ms=1000, slack=0, table=None, rng=random):
+    """Choose a column for the player to move.
+
+    Returns {'column', 'score', 'depth', 'nodes'}, where ``depth`` is the
+    deepest iteration that finished within ``ms`` milliseconds.
+    """
+    board = board.copy()
+    for column in ORDER:
+        if board.can_play(column) and board.is_winning_move(column):
+            return {'column': column, 'score': WIN - board.moves - 1, 'depth': 1, 'nodes': 0}
+
+    table = table or TranspositionTable()
+    table.new_search()
+    state = Search(board, table, time.perf_counter() + ms / 1000)
+    best = None
+    reached = 0
+    for iteration in range(1, min(depth, CELLS - board.moves) + 1):
+        try:
+            scores = state.root(iteration, best[1] if best else None, slack)
+        except Timeout:
+            break
+        # Ties go to the move tried first: last iteration's best, then the centre
+        top = max(scores, key=lambda s: s[0])
+        # Moves within ``slack`` of the best are as good as it, at this level
+        best = rng.choice([s for s in scores if s[0] >= top[0] - slack]) if slack else top
+        reached = iteration
+        if abs(top[0]) > WIN - CELLS - 1:
+            break  # the result is decided
+    if best is None:
+        best = (0, state.moves()[0])
+    return {'column': best[1], 'score': best[0], 'depth': reached, 'nodes': state.nodes}
+
+
+_table = None
+_pool = None
+
+
+def choose_move(board, difficulty='medium'):
+    """Worker entry point: the column to play at ``difficulty``"""
+    global _table
+    if _table is None:
+        _table = TranspositionTable()
+    return search(board, table=_table, **DIFFICULTIES[difficulty])['column']
+
+
+def worker_pool(workers=2):
+    """Process pool for searches, started on first use"""
+    global _pool
+    if _pool is None:
+        # Spawned, not forked: the server process has threads running
+        _pool = ProcessPoolExecutor(max_workers=workers,
+                                    mp_context=multiprocessing.get_context('spawn'))
+    return _pool
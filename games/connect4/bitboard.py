@@ -0,0 +1,132 @@
+"""Bitboard Connect 4 engine.
+
+Each player's stones are one int. Column ``c`` uses bits ``c*7`` (bottom)
+to ``c*7 + 5`` (top), and bit ``c*7 + 6`` stays empty as a sentinel, so
+the 7 x 7 = 49 bits can be shifted without a line wrapping from one
+column into the next. ``heights[c]`` is the bit the next stone in column
+``c`` lands on, which makes a drop O(1). Four in a row is a
+shift-and-mask per direction (vertical 1, horizontal 7, the diagonals 6
+and 8), constant work whatever the position.
+
+The list-of-lists board rooms send to clients (row 0 at the top, None or
+a colour per cell) is only a rendered view: ``rows()`` draws it and
+``from_rows()`` reads one back.
+"""
+
+WIDTH = 7
+HEIGHT = 6
+H1 = HEIGHT + 1
+CELLS = WIDTH * HEIGHT
+
+DIRECTIONS = (1, H1, HEIGHT, H1 + 1)
+COLORS = ('red', 'yellow')
+
+
+def lines_of_four(bits):
+    """Mask of the lowest stone of every four in a row, in any direction"""
+    found = 0
+    for shift in DIRECTIONS:
+        pairs = bits & (bits >> shift)
+        found |= pairs & (pairs >> 2 * shift)
+    return found
+
+
+def cell(bit):
+    """(row, column) of a bit index, row 0 being the top of the board"""
+    column, height = divmod(bit, H1)
+    return HEIGHT - 1 - height, column
+
+
+class Board:
+    """A Connect 4 position. Player 0 moves first."""
+
+    __slots__ = ('bits', 'heights', 'moves')
+
+    def __init__(self):
+        self.bits = [0, 0]
+        self.heights = [column * H1 for column in range(WIDTH)]
+        self.moves = 0
+
+    @property
+    def turn(self):
+        """The player to move: 0 or 1"""
+        return self.moves & 1
+
+    @property
+    def mask(self):
+        return self.bits[0] | self.bits[1]
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.bits = list(self.bits)
+        board.heights = list(self.heights)
+        board.moves = self.moves
+        return board
+
+    def can_play(self, column):
+        return 0 <= column < WIDTH and self.heights[column] < column * H1 + HEIGHT
+
+    def play(self, column):
+        """Drop the mover's stone in ``column``; returns the row it lands on"""
+        bit = self.heights[column]
+        self.bits[self.moves & 1] |= 1 << bit
+        self.heights[column] = bit + 1
+        self.moves += 1
+        return cell(bit)[0]
+
+    def undo(self, column):
+        """Take back the last move, which was in ``column``"""
+        self.moves -= 1
+        self.heights[column] -= 1
+        self.bits[self.moves & 1] ^= 1 << self.heights[column]
+
+    def won(self, player):
+        return lines_of_four(self.bits[player]) != 0
+
+    def is_winning_move(self, column):
+        """Whether the player to move wins by playing ``column``"""
+        return lines_of_four(self.bits[self.moves & 1] | 1 << self.heights[column]) != 0
+
+    def is_full(self):
+        return self.moves == CELLS
+
+    def key(self):
+        """Unique int for the position: the mover's stones plus the mask"""
+        return self.bits[self.moves & 1] + self.mask
+
+    def winning_cells(self, player):
+        """(row, column) of the four stones of one of ``player``'s lines, or []"""
+        bits = self.bits[player]
+        for shift in DIRECTIONS:
+            pairs = bits & (bits >> shift)
+            starts = pairs & (pairs >> 2 * shift)
+            if starts:
+                low = (starts & -starts).bit_length() - 1
+                return [cell(low + i * shift) for i in range(4)]
+        return []
+
+    def rows(self, colors=COLORS):
+        """The board as rows of None or colour, top row first"""
+        rows = [[None] * WIDTH for _ in range(HEIGHT)]
+        for player, color in enumerate(colors):
+            bits = self.bits[player]
+            while bits:
+                low = bits & -bits
+                row, column = cell(low.bit_length() - 1)
+                rows[row][column] = color
+                bits ^= low
+        return rows
+
+    @classmethod
+    def from_rows(cls, rows, colors=COLORS):
+        """Read a rendered board back; the mover is whoever has fewer stones"""
+        board = cls()
+        for row in range(HEIGHT):
+            for column in range(WIDTH):
+                value = rows[row][column]
+                if value in colors:
+                    bit = column * H1 + HEIGHT - 1 - row
+                    board.bits[colors.index(value)] |= 1 << bit
+                    board.heights[column] = max(board.heights[column], bit + 1)
+                    board.moves += 1
+        return board
@@ -1,99 +1,142 @@
-from flask_socketio import emit, join_room, leave_room
-from flask import request
-import random
-import string
+from flask_socketio import emit
+from flask import current_app, request
+import logging
+from utils.event_router import get_router
+from utils.player_manager import Roster, connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+from utils.server_mode import run_blocking
+from .ai import DIFFICULTIES, choose_move, worker_pool
+from .bitboard import COLORS, Board
+
+logger = logging.getLogger(__name__)
 
 # Store active Connect4 rooms
-connect4_rooms = {}
+connect4_rooms = RoomStore('connect4')
+
+# Player id of the computer in single-player rooms
+AI_PLAYER_ID = 'computer'
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(
-            random.choices(
-                string.ascii_uppercase +
-                string.digits,
-                k=6))
-        if code not in connect4_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('connect4')
 
 
 def check_winner(board):
-    """Check if there's a winner on the board"""
-    # Check horizontal
-    for row in range(6):
-        for col in range(4):
-            if board[row][col] and board[row][col] == board[row][col +
-                                                                 1] == board[row][col + 2] == board[row][col + 3]:
-                return board[row][col], [
-                    (row, col), (row, col + 1), (row, col + 2), (row, col + 3)]
-
-    # Check vertical
-    for row in range(3):
-        for col in range(7):
-            if board[row][col] and board[row][col] == board[row +
-                                                            1][col] == board[row + 2][col] == board[row + 3][col]:
-                return board[row][col], [
-                    (row, col), (row + 1, col), (row + 2, col), (row + 3, col)]
-
-    # Check diagonal (down-right)
-    for row in range(3):
-        for col in range(4):
-            if board[row][col] and board[row][col] == board[row + 1][col +
-                                                                     1] == board[row + 2][col + 2] == board[row + 3][col + 3]:
-                return board[row][col], [
-                    (row, col), (row + 1, col + 1), (row + 2, col + 2), (row + 3, col + 3)]
-
-    # Check diagonal (down-left)
-    for row in range(3):
-        for col in range(3, 7):
-            if board[row][col] and board[row][col] == board[row + 1][col -
-                                                                     1] == board[row + 2][col - 2] == board[row + 3][col - 3]:
-                return board[row][col], [
-                    (row, col), (row + 1, col - 1), (row + 2, col - 2), (row + 3, col - 3)]
-
+    """Check if there's a winner on a rendered board"""
+    position = Board.from_rows(board)
+    for player, color in enumerate(COLORS):
+        cells = position.winning_cells(player)
+        if cells:
+            return color, cells
     return None, []
 
 
 def register_connect4_events(socketio):
     """Register all Connect4 socket events"""
+    router = get_router(socketio)
+
+    def apply_move(room_code, room, player, column):
+        """Play ``player``'s stone in ``column`` and tell the room; returns
+        whether the game goes on"""
+        game = room['game']
+        # Drop the piece; the board list is only the rendered view
+        row = game.play(column)
+        room['board'][row][column] = player['color']
+        move = {'row': row, 'column': column, 'color': player['color']}
+
+        logger.debug("Room %s: %s placed at (%s, %s)", room_code, player['color'], row, column)
+
+        # Only the mover can have just made four in a row
+        if game.won(COLORS.index(player['color'])):
+            winner = player['color']
+            logger.info("Connect4 room %s won by %s", room_code, winner)
+
+            room['status'] = 'finished'
+
+            socketio.emit('game_over', {
+                'winner': winner,
+                'winning_cells': game.winning_cells(COLORS.index(winner)),
+                'reason': 'connect4',
+                'move': move
+            }, room=room_code)
+            return False
+
+        # Check for draw
+        if game.is_full():
+            logger.info("Connect4 room %s ended in a draw", room_code)
 
-    @socketio.on('create_room')
+            room['status'] = 'finished'
+
+            socketio.emit('game_over', {
+                'winner': 'draw',
+                'winning_cells': [],
+                'reason': 'board_full',
+                'move': move
+            }, room=room_code)
+            return False
+
+        # Switch turn
+        room['current_turn'] = 'yellow' if room['current_turn'] == 'red' else 'red'
+
+        # Send the move, not the board
+        socketio.emit('move_made', {
+            **move,
+            'current_turn': room['current_turn']
+        }, room=room_code)
+        return True
+
+    def request_ai_move(room_code, room):
+        """Search the computer's reply in the worker pool, off this thread"""
+        game = room['game']
+        future = worker_pool().submit(choose_move, game.copy(), room['ai'])
+        socketio.start_background_task(play_ai_move, room_code, room['generation'], game.moves,
+                                       future)
+
+    def play_ai_move(room_code, generation, moves, future):
+        try:
+            column = run_blocking(socketio, future.result)
+        except Exception:
+            logger.exception("Connect4 AI search failed in room %s", room_code)
+            return
+        with connect4_rooms.lock(room_code):
+            room = connect4_rooms.get(room_code)
+            # The game may have ended or restarted while the search ran
+            if room is None or room['status'] != 'playing' or \
+                    room['generation'] != generation or room['game'].moves != moves or \
+                    not room['game'].can_play(column):
+                return
+            apply_move(room_code, room, room['players'].get(AI_PLAYER_ID), column)
+            connect4_rooms.save(room_code)
+
+    @router.on('create_room', 'connect4')
     def handle_create_room(data):
         """Create a new Connect4 room"""
-        if data.get('game_type') != 'connect4':
-            return
-
         room_code = generate_room_code()
         player_name = data.get('player_name', 'Player 1')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"🔴 CREATING CONNECT4 ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Host: {player_name}")
-        print(f"Player ID: {player_id}")
-
         connect4_rooms[room_code] = {
             'code': room_code,
             'host': player_id,
-            'players': [{
+            'players': Roster([{
                 'id': player_id,
                 'name': player_name,
                 'color': 'red',
                 'is_host': True
-            }],
+            }]),
             'status': 'waiting',
             'board': [[None for _ in range(7)] for _ in range(6)],
+            'game': Board(),
+            'generation': 0,
             'current_turn': 'red',
             'game_started': False
         }
 
-        join_room(room_code)
+        join_game_room('connect4', room_code)
 
-        print(f"✅ Room created successfully")
-        print(f"{'=' * 60}\n")
+        logger.info("Connect4 room %s created by %s", room_code, player_name)
 
         # FIXED: Include players array in response
         emit('room_created', {
@@ -104,35 +147,25 @@ def register_connect4_events(socketio):
             'is_host': True
         })
 
-    @socketio.on('join_room')
+    @router.on('join_room', 'connect4')
+    @connect4_rooms.synchronized
     def handle_join_room(data):
         """Join an existing Connect4 room"""
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player 2')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"🟡 JOINING CONNECT4 ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Player: {player_name}")
-
         if room_code not in connect4_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Room not found!'})
             return
 
         room = connect4_rooms[room_code]
 
         if room['status'] != 'waiting':
-            print(f"❌ Game already in progress")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Game already in progress!'})
             return
 
         if len(room['players']) >= 2:
-            print(f"❌ Room is full")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Room is full!'})
             return
 
@@ -143,11 +176,10 @@ def register_connect4_events(socketio):
             'is_host': False
         })
 
-        join_room(room_code)
+        join_game_room('connect4', room_code)
 
-        print(f"✅ Player joined")
-        print(f"Total players: {len(room['players'])}")
-        print(f"{'=' * 60}\n")
+        logger.info("%s joined Connect4 room %s (%d players)",
+                    player_name, room_code, len(room['players']))
 
         emit('room_joined', {
             'room_code': room_code,
@@ -161,15 +193,12 @@ def register_connect4_events(socketio):
             'players': room['players']
         }, room=room_code, include_self=False)
 
-    @socketio.on('start_game')
+    @router.on('start_game', 'connect4')
+    @connect4_rooms.synchronized
     def handle_start_game(data):
         """Start the Connect4 game"""
         room_code = data.get('room_code', '').upper()
 
-        print(f"\n{'=' * 60}")
-        print(f"🎮 STARTING CONNECT4 GAME")
-        print(f"Room: {room_code}")
-
         if room_code not in connect4_rooms:
             emit('error', {'message': 'Room not found'})
             return
@@ -177,154 +206,157 @@ def register_connect4_events(socketio):
         room = connect4_rooms[room_code]
 
         if request.sid != room['host']:
-            print(f"❌ Only host can start")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Only host can start the game!'})
             return
 
         if len(room['players']) != 2:
-            print(f"❌ Need exactly 2 players")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Need 2 players to start!'})
             return
 
+        if room['status'] == 'playing':
+            emit('error', {'message': 'Game already in progress!'})
+            return
+
         room['status'] = 'playing'
         room['game_started'] = True
         room['current_turn'] = 'red'
+        room['board'] = [[None for _ in range(7)] for _ in range(6)]
+        room['game'] = Board()
+        # Searches started for an earlier game are ignored when they finish
+        room['generation'] += 1
 
-        print(f"✅ Game started")
-        print(f"{'=' * 60}\n")
+        logger.info("Connect4 room %s started", room_code)
 
         socketio.emit('game_started', {
             'board': room['board'],
             'current_turn': room['current_turn']
         }, room=room_code)
 
+    @socketio.on('start_ai_game')
+    def handle_start_ai_game(data):
+        """Start a single-player game; the player is red and moves first"""
+        difficulty = data.get('difficulty', 'medium')
+        if difficulty not in DIFFICULTIES:
+            emit('error', {'message': 'Unknown difficulty'})
+            return
+
+        room_code = generate_room_code()
+        player_name = data.get('player_name', 'Player 1')
+        player_id = request.sid
+        worker_pool(current_app.config.get('CONNECT4_AI_WORKERS', 2))
+
+        connect4_rooms[room_code] = {
+            'code': room_code,
+            'host': player_id,
+            'players': Roster([{
+                'id': player_id,
+                'name': player_name,
+                'color': 'red',
+                'is_host': True
+            }, {
+                'id': AI_PLAYER_ID,
+                'name': f'Computer ({difficulty})',
+                'color': 'yellow',
+                'is_host': False,
+                'is_ai': True
+            }]),
+            'status': 'playing',
+            'board': [[None for _ in range(7)] for _ in range(6)],
+            'game': Board(),
+            'generation': 0,
+            'current_turn': 'red',
+            'game_started': True,
+            'ai': difficulty
+        }
+
+        join_game_room('connect4', room_code)
+
+        logger.info("Connect4 room %s: %s vs computer (%s)", room_code, player_name, difficulty)
+
+        room = connect4_rooms[room_code]
+        emit('room_created', {
+            'room_code': room_code,
+            'player_id': player_id,
+            'players': room['players'],
+            'your_color': 'red',
+            'is_host': True,
+            'ai': difficulty
+        })
+        emit('game_started', {
+            'board': room['board'],
+            'current_turn': room['current_turn']
+        })
+
     @socketio.on('make_move')
+    @connect4_rooms.synchronized
     def handle_make_move(data):
         """Handle a player's move"""
         room_code = data.get('room_code', '').upper()
         column = data.get('column')
         player_id = request.sid
 
-        print(f"\n{'=' * 40}")
-        print(f"🎯 MAKE MOVE")
-        print(f"Room: {room_code}")
-        print(f"Column: {column}")
-
         if room_code not in connect4_rooms:
             emit('error', {'message': 'Room not found'})
             return
 
         room = connect4_rooms[room_code]
 
-        # Find player
-        player = None
-        for p in room['players']:
-            if p['id'] == player_id:
-                player = p
-                break
-
+        player = room['players'].get(player_id)
         if not player:
-            print(f"❌ Player not found")
             emit('error', {'message': 'Player not found'})
             return
 
-        if player['color'] != room['current_turn']:
-            print(f"❌ Not player's turn")
-            emit('error', {'message': 'Not your turn!'})
+        if room['status'] != 'playing':
+            emit('error', {'message': 'Game is not in progress'})
             return
 
-        # Find lowest empty row in column
-        row = None
-        for r in range(5, -1, -1):
-            if room['board'][r][column] is None:
-                row = r
-                break
-
-        if row is None:
-            print(f"❌ Column is full")
-            emit('error', {'message': 'Column is full!'})
+        if player['color'] != room['current_turn']:
+            emit('error', {'message': 'Not your turn!'})
             return
 
-        # Place piece
-        room['board'][row][column] = player['color']
-
-        print(f"✅ Piece placed at ({row}, {column})")
-
-        # Check for winner
-        winner, winning_cells = check_winner(room['board'])
-
-        if winner:
-            print(f"🏆 Winner: {winner}")
-            print(f"{'=' * 40}\n")
-
-            room['status'] = 'finished'
-
-            socketio.emit('game_over', {
-                'winner': winner,
-                'winning_cells': winning_cells,
-                'reason': 'connect4'
-            }, room=room_code)
+        game = room['game']
+        if not isinstance(column, int) or not 0 <= column < 7:
+            emit('error', {'message': 'Invalid column!'})
             return
 
-        # Check for draw
-        is_full = all(room['board'][0][c] is not None for c in range(7))
-        if is_full:
-            print(f"🤝 Draw!")
-            print(f"{'=' * 40}\n")
-
-            room['status'] = 'finished'
-
-            socketio.emit('game_over', {
-                'winner': 'draw',
-                'winning_cells': [],
-                'reason': 'board_full'
-            }, room=room_code)
+        if not game.can_play(column):
+            emit('error', {'message': 'Column is full!'})
             return
 
-        # Switch turn
-        room['current_turn'] = 'yellow' if room['current_turn'] == 'red' else 'red'
-
-        print(f"Next turn: {room['current_turn']}")
-        print(f"{'=' * 40}\n")
+        if apply_move(room_code, room, player, column) and room.get('ai'):
+            request_ai_move(room_code, room)
 
-        socketio.emit('move_made', {
-            'board': room['board'],
-            'current_turn': room['current_turn']
-        }, room=room_code)
-
-    @socketio.on('leave_room')
+    @router.on('leave_room', 'connect4')
+    @connect4_rooms.synchronized
     def handle_leave_room(data):
         """Handle player leaving room"""
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
 
-        print(f"\n{'=' * 40}")
-        print(f"🚪 PLAYER LEAVING")
-        print(f"Room: {room_code}")
-
         if room_code not in connect4_rooms:
             return
 
         room = connect4_rooms[room_code]
 
         # Remove player
-        room['players'] = [p for p in room['players'] if p['id'] != player_id]
+        room['players'].discard(player_id)
 
-        leave_room(room_code)
+        leave_game_room('connect4', room_code)
 
-        if len(room['players']) == 0:
-            # Delete empty room
+        if not any(not p.get('is_ai') for p in room['players']):
+            # Delete empty room (the computer doesn't keep one open)
             del connect4_rooms[room_code]
-            print(f"🗑️ Room deleted (empty)")
+            logger.info("Connect4 room %s deleted (empty)", room_code)
         else:
             # Notify remaining players
             socketio.emit('player_left', {
                 'players': room['players']
             }, room=room_code)
-            print(f"✅ Player left, {len(room['players'])} remaining")
+            logger.debug("Player left Connect4 room %s, %d remaining", room_code, len(room['players']))
 
-        print(f"{'=' * 40}\n")
+    @connections.on_disconnect('connect4')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
 
-    print("✅ Connect4 socket events registered")
+    logger.debug("Connect4 socket events registered")
@@ -1,44 +1,34 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
-import random
-import string
+import logging
+from utils.event_router import get_router
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 from .game_logic import validate_number, calculate_feedback, check_winner
 
+logger = logging.getLogger(__name__)
+
 # Store active Digit Guess rooms
-digit_guess_rooms = {}
+digit_guess_rooms = RoomStore('digit_guess')
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(
-            random.choices(
-                string.ascii_uppercase +
-                string.digits,
-                k=6))
-        if code not in digit_guess_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('digit_guess')
 
 
 def register_digit_guess_events(socketio):
     """Register all Digit Guess socket events"""
+    router = get_router(socketio)
 
-    @socketio.on('create_room')
+    @router.on('create_room', 'digit_guess')
     def handle_create_room(data):
         """Create a new Digit Guess room"""
-        if data.get('game_type') != 'digit_guess':
-            return
-
         room_code = generate_room_code()
         player_name = data.get('player_name', 'Player 1')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"🔢 CREATING DIGIT GUESS ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Host: {player_name}")
-        print(f"Player ID: {player_id}")
-
         digit_guess_rooms[room_code] = {
             'code': room_code,
             'host': player_id,
@@ -55,10 +45,9 @@ def register_digit_guess_events(socketio):
             'game_started': False
         }
 
-        join_room(room_code)
+        join_game_room('digit_guess', room_code)
 
-        print(f"✅ Room created successfully")
-        print(f"{'=' * 60}\n")
+        logger.info("Digit Guess room %s created by %s", room_code, player_name)
 
         emit('room_created', {
             'room_code': room_code,
@@ -67,35 +56,25 @@ def register_digit_guess_events(socketio):
             'is_host': True
         })
 
-    @socketio.on('join_room')
+    @router.on('join_room', 'digit_guess')
+    @digit_guess_rooms.synchronized
     def handle_join_room(data):
         """Join an existing Digit Guess room"""
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player 2')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"🔢 JOINING DIGIT GUESS ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Player: {player_name}")
-
         if room_code not in digit_guess_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Room not found!'})
             return
 
         room = digit_guess_rooms[room_code]
 
         if room['status'] != 'waiting':
-            print(f"❌ Game already in progress")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Game already in progress!'})
             return
 
         if len(room['players']) >= 2:
-            print(f"❌ Room is full")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Room is full!'})
             return
 
@@ -109,11 +88,10 @@ def register_digit_guess_events(socketio):
         
         room['guesses'][player_id] = []
 
-        join_room(room_code)
+        join_game_room('digit_guess', room_code)
 
-        print(f"✅ Player joined")
-        print(f"Total players: {len(room['players'])}")
-        print(f"{'=' * 60}\n")
+        logger.info("%s joined Digit Guess room %s (%d players)",
+                    player_name, room_code, len(room['players']))
 
         emit('room_joined', {
             'room_code': room_code,
@@ -126,15 +104,12 @@ def register_digit_guess_events(socketio):
             'players': room['players']
         }, room=room_code, include_self=False)
 
-    @socketio.on('start_game')
+    @router.on('start_game', 'digit_guess')
+    @digit_guess_rooms.synchronized
     def handle_start_game(data):
         """Start the Digit Guess game - move to number setting phase"""
         room_code = data.get('room_code', '').upper()
 
-        print(f"\n{'=' * 60}")
-        print(f"🎮 STARTING DIGIT GUESS GAME")
-        print(f"Room: {room_code}")
-
         if room_code not in digit_guess_rooms:
             emit('error', {'message': 'Room not found'})
             return
@@ -142,39 +117,30 @@ def register_digit_guess_events(socketio):
         room = digit_guess_rooms[room_code]
 
         if request.sid != room['host']:
-            print(f"❌ Only host can start")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Only host can start the game!'})
             return
 
         if len(room['players']) != 2:
-            print(f"❌ Need exactly 2 players")
-            print(f"{'=' * 60}\n")
             emit('error', {'message': 'Need 2 players to start!'})
             return
 
         room['status'] = 'setting_numbers'
         room['game_started'] = True
 
-        print(f"✅ Game started - players setting numbers")
-        print(f"{'=' * 60}\n")
+        logger.info("Digit Guess room %s started", room_code)
 
         socketio.emit('game_started', {
             'status': 'setting_numbers'
         }, room=room_code)
 
     @socketio.on('set_secret_number')
+    @digit_guess_rooms.synchronized
     def handle_set_secret_number(data):
         """Player sets their secret number"""
         room_code = data.get('room_code', '').upper()
         secret_number = data.get('secret_number', '').strip()
         player_id = request.sid
 
-        print(f"\n{'=' * 40}")
-        print(f"🔒 SET SECRET NUMBER")
-        print(f"Room: {room_code}")
-        print(f"Player: {player_id}")
-
         if room_code not in digit_guess_rooms:
             emit('error', {'message': 'Room not found'})
             return
@@ -184,7 +150,6 @@ def register_digit_guess_events(socketio):
         # Validate number
         is_valid, error_msg = validate_number(secret_number)
         if not is_valid:
-            print(f"❌ Invalid number: {error_msg}")
             emit('error', {'message': error_msg})
             return
 
@@ -202,7 +167,7 @@ def register_digit_guess_events(socketio):
         player['secret_number'] = secret_number
         player['ready'] = True
 
-        print(f"✅ Secret number set")
+        logger.debug("Room %s: %s set their number", room_code, player['name'])
 
         # Check if both players are ready
         all_ready = all(p['ready'] for p in room['players'])
@@ -218,9 +183,7 @@ def register_digit_guess_events(socketio):
             # First player (host) goes first
             room['current_turn'] = room['players'][0]['id']
 
-            print(f"✅ Both players ready - starting guessing phase")
-            print(f"First turn: {room['current_turn']}")
-            print(f"{'=' * 40}\n")
+            logger.debug("Room %s: both numbers set, guessing starts", room_code)
 
             socketio.emit('guessing_phase_started', {
                 'current_turn': room['current_turn'],
@@ -228,17 +191,13 @@ def register_digit_guess_events(socketio):
             }, room=room_code)
 
     @socketio.on('make_guess')
+    @digit_guess_rooms.synchronized
     def handle_make_guess(data):
         """Player makes a guess at opponent's number"""
         room_code = data.get('room_code', '').upper()
         guess = data.get('guess', '').strip()
         player_id = request.sid
 
-        print(f"\n{'=' * 40}")
-        print(f"🎯 MAKE GUESS")
-        print(f"Room: {room_code}")
-        print(f"Guess: {guess}")
-
         if room_code not in digit_guess_rooms:
             emit('error', {'message': 'Room not found'})
             return
@@ -247,14 +206,12 @@ def register_digit_guess_events(socketio):
 
         # Check if it's player's turn
         if room['current_turn'] != player_id:
-            print(f"❌ Not player's turn")
             emit('error', {'message': 'Not your turn!'})
             return
 
         # Validate guess
         is_valid, error_msg = validate_number(guess)
         if not is_valid:
-            print(f"❌ Invalid guess: {error_msg}")
             emit('error', {'message': error_msg})
             return
 
@@ -280,13 +237,11 @@ def register_digit_guess_events(socketio):
             'feedback': feedback
         })
 
-        print(f"✅ Guess processed")
-        print(f"Feedback: {feedback}")
+        logger.debug("Room %s: %s guessed %s -> %s", room_code, current_player['name'], guess, feedback)
 
         # Check if player won
         if check_winner(guess, opponent['secret_number']):
-            print(f"🏆 Winner: {current_player['name']}")
-            print(f"{'=' * 40}\n")
+            logger.info("Digit Guess room %s won by %s", room_code, current_player['name'])
 
             room['status'] = 'finished'
 
@@ -302,9 +257,6 @@ def register_digit_guess_events(socketio):
         # Switch turn
         room['current_turn'] = opponent['id']
 
-        print(f"Next turn: {opponent['name']}")
-        print(f"{'=' * 40}\n")
-
         socketio.emit('guess_made', {
             'player_id': player_id,
             'player_name': current_player['name'],
@@ -314,16 +266,13 @@ def register_digit_guess_events(socketio):
             'guess_history': room['guesses']
         }, room=room_code)
 
-    @socketio.on('leave_room')
+    @router.on('leave_room', 'digit_guess')
+    @digit_guess_rooms.synchronized
     def handle_leave_room(data):
         """Handle player leaving room"""
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
 
-        print(f"\n{'=' * 40}")
-        print(f"🚪 PLAYER LEAVING")
-        print(f"Room: {room_code}")
-
         if room_code not in digit_guess_rooms:
             return
 
@@ -332,19 +281,22 @@ def register_digit_guess_events(socketio):
         # Remove player
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
 
-        leave_room(room_code)
+        leave_game_room('digit_guess', room_code)
 
         if len(room['players']) == 0:
             # Delete empty room
             del digit_guess_rooms[room_code]
-            print(f"🗑️ Room deleted (empty)")
+            logger.info("Digit Guess room %s deleted (empty)", room_code)
         else:
             # Notify remaining players
             socketio.emit('player_left', {
                 'players': room['players']
             }, room=room_code)
-            print(f"✅ Player left, {len(room['players'])} remaining")
+            logger.debug("Player left Digit Guess room %s, %d remaining", room_code, len(room['players']))
 
-        print(f"{'=' * 40}\n")
+    @connections.on_disconnect('digit_guess')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
 
-    print("✅ Digit Guess socket events registered")
+    logger.debug("Digit Guess socket events registered")
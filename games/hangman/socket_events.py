@@ -1,17 +1,16 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
-import random
-import string
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 from .game_logic import HangmanGame
 
-hangman_rooms = {}  # room_code -> HangmanGame
+hangman_rooms = RoomStore('hangman')  # room_code -> HangmanGame
 
 
 def _generate_room_code():
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in hangman_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('hangman')
 
 
 def _players_payload(game):
@@ -33,7 +32,7 @@ def register_hangman_events(socketio):
         game.add_player(player_id, player_name, is_host=True)
         hangman_rooms[room_code] = game
 
-        join_room(room_code)
+        join_game_room('hangman', room_code)
 
         emit('hangman_room_created', {
             'room_code': room_code,
@@ -43,6 +42,7 @@ def register_hangman_events(socketio):
         })
 
     @socketio.on('hangman_join_room')
+    @hangman_rooms.synchronized
     def handle_join_room(data):
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
@@ -59,7 +59,7 @@ def register_hangman_events(socketio):
             return
 
         game.add_player(player_id, player_name, is_host=False)
-        join_room(room_code)
+        join_game_room('hangman', room_code)
 
         emit('hangman_room_joined', {
             'room_code': room_code,
@@ -73,6 +73,7 @@ def register_hangman_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('hangman_start_game')
+    @hangman_rooms.synchronized
     def handle_start_game(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -99,6 +100,7 @@ def register_hangman_events(socketio):
         socketio.emit('hangman_waiting_for_word', {}, room=room_code, include_self=False)
 
     @socketio.on('hangman_set_word')
+    @hangman_rooms.synchronized
     def handle_set_word(data):
         room_code = data.get('room_code', '').upper()
         word = data.get('word', '').strip()
@@ -129,6 +131,7 @@ def register_hangman_events(socketio):
         socketio.emit('hangman_game_started', state, room=room_code)
 
     @socketio.on('hangman_guess')
+    @hangman_rooms.synchronized
     def handle_guess(data):
         room_code = data.get('room_code', '').upper()
         letter = data.get('letter', '')
@@ -174,6 +177,7 @@ def register_hangman_events(socketio):
             socketio.emit('hangman_letter_guessed', state, room=room_code)
 
     @socketio.on('hangman_play_again')
+    @hangman_rooms.synchronized
     def handle_play_again(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -199,6 +203,7 @@ def register_hangman_events(socketio):
         socketio.emit('hangman_waiting_for_word', {}, room=room_code, include_self=False)
 
     @socketio.on('hangman_leave_room')
+    @hangman_rooms.synchronized
     def handle_leave_room(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -208,7 +213,7 @@ def register_hangman_events(socketio):
 
         game = hangman_rooms[room_code]
         game.remove_player(player_id)
-        leave_room(room_code)
+        leave_game_room('hangman', room_code)
 
         if not game.players:
             del hangman_rooms[room_code]
@@ -232,12 +237,9 @@ def register_hangman_events(socketio):
             'state': game.state,
         }, room=room_code)
 
-    @socketio.on('disconnect')
-    def handle_disconnect():
-        player_id = request.sid
-        for room_code in list(hangman_rooms.keys()):
-            if player_id in hangman_rooms[room_code].players:
-                handle_leave_room({'room_code': room_code})
-                break
+    @connections.on_disconnect('hangman')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
 
     print('✅ Hangman socket events registered')
@@ -6,6 +6,8 @@ Social deduction game with roles, day/night phases, and voting
 import random
 from enum import Enum
 
+from utils.broadcast import mark_entry, personalize, personalized_payloads
+
 
 class Role(Enum):
     MAFIA = "mafia"
@@ -250,50 +252,63 @@ class MafiaGame:
 
     def get_game_state(self, player_id=None):
         """Get current game state (filtered by player if provided)"""
-        state = {
+        state = self.public_state()
+        if player_id is None:
+            return state
+        seat = next((i for i, pid in enumerate(self.players) if pid == player_id), None)
+        return personalize(state, self.private_state(player_id, seat, state['players']))
+
+    def player_states(self):
+        """Yield (player_id, state) for every player, sharing the public part"""
+        public = self.public_state()
+        seats = {pid: i for i, pid in enumerate(self.players)}
+        return personalized_payloads(
+            public, list(self.players),
+            lambda pid: self.private_state(pid, seats[pid], public['players']))
+
+    def public_state(self):
+        """State every player may see"""
+        return {
             'room_code': self.room_code,
             'phase': self.phase.value,
             'round': self.round_number,
-            'players': [],
-            'log': self.game_log[-10:],  # Last 10 events
-        }
-        
-        # Build player list
-        for pid, pdata in self.players.items():
-            player_info = {
+            'players': [{
                 'id': pid,
                 'name': pdata['name'],
                 'alive': pdata['alive'],
-            }
-            
-            # Only show role to the player themselves
-            if player_id == pid:
-                player_info['role'] = pdata['role'].value
-            
-            state['players'].append(player_info)
-        
+            } for pid, pdata in self.players.items()],
+            'log': self.game_log[-10:],  # Last 10 events
+        }
+
+    def private_state(self, player_id, seat, public_players):
+        """Fields only ``player_id`` sees: their role and phase-specific info"""
+        if seat is None:
+            return {}
+        player_role = self.players[player_id]['role']
+        state = {}
+        # Only show role to the player themselves
+        if player_role is not None:
+            state['players'] = mark_entry(public_players, seat, role=player_role.value)
+
         # Add phase-specific info
-        if player_id and player_id in self.players:
-            player_role = self.players[player_id]['role']
-            
-            if self.phase == Phase.NIGHT:
-                # Show who has submitted actions
-                state['actions_submitted'] = len(self.night_actions)
-                
-                # Detective gets investigation result
-                if player_role == Role.DETECTIVE and self.investigated_tonight:
-                    target_role = self.players[self.investigated_tonight]['role']
-                    target_name = self.players[self.investigated_tonight]['name']
-                    is_mafia = target_role == Role.MAFIA
-                    state['investigation_result'] = {
-                        'target': target_name,
-                        'is_mafia': is_mafia
-                    }
-            
-            elif self.phase == Phase.VOTING:
-                state['votes_cast'] = len(self.day_votes)
-                state['alive_count'] = sum(1 for p in self.players.values() if p['alive'])
-        
+        if self.phase == Phase.NIGHT:
+            # Show who has submitted actions
+            state['actions_submitted'] = len(self.night_actions)
+
+            # Detective gets investigation result
+            if player_role == Role.DETECTIVE and self.investigated_tonight:
+                target_role = self.players[self.investigated_tonight]['role']
+                target_name = self.players[self.investigated_tonight]['name']
+                is_mafia = target_role == Role.MAFIA
+                state['investigation_result'] = {
+                    'target': target_name,
+                    'is_mafia': is_mafia
+                }
+
+        elif self.phase == Phase.VOTING:
+            state['votes_cast'] = len(self.day_votes)
+            state['alive_count'] = sum(1 for p in self.players.values() if p['alive'])
+
         return state
 
     def log_event(self, message):
@@ -3,11 +3,13 @@ Mafia game routes and Socket.IO handlers
 """
 
 from flask import Blueprint, render_template, request
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_manager import RoomStore
 from .game_logic import MafiaGame
 
 # Game instances
-mafia_games = {}
+mafia_games = RoomStore('mafia')
 
 # Blueprint
 mafia_bp = Blueprint('mafia', __name__)
@@ -23,9 +25,10 @@ def register_mafia_handlers(socketio):
     """Register Socket.IO event handlers for Mafia game"""
 
     @socketio.on('mafia_join')
+    @mafia_games.synchronized
     def handle_join(data):
         """Join a Mafia game room"""
-        room_code = data.get('room_code')
+        room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name')
         player_id = request.sid
         
@@ -44,16 +47,17 @@ def register_mafia_handlers(socketio):
             emit('mafia_error', {'error': result['error']})
             return
         
-        join_room(room_code)
+        join_game_room('mafia', room_code)
         
         # Send state to everyone
         emit('mafia_state', game.get_game_state(), room=room_code)
         emit('mafia_joined', {'room_code': room_code})
 
     @socketio.on('mafia_start')
+    @mafia_games.synchronized
     def handle_start(data):
         """Start the game and assign roles"""
-        room_code = data.get('room_code')
+        room_code = data.get('room_code', '').upper().strip()
         player_id = request.sid
         
         if room_code not in mafia_games:
@@ -68,17 +72,17 @@ def register_mafia_handlers(socketio):
             return
         
         # Send role to each player privately
-        for pid in game.players:
-            player_state = game.get_game_state(pid)
+        for pid, player_state in game.player_states():
             socketio.emit('mafia_state', player_state, room=pid)
         
         # Notify all that game started
         emit('mafia_started', {}, room=room_code)
 
     @socketio.on('mafia_night_action')
+    @mafia_games.synchronized
     def handle_night_action(data):
         """Handle night actions (kill, save, investigate)"""
-        room_code = data.get('room_code')
+        room_code = data.get('room_code', '').upper().strip()
         action_type = data.get('action')
         target_id = data.get('target')
         player_id = request.sid
@@ -108,14 +112,14 @@ def register_mafia_handlers(socketio):
             game.resolve_night()
             
             # Send updated state to everyone
-            for pid in game.players:
-                player_state = game.get_game_state(pid)
+            for pid, player_state in game.player_states():
                 socketio.emit('mafia_state', player_state, room=pid)
 
     @socketio.on('mafia_start_voting')
+    @mafia_games.synchronized
     def handle_start_voting(data):
         """Start the voting phase"""
-        room_code = data.get('room_code')
+        room_code = data.get('room_code', '').upper().strip()
         player_id = request.sid
         
         if room_code not in mafia_games:
@@ -133,9 +137,10 @@ def register_mafia_handlers(socketio):
         emit('mafia_state', game.get_game_state(), room=room_code)
 
     @socketio.on('mafia_vote')
+    @mafia_games.synchronized
     def handle_vote(data):
         """Submit a vote to eliminate"""
-        room_code = data.get('room_code')
+        room_code = data.get('room_code', '').upper().strip()
         target_id = data.get('target')
         player_id = request.sid
         
@@ -163,18 +168,18 @@ def register_mafia_handlers(socketio):
                 emit('mafia_game_over', {'winner': result['winner']}, room=room_code)
             
             # Send updated state
-            for pid in game.players:
-                player_state = game.get_game_state(pid)
+            for pid, player_state in game.player_states():
                 socketio.emit('mafia_state', player_state, room=pid)
 
     @socketio.on('mafia_leave')
+    @mafia_games.synchronized
     def handle_leave(data):
         """Leave the game"""
-        room_code = data.get('room_code')
+        room_code = data.get('room_code', '').upper().strip()
         player_id = request.sid
         
         if room_code in mafia_games:
-            leave_room(room_code)
+            leave_game_room('mafia', room_code)
             
             # Optionally clean up empty games
             game = mafia_games[room_code]
@@ -184,21 +189,23 @@ def register_mafia_handlers(socketio):
             if not game.players:
                 del mafia_games[room_code]
 
-    @socketio.on('disconnect')
-    def handle_disconnect():
-        """Handle player disconnect"""
+    @connections.on_disconnect('mafia')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their game"""
         player_id = request.sid
-        
-        # Find and remove player from any games
-        for room_code, game in list(mafia_games.items()):
-            if player_id in game.players:
-                player_name = game.players[player_id]['name']
-                game.log_event(f"{player_name} disconnected")
-                del game.players[player_id]
-                
-                # Notify room
-                emit('mafia_state', game.get_game_state(), room=room_code)
-                
-                # Clean up empty games
-                if not game.players:
-                    del mafia_games[room_code]
+
+        with mafia_games.lock(room_code):
+            game = mafia_games.get(room_code)
+            if game is None or player_id not in game.players:
+                return
+
+            player_name = game.players[player_id]['name']
+            game.log_event(f"{player_name} disconnected")
+            del game.players[player_id]
+
+            # Notify room
+            emit('mafia_state', game.get_game_state(), room=room_code)
+
+            # Clean up empty games
+            if not game.players:
+                del mafia_games[room_code]
@@ -1,13 +1,13 @@
 from flask import Blueprint, render_template, jsonify, request, session
 from .game_logic import MemoryGame
-import random
-import string
 import uuid
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
 memory_bp = Blueprint('memory', __name__)
 
 # Store active games (in production, use Redis or database)
-active_games = {}
+active_games = RoomStore('memory')
 
 
 @memory_bp.route('/')
@@ -37,11 +37,7 @@ def list_rooms():
 @memory_bp.route('/create', methods=['POST'])
 def create_game():
     """Create a new game room"""
-    room_code = ''.join(
-        random.choices(
-            string.ascii_uppercase +
-            string.digits,
-            k=6))
+    room_code = room_codes.allocate('memory')
     
     # Get grid size from request (default 16 for 4x4)
     data = request.json or {}
@@ -122,7 +118,8 @@ def flip_card(room_code):
     if card_index is None:
         return jsonify({'success': False, 'error': 'Card index required'}), 400
 
-    result = game.flip_card(player_id, card_index)
+    with active_games.lock(room_code):
+        result = game.flip_card(player_id, card_index)
     return jsonify(result)
 
 
@@ -133,7 +130,8 @@ def reset_flipped(room_code):
         return jsonify({'success': False, 'error': 'Game not found'}), 404
 
     game = active_games[room_code]
-    result = game.reset_flipped_cards()
+    with active_games.lock(room_code):
+        result = game.reset_flipped_cards()
     
     return jsonify({
         'success': True,
@@ -1,23 +1,21 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
+import logging
 import random
-import string
 import time
+from utils.player_manager import Roster, connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+
+logger = logging.getLogger(__name__)
 
 # Store active pictionary rooms
-pictionary_rooms = {}
+pictionary_rooms = RoomStore('pictionary')
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(
-            random.choices(
-                string.ascii_uppercase +
-                string.digits,
-                k=6))
-        if code not in pictionary_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('pictionary')
 
 
 # Word list for drawing
@@ -60,24 +58,17 @@ def register_pictionary_events(socketio):
         max_rounds = data.get('max_rounds', 3)
         difficulty = data.get('difficulty', 'medium')
 
-        print(f"\n{'=' * 60}")
-        print(f"🎨 CREATING PICTIONARY ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Host: {player_name}")
-        print(f"Time limit: {time_limit}s")
-        print(f"Difficulty: {difficulty}")
-
         pictionary_rooms[room_code] = {
             'code': room_code,
             'host': player_id,
-            'players': [{
+            'players': Roster([{
                 'id': player_id,
                 'name': player_name,
                 'is_host': True,
                 'ready': False,
                 'score': 0,
                 'is_drawing': False
-            }],
+            }]),
             'status': 'waiting',  # waiting, playing, finished
             'time_limit': time_limit,
             'round': 0,
@@ -91,10 +82,10 @@ def register_pictionary_events(socketio):
             'drawing_data': []
         }
 
-        join_room(room_code)
+        join_game_room('pictionary', room_code)
 
-        print(f"✅ Pictionary room created")
-        print(f"{'=' * 60}\n")
+        logger.info("Pictionary room %s created by %s (%ss, %s)",
+                    room_code, player_name, time_limit, difficulty)
 
         emit('pictionary_room_created', {
             'room_code': room_code,
@@ -106,34 +97,24 @@ def register_pictionary_events(socketio):
         })
 
     @socketio.on('join_pictionary_room')
+    @pictionary_rooms.synchronized
     def handle_join_room(data):
         """Join an existing pictionary room"""
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print(f"🚪 JOINING PICTIONARY ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Player: {player_name}")
-
         if room_code not in pictionary_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             emit('pictionary_error', {'message': 'Room not found!'})
             return
 
         room = pictionary_rooms[room_code]
 
         if room['status'] != 'waiting':
-            print(f"❌ Game already in progress")
-            print(f"{'=' * 60}\n")
             emit('pictionary_error', {'message': 'Game already in progress!'})
             return
 
         if len(room['players']) >= 8:
-            print(f"❌ Room is full")
-            print(f"{'=' * 60}\n")
             emit('pictionary_error', {'message': 'Room is full! (Max 8 players)'})
             return
 
@@ -146,11 +127,10 @@ def register_pictionary_events(socketio):
             'is_drawing': False
         })
 
-        join_room(room_code)
+        join_game_room('pictionary', room_code)
 
-        print(f"✅ Player joined")
-        print(f"Total players: {len(room['players'])}")
-        print(f"{'=' * 60}\n")
+        logger.info("%s joined Pictionary room %s (%d players)",
+                    player_name, room_code, len(room['players']))
 
         emit('pictionary_room_joined', {
             'room_code': room_code,
@@ -164,6 +144,7 @@ def register_pictionary_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('pictionary_player_ready')
+    @pictionary_rooms.synchronized
     def handle_player_ready(data):
         """Mark player as ready"""
         room_code = data.get('room_code', '').upper()
@@ -174,44 +155,34 @@ def register_pictionary_events(socketio):
 
         room = pictionary_rooms[room_code]
 
-        for player in room['players']:
-            if player['id'] == player_id:
-                player['ready'] = True
-                break
+        player = room['players'].get(player_id)
+        if player:
+            player['ready'] = True
 
         socketio.emit('pictionary_ready_update', {
             'players': room['players']
         }, room=room_code)
 
     @socketio.on('start_pictionary_game')
+    @pictionary_rooms.synchronized
     def handle_start_game(data):
         """Start the pictionary game"""
         room_code = data.get('room_code', '').upper()
 
-        print(f"\n{'=' * 60}")
-        print(f"🎮 STARTING PICTIONARY - Room: {room_code}")
-
         if room_code not in pictionary_rooms:
-            print(f"❌ Room not found")
-            print(f"{'=' * 60}\n")
             return
 
         room = pictionary_rooms[room_code]
 
         if request.sid != room['host']:
-            print(f"❌ Only host can start")
-            print(f"{'=' * 60}\n")
             emit('pictionary_error', {'message': 'Only host can start the game!'})
             return
 
         if len(room['players']) < 2:
-            print(f"❌ Need at least 2 players")
-            print(f"{'=' * 60}\n")
             emit('pictionary_error', {'message': 'Need at least 2 players to start!'})
             return
 
-        print(f"✅ Game starting with {len(room['players'])} players")
-        print(f"{'=' * 60}\n")
+        logger.info("Pictionary room %s started with %d players", room_code, len(room['players']))
 
         start_turn(room_code, socketio)
 
@@ -239,7 +210,8 @@ def register_pictionary_events(socketio):
         # Move to next drawer for next turn
         room['drawer_index'] = (drawer_index + 1) % len(room['players'])
 
-        print(f"\n🎨 Round {room['round']} - {current_drawer['name']} is drawing: {room['current_word']}")
+        logger.debug("Room %s round %s: %s is drawing %r",
+                     room_code, room['round'], current_drawer['name'], room['current_word'])
 
         # Send word to drawer only
         socketio.emit('turn_start_drawer', {
@@ -262,6 +234,7 @@ def register_pictionary_events(socketio):
         }, room=room_code, skip_sid=current_drawer['id'])
 
     @socketio.on('draw_action')
+    @pictionary_rooms.synchronized
     def handle_draw_action(data):
         """Handle drawing actions (pen strokes)"""
         room_code = data.get('room_code', '').upper()
@@ -286,6 +259,7 @@ def register_pictionary_events(socketio):
         }, room=room_code, skip_sid=player_id)
 
     @socketio.on('submit_guess')
+    @pictionary_rooms.synchronized
     def handle_guess(data):
         """Handle guess submission"""
         room_code = data.get('room_code', '').upper()
@@ -307,12 +281,8 @@ def register_pictionary_events(socketio):
 
         correct_word = room['current_word'].lower()
 
-        # Find player
-        player_name = None
-        for player in room['players']:
-            if player['id'] == player_id:
-                player_name = player['name']
-                break
+        player = room['players'].get(player_id)
+        player_name = player['name'] if player else None
 
         # Broadcast guess to room
         socketio.emit('player_guessed', {
@@ -329,21 +299,18 @@ def register_pictionary_events(socketio):
             points = 10 + time_bonus + position_bonus
 
             # Award points to guesser
-            for player in room['players']:
-                if player['id'] == player_id:
-                    player['score'] += points
-                    break
+            if player:
+                player['score'] += points
 
             # Award points to drawer
-            for player in room['players']:
-                if player['id'] == room['current_drawer']:
-                    player['score'] += 5
-                    break
+            drawer = room['players'].get(room['current_drawer'])
+            if drawer:
+                drawer['score'] += 5
 
             # Mark as guessed
             room['guessed_players'].append(player_id)
 
-            print(f"✅ {player_name} guessed correctly! +{points} points")
+            logger.debug("Room %s: %s guessed correctly (+%s)", room_code, player_name, points)
 
             socketio.emit('correct_guess', {
                 'player_name': player_name,
@@ -356,6 +323,7 @@ def register_pictionary_events(socketio):
                 end_turn(room_code, socketio)
 
     @socketio.on('time_up')
+    @pictionary_rooms.synchronized
     def handle_time_up(data):
         """Handle time running out"""
         room_code = data.get('room_code', '').upper()
@@ -373,7 +341,7 @@ def register_pictionary_events(socketio):
         """End current turn"""
         room = pictionary_rooms[room_code]
 
-        print(f"\n⏰ Turn ended - Word was: {room['current_word']}")
+        logger.debug("Room %s: turn ended, word was %r", room_code, room['current_word'])
 
         socketio.emit('turn_end', {
             'word': room['current_word'],
@@ -386,6 +354,7 @@ def register_pictionary_events(socketio):
             end_game(room_code, socketio)
 
     @socketio.on('next_turn')
+    @pictionary_rooms.synchronized
     def handle_next_turn(data):
         """Start next turn"""
         room_code = data.get('room_code', '').upper()
@@ -413,9 +382,8 @@ def register_pictionary_events(socketio):
             reverse=True
         )
 
-        print(f"\n🎉 GAME OVER - Final Results:")
-        for i, player in enumerate(final_results):
-            print(f"{i + 1}. {player['name']}: {player['score']} points")
+        logger.info("Pictionary room %s finished: %s", room_code,
+                    [(p['name'], p['score']) for p in final_results])
 
         socketio.emit('game_over', {
             'final_results': [{
@@ -426,6 +394,7 @@ def register_pictionary_events(socketio):
         }, room=room_code)
 
     @socketio.on('leave_pictionary_room')
+    @pictionary_rooms.synchronized
     def handle_leave_room(data):
         """Leave pictionary room"""
         room_code = data.get('room_code', '').upper()
@@ -437,14 +406,14 @@ def register_pictionary_events(socketio):
         room = pictionary_rooms[room_code]
 
         # Remove player
-        room['players'] = [p for p in room['players'] if p['id'] != player_id]
+        room['players'].discard(player_id)
 
-        leave_room(room_code)
+        leave_game_room('pictionary', room_code)
 
         if len(room['players']) == 0:
             # Delete empty room
             del pictionary_rooms[room_code]
-            print(f"🗑️ Room {room_code} deleted (empty)")
+            logger.info("Pictionary room %s deleted (empty)", room_code)
         else:
             # If host left, assign new host
             if room['host'] == player_id and len(room['players']) > 0:
@@ -459,4 +428,9 @@ def register_pictionary_events(socketio):
                     'players': room['players']
                 }, room=room_code)
 
-    print("✅ Pictionary socket events registered")
+    @connections.on_disconnect('pictionary')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
+    logger.debug("Pictionary socket events registered")
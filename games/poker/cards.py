@@ -0,0 +1,121 @@
+"""Integer playing cards.
+
+A card is an int 0-51: ``rank * 4 + suit`` with ranks 0 (deuce) to 12 (ace)
+and suits in ``SUITS`` order. Game logic, the hand evaluator and equity code
+work on these ints; ``cards_to_wire`` converts to the ``{'value', 'suit'}``
+dicts the poker client renders only when a payload is built. Each room keeps
+one ``Deck`` (52 bytes) and reshuffles it in place for every hand.
+"""
+
+import random
+
+RANKS = '23456789TJQKA'
+SUITS = '♠♥♦♣'
+# ASCII suit letters, same order, for text notation ('As', 'Td')
+SUIT_LETTERS = 'shdc'
+WIRE_VALUES = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+_WIRE_RANKS = {value: rank for rank, value in enumerate(WIRE_VALUES)}
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+_SUIT_INDEX.update({letter: i for i, letter in enumerate(SUIT_LETTERS)})
+
+
+def make_card(rank, suit):
+    return rank * 4 + suit
+
+
+def rank_of(card):
+    return card >> 2
+
+
+def suit_of(card):
+    return card & 3
+
+
+def parse_card(text):
+    """'As', 'Td', '10h' or 'A♠' -> card int"""
+    value, suit = text[:-1].upper(), text[-1]
+    rank = RANKS.find(value) if len(value) == 1 else -1
+    if rank < 0:
+        rank = _WIRE_RANKS.get(value, -1)
+    if rank < 0 or suit not in _SUIT_INDEX:
+        raise ValueError(f'Not a card: {text!r}')
+    return make_card(rank, _SUIT_INDEX[suit])
+
+
+def parse_cards(text):
+    """'As Kd 7c' -> [card, ...]"""
+    return [parse_card(part) for part in text.split()]
+
+
+def card_str(card):
+    """card int -> 'As'"""
+    return RANKS[card >> 2] + SUIT_LETTERS[card & 3]
+
+
+def card_to_wire(card):
+    """card int -> {'value': 'A', 'suit': '♠'} as sent to clients"""
+    return {'value': WIRE_VALUES[card >> 2], 'suit': SUITS[card & 3]}
+
+
+def card_from_wire(card):
+    """{'value': 'A', 'suit': '♠'} -> card int"""
+    return make_card(_WIRE_RANKS[card['value']], _SUIT_INDEX[card['suit']])
+
+
+# card int -> wire dict, built once; payloads share these (never mutate them)
+WIRE_CARDS = tuple(card_to_wire(card) for card in range(52))
+
+
+def cards_to_wire(cards):
+    """[card int, ...] -> [{'value', 'suit'}, ...] for a payload"""
+    return [WIRE_CARDS[card] for card in cards]
+
+
+class Deck:
+    """A reusable deck of card ints, dealt from a cursor.
+
+    ``shuffle`` permutes the 52 bytes in place and rewinds the cursor, so a
+    hand allocates nothing. ``pop`` deals the next card and ``len``/truth
+    give the cards left, like the list of cards the room used to hold.
+    """
+
+    def __init__(self, rng=None):
+        self.cards = bytearray(range(52))
+        self.dealt = 52  # nothing to deal until the first shuffle
+        self._rng = rng or random
+
+    def __getstate__(self):
+        # The rng (usually the random module) isn't pickled with room state
+        return {'cards': self.cards, 'dealt': self.dealt}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._rng = random
+
+    def shuffle(self):
+        self._rng.shuffle(self.cards)
+        self.dealt = 0
+        return self
+
+    def pop(self):
+        if self.dealt >= 52:
+            raise IndexError('deal from an empty deck')
+        card = self.cards[self.dealt]
+        self.dealt += 1
+        return card
+
+    def deal(self, n):
+        """The next ``n`` cards as a list"""
+        if self.dealt + n > 52:
+            raise IndexError('deal from an empty deck')
+        cards = list(self.cards[self.dealt:self.dealt + n])
+        self.dealt += n
+        return cards
+
+    def remaining(self):
+        """Cards not dealt yet"""
+        return list(self.cards[self.dealt:])
+
+    def __len__(self):
+        return 52 - self.dealt
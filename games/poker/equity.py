@@ -0,0 +1,142 @@
+"""Win/tie equity for live poker hands.
+
+``equity(hands, board)`` deals the rest of the board many times at once as
+NumPy arrays and scores every player's 7 cards with a vectorized version of
+``evaluator.evaluate`` (same card keys, same lookup tables). When the
+remaining boards are few enough (turn and flop) it enumerates all of them
+instead and the result is exact. Monte Carlo runs in batches until a time
+budget is spent, so callers get a bounded-latency estimate.
+``equity_vs_random`` deals the opponents' hole cards too, for equity against
+unknown hands (see ``preflop`` for the precomputed starting-hand table).
+"""
+
+import time
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from . import evaluator
+
+# Enumerate every remaining board when there are at most this many
+EXACT_LIMIT = 2000
+BATCH = 1000
+DEFAULT_BUDGET = 0.005  # seconds
+
+_CARD_KEYS = np.array(evaluator.CARD_KEYS, dtype=np.int64)
+_batch_tables = None
+
+
+def _tables():
+    """Evaluator tables as arrays: sorted rank keys/values, flush values, flush suit"""
+    global _batch_tables
+    if _batch_tables is None:
+        rank_values, flush_values, flush_suit = evaluator.tables()
+        keys = np.array(sorted(rank_values), dtype=np.int64)
+        values = np.array([rank_values[k] for k in keys.tolist()], dtype=np.int64)
+        _batch_tables = (keys, values, np.array(flush_values, dtype=np.int64),
+                         np.array(flush_suit, dtype=np.int8))
+    return _batch_tables
+
+
+def evaluate_batch(cards):
+    """``evaluator.evaluate`` over each row of an (n, k) int array of cards"""
+    keys, values, flush_values, flush_suit = _tables()
+    cards = np.asarray(cards, dtype=np.int64)
+    total = _CARD_KEYS[cards].sum(axis=1)
+    result = values[np.searchsorted(keys, total >> 16)]
+
+    suit = flush_suit[total & 0xFFFF]
+    flushed = np.nonzero(suit >= 0)[0]
+    if flushed.size:
+        rows = cards[flushed]
+        in_suit = (rows & 3) == suit[flushed][:, None]
+        masks = np.where(in_suit, 1 << (rows >> 2), 0).sum(axis=1)
+        result[flushed] = flush_values[masks]
+    return result
+
+
+def _score(hands, board, runouts):
+    """Wins, ties and pot shares per player over an (n, m) array of board runouts"""
+    n = len(runouts)
+    fixed = np.array(board, dtype=np.int64)
+    values = np.empty((len(hands), n), dtype=np.int64)
+    for i, hand in enumerate(hands):
+        known = np.concatenate([np.array(hand, dtype=np.int64), fixed])
+        cards = np.concatenate([np.broadcast_to(known, (n, known.size)), runouts], axis=1)
+        values[i] = evaluate_batch(cards)
+
+    best = values.max(axis=0)
+    winning = values == best
+    tied = winning.sum(axis=0)
+    wins = (winning & (tied == 1)).sum(axis=1)
+    # A k-way tie is worth 1/k of the pot to each tied player
+    shares = (winning / tied).sum(axis=1)
+    ties = (winning & (tied > 1)).sum(axis=1)
+    return wins, ties, shares
+
+
+def equity(hands, board=(), dead=(), budget=DEFAULT_BUDGET, max_trials=200_000, rng=None):
+    """Equity of each hand in ``hands`` (lists of 2 card ints) given ``board``.
+
+    Returns {'equity', 'win', 'tie'} (one fraction per hand), 'trials' and
+    'exact'. ``budget`` bounds the Monte Carlo time in seconds; at least one
+    batch always runs.
+    """
+    board = list(board)
+    used = {card for hand in hands for card in hand} | set(board) | set(dead)
+    remaining = np.array([card for card in range(52) if card not in used], dtype=np.int64)
+    to_come = 5 - len(board)
+
+    if to_come == 0 or comb(remaining.size, to_come) <= EXACT_LIMIT:
+        runouts = np.array(list(combinations(remaining.tolist(), to_come)),
+                           dtype=np.int64).reshape(-1, to_come) if to_come else np.empty((1, 0), np.int64)
+        wins, ties, shares = _score(hands, board, runouts)
+        trials, exact = len(runouts), True
+    else:
+        rng = rng or np.random.default_rng()
+        deadline = time.perf_counter() + budget
+        wins = ties = shares = 0
+        trials = 0
+        while True:
+            n = min(BATCH, max_trials - trials)
+            # First ``to_come`` columns of a random permutation of each row
+            order = rng.random((n, remaining.size)).argpartition(to_come, axis=1)[:, :to_come]
+            w, t, s = _score(hands, board, remaining[order])
+            wins, ties, shares = wins + w, ties + t, shares + s
+            trials += n
+            if trials >= max_trials or time.perf_counter() >= deadline:
+                break
+        exact = False
+
+    return {
+        'equity': (shares / trials).tolist(),
+        'win': (wins / trials).tolist(),
+        'tie': (ties / trials).tolist(),
+        'trials': trials,
+        'exact': exact,
+    }
+
+
+def equity_vs_random(hand, opponents=1, trials=20_000, rng=None):
+    """Equity of ``hand`` against ``opponents`` random hands over random boards"""
+    rng = rng or np.random.default_rng()
+    remaining = np.array([card for card in range(52) if card not in hand], dtype=np.int64)
+    drawn = 2 * opponents + 5
+    hero = np.array(hand, dtype=np.int64)
+    total = 0.0
+    done = 0
+    while done < trials:
+        n = min(BATCH * 10, trials - done)
+        deals = remaining[rng.random((n, remaining.size)).argpartition(drawn, axis=1)[:, :drawn]]
+        boards = deals[:, :5]
+        values = np.empty((opponents + 1, n), dtype=np.int64)
+        values[0] = evaluate_batch(np.concatenate([np.broadcast_to(hero, (n, 2)), boards], axis=1))
+        for i in range(opponents):
+            values[i + 1] = evaluate_batch(
+                np.concatenate([deals[:, 5 + 2 * i:7 + 2 * i], boards], axis=1))
+        best = values.max(axis=0)
+        winning = values == best
+        total += (winning[0] / winning.sum(axis=0)).sum()
+        done += n
+    return total / trials
@@ -0,0 +1,185 @@
+"""Poker hand evaluator for 5, 6 and 7 card hands.
+
+``evaluate(cards)`` takes card ints (see ``cards.py``) and returns an int
+that orders hands: a higher value is a better hand and equal values tie.
+The value packs the category in bits 20+ and up to five tie-break ranks in
+4-bit fields below it, so ``category(value)`` is a shift.
+
+No per-hand sorting or enumeration of 5-card subsets: each card adds a
+precomputed key that holds 5**rank (so the sum encodes the rank counts)
+and a 4-bit per-suit counter. The suit counters index a flush table; the
+rank counts index a table holding the best non-flush value for every rank
+multiset of 1-7 cards. Flush hands look up the flush suit's rank bitmask
+in an 8192-entry table instead. Tables are built on first use.
+"""
+
+import threading
+from itertools import combinations, combinations_with_replacement
+
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_NAMES = [
+    'High Card', 'One Pair', 'Two Pair', 'Three of a Kind', 'Straight',
+    'Flush', 'Full House', 'Four of a Kind', 'Straight Flush',
+]
+
+MAX_CARDS = 7
+
+# rank -> 5**rank: summed over a hand it encodes how many of each rank it holds
+RANK_KEYS = [5 ** rank for rank in range(13)]
+# card -> rank key above 16 bits of per-suit counters (4 bits each)
+CARD_KEYS = [(RANK_KEYS[card >> 2] << 16) | (1 << 4 * (card & 3)) for card in range(52)]
+
+_rank_values = None    # sum of 5**rank -> best non-flush value
+_flush_values = None   # 13-bit rank mask -> flush / straight flush value
+_flush_suit = None     # 16-bit suit counters -> suit with 5+ cards, or -1
+_build_lock = threading.Lock()
+
+
+def _pack(category, ranks):
+    value = category
+    for i in range(5):
+        value = (value << 4) | (ranks[i] if i < len(ranks) else 0)
+    return value
+
+
+def category(value):
+    return value >> 20
+
+
+def describe(value):
+    """Category name for a hand value, e.g. 'Full House'"""
+    return CATEGORY_NAMES[value >> 20]
+
+
+def _straight_high(mask):
+    """Top rank of the best straight in a 13-bit rank mask, or -1"""
+    for top in range(12, 3, -1):
+        window = 0b11111 << (top - 4)
+        if mask & window == window:
+            return top
+    wheel = (1 << 12) | 0b1111  # A-2-3-4-5
+    return 3 if mask & wheel == wheel else -1
+
+
+def _flush_value(mask):
+    high = _straight_high(mask)
+    if high >= 0:
+        return _pack(STRAIGHT_FLUSH, [high])
+    return _pack(FLUSH, [r for r in range(12, -1, -1) if mask >> r & 1][:5])
+
+
+def _counts_value(ranks):
+    """Best non-flush value for a multiset of ranks"""
+    counts = {}
+    for rank in ranks:
+        counts[rank] = counts.get(rank, 0) + 1
+    # (count, rank), most repeated then highest first
+    groups = sorted(((n, r) for r, n in counts.items()), reverse=True)
+    present = sorted(counts, reverse=True)
+    top_count, top = groups[0]
+
+    if top_count == 4:
+        return _pack(FOUR_OF_A_KIND, [top] + [r for r in present if r != top][:1])
+    if top_count == 3:
+        pair = [r for n, r in groups[1:] if n >= 2]
+        if pair:
+            return _pack(FULL_HOUSE, [top, max(pair)])
+    high = _straight_high(sum(1 << r for r in present))
+    if high >= 0:
+        return _pack(STRAIGHT, [high])
+    if top_count == 3:
+        return _pack(THREE_OF_A_KIND, [top] + [r for r in present if r != top][:2])
+    if top_count == 2:
+        if len(groups) > 1 and groups[1][0] == 2:
+            pairs = [top, groups[1][1]]
+            return _pack(TWO_PAIR, pairs + [r for r in present if r not in pairs][:1])
+        return _pack(ONE_PAIR, [top] + [r for r in present if r != top][:3])
+    return _pack(HIGH_CARD, present[:5])
+
+
+def _build_tables():
+    global _rank_values, _flush_values, _flush_suit
+    with _build_lock:
+        if _rank_values is not None:
+            return
+        tables = _compute_tables()
+    _flush_values, _flush_suit = tables[1:]
+    _rank_values = tables[0]  # set last: evaluate() checks it
+
+
+def warm_up():
+    """Build the lookup tables now (about a second) instead of on first use"""
+    if _rank_values is None:
+        _build_tables()
+
+
+def tables():
+    """The lookup tables (rank values, flush values, flush suit), for batch evaluators"""
+    warm_up()
+    return _rank_values, _flush_values, _flush_suit
+
+
+def _compute_tables():
+    rank_values = {}
+    for size in range(1, MAX_CARDS + 1):
+        for ranks in combinations_with_replacement(range(13), size):
+            if size > 4 and any(ranks[i] == ranks[i + 4] for i in range(size - 4)):
+                continue  # five of a rank
+            rank_values[sum(RANK_KEYS[r] for r in ranks)] = _counts_value(ranks)
+
+    flush_values = [0] * (1 << 13)
+    for size in range(5, 14):
+        for ranks in combinations(range(13), size):
+            mask = sum(1 << r for r in ranks)
+            flush_values[mask] = _flush_value(mask)
+
+    # Suit counters of hands with a suit holding 5+ of at most 7 cards
+    flush_suit = [-1] * (1 << 16)
+    for size in range(5, MAX_CARDS + 1):
+        for suits in combinations_with_replacement(range(4), size):
+            counters = sum(1 << 4 * s for s in suits)
+            for suit in range(4):
+                if (counters >> 4 * suit) & 0xF >= 5:
+                    flush_suit[counters] = suit
+
+    return rank_values, flush_values, flush_suit
+
+
+def evaluate(cards):
+    """Value of the best poker hand within 1-7 card ints (higher is better)"""
+    if _rank_values is None:
+        _build_tables()
+    total = 0
+    for card in cards:
+        total += CARD_KEYS[card]
+    suit = _flush_suit[total & 0xFFFF]
+    if suit < 0:
+        return _rank_values[total >> 16]
+    mask = 0
+    for card in cards:
+        if card & 3 == suit:
+            mask |= 1 << (card >> 2)
+    return _flush_values[mask]
+
+
+def best_five(cards):
+    """The five cards making the best hand (for display; slower than ``evaluate``)"""
+    if len(cards) <= 5:
+        return list(cards)
+    return list(max(combinations(cards, 5), key=evaluate))
+
+
+def winners(hands):
+    """Indexes of the best hands in ``hands`` (several on a tie)"""
+    values = [evaluate(hand) for hand in hands]
+    best = max(values)
+    return [i for i, value in enumerate(values) if value == best]
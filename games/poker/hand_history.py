@@ -0,0 +1,410 @@
+"""Compact binary hand histories for poker rooms.
+
+Every deal, action, board card and result is appended to a per-room log.
+Records are a type byte followed by LEB128 varints, so most take 3-6 bytes:
+
+    HAND_START  time ms (absolute), hand number, small blind, big blind,
+                dealer seat, player count, then per seat: name (length +
+                UTF-8), chips, two hole cards
+    ACTION      ms since the previous record, seat, action (low 3 bits;
+                bit 3 set when the turn clock acted), chips added
+    BOARD       ms since the previous record, card count, cards
+    RESULT      ms since the previous record, winner count, then per
+                winner: seat, chips won
+
+Amounts are deltas: an action records the chips it added, so a raise "to"
+some amount is recovered by summing the seat's chips on that street.
+Times are deltas within a hand and absolute at each HAND_START, so every
+file can be read from its first hand on its own.
+
+Recording only appends to an in-memory buffer; ``flush`` writes buffered
+bytes for every room in one pass and runs every ``flush_interval`` seconds
+on a background writer, off the socket handlers and the timer wheel. A
+room's log rotates to a new file (``<dir>/<room>/<seq>.phh``) at the first
+hand that would take it over ``max_bytes``. The writer finds the first free
+``seq`` for a room once, when it first writes for it; ``forget`` drops the
+room's state when the room goes away.
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from utils.server_mode import run_blocking
+from .cards import card_str
+from .evaluator import describe, evaluate
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PKHH\x01'
+HAND_START = 1
+ACTION = 2
+BOARD = 3
+RESULT = 4
+
+ACTIONS = ['fold', 'check', 'call', 'raise', 'allin', 'post']
+AUTO = 8
+STREETS = ['preflop', 'flop', 'turn', 'river']
+
+
+def _varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class RoomLog:
+    """One room's log: buffered records and the file they go to"""
+
+    __slots__ = ('room', 'base', 'rotation', 'size', 'pending')
+
+    def __init__(self, room):
+        self.room = room
+        self.base = None     # file seq of rotation 0, found by the writer
+        self.rotation = 0    # files started since, this room counts from 0
+        self.size = 0        # bytes already in the current file
+        self.pending = []    # [rotation, bytearray] waiting to be written
+
+
+class HandHistory:
+    """Buffers hand-history records per room and writes them in batches."""
+
+    def __init__(self, directory=None, max_bytes=8 * 1024 * 1024, flush_interval=1.0):
+        self.directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.bytes_written = 0
+        self.records = 0
+        self._logs = {}       # room -> RoomLog
+        self._dirty = {}      # RoomLog -> None, in the order they got records
+        self._last_ms = {}    # room -> time of the room's last record
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._running = False
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    def _next_seq(self, room_code):
+        folder = self.directory / room_code
+        existing = [int(p.stem) for p in folder.glob('*.phh') if p.stem.isdigit()]
+        return max(existing, default=-1) + 1
+
+    def _append(self, room_code, record, new_hand=False):
+        with self._lock:
+            log = self._logs.get(room_code)
+            if log is None:
+                log = self._logs[room_code] = RoomLog(room_code)
+            pending = sum(len(buf) for rotation, buf in log.pending if rotation == log.rotation)
+            # Rotate at hand boundaries only, so every file starts with a hand
+            if new_hand and log.size + pending + len(record) > self.max_bytes and \
+                    log.size + pending > 0:
+                log.rotation += 1
+                log.size = 0
+            if not log.pending or log.pending[-1][0] != log.rotation:
+                log.pending.append([log.rotation, bytearray()])
+            log.pending[-1][1] += record
+            self._dirty[log] = None
+            self.records += 1
+
+    def forget(self, room_code):
+        """Drop a room that has gone; records still buffered are written"""
+        with self._lock:
+            self._logs.pop(room_code, None)
+            self._last_ms.pop(room_code, None)
+
+    def _header(self, kind, room_code, absolute=False):
+        now = _now_ms()
+        previous = self._last_ms.get(room_code, now)
+        self._last_ms[room_code] = now
+        record = bytearray((kind,))
+        _varint(record, now if absolute else max(0, now - previous))
+        return record
+
+    def hand_started(self, room_code, room):
+        """Record a new hand: blinds, seats, stacks and hole cards (before blinds are posted)"""
+        if not self.enabled:
+            return
+        record = self._header(HAND_START, room_code, absolute=True)
+        players = room['players']
+        for value in (room['hand_number'], room['small_blind'], room['big_blind'],
+                      room['dealer'], len(players)):
+            _varint(record, value)
+        for player in players:
+            name = player['name'].encode('utf-8')[:255]
+            record.append(len(name))
+            record += name
+            _varint(record, player['chips'])
+            record += bytes(player['hand'][:2]).ljust(2, b'\xff')
+        self._append(room_code, record, new_hand=True)
+
+    def action(self, room_code, seat, action, amount, auto=False):
+        if not self.enabled or action not in ACTIONS:
+            return
+        record = self._header(ACTION, room_code)
+        record.append(seat)
+        record.append(ACTIONS.index(action) | (AUTO if auto else 0))
+        _varint(record, max(0, amount))
+        self._append(room_code, record)
+
+    def board(self, room_code, cards):
+        if not self.enabled:
+            return
+        record = self._header(BOARD, room_code)
+        record.append(len(cards))
+        record += bytes(cards)
+        self._append(room_code, record)
+
+    def result(self, room_code, won):
+        """Record the chips each winning seat collected ({seat: chips})"""
+        if not self.enabled:
+            return
+        record = self._header(RESULT, room_code)
+        record.append(len(won))
+        for seat, chips in sorted(won.items()):
+            record.append(seat)
+            _varint(record, chips)
+        self._append(room_code, record)
+
+    def flush(self):
+        """Write every room's buffered records; returns bytes written"""
+        written = 0
+        # Swap under the flush lock too, so batches reach the files in order
+        with self._flush_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+                batches = []
+                for log in dirty:
+                    batches.append((log, log.pending))
+                    log.pending = []
+            for log, parts in batches:
+                folder = self.directory / log.room
+                if log.base is None:
+                    log.base = self._next_seq(log.room)
+                folder.mkdir(parents=True, exist_ok=True)
+                for rotation, data in parts:
+                    path = folder / f'{log.base + rotation:05d}.phh'
+                    try:
+                        with open(path, 'ab') as f:
+                            if f.tell() == 0:
+                                f.write(MAGIC)
+                            f.write(data)
+                            size = f.tell()
+                    except OSError:
+                        logger.exception("Could not write hand history %s", path)
+                        continue
+                    with self._lock:
+                        if log.rotation == rotation:
+                            log.size = size
+                    written += len(data)
+        self.bytes_written += written
+        return written
+
+    def start(self, socketio):
+        """Flush every ``flush_interval`` seconds on a background task"""
+        if self._running:
+            return
+        self._running = True
+        socketio.start_background_task(self._run, socketio)
+
+    def stop(self):
+        self._running = False
+
+    def _run(self, socketio):
+        while self._running:
+            socketio.sleep(self.flush_interval)
+            try:
+                # File writes go to a real thread in green-thread modes
+                run_blocking(socketio, self.flush)
+            except Exception:
+                logger.exception("Hand history flush failed")
+
+
+hand_history = HandHistory()
+
+
+def init_hand_history(app, socketio):
+    """Configure the shared recorder from app config; recording is off without a directory"""
+    directory = app.config.get('HAND_HISTORY_DIR')
+    if not directory or hand_history.enabled:
+        return hand_history
+    hand_history.directory = Path(directory)
+    hand_history.max_bytes = app.config.get('HAND_HISTORY_MAX_BYTES', hand_history.max_bytes)
+    hand_history.start(socketio)
+    return hand_history
+
+
+# Reading and exporting
+
+def read_hands(path, room_code=None):
+    """Stream the hands in one history file as dicts"""
+    data = Path(path).read_bytes()
+    if not data.startswith(MAGIC):
+        raise ValueError(f'{path} is not a hand history file')
+    room_code = room_code or Path(path).parent.name
+    pos = len(MAGIC)
+    hand = None
+    while pos < len(data):
+        kind = data[pos]
+        ms, pos = _read_varint(data, pos + 1)
+        if kind == HAND_START:
+            if hand is not None:
+                yield hand
+            now = ms
+            values = []
+            for _ in range(5):
+                value, pos = _read_varint(data, pos)
+                values.append(value)
+            number, small, big, dealer, count = values
+            players = []
+            for seat in range(count):
+                length = data[pos]
+                name = data[pos + 1:pos + 1 + length].decode('utf-8', 'replace')
+                chips, pos = _read_varint(data, pos + 1 + length)
+                cards = [c for c in data[pos:pos + 2] if c < 52]
+                pos += 2
+                players.append({'seat': seat, 'name': name, 'chips': chips, 'cards': cards})
+            hand = {'room': room_code, 'hand': number, 'time': now, 'small_blind': small,
+                    'big_blind': big, 'dealer': dealer, 'players': players, 'actions': [],
+                    'board': [], 'winners': []}
+            street = 0
+            street_bets = [0] * count
+            continue
+        if hand is None:
+            raise ValueError(f'{path}: record before the first hand')
+        now += ms
+        if kind == ACTION:
+            seat, code = data[pos], data[pos + 1]
+            amount, pos = _read_varint(data, pos + 2)
+            street_bets[seat] += amount
+            hand['actions'].append({
+                'street': STREETS[street], 'seat': seat, 'action': ACTIONS[code & 7],
+                'amount': amount, 'to': street_bets[seat], 'auto': bool(code & AUTO),
+                'time': now})
+        elif kind == BOARD:
+            count = data[pos]
+            hand['board'] += list(data[pos + 1:pos + 1 + count])
+            pos += 1 + count
+            street = min(street + 1, 3)
+            street_bets = [0] * len(street_bets)
+        elif kind == RESULT:
+            count = data[pos]
+            pos += 1
+            for _ in range(count):
+                seat = data[pos]
+                won, pos = _read_varint(data, pos + 1)
+                hand['winners'].append({'seat': seat, 'won': won})
+        else:
+            raise ValueError(f'{path}: unknown record type {kind} at byte {pos}')
+    if hand is not None:
+        yield hand
+
+
+def history_files(directory):
+    """Every history file under ``directory`` (or the file itself), in order"""
+    directory = Path(directory)
+    if directory.is_file():
+        return [directory]
+    return sorted(directory.rglob('*.phh'))
+
+
+def hand_to_json(hand):
+    """A hand with card ints as text ('As'), for JSON lines"""
+    return {
+        **hand,
+        'players': [{**p, 'cards': [card_str(c) for c in p['cards']]} for p in hand['players']],
+        'board': [card_str(c) for c in hand['board']],
+        'winners': [{**w, 'name': hand['players'][w['seat']]['name']} for w in hand['winners']],
+    }
+
+
+def _action_text(name, act, blinds):
+    action, amount = act['action'], act['amount']
+    timed_out = ' (timed out)' if act['auto'] else ''
+    if action == 'post':
+        return f"{name}: posts {next(blinds, 'blind')} ${amount}"
+    if action == 'fold':
+        return f"{name}: folds{timed_out}"
+    if action == 'check':
+        return f"{name}: checks{timed_out}"
+    if action == 'call':
+        return f"{name}: calls ${amount}"
+    suffix = ' and is all-in' if action == 'allin' else ''
+    return f"{name}: raises to ${act['to']}{suffix}"
+
+
+def hand_to_text(hand):
+    """A hand in the usual text hand-history layout"""
+    players = hand['players']
+    names = [p['name'] for p in players]
+    stamp = datetime.fromtimestamp(hand['time'] / 1000, tz=timezone.utc)
+    lines = [
+        f"Hand #{hand['hand']} (Room {hand['room']}) - "
+        f"${hand['small_blind']}/${hand['big_blind']} - {stamp:%Y-%m-%d %H:%M:%S} UTC",
+    ]
+    for p in players:
+        button = ' [button]' if p['seat'] == hand['dealer'] else ''
+        lines.append(f"Seat {p['seat'] + 1}: {p['name']} (${p['chips']} in chips){button}")
+
+    board = hand['board']
+    reached = {0: 1, 3: 2, 4: 3, 5: 4}.get(len(board), 1)
+    blinds = iter(('small blind', 'big blind'))
+    for street in STREETS[:reached]:
+        if street == 'preflop':
+            lines.append('*** HOLE CARDS ***')
+        else:
+            shown = {'flop': 3, 'turn': 4, 'river': 5}[street]
+            head = ' '.join(card_str(c) for c in board[:max(3, shown - 1)])
+            tail = f" [{card_str(board[shown - 1])}]" if shown > 3 else ''
+            lines.append(f"*** {street.upper()} *** [{head}]{tail}")
+        for act in hand['actions']:
+            if act['street'] == street:
+                lines.append(_action_text(names[act['seat']], act, blinds))
+
+    folded = {act['seat'] for act in hand['actions'] if act['action'] == 'fold'}
+    live = [p for p in players if p['seat'] not in folded and len(p['cards']) == 2]
+    if len(live) > 1 and len(hand['board']) == 5:
+        lines.append('*** SHOWDOWN ***')
+        for p in live:
+            shown = ' '.join(card_str(c) for c in p['cards'])
+            lines.append(f"{p['name']}: shows [{shown}] "
+                         f"({describe(evaluate(p['cards'] + hand['board']))})")
+    for w in hand['winners']:
+        lines.append(f"{names[w['seat']]} collected ${w['won']} from pot")
+    if hand['board']:
+        lines.append(f"Board [{' '.join(card_str(c) for c in hand['board'])}]")
+    return '\n'.join(lines) + '\n'
+
+
+def export(paths, out, fmt='text'):
+    """Stream every hand in ``paths`` to the file object ``out``; returns the hand count"""
+    count = 0
+    for path in paths:
+        for hand in read_hands(path):
+            if fmt == 'jsonl':
+                out.write(json.dumps(hand_to_json(hand)) + '\n')
+            else:
+                out.write(hand_to_text(hand) + '\n')
+            count += 1
+    return count
+
@@ -0,0 +1,107 @@
+"""Precomputed preflop equities for the 169 starting-hand classes.
+
+Every two-card hand falls into one of 169 classes: a pair, or two ranks
+suited or offsuit. ``tools/build_preflop_equity.py`` simulates each class
+against 1-5 random opponents and writes ``data/preflop_equity.bin``:
+
+    8-byte header  b'PFEQ', version (u8), max opponents (u8), classes (u16 LE)
+    body           u16 LE equity * 65535, [class][opponents - 1]
+
+Classes are numbered like a 13x13 starting-hand chart, ``high * 13 + low``
+for suited hands and ``low * 13 + high`` for offsuit ones, so pairs sit on
+the diagonal. Nothing is read at import: the file is memory-mapped on the
+first lookup and each lookup is one unpack at a computed offset.
+"""
+
+import mmap
+import struct
+import threading
+from pathlib import Path
+
+from .cards import RANKS
+
+TABLE_PATH = Path(__file__).parent / 'data' / 'preflop_equity.bin'
+MAGIC = b'PFEQ'
+VERSION = 1
+CLASSES = 169
+MAX_OPPONENTS = 5
+HEADER = struct.Struct('<4sBBH')
+ENTRY = struct.Struct('<H')
+SCALE = 65535
+
+_table = None
+_load_lock = threading.Lock()
+
+
+def hand_class(first, second):
+    """Class index (0-168) of two card ints"""
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if (first & 3) == (second & 3):
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index):
+    """Class index -> 'AA', 'AKs', 'T9o'"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return RANKS[row] + RANKS[col] + 's'
+    return RANKS[col] + RANKS[row] + 'o'
+
+
+def class_hand(index):
+    """A representative pair of card ints for a class"""
+    row, col = divmod(index, 13)
+    if row == col:
+        return [row * 4, row * 4 + 1]
+    if row > col:
+        return [row * 4, col * 4]
+    return [col * 4, row * 4 + 1]
+
+
+def pack(equities, path=TABLE_PATH):
+    """Write ``equities`` ([class][opponents - 1] fractions) as the table file"""
+    body = bytearray()
+    for row in equities:
+        for value in row:
+            body += ENTRY.pack(round(value * SCALE))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(HEADER.pack(MAGIC, VERSION, len(equities[0]), len(equities)) + body)
+
+
+def open_table(path=TABLE_PATH):
+    """Memory-map and check a table file"""
+    with open(path, 'rb') as f:
+        table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, opponents, classes = HEADER.unpack_from(table)
+    if (magic, version, opponents, classes) != (MAGIC, VERSION, MAX_OPPONENTS, CLASSES) \
+            or len(table) != HEADER.size + classes * opponents * ENTRY.size:
+        table.close()
+        raise ValueError(f'{path} is not a preflop equity table; '
+                         'run tools/build_preflop_equity.py')
+    return table
+
+
+def _load():
+    global _table
+    with _load_lock:
+        if _table is None:
+            _table = open_table()
+    return _table
+
+
+def class_equity(index, opponents=1, table=None):
+    """Equity of hand class ``index`` against ``opponents`` random hands"""
+    if not 1 <= opponents <= MAX_OPPONENTS:
+        raise ValueError(f'opponents must be 1-{MAX_OPPONENTS}, got {opponents}')
+    table = table or _table or _load()
+    offset = HEADER.size + (index * MAX_OPPONENTS + opponents - 1) * ENTRY.size
+    return ENTRY.unpack_from(table, offset)[0] / SCALE
+
+
+def preflop_equity(hand, opponents=1):
+    """Equity of two hole cards (ints) against ``opponents`` random hands"""
+    return class_equity(hand_class(hand[0], hand[1]), opponents)
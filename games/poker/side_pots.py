@@ -0,0 +1,76 @@
+"""Main and side pots for hands with all-in players.
+
+``build_pots`` layers everything committed during a hand into pots: each
+distinct amount committed by a player still in the hand caps one layer, and
+a pot's eligible players are the live players who committed at least that
+much. ``award_pots`` then gives each pot to the best eligible hand(s),
+splitting ties with the odd chips going to the winners closest to the
+dealer's left. Everything is keyed by seat index.
+"""
+
+
+def build_pots(committed, folded=()):
+    """Layer ``committed`` ({seat: chips}) into [{'amount', 'eligible'}].
+
+    Folded seats' chips are in the pots, but those seats can't win them.
+    Chips a folded seat put in above the largest live commitment go to the
+    last pot. Sorting the commitments once makes this O(n log n).
+    """
+    folded = set(folded)
+    ordered = sorted((chips, seat) for seat, chips in committed.items() if chips > 0)
+    live = [seat for chips, seat in ordered if seat not in folded]
+
+    pots = []
+    previous = 0
+    i = 0            # ordered[:i] are fully counted into earlier layers
+    live_i = 0       # live[:live_i] committed less than the current level
+    remaining = len(ordered)
+    for chips, seat in ordered:
+        if seat in folded or chips == previous:
+            continue
+        level = chips
+        amount = 0
+        # Seats committing less than this level only add what's above previous
+        while i < len(ordered) and ordered[i][0] < level:
+            amount += ordered[i][0] - previous
+            i += 1
+            remaining -= 1
+        amount += (level - previous) * remaining
+        while live_i < len(live) and committed[live[live_i]] < level:
+            live_i += 1
+        pots.append({'amount': amount, 'eligible': sorted(live[live_i:])})
+        previous = level
+
+    # Folded chips above the top live level
+    excess = sum(chips - previous for chips, seat in ordered if chips > previous)
+    if excess:
+        if pots:
+            pots[-1]['amount'] += excess
+        else:
+            pots.append({'amount': excess, 'eligible': []})
+    return pots
+
+
+def award_pots(pots, values, seat_order):
+    """Pay every pot to its best eligible hand(s).
+
+    ``values`` maps seat -> hand value (higher wins); ``seat_order`` lists
+    seats starting left of the dealer and decides who gets odd chips.
+    Returns ({seat: chips won}, [{'amount', 'winners'}] per pot).
+    """
+    position = {seat: i for i, seat in enumerate(seat_order)}
+    won = {}
+    results = []
+    for pot in pots:
+        contenders = [seat for seat in pot['eligible'] if seat in values]
+        if not contenders:
+            results.append({'amount': pot['amount'], 'winners': []})
+            continue
+        best = max(values[seat] for seat in contenders)
+        winners = sorted((seat for seat in contenders if values[seat] == best),
+                         key=lambda seat: position.get(seat, len(position)))
+        share, odd = divmod(pot['amount'], len(winners))
+        for i, seat in enumerate(winners):
+            won[seat] = won.get(seat, 0) + share + (1 if i < odd else 0)
+        results.append({'amount': pot['amount'], 'winners': winners})
+    return won, results
@@ -1,31 +1,44 @@
-from flask_socketio import emit, join_room
-from flask import request
-import random
-import string
+from flask_socketio import emit, join_room, leave_room
+from flask import current_app, request
+import logging
+import time
+from utils.broadcast import emit_personalized, mark_entry
+from utils.player_manager import Roster, connections, join_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+from utils.server_mode import run_blocking
+from utils.timer_wheel import timer_wheel
+from .cards import Deck, card_to_wire, cards_to_wire
+from .equity import equity
+from .hand_history import hand_history
+from .evaluator import describe, evaluate, warm_up
+from .preflop import MAX_OPPONENTS, preflop_equity
+from .side_pots import award_pots, build_pots
+
+logger = logging.getLogger(__name__)
 
 # Store active poker rooms
-poker_rooms = {}
+poker_rooms = RoomStore('poker')
+poker_rooms.on_remove(hand_history.forget)
+
+# Seconds the player to act has before they auto-check (or fold to a bet)
+DEFAULT_TURN_SECONDS = 30
+# room code -> this process's timer for the room's current turn
+turn_clocks = {}
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(
-            random.choices(
-                string.ascii_uppercase +
-                string.digits,
-                k=6))
-        if code not in poker_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('poker')
 
 
 def create_deck():
-    """Create a standard 52-card deck"""
-    suits = ['♠', '♥', '♦', '♣']
-    values = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    deck = [{'value': v, 'suit': s} for s in suits for v in values]
-    random.shuffle(deck)
-    return deck
+    """A shuffled 52-card deck in the client's {'value', 'suit'} format.
+
+    Rooms deal from their own reusable ``Deck`` of card ints; this is the
+    wire-format view for callers that want dicts.
+    """
+    return [card_to_wire(card) for card in Deck().shuffle().cards]
 
 
 def get_public_player_data(players, requesting_player_id=None):
@@ -41,21 +54,125 @@ def get_public_player_data(players, requesting_player_id=None):
     } for p in players]
 
 
+def spectator_room(room_code):
+    """Socket.IO room for spectators, who may see live equities"""
+    return f'{room_code}:spectators'
+
+
+def new_player(player_id, name, chips, position, is_host=False):
+    """A seat's state in ``room['players']``"""
+    return {
+        'id': player_id,
+        'name': name,
+        'chips': chips,
+        'hand': [],
+        'bet': 0,
+        'folded': False,
+        'is_host': is_host,
+        'position': position,
+        'acted_after_raise': False
+    }
+
+
+def new_room(room_code, host, players, starting_chips, turn_seconds=DEFAULT_TURN_SECONDS):
+    """Room state for a table waiting to start"""
+    return {
+        'code': room_code,
+        'host': host,
+        'players': Roster(players),
+        'status': 'waiting',
+        'deck': Deck(),
+        'community_cards': [],
+        'pot': 0,
+        'current_bet': 0,
+        'dealer': 0,
+        'current_turn': 0,
+        'phase': 'waiting',
+        'small_blind': 10,
+        'big_blind': 20,
+        'starting_chips': starting_chips,
+        'last_raiser': -1,
+        'turn_seconds': turn_seconds,
+        # Sids watching; equities are only worked out while someone is
+        'spectators': set()
+    }
+
+
+# Phases in which a hand is being played
+HAND_PHASES = ('preflop', 'flop', 'turn', 'river')
+
+
+def hand_in_progress(room):
+    return room['status'] == 'playing' and room['phase'] in HAND_PHASES
+
+
+def drop_seat(room, seat):
+    """Remove a seat between hands; positions, the button and the host follow"""
+    player = room['players'].pop(seat)
+    if not room['players']:
+        return player
+    for i, p in enumerate(room['players']):
+        p['position'] = i
+    if seat < room['dealer']:
+        room['dealer'] -= 1
+    room['dealer'] %= len(room['players'])
+    if room['host'] == player['id']:
+        room['host'] = room['players'][0]['id']
+        room['players'][0]['is_host'] = True
+    return player
+
+
+def commit_chips(room, player, amount):
+    """Move ``amount`` of a player's chips into the pot"""
+    player['chips'] -= amount
+    player['bet'] += amount
+    player['committed'] += amount
+    room['pot'] += amount
+
+
 def register_poker_events(socketio):
     """Register all Poker socket events"""
+    # Build the hand evaluator's tables off the request path
+    socketio.start_background_task(warm_up)
+
+    def drop_departed(room_code):
+        """Drop the seats of players who left; returns False if the table can't deal"""
+        room = poker_rooms[room_code]
+        for seat in reversed(range(len(room['players']))):
+            if room['players'][seat].get('disconnected'):
+                player = drop_seat(room, seat)
+                socketio.emit('poker_player_left', {
+                    'player_name': player['name'],
+                    'players': get_public_player_data(room['players'])
+                }, room=room_code)
+        if not room['players']:
+            del poker_rooms[room_code]
+            return False
+        if len(room['players']) < 2:
+            room['status'] = 'waiting'
+            room['phase'] = 'waiting'
+            return False
+        return True
 
     def deal_new_hand(room_code):
         """Deal a new hand"""
         room = poker_rooms[room_code]
 
-        print(f"\n{'=' * 60}")
-        print(f"🎴 DEALING NEW HAND - Room: {room_code}")
+        # Seats whose player left during the last hand go now; tournament
+        # tables keep them, the turn clock folds them until they bust
+        if not room.get('tournament') and not drop_departed(room_code):
+            return
+
+        logger.debug("Dealing new hand in room %s", room_code)
 
-        # Reset hand state
-        room['deck'] = create_deck()
+        # Reset hand state; the room's deck is reshuffled in place
+        if not isinstance(room.get('deck'), Deck):
+            room['deck'] = Deck()
+        room['deck'].shuffle()
         room['community_cards'] = []
         room['pot'] = 0
         room['current_bet'] = 0
+        room['hand_number'] = room.get('hand_number', 0) + 1
         room['phase'] = 'preflop'
         room['last_raiser'] = -1
         room['players_acted'] = set()  # NEW: Track who has acted
@@ -64,6 +181,7 @@ def register_poker_events(socketio):
         for player in room['players']:
             player['hand'] = []
             player['bet'] = 0
+            player['committed'] = 0  # chips put in this hand, for side pots
             player['folded'] = False
             player['acted_after_raise'] = False
 
@@ -73,66 +191,171 @@ def register_poker_events(socketio):
                 if room['deck']:
                     player['hand'].append(room['deck'].pop())
 
+        hand_history.hand_started(room_code, room)
+
         # Post blinds
         num_players = len(room['players'])
         small_blind_pos = (room['dealer'] + 1) % num_players
         big_blind_pos = (room['dealer'] + 2) % num_players
 
-        # Small blind
-        room['players'][small_blind_pos]['chips'] -= room['small_blind']
-        room['players'][small_blind_pos]['bet'] = room['small_blind']
-        room['pot'] += room['small_blind']
-
-        # Big blind
-        room['players'][big_blind_pos]['chips'] -= room['big_blind']
-        room['players'][big_blind_pos]['bet'] = room['big_blind']
-        room['pot'] += room['big_blind']
+        # Blinds (a short stack posts what it has and is all-in)
+        for pos, blind in ((small_blind_pos, room['small_blind']),
+                           (big_blind_pos, room['big_blind'])):
+            player = room['players'][pos]
+            posted = min(blind, player['chips'])
+            commit_chips(room, player, posted)
+            hand_history.action(room_code, pos, 'post', posted)
 
         room['current_bet'] = room['big_blind']
         room['current_turn'] = (big_blind_pos + 1) % num_players
 
-        print(f"Dealer: {room['dealer']}")
-        print(
-            f"Small blind (${
-                room['small_blind']}): Player {small_blind_pos}")
-        print(f"Big blind (${room['big_blind']}): Player {big_blind_pos}")
-        print(f"First to act: Player {room['current_turn']}")
-        print(f"Pot: ${room['pot']}")
-        print(f"Current bet: ${room['current_bet']}")
-
-        # Send game state to each player individually with their correct index
-        for i, player in enumerate(room['players']):
-            player_data = {
-                'hand': player['hand'],
-                'dealer': room['dealer'],
-                'pot': room['pot'],
-                'current_bet': room['current_bet'],
-                'current_turn': room['current_turn'],
-                'players': get_public_player_data(
-                    room['players'],
-                    player['id']),
-                'phase': 'preflop',
-                'your_position': i,
-                'player_id': player['id']}
+        logger.debug(
+            "Room %s: dealer %s, small blind $%s by %s, big blind $%s by %s, "
+            "first to act %s, pot $%s",
+            room_code, room['dealer'], room['small_blind'], small_blind_pos,
+            room['big_blind'], big_blind_pos, room['current_turn'], room['pot'])
+
+        # Public state is built once; each player gets their cards and seat on top
+        public_players = get_public_player_data(room['players'])
+        shared = {
+            'dealer': room['dealer'],
+            'pot': room['pot'],
+            'current_bet': room['current_bet'],
+            'current_turn': room['current_turn'],
+            'players': public_players,
+            'phase': 'preflop'
+        }
 
-            print(
-                f"📤 Sending to {
-                    player['name']}: Position={i}, Turn={
-                    room['current_turn']}, IsYourTurn={
-                    i == room['current_turn']}")
+        def private(seat):
+            player = room['players'][seat]
+            return {
+                'hand': cards_to_wire(player['hand']),
+                'players': mark_entry(public_players, seat, is_me=True),
+                'your_position': seat,
+                'player_id': player['id']
+            }
 
-            socketio.emit('hand_dealt', player_data, to=player['id'])
+        emit_personalized(socketio, 'hand_dealt', shared, range(len(room['players'])), private,
+                          sid=lambda seat: room['players'][seat]['id'])
 
-        print(f"{'=' * 60}\n")
+        start_turn_clock(room_code)
+        publish_equity(room_code)
+
+    def start_turn_clock(room_code):
+        """Give the player to act ``turn_seconds`` on the shared timer wheel"""
+        room = poker_rooms[room_code]
+        stop_turn_clock(room_code)
+        seconds = room.get('turn_seconds', DEFAULT_TURN_SECONDS)
+        if not seconds:
+            return
+        room['turn_deadline'] = time.time() + seconds
+        turn_clocks[room_code] = timer_wheel.schedule_task(
+            seconds, handle_turn_timeout, room_code, room['turn_id'])
+        socketio.emit('turn_clock', {
+            'current_turn': room['current_turn'],
+            'deadline': room['turn_deadline'],
+            'seconds': seconds
+        }, room=room_code)
+
+    def stop_turn_clock(room_code):
+        """Cancel the turn clock; a timer still pending anywhere no longer matches"""
+        room = poker_rooms[room_code]
+        timer = turn_clocks.pop(room_code, None)
+        if timer is not None:
+            timer.cancel()
+        room['turn_id'] = room.get('turn_id', 0) + 1
+        room['turn_deadline'] = None
+
+    def handle_turn_timeout(room_code, turn_id):
+        """Act for a player whose clock ran out: check if free, otherwise fold"""
+        with poker_rooms.lock(room_code):
+            room = poker_rooms.get(room_code)
+            if room is None:
+                turn_clocks.pop(room_code, None)
+                return
+            if room.get('turn_id') != turn_id:
+                return
+            turn_clocks.pop(room_code, None)
+            seat = room['current_turn']
+            player = room['players'][seat]
+            action = 'check' if player['bet'] >= room['current_bet'] else 'fold'
+            logger.info("Room %s: %s ran out of time, auto-%s",
+                        room_code, player['name'], action)
+            take_action(room_code, seat, action, auto=True)
+            poker_rooms.save(room_code)
+
+    def publish_equity(room_code):
+        """Send live equities to spectators: looked up preflop, simulated off
+        the socket thread on later streets.
+
+        Players never receive these: they would reveal the other hands.
+        """
+        room = poker_rooms[room_code]
+        if not room.get('spectators'):
+            return
+        seats = [seat for seat, p in enumerate(room['players']) if not p['folded']]
+        if len(seats) < 2:
+            return
+        hands = [list(room['players'][seat]['hand']) for seat in seats]
+        board = list(room['community_cards'])
+        street = (room['hand_number'], room['phase'])
+        if room['phase'] == 'preflop':
+            # Looked up in the precomputed table rather than simulated
+            send_preflop_equity(room_code, street, seats, hands)
+            return
+        socketio.start_background_task(_publish_equity, room_code, street, seats, hands, board)
+
+    def send_preflop_equity(room_code, street, seats, hands):
+        """Each live hand's equity against as many random hands as it has opponents"""
+        room = poker_rooms[room_code]
+        opponents = min(len(seats) - 1, MAX_OPPONENTS)
+        payload = {
+            'hand_number': street[0],
+            'phase': street[1],
+            'source': 'preflop_table',
+            'opponents': opponents,
+            'players': [{
+                'name': room['players'][seat]['name'],
+                'position': seat,
+                'equity': round(preflop_equity(hand, opponents), 4),
+            } for seat, hand in zip(seats, hands)],
+        }
+        room['equity'] = payload
+        socketio.emit('poker_equity', payload, to=spectator_room(room_code))
+
+    def _publish_equity(room_code, street, seats, hands, board):
+        try:
+            result = run_blocking(socketio, equity, hands, board)
+        except Exception:
+            logger.exception("Equity failed for poker room %s", room_code)
+            return
+        with poker_rooms.lock(room_code):
+            room = poker_rooms.get(room_code)
+            # Drop results for a street that has already moved on
+            if room is None or (room.get('hand_number'), room['phase']) != street:
+                return
+            payload = {
+                'hand_number': street[0],
+                'phase': street[1],
+                'source': 'simulation',
+                'exact': result['exact'],
+                'trials': result['trials'],
+                'players': [{
+                    'name': room['players'][seat]['name'],
+                    'position': seat,
+                    'equity': round(result['equity'][i], 4),
+                    'win': round(result['win'][i], 4),
+                    'tie': round(result['tie'][i], 4),
+                } for i, seat in enumerate(seats)],
+            }
+            room['equity'] = payload
+            poker_rooms.save(room_code)
+        socketio.emit('poker_equity', payload, to=spectator_room(room_code))
 
     def next_phase(room_code):
         """Move to the next betting phase"""
         room = poker_rooms[room_code]
 
-        print(f"\n{'=' * 50}")
-        print(f"🎴 NEXT PHASE - Room: {room_code}")
-        print(f"Current phase: {room['phase']}")
-
         # Reset bets and tracking for new round
         for player in room['players']:
             player['bet'] = 0
@@ -142,6 +365,7 @@ def register_poker_events(socketio):
         room['last_raiser'] = -1
         room['players_acted'] = set()
 
+        board_before = len(room['community_cards'])
         if room['phase'] == 'preflop':
             # Deal flop (3 cards)
             for _ in range(3):
@@ -164,89 +388,119 @@ def register_poker_events(socketio):
         elif room['phase'] == 'river':
             # Showdown
             room['phase'] = 'showdown'
+            stop_turn_clock(room_code)
             determine_winner(room_code)
             return
 
+        hand_history.board(room_code, room['community_cards'][board_before:])
+
         # Start betting with player after dealer
         room['current_turn'] = (room['dealer'] + 1) % len(room['players'])
 
-        # Skip folded players
+        # Skip folded and all-in players
         attempts = 0
-        while room['players'][room['current_turn']
-                              ]['folded'] and attempts < len(room['players']):
+        while (room['players'][room['current_turn']]['folded']
+               or room['players'][room['current_turn']]['chips'] == 0) \
+                and attempts < len(room['players']):
             room['current_turn'] = (
                 room['current_turn'] + 1) % len(room['players'])
             attempts += 1
 
-        print(f"New phase: {room['phase']}")
-        print(f"Community cards: {len(room['community_cards'])}")
-        print(f"Starting with player {room['current_turn']}")
-        print(f"{'=' * 50}\n")
+        logger.debug("Room %s: %s dealt (%d community cards), player %s to act",
+                     room_code, room['phase'], len(room['community_cards']),
+                     room['current_turn'])
 
         socketio.emit('next_phase', {
             'phase': room['phase'],
-            'community_cards': room['community_cards'],
+            'community_cards': cards_to_wire(room['community_cards']),
             'pot': room['pot'],
             'current_bet': room['current_bet'],
             'current_turn': room['current_turn'],
             'players': get_public_player_data(room['players'])
         }, room=room_code)
 
-    def determine_winner(room_code):
-        """Determine the winner at showdown"""
-        room = poker_rooms[room_code]
-        active_players = [p for p in room['players'] if not p['folded']]
+        publish_equity(room_code)
 
-        print(f"\n{'=' * 50}")
-        print(f"🏆 SHOWDOWN - Room: {room_code}")
-        print(f"Active players: {[p['name'] for p in active_players]}")
-
-        # Simple winner determination (first active player wins for now)
-        # TODO: Implement proper hand evaluation
-        winner = active_players[0]
-        winner['chips'] += room['pot']
+        # Everyone (or all but one) is all-in: no more betting, run the board out
+        can_bet = sum(1 for p in room['players'] if not p['folded'] and p['chips'] > 0)
+        if can_bet < 2:
+            next_phase(room_code)
+        else:
+            start_turn_clock(room_code)
 
-        print(f"Winner: {winner['name']} wins ${room['pot']}")
-        print(f"{'=' * 50}\n")
+    def determine_winner(room_code):
+        """Evaluate every hand still in at showdown and pay each pot"""
+        room = poker_rooms[room_code]
+        players = room['players']
+        active_players = [p for p in players if not p['folded']]
+
+        board = room['community_cards']
+        values = {seat: evaluate(p['hand'] + board)
+                  for seat, p in enumerate(players) if not p['folded']}
+
+        pots = build_pots({seat: p.get('committed', 0) for seat, p in enumerate(players)},
+                          folded=[seat for seat, p in enumerate(players) if p['folded']])
+        # Odd chips go to the winners closest to the dealer's left
+        seat_order = [(room['dealer'] + 1 + i) % len(players) for i in range(len(players))]
+        won, results = award_pots(pots, values, seat_order)
+        hand_history.result(room_code, won)
+        for seat, chips in won.items():
+            players[seat]['chips'] += chips
+
+        winners = [players[seat] for seat in seat_order if seat in won]
+        winner_names = ' & '.join(w['name'] for w in winners)
+        best = max(values.values())
+        logger.info("Room %s showdown: %s win $%s in %d pot(s), best hand %s",
+                    room_code, winner_names, room['pot'], len(pots), describe(best))
 
         # Reveal all hands
-        all_hands = {p['name']: p['hand'] for p in active_players}
+        all_hands = {p['name']: cards_to_wire(p['hand']) for p in active_players}
 
         socketio.emit('showdown', {
-            'winner': winner['name'],
+            'winner': winner_names,
+            'winners': [w['name'] for w in winners],
+            'hand_name': describe(best),
             'pot': room['pot'],
+            'pots': [{
+                'amount': result['amount'],
+                'winners': [players[seat]['name'] for seat in result['winners']],
+                'hand_name': describe(values[result['winners'][0]]) if result['winners'] else None
+            } for result in results],
             'hands': all_hands,
             'players': get_public_player_data(room['players'])
         }, room=room_code)
 
+        room['pot'] = 0
         room['dealer'] = (room['dealer'] + 1) % len(room['players'])
+        on_hand_finished(room_code)
 
     def advance_game(room_code):
         """Advance to next player or next phase"""
         room = poker_rooms[room_code]
 
-        print(f"\n{'=' * 50}")
-        print(f"🔄 ADVANCING GAME - Room: {room_code}")
-
         # Find active players
         active_players = [p for p in room['players'] if not p['folded']]
 
-        print(f"Active players: {len(active_players)}")
-
         # Check if only one player left
         if len(active_players) == 1:
             winner = active_players[0]
             winner['chips'] += room['pot']
+            hand_history.result(room_code, {room['players'].seat(winner['id']): room['pot']})
 
-            print(f"🏆 {winner['name']} wins ${room['pot']} (only player left)")
+            logger.info("Room %s: %s wins $%s (only player left)",
+                        room_code, winner['name'], room['pot'])
 
+            stop_turn_clock(room_code)
             socketio.emit('hand_complete', {
                 'winner': winner['name'],
                 'pot': room['pot'],
                 'players': get_public_player_data(room['players'])
             }, room=room_code)
 
+            room['pot'] = 0
+            room['phase'] = 'complete'
             room['dealer'] = (room['dealer'] + 1) % len(room['players'])
+            on_hand_finished(room_code)
             return
 
         # NEW LOGIC: Track who has acted this round
@@ -275,20 +529,14 @@ def register_poker_events(socketio):
             # 1. Player hasn't acted yet this round
             if next_player not in room['players_acted']:
                 needs_to_act = True
-                print(f"  ➡️ Player {next_player} hasn't acted yet")
 
             # 2. Player's bet is less than current bet
             elif player['bet'] < room['current_bet']:
                 needs_to_act = True
-                print(
-                    f"  ➡️ Player {next_player} needs to match bet (${
-                        player['bet']} < ${
-                        room['current_bet']})")
 
             # 3. Someone raised after this player acted
             elif room.get('last_raiser', -1) >= 0 and not player.get('acted_after_raise', False):
                 needs_to_act = True
-                print(f"  ➡️ Player {next_player} needs to act after raise")
 
             if needs_to_act:
                 break
@@ -298,7 +546,7 @@ def register_poker_events(socketio):
 
         # If we've gone through all players and no one needs to act
         if attempts >= len(room['players']):
-            print("✅ Betting round complete - all players acted")
+            logger.debug("Room %s: betting round complete", room_code)
 
             # Reset tracking for next round
             room['players_acted'] = set()
@@ -312,11 +560,9 @@ def register_poker_events(socketio):
         # Move to next player
         room['current_turn'] = next_player
 
-        print(
-            f"⏭️ Moving to player {next_player} ({
-                room['players'][next_player]['name']})")
-        print(f"Players acted so far: {room['players_acted']}")
-        print(f"{'=' * 50}\n")
+        logger.debug("Room %s: player %s (%s) to act, acted so far %s",
+                     room_code, next_player, room['players'][next_player]['name'],
+                     room['players_acted'])
 
         socketio.emit('next_turn', {
             'current_turn': next_player,
@@ -325,6 +571,88 @@ def register_poker_events(socketio):
             'players': get_public_player_data(room['players'])
         }, room=room_code)
 
+        start_turn_clock(room_code)
+
+    def take_action(room_code, player_index, action, raise_amount=None, auto=False):
+        """Apply a player's action, broadcast it and move the game on.
+
+        Returns an error message for an action that isn't allowed (nothing
+        changes), else None. ``auto`` marks actions taken by the turn clock.
+        """
+        room = poker_rooms[room_code]
+        player = room['players'][player_index]
+        bet_before = player['bet']
+
+        # Process action
+        if action == 'fold':
+            player['folded'] = True
+
+        elif action == 'check':
+            if player['bet'] < room['current_bet']:
+                return 'Cannot check, you must call or raise'
+            player['acted_after_raise'] = True
+
+        elif action == 'call':
+            call_amount = room['current_bet'] - player['bet']
+
+            if call_amount > player['chips']:
+                # All-in call
+                call_amount = player['chips']
+
+            commit_chips(room, player, call_amount)
+
+            player['acted_after_raise'] = True
+
+        elif action == 'raise':
+            if raise_amount is None:
+                raise_amount = room['current_bet'] * 2
+            total_needed = raise_amount - player['bet']
+
+            if total_needed > player['chips']:
+                return 'Not enough chips'
+
+            commit_chips(room, player, total_needed)
+            room['current_bet'] = raise_amount
+            room['last_raiser'] = player_index
+
+            # Reset acted_after_raise for all other players
+            for p in room['players']:
+                if not p['folded']:
+                    p['acted_after_raise'] = False
+            player['acted_after_raise'] = True
+
+        elif action == 'allin':
+            commit_chips(room, player, player['chips'])
+
+            if player['bet'] > room['current_bet']:
+                room['current_bet'] = player['bet']
+                room['last_raiser'] = player_index
+                # Reset acted_after_raise for all other players
+                for p in room['players']:
+                    if not p['folded']:
+                        p['acted_after_raise'] = False
+                player['acted_after_raise'] = True
+
+        hand_history.action(room_code, player_index, action, player['bet'] - bet_before, auto)
+
+        # Broadcast action
+        socketio.emit('player_action', {
+            'player': player['name'],
+            'action': action,
+            'amount': player['bet'] if action in ['raise', 'call', 'allin'] else None,
+            'auto': auto,
+            'pot': room['pot'],
+            'players': get_public_player_data(room['players'])
+        }, room=room_code)
+
+        logger.debug("Room %s: %s %s (bet $%s, chips $%s), pot $%s, current bet $%s",
+                     room_code, player['name'], action, player['bet'], player['chips'],
+                     room['pot'], room['current_bet'])
+
+        # Advance game
+        advance_game(room_code)
+        return None
+
     @socketio.on('create_poker_room')
     def handle_create_room(data):
         """Create a new poker room"""
@@ -333,44 +661,14 @@ def register_poker_events(socketio):
         starting_chips = data.get('starting_chips', 1000)
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print("🎲 CREATING POKER ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Host: {player_name}")
-        print(f"Starting chips: ${starting_chips}")
-
-        poker_rooms[room_code] = {
-            'code': room_code,
-            'host': player_id,
-            'players': [{
-                'id': player_id,
-                'name': player_name,
-                'chips': starting_chips,
-                'hand': [],
-                'bet': 0,
-                'folded': False,
-                'is_host': True,
-                'position': 0,
-                'acted_after_raise': False
-            }],
-            'status': 'waiting',
-            'deck': [],
-            'community_cards': [],
-            'pot': 0,
-            'current_bet': 0,
-            'dealer': 0,
-            'current_turn': 0,
-            'phase': 'waiting',
-            'small_blind': 10,
-            'big_blind': 20,
-            'starting_chips': starting_chips,
-            'last_raiser': -1
-        }
+        poker_rooms[room_code] = new_room(
+            room_code, player_id, [new_player(player_id, player_name, starting_chips, 0, is_host=True)],
+            starting_chips, current_app.config.get('POKER_TURN_SECONDS', DEFAULT_TURN_SECONDS))
 
-        join_room(room_code)
+        join_game_room('poker', room_code)
 
-        print("✅ Room created successfully")
-        print(f"{'=' * 60}\n")
+        logger.info("Poker room %s created by %s ($%s starting chips)",
+                    room_code, player_name, starting_chips)
 
         emit('poker_room_created', {
             'room_code': room_code,
@@ -380,55 +678,39 @@ def register_poker_events(socketio):
         })
 
     @socketio.on('join_poker_room')
+    @poker_rooms.synchronized
     def handle_join_room(data):
         """Join an existing poker room"""
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
         player_id = request.sid
 
-        print(f"\n{'=' * 60}")
-        print("🚪 JOINING POKER ROOM")
-        print(f"Room code: {room_code}")
-        print(f"Player: {player_name}")
-
         if room_code not in poker_rooms:
-            print("❌ Room not found")
-            print(f"{'=' * 60}\n")
+            logger.debug("%s tried to join missing room %s", player_name, room_code)
             emit('poker_error', {'message': 'Room not found!'})
             return
 
         room = poker_rooms[room_code]
 
         if room['status'] != 'waiting':
-            print("❌ Game already in progress")
-            print(f"{'=' * 60}\n")
             emit('poker_error', {'message': 'Game already in progress!'})
             return
 
         if len(room['players']) >= 6:
-            print("❌ Room is full")
-            print(f"{'=' * 60}\n")
             emit('poker_error', {'message': 'Room is full! (Max 6 players)'})
             return
 
         position = len(room['players'])
-        room['players'].append({
-            'id': player_id,
-            'name': player_name,
-            'chips': room['starting_chips'],
-            'hand': [],
-            'bet': 0,
-            'folded': False,
-            'is_host': False,
-            'position': position,
-            'acted_after_raise': False
-        })
+        room['players'].append(new_player(player_id, player_name, room['starting_chips'], position))
+        # Equities would show a seated player the other hands
+        leave_room(spectator_room(room_code))
+        room['spectators'].discard(player_id)
+        connections.discard(player_id, 'poker_watch', room_code)
 
-        join_room(room_code)
+        join_game_room('poker', room_code)
 
-        print(f"✅ Player joined (Position: {position})")
-        print(f"Total players: {len(room['players'])}")
-        print(f"{'=' * 60}\n")
+        logger.info("%s joined poker room %s at position %s (%d players)",
+                    player_name, room_code, position, len(room['players']))
 
         emit('poker_room_joined', {
             'room_code': room_code,
@@ -442,29 +724,21 @@ def register_poker_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('start_poker_game')
+    @poker_rooms.synchronized
     def handle_start_game(data):
         """Start the poker game"""
         room_code = data.get('room_code', '').upper()
 
-        print(f"\n{'=' * 60}")
-        print(f"🎮 STARTING POKER GAME - Room: {room_code}")
-
         if room_code not in poker_rooms:
-            print("❌ Room not found")
-            print(f"{'=' * 60}\n")
             return
 
         room = poker_rooms[room_code]
 
         if request.sid != room['host']:
-            print("❌ Only host can start")
-            print(f"{'=' * 60}\n")
             emit('poker_error', {'message': 'Only host can start the game!'})
             return
 
         if len(room['players']) < 2:
-            print("❌ Need at least 2 players")
-            print(f"{'=' * 60}\n")
             emit(
                 'poker_error', {
                     'message': 'Need at least 2 players to start!'})
@@ -472,147 +746,141 @@ def register_poker_events(socketio):
 
         room['status'] = 'playing'
 
-        print(f"✅ Game starting with {len(room['players'])} players")
-        print(f"{'=' * 60}\n")
+        logger.info("Poker room %s started with %d players", room_code, len(room['players']))
 
         deal_new_hand(room_code)
 
     @socketio.on('poker_action')
+    @poker_rooms.synchronized
     def handle_poker_action(data):
         """Handle player actions"""
         room_code = data.get('room_code', '').upper()
         action = data.get('action')
         player_id = request.sid
 
-        print(f"\n{'=' * 40}")
-        print(f"🎮 PLAYER ACTION - Room: {room_code}")
-        print(f"Action: {action}")
-
         if room_code not in poker_rooms:
             emit('poker_error', {'message': 'Room not found'})
             return
 
         room = poker_rooms[room_code]
 
-        # Find player
-        player_index = None
-        for i, p in enumerate(room['players']):
-            if p['id'] == player_id:
-                player_index = i
-                break
-
+        player_index = room['players'].seat(player_id)
         if player_index is None:
             emit('poker_error', {'message': 'Player not found'})
             return
 
-        player = room['players'][player_index]
+        if not hand_in_progress(room):
+            emit('poker_error', {'message': 'No hand in progress'})
+            return
 
         # Verify it's player's turn
         if room['current_turn'] != player_index:
-            print(
-                f"❌ Not player's turn (current: {
-                    room['current_turn']}, player: {player_index})")
-            print(f"{'=' * 40}\n")
+            logger.debug("Room %s: out-of-turn %s from position %s (turn %s)",
+                         room_code, action, player_index, room['current_turn'])
             emit('poker_error', {'message': 'Not your turn!'})
             return
 
-        print(f"Player: {player['name']} (Position: {player_index})")
-        print(
-            f"Current bet: ${
-                room['current_bet']}, Player bet: ${
-                player['bet']}, Chips: ${
-                player['chips']}")
+        error = take_action(room_code, player_index, action, data.get('raise_amount'))
+        if error:
+            emit('poker_error', {'message': error})
 
-        # Process action
-        if action == 'fold':
-            player['folded'] = True
-            print(f"🚫 {player['name']} folded")
-
-        elif action == 'check':
-            if player['bet'] < room['current_bet']:
-                emit(
-                    'poker_error', {
-                        'message': 'Cannot check, you must call or raise'})
-                return
-            print(f"✓ {player['name']} checked")
-            player['acted_after_raise'] = True
-
-        elif action == 'call':
-            call_amount = room['current_bet'] - player['bet']
-
-            if call_amount > player['chips']:
-                # All-in call
-                call_amount = player['chips']
-
-            player['chips'] -= call_amount
-            player['bet'] += call_amount
-            room['pot'] += call_amount
-
-            print(f"📞 {player['name']} called ${call_amount}")
-            player['acted_after_raise'] = True
-
-        elif action == 'raise':
-            raise_amount = data.get('raise_amount', room['current_bet'] * 2)
-            total_needed = raise_amount - player['bet']
-
-            if total_needed > player['chips']:
-                emit('poker_error', {'message': 'Not enough chips'})
-                return
+    @socketio.on('deal_new_hand')
+    @poker_rooms.synchronized
+    def handle_deal_new_hand(data):
+        """Deal a new hand"""
+        room_code = data.get('room_code', '').upper()
 
-            player['chips'] -= total_needed
-            player['bet'] = raise_amount
-            room['pot'] += total_needed
-            room['current_bet'] = raise_amount
-            room['last_raiser'] = player_index
+        if room_code not in poker_rooms:
+            return
 
-            # Reset acted_after_raise for all other players
-            for p in room['players']:
-                if not p['folded']:
-                    p['acted_after_raise'] = False
-            player['acted_after_raise'] = True
+        # Tournament tables deal themselves
+        if poker_rooms[room_code].get('tournament'):
+            return
 
-            print(f"📈 {player['name']} raised to ${raise_amount}")
+        deal_new_hand(room_code)
 
-        elif action == 'allin':
-            all_in_amount = player['chips']
-            player['bet'] += all_in_amount
-            room['pot'] += all_in_amount
-            player['chips'] = 0
+    @socketio.on('watch_poker_room')
+    @poker_rooms.synchronized
+    def handle_watch_room(data):
+        """Spectate a room: receive live equities with each street"""
+        room_code = data.get('room_code', '').upper().strip()
 
-            if player['bet'] > room['current_bet']:
-                room['current_bet'] = player['bet']
-                room['last_raiser'] = player_index
-                # Reset acted_after_raise for all other players
-                for p in room['players']:
-                    if not p['folded']:
-                        p['acted_after_raise'] = False
-                player['acted_after_raise'] = True
+        if room_code not in poker_rooms:
+            emit('poker_error', {'message': 'Room not found!'})
+            return
 
-            print(f"🔥 {player['name']} went all-in with ${all_in_amount}")
+        room = poker_rooms[room_code]
+        # Equities are worked out from every hand, the watcher's opponents' too
+        if room['players'].seat(request.sid) is not None:
+            emit('poker_error', {'message': 'Players cannot watch their own table!'})
+            return
 
-        # Broadcast action
-        socketio.emit('player_action', {
-            'player': player['name'],
-            'action': action,
-            'amount': player['bet'] if action in ['raise', 'call', 'allin'] else None,
+        join_room(spectator_room(room_code))
+        room['spectators'].add(request.sid)
+        connections.add(request.sid, 'poker_watch', room_code)
+        emit('poker_spectating', {
+            'room_code': room_code,
+            'players': get_public_player_data(room['players']),
+            'community_cards': cards_to_wire(room['community_cards']),
             'pot': room['pot'],
-            'players': get_public_player_data(room['players'])
-        }, room=room_code)
+        })
+        # Streets nobody watched have no equity yet
+        latest = room.get('equity')
+        if latest and (latest['hand_number'], latest['phase']) == (room.get('hand_number'), room['phase']):
+            emit('poker_equity', latest)
+        elif hand_in_progress(room):
+            publish_equity(room_code)
+
+    @connections.on_disconnect('poker_watch')
+    def handle_spectator_disconnect(room_code):
+        """Stop working out equities for a spectator who left"""
+        with poker_rooms.lock(room_code):
+            room = poker_rooms.get(room_code)
+            if room is not None:
+                room['spectators'].discard(request.sid)
+
+    @connections.on_disconnect('poker')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player's seat, or fold it if a hand is in progress"""
+        player_id = request.sid
 
-        print(f"Pot: ${room['pot']}, Current bet: ${room['current_bet']}")
-        print(f"{'=' * 40}\n")
+        with poker_rooms.lock(room_code):
+            room = poker_rooms.get(room_code)
+            if room is None:
+                return
 
-        # Advance game
-        advance_game(room_code)
+            player_index = room['players'].seat(player_id)
+            if player_index is None:
+                return
+            player = room['players'][player_index]
 
-    @socketio.on('deal_new_hand')
-    def handle_deal_new_hand(data):
-        """Deal a new hand"""
-        room_code = data.get('room_code', '').upper()
+            if not hand_in_progress(room):
+                # Tournament tables keep the seat; the engine owns seating
+                if not room.get('tournament'):
+                    player['disconnected'] = True
+                    drop_departed(room_code)
+                return
 
-        if room_code not in poker_rooms:
-            return
+            # Mid-hand the seat stays (positions index the turn order); fold
+            # it now and drop it when the next hand is dealt
+            logger.info("%s disconnected from poker room %s, folding", player['name'], room_code)
+            player['folded'] = True
+            player['disconnected'] = True
+            hand_history.action(room_code, player_index, 'fold', 0)
+            socketio.emit('player_action', {
+                'player': player['name'],
+                'action': 'fold',
+                'amount': None,
+                'pot': room['pot'],
+                'players': get_public_player_data(room['players'])
+            }, room=room_code)
 
-        deal_new_hand(room_code)
+            active_players = [p for p in room['players'] if not p['folded']]
+            if room['current_turn'] == player_index or len(active_players) == 1:
+                advance_game(room_code)
+
+    # Tournament tables are poker rooms; it hears about every finished hand
+    from .tournament_events import register_tournament_events
+    on_hand_finished = register_tournament_events(socketio, deal_new_hand)
 
-    print("✅ Poker socket events registered")
+    logger.debug("Poker socket events registered")
@@ -0,0 +1,233 @@
+"""Multi-table poker tournaments: seating, blind levels and table balancing.
+
+A ``Tournament`` seats its entrants at tables of up to ``table_size`` and
+keeps every table within one player of the others as players bust. Each
+table is played as an ordinary poker room with its own lock, so all tables
+run their hands concurrently. Seating changes only happen when a table
+reports a finished hand (``hand_finished``): players then leave *that*
+table, which is between hands, for the emptiest table, where they are dealt
+in from its next hand. That way a rebalance never waits on, or interrupts,
+a hand at another table.
+
+Tables are kept in a min-heap keyed by player count, so picking where a
+player goes costs O(log tables). The heap is lazy: entries are pushed
+whenever a count changes and stale ones are skipped when popped.
+"""
+
+import heapq
+import math
+import random
+import time
+
+# (small blind, big blind) per level
+DEFAULT_SCHEDULE = [
+    (10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200),
+    (150, 300), (200, 400), (300, 600), (400, 800), (600, 1200),
+    (800, 1600), (1000, 2000), (1500, 3000), (2000, 4000),
+]
+
+
+class TournamentTable:
+    """Seats at one table; ``seats`` holds player ids or None"""
+
+    def __init__(self, table_id, size):
+        self.id = table_id
+        self.seats = [None] * size
+        self.button = 0
+        self.count = 0
+        self.room_code = None
+
+    def players(self):
+        """Seated player ids in seat order"""
+        return [pid for pid in self.seats if pid is not None]
+
+    def seat_player(self, player_id):
+        seat = self.seats.index(None)
+        self.seats[seat] = player_id
+        self.count += 1
+        return seat
+
+    def unseat(self, player_id):
+        self.seats[self.seats.index(player_id)] = None
+        self.count -= 1
+
+    def next_big_blind(self):
+        """The player two seats after the button, who moves first so the
+        blinds they skip and the ones they pay even out"""
+        size = len(self.seats)
+        occupied = [self.seats[(self.button + i) % size] for i in range(1, size + 1)
+                    if self.seats[(self.button + i) % size] is not None]
+        return occupied[1] if len(occupied) > 1 else occupied[0]
+
+    def advance_button(self):
+        size = len(self.seats)
+        for i in range(1, size + 1):
+            if self.seats[(self.button + i) % size] is not None:
+                self.button = (self.button + i) % size
+                return
+
+
+class Tournament:
+    """Registration, seating and balancing for one tournament.
+
+    ``status`` goes 'registering' -> 'running' -> 'finished'. Finishing
+    places are recorded as players bust: ``players[pid]['place']``.
+    """
+
+    def __init__(self, tournament_id, host=None, name='Tournament', table_size=6,
+                 starting_chips=1500, schedule=None, level_seconds=600):
+        self.id = tournament_id
+        self.host = host
+        self.name = name
+        self.table_size = table_size
+        self.starting_chips = starting_chips
+        self.schedule = list(schedule or DEFAULT_SCHEDULE)
+        self.level_seconds = level_seconds
+        self.players = {}  # id -> {'id', 'name', 'chips', 'table', 'place'}
+        self.tables = {}   # table id -> TournamentTable
+        self.status = 'registering'
+        self.started_at = None
+        self.remaining = 0
+        self.winner = None
+        self._heap = []
+
+    def register(self, player_id, name):
+        if self.status != 'registering':
+            raise ValueError('Registration is closed')
+        self.players[player_id] = {'id': player_id, 'name': name, 'chips': self.starting_chips,
+                                   'table': None, 'place': None}
+
+    def unregister(self, player_id):
+        if self.status == 'registering':
+            self.players.pop(player_id, None)
+
+    def start(self, now=None, rng=random):
+        """Seat everyone at as few tables as possible, evenly; returns the tables"""
+        if self.status != 'registering':
+            raise ValueError('Tournament already started')
+        if len(self.players) < 2:
+            raise ValueError('Need at least 2 entrants')
+        entrants = list(self.players)
+        rng.shuffle(entrants)
+        count = math.ceil(len(entrants) / self.table_size)
+        for table_id in range(count):
+            self.tables[table_id] = TournamentTable(table_id, self.table_size)
+        # Round-robin keeps table sizes within one of each other
+        for i, player_id in enumerate(entrants):
+            table = self.tables[i % count]
+            table.seat_player(player_id)
+            self.players[player_id]['table'] = table.id
+        for table in self.tables.values():
+            table.button = rng.randrange(self.table_size)
+            table.advance_button()
+            self._push(table)
+        self.status = 'running'
+        self.started_at = time.time() if now is None else now
+        self.remaining = len(entrants)
+        return list(self.tables.values())
+
+    def level(self, now=None):
+        now = time.time() if now is None else now
+        return min(int((now - self.started_at) // self.level_seconds), len(self.schedule) - 1)
+
+    def blinds(self, now=None):
+        """(small, big) for the current level"""
+        return self.schedule[self.level(now)]
+
+    def tables_needed(self):
+        return max(1, math.ceil(self.remaining / self.table_size))
+
+    # Table heap: (count, table id), stale entries skipped on pop
+
+    def _push(self, table):
+        heapq.heappush(self._heap, (table.count, table.id))
+        if len(self._heap) > 4 * len(self.tables) + 16:
+            self._heap = [(t.count, t.id) for t in self.tables.values()]
+            heapq.heapify(self._heap)
+
+    def _smallest(self, exclude):
+        """The table with the fewest players other than ``exclude``, or None"""
+        skipped = []
+        found = None
+        while self._heap:
+            count, table_id = self._heap[0]
+            table = self.tables.get(table_id)
+            if table is None or table.count != count:
+                heapq.heappop(self._heap)
+                continue
+            if table_id == exclude:
+                skipped.append(heapq.heappop(self._heap))
+                continue
+            found = table
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def _move(self, player_id, source, target):
+        source.unseat(player_id)
+        seat = target.seat_player(player_id)
+        self.players[player_id]['table'] = target.id
+        self._push(source)
+        self._push(target)
+        return {'player': player_id, 'from': source.id, 'to': target.id, 'seat': seat}
+
+    def hand_finished(self, table_id, chips):
+        """Record a table's finished hand and rebalance from it.
+
+        ``chips`` maps player id -> chips after the hand. Players left with
+        none are out. Returns {'busted': [(id, place)], 'moves': [...],
+        'broken': bool, 'winner': id or None}; moved players join their
+        new table from its next hand.
+        """
+        table = self.tables[table_id]
+        result = {'busted': [], 'moves': [], 'broken': False, 'winner': None}
+
+        # Busted together: whoever started the hand with more chips places higher
+        out = sorted((pid for pid, stack in chips.items() if stack <= 0 and pid in table.seats),
+                     key=lambda pid: self.players[pid]['chips'])
+        for player_id, stack in chips.items():
+            self.players[player_id]['chips'] = stack
+        for player_id in out:
+            self.players[player_id]['place'] = self.remaining
+            self.players[player_id]['table'] = None
+            result['busted'].append((player_id, self.remaining))
+            table.unseat(player_id)
+            self.remaining -= 1
+        if table.count:
+            table.advance_button()
+        self._push(table)
+
+        if self.remaining <= 1:
+            self.status = 'finished'
+            self.winner = next((pid for pid, p in self.players.items() if p['place'] is None), None)
+            if self.winner is not None:
+                self.players[self.winner]['place'] = 1
+            result['winner'] = self.winner
+            return result
+
+        smallest = self._smallest(exclude=table_id)
+        if smallest is None:
+            return result
+        if len(self.tables) > self.tables_needed() and table.count <= smallest.count:
+            # Break this table: everyone goes to the emptiest remaining tables
+            for player_id in table.players():
+                result['moves'].append(self._move(player_id, table, self._smallest(exclude=table_id)))
+            del self.tables[table_id]
+            result['broken'] = True
+            return result
+
+        # Send players to the emptiest table until sizes are within one
+        while table.count > smallest.count + 1:
+            result['moves'].append(self._move(table.next_big_blind(), table, smallest))
+            smallest = self._smallest(exclude=table_id)
+        return result
+
+    def standings(self):
+        """Players still in by chips, then busted players by place"""
+        alive = sorted((p for p in self.players.values() if p['place'] is None or p['place'] == 1),
+                       key=lambda p: -p['chips'])
+        out = sorted((p for p in self.players.values() if p['place'] not in (None, 1)),
+                     key=lambda p: p['place'])
+        return [{'name': p['name'], 'chips': p['chips'], 'place': p['place'],
+                 'table': p['table']} for p in alive + out]
@@ -0,0 +1,261 @@
+"""Socket events for multi-table poker tournaments.
+
+Each tournament table is an ordinary poker room (``room['tournament']`` and
+``room['table_id']`` tie it back), so hands are played by the normal poker
+handlers under that room's own lock and tables run concurrently. When a
+table finishes a hand the ``Tournament`` records busts and rebalances from
+that table; moved players switch Socket.IO rooms and are dealt in at their
+new table's next hand. Tables deal their own next hand a few seconds later:
+the shared timer wheel starts a background task per table when the delay is
+up, so a slow table never holds up the others.
+
+Locks are always taken table first, then tournament, never the reverse.
+"""
+
+import logging
+
+from flask import request
+from flask_socketio import emit, join_room
+
+from utils.player_manager import connections
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+from utils.timer_wheel import timer_wheel
+from .socket_events import generate_room_code, new_player, new_room, poker_rooms, spectator_room
+from .tournament import Tournament
+
+logger = logging.getLogger(__name__)
+
+poker_tournaments = RoomStore('poker_tournament')
+
+# Seconds between a table's hands
+NEXT_HAND_DELAY = 3
+# Seconds before a table short of players checks again
+SHORT_TABLE_RETRY = 5
+MAX_TABLE_SIZE = 6
+
+
+def generate_tournament_id():
+    """Reserve a tournament id; it doubles as the tournament's Socket.IO room"""
+    return room_codes.allocate('poker_tournament')
+
+
+def tournament_summary(tournament):
+    small, big = tournament.blinds() if tournament.started_at else tournament.schedule[0]
+    return {
+        'tournament_id': tournament.id,
+        'name': tournament.name,
+        'status': tournament.status,
+        'entrants': len(tournament.players),
+        'remaining': tournament.remaining,
+        'tables': len(tournament.tables),
+        'level': tournament.level() + 1 if tournament.started_at else 1,
+        'small_blind': small,
+        'big_blind': big,
+    }
+
+
+def sync_table(room, tournament, table):
+    """Seat the table's current players in its room with their tournament stacks"""
+    current = {p['id']: p for p in room['players']}
+    players = []
+    for position, player_id in enumerate(table.players()):
+        entrant = tournament.players[player_id]
+        player = current.get(player_id) or new_player(player_id, entrant['name'], 0, position)
+        player['chips'] = entrant['chips']
+        player['position'] = position
+        players.append(player)
+    room['players'][:] = players
+    button = table.seats[table.button]
+    room['dealer'] = room['players'].seat(button) if button is not None else 0
+    room['small_blind'], room['big_blind'] = tournament.blinds()
+
+
+def register_tournament_events(socketio, deal_new_hand):
+    """Register tournament events; returns the poker rooms' end-of-hand hook"""
+
+    def seat_socket(player_id, room_code):
+        socketio.server.leave_room(player_id, spectator_room(room_code), namespace='/')
+        socketio.server.enter_room(player_id, room_code, namespace='/')
+        connections.add(player_id, 'poker', room_code)
+
+    def unseat_socket(player_id, room_code):
+        socketio.server.leave_room(player_id, room_code, namespace='/')
+        connections.discard(player_id, 'poker', room_code)
+
+    def open_table(tournament_id, table_id):
+        """Create the poker room for a table and deal its first hand"""
+        room_code = generate_room_code()
+        with poker_rooms.lock(room_code):
+            with poker_tournaments.lock(tournament_id):
+                tournament = poker_tournaments[tournament_id]
+                table = tournament.tables[table_id]
+                table.room_code = room_code
+                room = new_room(room_code, None, [], tournament.starting_chips)
+                room.update({'status': 'playing', 'tournament': tournament_id,
+                             'table_id': table_id})
+                sync_table(room, tournament, table)
+                poker_rooms[room_code] = room
+                poker_tournaments.save(tournament_id)
+            for position, player in enumerate(room['players']):
+                seat_socket(player['id'], room_code)
+                socketio.emit('tournament_table', {
+                    'tournament_id': tournament_id,
+                    'room_code': room_code,
+                    'table': table_id,
+                    'your_position': position,
+                }, to=player['id'])
+            deal_new_hand(room_code)
+            poker_rooms.save(room_code)
+
+    def start_table_hand(tournament_id, room_code):
+        """Timer callback: deal the table's next hand, or wait for players"""
+        with poker_rooms.lock(room_code):
+            room = poker_rooms.get(room_code)
+            if room is None or room['status'] != 'playing':
+                return
+            with poker_tournaments.lock(tournament_id):
+                tournament = poker_tournaments.get(tournament_id)
+                table = tournament.tables.get(room['table_id']) if tournament else None
+                if table is None or tournament.status != 'running':
+                    return
+                if table.count < 2:
+                    # Nobody to play: this table may be the one to break
+                    apply_result(tournament, room_code, tournament.hand_finished(table.id, {}))
+                    poker_tournaments.save(tournament_id)
+                    return
+                sync_table(room, tournament, table)
+            deal_new_hand(room_code)
+            poker_rooms.save(room_code)
+
+    def apply_result(tournament, room_code, result):
+        """Act on ``Tournament.hand_finished``: busts, moves, the next hand"""
+        room = poker_rooms[room_code]
+        for player_id, place in result['busted']:
+            unseat_socket(player_id, room_code)
+            name = tournament.players[player_id]['name']
+            logger.info("Tournament %s: %s finished %s", tournament.id, name, place)
+            socketio.emit('tournament_bust', {'player': name, 'place': place}, room=tournament.id)
+
+        for move in result['moves']:
+            target = tournament.tables[move['to']].room_code
+            unseat_socket(move['player'], room_code)
+            seat_socket(move['player'], target)
+            logger.debug("Tournament %s: %s moves from table %s to %s",
+                         tournament.id, move['player'], move['from'], move['to'])
+            socketio.emit('tournament_table', {
+                'tournament_id': tournament.id,
+                'room_code': target,
+                'table': move['to'],
+                'seat': move['seat'],
+            }, to=move['player'])
+
+        if result['winner'] is not None:
+            room['status'] = 'finished'
+            winner = tournament.players[result['winner']]['name']
+            logger.info("Tournament %s won by %s", tournament.id, winner)
+            socketio.emit('tournament_finished', {
+                'winner': winner,
+                'standings': tournament.standings(),
+            }, room=tournament.id)
+        elif result['broken']:
+            room['status'] = 'finished'
+            del poker_rooms[room_code]
+        else:
+            ready = tournament.tables[room['table_id']].count >= 2
+            timer_wheel.schedule_task(NEXT_HAND_DELAY if ready else SHORT_TABLE_RETRY,
+                                      start_table_hand, tournament.id, room_code)
+
+        if result['busted'] or result['moves'] or result['broken']:
+            socketio.emit('tournament_update', tournament_summary(tournament), room=tournament.id)
+
+    def on_hand_finished(room_code):
+        """Poker rooms call this (under the room's lock) after every hand"""
+        room = poker_rooms[room_code]
+        tournament_id = room.get('tournament')
+        if tournament_id is None:
+            return
+        with poker_tournaments.lock(tournament_id):
+            tournament = poker_tournaments.get(tournament_id)
+            if tournament is None or tournament.status != 'running':
+                return
+            chips = {p['id']: p['chips'] for p in room['players']}
+            apply_result(tournament, room_code, tournament.hand_finished(room['table_id'], chips))
+            poker_tournaments.touch(tournament_id)
+            poker_tournaments.save(tournament_id)
+
+    @socketio.on('create_poker_tournament')
+    def handle_create_tournament(data):
+        """Open registration for a tournament; the creator is its first entrant"""
+        player_name = data.get('player_name', 'Player')
+        tournament_id = generate_tournament_id()
+        table_size = max(2, min(int(data.get('table_size', MAX_TABLE_SIZE)), MAX_TABLE_SIZE))
+        tournament = Tournament(
+            tournament_id,
+            host=request.sid,
+            name=data.get('name') or f"{player_name}'s tournament",
+            table_size=table_size,
+            starting_chips=int(data.get('starting_chips', 1500)),
+            level_seconds=int(data.get('level_minutes', 10)) * 60)
+        tournament.register(request.sid, player_name)
+        poker_tournaments[tournament_id] = tournament
+        join_room(tournament_id)
+
+        logger.info("Poker tournament %s created by %s", tournament_id, player_name)
+        emit('tournament_created', tournament_summary(tournament))
+
+    @socketio.on('join_poker_tournament')
+    @poker_tournaments.synchronized(key='tournament_id')
+    def handle_join_tournament(data):
+        """Register for a tournament that hasn't started"""
+        tournament_id = data.get('tournament_id', '').upper().strip()
+        tournament = poker_tournaments.get(tournament_id)
+        if tournament is None:
+            emit('poker_error', {'message': 'Tournament not found!'})
+            return
+        if tournament.status != 'registering':
+            emit('poker_error', {'message': 'Registration is closed!'})
+            return
+
+        tournament.register(request.sid, data.get('player_name', 'Player'))
+        poker_tournaments.save(tournament_id)
+        join_room(tournament_id)
+        socketio.emit('tournament_update', tournament_summary(tournament), room=tournament_id)
+
+    @socketio.on('start_poker_tournament')
+    def handle_start_tournament(data):
+        """Seat every entrant and deal at all tables"""
+        tournament_id = data.get('tournament_id', '').upper().strip()
+        with poker_tournaments.lock(tournament_id):
+            tournament = poker_tournaments.get(tournament_id)
+            if tournament is None:
+                emit('poker_error', {'message': 'Tournament not found!'})
+                return
+            if request.sid != tournament.host:
+                emit('poker_error', {'message': 'Only host can start the tournament!'})
+                return
+            try:
+                tables = tournament.start()
+            except ValueError as e:
+                emit('poker_error', {'message': str(e)})
+                return
+            poker_tournaments.save(tournament_id)
+
+        logger.info("Poker tournament %s started: %d players at %d tables",
+                    tournament_id, tournament.remaining, len(tables))
+        # Table locks come before the tournament lock, so open tables after releasing it
+        for table in tables:
+            open_table(tournament_id, table.id)
+        socketio.emit('tournament_update', tournament_summary(tournament), room=tournament_id)
+
+    @socketio.on('poker_tournament_standings')
+    def handle_standings(data):
+        tournament_id = data.get('tournament_id', '').upper().strip()
+        tournament = poker_tournaments.get(tournament_id)
+        if tournament is None:
+            emit('poker_error', {'message': 'Tournament not found!'})
+            return
+        emit('tournament_standings', {**tournament_summary(tournament),
+                                      'standings': tournament.standings()})
+
+    return on_hand_finished
@@ -1,24 +1,23 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
-import random
-import string
+from utils.event_router import get_router
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
-pong_rooms = {}
+pong_rooms = RoomStore('pong')
 
 
 def generate_room_code():
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in pong_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('pong')
 
 
 def register_pong_events(socketio):
+    router = get_router(socketio)
 
-    @socketio.on('create_room')
+    @router.on('create_room', 'pong')
     def handle_create_room(data):
-        if data.get('game_type') != 'pong':
-            return
         room_code = generate_room_code()
         player_name = data.get('player_name', 'Player 1')
         player_id = request.sid
@@ -30,7 +29,7 @@ def register_pong_events(socketio):
             'status': 'waiting',
             'score': {'left': 0, 'right': 0}
         }
-        join_room(room_code)
+        join_game_room('pong', room_code)
         emit('room_created', {
             'room_code': room_code,
             'player_id': player_id,
@@ -39,10 +38,9 @@ def register_pong_events(socketio):
             'is_host': True
         })
 
-    @socketio.on('join_room')
+    @router.on('join_room', 'pong')
+    @pong_rooms.synchronized
     def handle_join_room(data):
-        if data.get('game_type') != 'pong':
-            return
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player 2')
         player_id = request.sid
@@ -59,7 +57,7 @@ def register_pong_events(socketio):
             return
 
         room['players'].append({'id': player_id, 'name': player_name, 'side': 'right', 'is_host': False})
-        join_room(room_code)
+        join_game_room('pong', room_code)
 
         emit('room_joined', {
             'room_code': room_code,
@@ -70,10 +68,9 @@ def register_pong_events(socketio):
         }, to=player_id)
         emit('player_joined', {'players': room['players']}, room=room_code, include_self=False)
 
-    @socketio.on('start_game')
+    @router.on('start_game', 'pong')
+    @pong_rooms.synchronized
     def handle_start_game(data):
-        if data.get('game_type') != 'pong':
-            return
         room_code = data.get('room_code', '').upper()
         if room_code not in pong_rooms:
             emit('error', {'message': 'Room not found'})
@@ -91,6 +88,7 @@ def register_pong_events(socketio):
         }, room=room_code)
 
     @socketio.on('pong_paddle_update')
+    @pong_rooms.synchronized
     def handle_paddle_update(data):
         room_code = data.get('room_code', '').upper()
         if room_code not in pong_rooms:
@@ -102,6 +100,7 @@ def register_pong_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('pong_ball_update')
+    @pong_rooms.synchronized
     def handle_ball_update(data):
         room_code = data.get('room_code', '').upper()
         if room_code not in pong_rooms:
@@ -117,6 +116,7 @@ def register_pong_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('pong_game_over')
+    @pong_rooms.synchronized
     def handle_game_over(data):
         room_code = data.get('room_code', '').upper()
         if room_code not in pong_rooms:
@@ -130,20 +130,24 @@ def register_pong_events(socketio):
             'score': data.get('score')
         }, room=room_code)
 
-    @socketio.on('leave_room')
+    @router.on('leave_room', 'pong')
+    @pong_rooms.synchronized
     def handle_leave_room(data):
-        if data.get('game_type') != 'pong':
-            return
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
         if room_code not in pong_rooms:
             return
         room = pong_rooms[room_code]
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
-        leave_room(room_code)
+        leave_game_room('pong', room_code)
         if len(room['players']) == 0:
             del pong_rooms[room_code]
         else:
             socketio.emit('player_left', {'players': room['players']}, room=room_code)
 
+    @connections.on_disconnect('pong')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
     print('✅ Pong socket events registered')
@@ -1,18 +1,19 @@
 """Raja Mantri Chor Sipahi — Socket.IO events for network multiplayer."""
 
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
 import random
-import string
+from utils.broadcast import emit_personalized
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
-raja_rooms = {}
+raja_rooms = RoomStore('raja_mantri')
 
 
 def generate_room_code():
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in raja_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('raja_mantri')
 
 
 def register_raja_mantri_events(socketio):
@@ -36,7 +37,7 @@ def register_raja_mantri_events(socketio):
             'mantri_id': None,
         }
 
-        join_room(room_code)
+        join_game_room('raja_mantri', room_code)
 
         emit('raja_room_created', {
             'room_code': room_code,
@@ -45,6 +46,7 @@ def register_raja_mantri_events(socketio):
         })
 
     @socketio.on('join_raja_room')
+    @raja_rooms.synchronized
     def handle_join_room(data):
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
@@ -65,7 +67,7 @@ def register_raja_mantri_events(socketio):
             return
 
         room['players'].append({'id': player_id, 'name': player_name})
-        join_room(room_code)
+        join_game_room('raja_mantri', room_code)
 
         emit('raja_room_joined', {
             'room_code': room_code,
@@ -78,6 +80,7 @@ def register_raja_mantri_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('start_raja_game')
+    @raja_rooms.synchronized
     def handle_start_game(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -108,15 +111,13 @@ def register_raja_mantri_events(socketio):
         room['mantri_id'] = next(pid for pid, r in room['roles'].items() if r == 'Mantri')
 
         # Send each player their private role
-        for player in room['players']:
-            pid = player['id']
-            emit('raja_game_started', {
-                'your_role': room['roles'][pid],
-                'your_name': player['name'],
-                'players': room['players']
-            }, to=pid)
+        emit_personalized(
+            socketio, 'raja_game_started', {'players': room['players']}, room['players'],
+            lambda player: {'your_role': room['roles'][player['id']], 'your_name': player['name']},
+            sid=lambda player: player['id'])
 
     @socketio.on('raja_reveal_done')
+    @raja_rooms.synchronized
     def handle_reveal_done(data):
         """Called when a player has read their role card and dismissed it."""
         room_code = data.get('room_code', '').upper()
@@ -136,6 +137,7 @@ def register_raja_mantri_events(socketio):
             }, room=room_code, include_self=True)
 
     @socketio.on('raja_sipahi_guess')
+    @raja_rooms.synchronized
     def handle_guess(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -184,6 +186,7 @@ def register_raja_mantri_events(socketio):
         }, room=room_code, include_self=True)
 
     @socketio.on('leave_raja_room')
+    @raja_rooms.synchronized
     def handle_leave_room(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -191,7 +194,7 @@ def register_raja_mantri_events(socketio):
         if room_code not in raja_rooms:
             return
 
-        leave_room(room_code)
+        leave_game_room('raja_mantri', room_code)
         room = raja_rooms[room_code]
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
 
@@ -202,4 +205,9 @@ def register_raja_mantri_events(socketio):
                 room['host'] = room['players'][0]['id']
             emit('raja_player_left', {'players': room['players']}, room=room_code)
 
+    @connections.on_disconnect('raja_mantri')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
     print("✅ Raja Mantri socket events registered")
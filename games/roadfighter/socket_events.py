@@ -1,26 +1,25 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
-import random
-import string
+from utils.event_router import get_router
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
-roadfighter_rooms = {}
+roadfighter_rooms = RoomStore('roadfighter')
 
 CAR_COLORS = ['#00f5ff', '#ff00cc', '#ffcc00', '#00ff88']
 
 
 def generate_room_code():
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in roadfighter_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('roadfighter')
 
 
 def register_roadfighter_events(socketio):
+    router = get_router(socketio)
 
-    @socketio.on('create_room')
+    @router.on('create_room', 'roadfighter')
     def handle_create_room(data):
-        if data.get('game_type') != 'roadfighter':
-            return
         room_code = generate_room_code()
         player_name = data.get('player_name', 'Racer 1')
         player_id = request.sid
@@ -38,7 +37,7 @@ def register_roadfighter_events(socketio):
             'status': 'waiting',
             'max_players': 4
         }
-        join_room(room_code)
+        join_game_room('roadfighter', room_code)
         emit('room_created', {
             'room_code': room_code,
             'player_id': player_id,
@@ -48,10 +47,9 @@ def register_roadfighter_events(socketio):
             'is_host': True
         })
 
-    @socketio.on('join_room')
+    @router.on('join_room', 'roadfighter')
+    @roadfighter_rooms.synchronized
     def handle_join_room(data):
-        if data.get('game_type') != 'roadfighter':
-            return
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Racer')
         player_id = request.sid
@@ -75,7 +73,7 @@ def register_roadfighter_events(socketio):
             'index': idx,
             'is_host': False
         })
-        join_room(room_code)
+        join_game_room('roadfighter', room_code)
 
         emit('room_joined', {
             'room_code': room_code,
@@ -87,10 +85,9 @@ def register_roadfighter_events(socketio):
         }, to=player_id)
         emit('player_joined', {'players': room['players']}, room=room_code, include_self=False)
 
-    @socketio.on('start_game')
+    @router.on('start_game', 'roadfighter')
+    @roadfighter_rooms.synchronized
     def handle_start_game(data):
-        if data.get('game_type') != 'roadfighter':
-            return
         room_code = data.get('room_code', '').upper()
         if room_code not in roadfighter_rooms:
             emit('error', {'message': 'Room not found'})
@@ -106,6 +103,7 @@ def register_roadfighter_events(socketio):
         socketio.emit('game_started', {'players': room['players']}, room=room_code)
 
     @socketio.on('rf_player_update')
+    @roadfighter_rooms.synchronized
     def handle_player_update(data):
         """Relay car position to all other players."""
         room_code = data.get('room_code', '').upper()
@@ -121,6 +119,7 @@ def register_roadfighter_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('rf_obstacles')
+    @roadfighter_rooms.synchronized
     def handle_obstacles(data):
         """Host broadcasts obstacle list to all players (shared game state)."""
         room_code = data.get('room_code', '').upper()
@@ -135,6 +134,7 @@ def register_roadfighter_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('rf_game_over')
+    @roadfighter_rooms.synchronized
     def handle_game_over(data):
         room_code = data.get('room_code', '').upper()
         if room_code not in roadfighter_rooms:
@@ -147,20 +147,24 @@ def register_roadfighter_events(socketio):
             'results': data.get('results')
         }, room=room_code)
 
-    @socketio.on('leave_room')
+    @router.on('leave_room', 'roadfighter')
+    @roadfighter_rooms.synchronized
     def handle_leave_room(data):
-        if data.get('game_type') != 'roadfighter':
-            return
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
         if room_code not in roadfighter_rooms:
             return
         room = roadfighter_rooms[room_code]
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
-        leave_room(room_code)
+        leave_game_room('roadfighter', room_code)
         if len(room['players']) == 0:
             del roadfighter_rooms[room_code]
         else:
             socketio.emit('player_left', {'players': room['players']}, room=room_code)
 
+    @connections.on_disconnect('roadfighter')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
     print('✅ Road Fighter socket events registered')
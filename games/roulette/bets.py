@@ -0,0 +1,130 @@
+"""Every roulette bet as a row of one precomputed win table.
+
+A bet is a set of numbers on a single-zero wheel and pays 36 / len(numbers)
+times the stake back (stake included) when the ball lands in the set. The
+outside bets keep their original names ('red', 'first12', ...). Inside bets
+are named by kind and the numbers they cover, lowest first:
+
+    straight-17                    split-17-20, split-0-2
+    street-16-17-18, street-0-1-2  corner-17-18-20-21, corner-0-1-2-3
+    sixline-16-17-18-19-20-21      column1, column2, column3
+
+``PAYOUT_TABLE[number, index]`` is what bet ``index`` pays per chip when
+``number`` comes up (0 if it loses) and ``BET_MASKS[index]`` is the same
+bet as a 37-bit mask. Settling a spin is one row lookup: stakes aggregated
+per bet type times ``PAYOUT_TABLE[result]``.
+"""
+
+import numpy as np
+
+RED_NUMBERS = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+POCKETS = 37
+
+
+def number_color(n):
+    if n == 0:
+        return 'green'
+    return 'red' if n in RED_NUMBERS else 'black'
+
+
+def _outside_bets():
+    numbers = range(1, POCKETS)
+    return [
+        ('red', [n for n in numbers if n in RED_NUMBERS]),
+        ('black', [n for n in numbers if n not in RED_NUMBERS]),
+        ('zero', [0]),
+        ('even', [n for n in numbers if n % 2 == 0]),
+        ('odd', [n for n in numbers if n % 2 == 1]),
+        ('low', list(range(1, 19))),
+        ('high', list(range(19, 37))),
+        ('first12', list(range(1, 13))),
+        ('second12', list(range(13, 25))),
+        ('third12', list(range(25, 37))),
+        ('column1', list(range(1, 37, 3))),
+        ('column2', list(range(2, 37, 3))),
+        ('column3', list(range(3, 37, 3))),
+    ]
+
+
+def _inside_bets():
+    """Inside bets on the 12-row layout; row r holds 3r+1, 3r+2, 3r+3"""
+    bets = [[n] for n in range(1, POCKETS)]
+    # Splits: side by side, one above the other, and with zero
+    bets += [[n, n + 1] for n in range(1, 37) if n % 3]
+    bets += [[n, n + 3] for n in range(1, 34)]
+    bets += [[0, n] for n in (1, 2, 3)]
+    # Streets, plus the two trios with zero
+    bets += [[n, n + 1, n + 2] for n in range(1, 37, 3)]
+    bets += [[0, 1, 2], [0, 2, 3]]
+    # Corners, plus the first four
+    bets += [[n, n + 1, n + 3, n + 4] for n in range(1, 33) if n % 3]
+    bets += [[0, 1, 2, 3]]
+    bets += [list(range(n, n + 6)) for n in range(1, 32, 3)]
+    kinds = {1: 'straight', 2: 'split', 3: 'street', 4: 'corner', 6: 'sixline'}
+    return [(f"{kinds[len(numbers)]}-{'-'.join(map(str, numbers))}", numbers)
+            for numbers in bets]
+
+
+BETS = _outside_bets() + _inside_bets()
+BET_TYPES = [name for name, _ in BETS]
+BET_COUNT = len(BETS)
+BET_INDEX = {name: index for index, name in enumerate(BET_TYPES)}
+BET_INDEX['straight-0'] = BET_INDEX['zero']
+
+BET_MASKS = [sum(1 << n for n in numbers) for _, numbers in BETS]
+PAYOUTS = {name: 36 // len(numbers) for name, numbers in BETS}
+
+
+def _payout_table():
+    table = np.zeros((POCKETS, BET_COUNT), dtype=np.int64)
+    for index, (_, numbers) in enumerate(BETS):
+        table[numbers, index] = 36 // len(numbers)
+    table.flags.writeable = False
+    return table
+
+
+PAYOUT_TABLE = _payout_table()
+# Per pocket, the bets that win on it (7 to 17 of the 157)
+WINNING_BETS = [np.flatnonzero(PAYOUT_TABLE[number]) for number in range(POCKETS)]
+
+
+def bet_index(bet_type):
+    """Index of a bet name, or None. Inside bets may list numbers in any order."""
+    if not isinstance(bet_type, str):
+        return None
+    index = BET_INDEX.get(bet_type)
+    if index is None and '-' in bet_type:
+        kind, *numbers = bet_type.split('-')
+        try:
+            numbers = sorted(int(n) for n in numbers)
+        except ValueError:
+            return None
+        index = BET_INDEX.get(f"{kind}-{'-'.join(map(str, numbers))}")
+    return index
+
+
+def bet_wins(bet_type, number, color=None):
+    # ``color`` is accepted for older callers; it follows from ``number``
+    index = bet_index(bet_type)
+    return index is not None and bool(BET_MASKS[index] >> number & 1)
+
+
+def settle(result, stakes):
+    """Chips paid back per row of ``stakes``, an (n, BET_COUNT) array of
+    chips on each bet type (or one such row). Only the winning columns
+    are read."""
+    winners = WINNING_BETS[result]
+    return stakes[..., winners] @ PAYOUT_TABLE[result, winners]
+
+
+def new_stakes():
+    """Chips on each bet type for one player, all zero"""
+    return np.zeros(BET_COUNT, dtype=np.int64)
+
+
+def aggregate(bets):
+    """One row of stakes from a list of {'type', 'amount'} bets"""
+    stakes = new_stakes()
+    for bet in bets:
+        stakes[bet_index(bet['type'])] += bet['amount']
+    return stakes
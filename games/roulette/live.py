@@ -0,0 +1,137 @@
+"""The live wheel: one server-driven roulette table for everyone.
+
+Unlike host-driven rooms, the live wheel runs on a fixed cycle: bets are
+open for a set time, then the ball spins, the round settles and betting
+reopens. Anyone can join or leave at any time. Each player's bets are one
+row of stakes by bet type, and ``totals`` keeps the sum over everyone, so a
+bet is O(1) however big the audience is. Settling stacks the rows of players
+who bet and settles them all with one payout-table lookup.
+
+The table lives in this process, guarded by ``lock``. It is only run on
+single-process servers; see ``live_events``.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from .bets import BET_TYPES, bet_index, new_stakes, number_color, settle
+
+STARTING_CHIPS = 1000
+HISTORY = 20
+
+
+class LiveWheel:
+    """Players, stakes and phase of the shared wheel.
+
+    ``phase`` goes 'idle' -> 'betting' -> 'spinning' -> 'betting' ...
+    and back to 'idle' when a round opens with nobody at the table.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.players = {}  # sid -> {'name', 'chips', 'stakes'}
+        self.bettors = set()
+        self.totals = new_stakes()
+        self.totals_changed = False
+        self.phase = 'idle'
+        self.round = 0
+        self.deadline = None
+        self.result = None
+        self.history = deque(maxlen=HISTORY)
+
+    def join(self, sid, name):
+        """Seat a player; returns False if they are already here"""
+        if sid in self.players:
+            return False
+        self.players[sid] = {'name': name, 'chips': STARTING_CHIPS, 'stakes': new_stakes()}
+        return True
+
+    def leave(self, sid):
+        """Drop a player; stakes they leave on the table are forfeit"""
+        player = self.players.pop(sid, None)
+        if player is not None and sid in self.bettors:
+            self.bettors.discard(sid)
+            self.totals -= player['stakes']
+            self.totals_changed = True
+
+    def place_bet(self, sid, bet_type, amount):
+        """Stake ``amount`` on ``bet_type``; returns (bet type, total on it, chips)"""
+        if self.phase != 'betting':
+            raise ValueError('Betting is closed')
+        player = self.players.get(sid)
+        if player is None:
+            raise ValueError('Join the live wheel first')
+        if amount <= 0 or amount > player['chips']:
+            raise ValueError('Invalid bet amount')
+        index = bet_index(bet_type)
+        if index is None:
+            raise ValueError('Invalid bet type')
+
+        player['chips'] -= amount
+        player['stakes'][index] += amount
+        self.totals[index] += amount
+        self.totals_changed = True
+        self.bettors.add(sid)
+        return BET_TYPES[index], int(player['stakes'][index]), player['chips']
+
+    def open_betting(self, seconds, now=None):
+        """Start the next round; returns False (and idles) with nobody here"""
+        if not self.players:
+            self.phase = 'idle'
+            self.deadline = None
+            return False
+        self.phase = 'betting'
+        self.round += 1
+        self.deadline = (time.time() if now is None else now) + seconds
+        return True
+
+    def spin(self, seconds, rng=random, now=None):
+        """Close betting and pick the result, which ``settle`` pays out"""
+        self.phase = 'spinning'
+        self.result = rng.randrange(37)
+        self.deadline = (time.time() if now is None else now) + seconds
+        return self.result
+
+    def settle(self):
+        """Pay the round's bets; returns {sid: (chips staked, chips won)}"""
+        bettors = [sid for sid in self.bettors if sid in self.players]
+        payouts = {}
+        if bettors:
+            stakes = np.stack([self.players[sid]['stakes'] for sid in bettors])
+            staked = stakes.sum(axis=1).tolist()
+            for sid, bet, won in zip(bettors, staked, settle(self.result, stakes).tolist()):
+                player = self.players[sid]
+                player['chips'] += won
+                player['stakes'][:] = 0
+                payouts[sid] = (bet, won)
+        self.bettors.clear()
+        self.totals[:] = 0
+        self.totals_changed = False
+        self.history.appendleft(self.result)
+        return payouts
+
+    def totals_snapshot(self):
+        """Chips on every bet type with any, and marks the totals as sent"""
+        self.totals_changed = False
+        return {BET_TYPES[i]: int(self.totals[i]) for i in np.flatnonzero(self.totals)}
+
+    def state(self, sid=None):
+        """Table state for a client joining mid-round"""
+        state = {
+            'phase': self.phase,
+            'round': self.round,
+            'deadline': self.deadline,
+            'players': len(self.players),
+            'history': [{'result': n, 'color': number_color(n)} for n in self.history],
+            'totals': {BET_TYPES[i]: int(self.totals[i]) for i in np.flatnonzero(self.totals)},
+        }
+        player = self.players.get(sid)
+        if player is not None:
+            state['chips'] = player['chips']
+            state['stakes'] = {BET_TYPES[i]: int(player['stakes'][i])
+                               for i in np.flatnonzero(player['stakes'])}
+        return state
@@ -0,0 +1,160 @@
+"""Socket events for the live wheel.
+
+The cycle runs on the shared timer wheel: a round opens for bets,
+``close_betting`` spins after ``BETTING_SECONDS`` and ``finish_spin``
+settles ``SPIN_SECONDS`` later and opens the next round. It starts when
+the first player joins and idles once a round would open with nobody
+there.
+
+Broadcasts are tiered so their cost follows the number of rounds, not
+the number of bets:
+
+* a bet is acknowledged to the bettor only (``live_bet_placed``);
+* the table's bet totals go to everyone at most once per
+  ``TOTALS_INTERVAL`` while betting is open, and only if they changed;
+* phase changes and the result are one room broadcast each;
+* only players with chips on the round get a private ``live_wheel_settlement``.
+
+The wheel, its players and its clock live in this process. When a
+Socket.IO message queue joins several processes, each would run its own
+wheel into the same ``LIVE_ROOM``, so the live wheel is switched off there
+and joining it is refused.
+"""
+
+import logging
+import random
+
+from flask import request
+from flask_socketio import emit
+
+from utils.broadcast import emit_personalized
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.timer_wheel import timer_wheel
+from .bets import number_color
+from .live import LiveWheel
+
+logger = logging.getLogger(__name__)
+
+LIVE_ROOM = 'roulette:live'
+BETTING_SECONDS = 20
+SPIN_SECONDS = 6
+# Seconds between bet total broadcasts
+TOTALS_INTERVAL = 0.5
+
+live_wheel = LiveWheel()
+
+
+def multi_process(socketio):
+    """Whether a message queue shares this server's rooms with other processes"""
+    return bool(socketio.server_options.get('message_queue'))
+
+
+def register_live_wheel_events(socketio):
+    """Register the live wheel's events"""
+
+    if multi_process(socketio):
+        logger.warning("Live wheel disabled: it cannot run across processes")
+
+        @socketio.on('join_live_wheel')
+        def handle_join_unavailable(data=None):
+            emit('roulette_error', {'message': 'The live wheel is not available on this server'})
+        return
+
+    def phase_payload():
+        return {'phase': live_wheel.phase, 'round': live_wheel.round,
+                'deadline': live_wheel.deadline, 'players': len(live_wheel.players)}
+
+    def start_round():
+        """Open betting (lock held); returns the announcement, or None if idle"""
+        if not live_wheel.open_betting(BETTING_SECONDS):
+            logger.info("Live wheel idle")
+            return None
+        return phase_payload()
+
+    def announce_round(payload):
+        socketio.emit('live_wheel_phase', payload, room=LIVE_ROOM)
+        timer_wheel.schedule(BETTING_SECONDS, close_betting)
+        timer_wheel.schedule(TOTALS_INTERVAL, push_totals, payload['round'])
+
+    def push_totals(round_number):
+        """Sampled bet totals, at most one broadcast per interval"""
+        with live_wheel.lock:
+            if live_wheel.round != round_number or live_wheel.phase != 'betting':
+                return
+            totals = live_wheel.totals_snapshot() if live_wheel.totals_changed else None
+        if totals is not None:
+            socketio.emit('live_wheel_totals', {'round': round_number, 'totals': totals},
+                          room=LIVE_ROOM)
+        timer_wheel.schedule(TOTALS_INTERVAL, push_totals, round_number)
+
+    def close_betting():
+        with live_wheel.lock:
+            if live_wheel.phase != 'betting':
+                return
+            live_wheel.spin(SPIN_SECONDS, random)
+            payload = phase_payload()
+            payload['totals'] = live_wheel.totals_snapshot()
+        socketio.emit('live_wheel_phase', payload, room=LIVE_ROOM)
+        timer_wheel.schedule(SPIN_SECONDS, finish_spin)
+
+    def finish_spin():
+        with live_wheel.lock:
+            if live_wheel.phase != 'spinning':
+                return
+            result = live_wheel.result
+            payouts = live_wheel.settle()
+            chips = {sid: live_wheel.players[sid]['chips'] for sid in payouts}
+            round_number = live_wheel.round
+            next_round = start_round()
+        shared = {'round': round_number, 'result': result, 'color': number_color(result)}
+        socketio.emit('live_wheel_result', shared, room=LIVE_ROOM)
+        emit_personalized(socketio, 'live_wheel_settlement', shared, payouts,
+                          lambda sid: {'staked': payouts[sid][0], 'won': payouts[sid][1],
+                                       'chips': chips[sid]})
+        logger.debug("Live wheel round %s: %s, %d bettors", round_number, result, len(payouts))
+        if next_round is not None:
+            announce_round(next_round)
+
+    @socketio.on('join_live_wheel')
+    def handle_join_live_wheel(data):
+        player_name = data.get('player_name', 'Player')
+        with live_wheel.lock:
+            if not live_wheel.join(request.sid, player_name):
+                emit('roulette_error', {'message': 'Already at the live wheel'})
+                return
+            # The first player at an idle table starts the cycle
+            first_round = start_round() if live_wheel.phase == 'idle' else None
+            state = live_wheel.state(request.sid)
+        join_game_room('roulette_live', LIVE_ROOM)
+        emit('live_wheel_joined', state)
+        if first_round is not None:
+            announce_round(first_round)
+
+    @socketio.on('live_bet')
+    def handle_live_bet(data):
+        try:
+            amount = int(data.get('bet_amount', 0))
+        except (TypeError, ValueError):
+            amount = 0
+        with live_wheel.lock:
+            try:
+                bet_type, total, chips = live_wheel.place_bet(
+                    request.sid, data.get('bet_type'), amount)
+            except ValueError as e:
+                emit('roulette_error', {'message': str(e)})
+                return
+            round_number = live_wheel.round
+        emit('live_bet_placed', {'round': round_number, 'bet_type': bet_type,
+                                 'bet_amount': amount, 'bet_total': total,
+                                 'remaining_chips': chips})
+
+    @socketio.on('leave_live_wheel')
+    def handle_leave_live_wheel(data=None):
+        with live_wheel.lock:
+            live_wheel.leave(request.sid)
+        leave_game_room('roulette_live', LIVE_ROOM)
+
+    @connections.on_disconnect('roulette_live')
+    def handle_disconnect(room_code):
+        with live_wheel.lock:
+            live_wheel.leave(request.sid)
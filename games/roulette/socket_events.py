@@ -1,58 +1,21 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
 import random
-import string
+import numpy as np
+from utils.player_manager import Roster, connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+from .bets import BET_TYPES, bet_index, new_stakes, number_color, settle
+from .bets import PAYOUTS, RED_NUMBERS, bet_wins  # noqa: F401
+from .live_events import register_live_wheel_events
 
 # Store active roulette rooms
-roulette_rooms = {}
-
-RED_NUMBERS = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
-
-PAYOUTS = {
-    'red': 2, 'black': 2, 'zero': 36,
-    'even': 2, 'odd': 2,
-    'low': 2, 'high': 2,
-    'first12': 3, 'second12': 3, 'third12': 3,
-}
+roulette_rooms = RoomStore('roulette')
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in roulette_rooms:
-            return code
-
-
-def number_color(n):
-    if n == 0:
-        return 'green'
-    return 'red' if n in RED_NUMBERS else 'black'
-
-
-def bet_wins(bet_type, number, color):
-    """Return True if the bet wins for this wheel result."""
-    if bet_type == 'red':
-        return color == 'red'
-    if bet_type == 'black':
-        return color == 'black'
-    if bet_type == 'zero':
-        return number == 0
-    if bet_type == 'even':
-        return number != 0 and number % 2 == 0
-    if bet_type == 'odd':
-        return number != 0 and number % 2 == 1
-    if bet_type == 'low':
-        return 1 <= number <= 18
-    if bet_type == 'high':
-        return 19 <= number <= 36
-    if bet_type == 'first12':
-        return 1 <= number <= 12
-    if bet_type == 'second12':
-        return 13 <= number <= 24
-    if bet_type == 'third12':
-        return 25 <= number <= 36
-    return False
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('roulette')
 
 
 def register_roulette_events(socketio):
@@ -67,18 +30,18 @@ def register_roulette_events(socketio):
         roulette_rooms[room_code] = {
             'code': room_code,
             'host': player_id,
-            'players': [{
+            'players': Roster([{
                 'id': player_id,
                 'name': player_name,
                 'chips': 1000,
                 'is_host': True
-            }],
+            }]),
             'status': 'betting',
             'current_bets': {},
             'last_result': None
         }
 
-        join_room(room_code)
+        join_game_room('roulette', room_code)
 
         emit('roulette_room_created', {
             'room_code': room_code,
@@ -87,6 +50,7 @@ def register_roulette_events(socketio):
         })
 
     @socketio.on('join_roulette_room')
+    @roulette_rooms.synchronized
     def handle_join_room(data):
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
@@ -98,7 +62,7 @@ def register_roulette_events(socketio):
 
         room = roulette_rooms[room_code]
 
-        if any(p['id'] == player_id for p in room['players']):
+        if room['players'].seat(player_id) is not None:
             emit('roulette_error', {'message': 'Already in this room'})
             return
 
@@ -109,7 +73,7 @@ def register_roulette_events(socketio):
             'is_host': False
         })
 
-        join_room(room_code)
+        join_game_room('roulette', room_code)
 
         emit('roulette_room_joined', {
             'room_code': room_code,
@@ -136,6 +100,7 @@ def register_roulette_events(socketio):
         emit('roulette_rooms_list', {'rooms': rooms_list})
 
     @socketio.on('place_bet')
+    @roulette_rooms.synchronized
     def handle_place_bet(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -152,7 +117,7 @@ def register_roulette_events(socketio):
             return
 
         # Find player and validate chips
-        player = next((p for p in room['players'] if p['id'] == player_id), None)
+        player = room['players'].get(player_id)
         if not player:
             return
 
@@ -160,30 +125,32 @@ def register_roulette_events(socketio):
             emit('roulette_error', {'message': 'Invalid bet amount'})
             return
 
-        if bet_type not in PAYOUTS:
+        index = bet_index(bet_type)
+        if index is None:
             emit('roulette_error', {'message': 'Invalid bet type'})
             return
+        bet_type = BET_TYPES[index]
 
         # Deduct chips immediately
         player['chips'] -= bet_amount
 
-        if player_id not in room['current_bets']:
-            room['current_bets'][player_id] = []
-
-        room['current_bets'][player_id].append({
-            'type': bet_type,
-            'amount': bet_amount
-        })
+        # One fixed-size row of stakes per player, however many chips they click
+        stakes = room['current_bets'].get(player_id)
+        if stakes is None:
+            stakes = room['current_bets'][player_id] = new_stakes()
+        stakes[index] += bet_amount
 
+        # Only what changed: this player's stake on this bet and their chips
         emit('bet_placed', {
             'player_id': player_id,
             'bet_type': bet_type,
             'bet_amount': bet_amount,
-            'remaining_chips': player['chips'],
-            'players': room['players']
+            'bet_total': int(stakes[index]),
+            'remaining_chips': player['chips']
         }, room=room_code, include_self=True)
 
     @socketio.on('spin_wheel')
+    @roulette_rooms.synchronized
     def handle_spin_wheel(data):
         room_code = data.get('room_code', '').upper()
 
@@ -206,16 +173,16 @@ def register_roulette_events(socketio):
         room['last_result'] = result
         room['status'] = 'spinning'
 
-        # Resolve bets for every player
+        # Resolve every player's bets with one lookup into the payout table
+        bettors = list(room['current_bets'])
+        winnings = {}
+        if bettors:
+            stakes = np.stack([room['current_bets'][pid] for pid in bettors])
+            winnings = dict(zip(bettors, settle(result, stakes).tolist()))
         player_results = {}
         for player in room['players']:
             pid = player['id']
-            bets = room['current_bets'].get(pid, [])
-            total_won = sum(
-                bet['amount'] * PAYOUTS[bet['type']]
-                for bet in bets
-                if bet_wins(bet['type'], result, color)
-            )
+            total_won = winnings.get(pid, 0)
             player['chips'] += total_won
             player_results[pid] = {
                 'won': total_won,
@@ -234,6 +201,7 @@ def register_roulette_events(socketio):
         }, room=room_code, include_self=True)
 
     @socketio.on('leave_roulette_room')
+    @roulette_rooms.synchronized
     def handle_leave_room(data):
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
@@ -241,9 +209,10 @@ def register_roulette_events(socketio):
         if room_code not in roulette_rooms:
             return
 
-        leave_room(room_code)
+        leave_game_room('roulette', room_code)
         room = roulette_rooms[room_code]
-        room['players'] = [p for p in room['players'] if p['id'] != player_id]
+        room['players'].discard(player_id)
+        room['current_bets'].pop(player_id, None)
 
         # Reassign host if the host left
         if room['players'] and player_id == room['host']:
@@ -255,4 +224,11 @@ def register_roulette_events(socketio):
         else:
             emit('roulette_player_left', {'players': room['players']}, room=room_code)
 
+    @connections.on_disconnect('roulette')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
+    register_live_wheel_events(socketio)
+
     print("✅ Roulette socket events registered")
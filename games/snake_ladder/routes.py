@@ -17,6 +17,7 @@ def index():
 @snake_ladder_bp.route('/create', methods=['POST'])
 def create_game():
     """Create a new game room"""
+    # Nothing is stored for this code, so it isn't reserved with the allocator
     room_code = str(uuid.uuid4())[:6].upper()
     player_id = str(uuid.uuid4())
     # Store game state in database or session
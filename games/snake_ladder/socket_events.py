@@ -1,32 +1,19 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
-import random
-import string
-import threading
+import logging
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
-# Store active rooms
-snake_rooms = {}
+logger = logging.getLogger(__name__)
+
+# Store active rooms (finished games are reaped 30 seconds after the last move)
+snake_rooms = RoomStore('snake_ladder', ttls={'finished': 30})
 
 
 def generate_room_code():
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(
-            random.choices(
-                string.ascii_uppercase +
-                string.digits,
-                k=6))
-        if code not in snake_rooms:
-            return code
-
-
-def cleanup_room(socketio_instance, room_code):
-    """Clean up room after delay"""
-    import time
-    time.sleep(30)
-    if room_code in snake_rooms:
-        del snake_rooms[room_code]
-        print(f"🗑️ Room {room_code} cleaned up")
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('snake_ladder')
 
 
 def register_snake_events(socketio):
@@ -35,8 +22,6 @@ def register_snake_events(socketio):
     @socketio.on('create_snake_room')
     def handle_create_room(data):
         """Create a new game room"""
-        print(f"🎮 Creating Snake room...")
-
         room_code = generate_room_code()
         player_name = data.get('player_name', 'Player')
         player_id = request.sid
@@ -58,10 +43,9 @@ def register_snake_events(socketio):
         }
 
         # Join socket room
-        join_room(room_code)
+        join_game_room('snake_ladder', room_code)
 
-        print(f"✅ Room created: {room_code} by {player_name}")
-        print(f"📊 Room state: {snake_rooms[room_code]}")
+        logger.info("Snake room %s created by %s", room_code, player_name)
 
         emit('snake_room_created', {
             'room_code': room_code,
@@ -70,19 +54,16 @@ def register_snake_events(socketio):
         })
 
     @socketio.on('join_snake_room')
+    @snake_rooms.synchronized
     def handle_join_room(data):
         """Join an existing game room"""
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Player')
         player_id = request.sid
 
-        print(
-            f"🎮 {player_name} (ID: {player_id}) trying to join room {room_code}...")
-        print(f"📋 Available rooms: {list(snake_rooms.keys())}")
 
         # Validate room exists
         if room_code not in snake_rooms:
-            print(f"❌ Room {room_code} not found!")
             emit('snake_error', {'message': f'Room {room_code} not found!'})
             return
 
@@ -90,7 +71,6 @@ def register_snake_events(socketio):
 
         # Check if player already in room
         if any(p['id'] == player_id for p in room['players']):
-            print(f"⚠️ Player already in room {room_code}")
             emit('snake_room_joined', {
                 'room_code': room_code,
                 'player_id': player_id,
@@ -100,13 +80,11 @@ def register_snake_events(socketio):
 
         # Check if room is full
         if len(room['players']) >= room['max_players']:
-            print(f"❌ Room {room_code} is full!")
             emit('snake_error', {'message': 'Room is full!'})
             return
 
         # Check if game already started
         if room['game_started']:
-            print(f"❌ Game already started in room {room_code}")
             emit('snake_error', {'message': 'Game already in progress!'})
             return
 
@@ -119,11 +97,10 @@ def register_snake_events(socketio):
         })
 
         # Join socket room
-        join_room(room_code)
+        join_game_room('snake_ladder', room_code)
 
-        print(f"✅ {player_name} joined room {room_code}")
-        print(
-            f"📊 Room now has {len(room['players'])} players: {[p['name'] for p in room['players']]}")
+        logger.info("%s joined Snake room %s (%d players)",
+                    player_name, room_code, len(room['players']))
 
         # Notify the joining player
         emit('snake_room_joined', {
@@ -140,10 +117,9 @@ def register_snake_events(socketio):
             'player_count': len(room['players'])
         }, room=room_code, include_self=True)
 
-        print(
-            f"📤 Broadcasted player join to all {len(room['players'])} players in room {room_code}")
 
     @socketio.on('leave_snake_room')
+    @snake_rooms.synchronized
     def handle_leave_room(data):
         """Leave a game room"""
         room_code = data.get('room_code', '').upper()
@@ -164,23 +140,21 @@ def register_snake_events(socketio):
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
 
         # Leave socket room
-        leave_room(room_code)
+        leave_game_room('snake_ladder', room_code)
 
-        print(f"👋 {player_name} left room {room_code}")
+        logger.info("%s left Snake room %s", player_name, room_code)
 
         # If room is empty, delete it
         if len(room['players']) == 0:
             del snake_rooms[room_code]
-            print(f"🗑️ Empty room {room_code} deleted")
+            logger.info("Snake room %s deleted (empty)", room_code)
             return
 
         # If host left, assign new host
         if room['host'] == player_id and len(room['players']) > 0:
             room['host'] = room['players'][0]['id']
             room['players'][0]['is_host'] = True
-            print(
-                f"👑 New host assigned in room {room_code}: {
-                    room['players'][0]['name']}")
+            logger.debug("Snake room %s: new host %s", room_code, room['players'][0]['name'])
 
         # Notify remaining players
         emit('snake_player_left', {
@@ -188,10 +162,14 @@ def register_snake_events(socketio):
             'players': room['players']
         }, room=room_code)
 
+    @connections.on_disconnect('snake_ladder')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
     @socketio.on('get_snake_rooms')
     def handle_get_rooms():
         """Get list of available rooms"""
-        print(f"📋 Getting rooms list... Total rooms: {len(snake_rooms)}")
 
         rooms_list = [{
             'code': room['code'],
@@ -200,20 +178,17 @@ def register_snake_events(socketio):
             'status': room['status']
         } for room in snake_rooms.values() if not room['game_started']]
 
-        print(f"📋 Sending {len(rooms_list)} available rooms")
         emit('snake_rooms_list', {'rooms': rooms_list})
 
     @socketio.on('start_snake_game')
+    @snake_rooms.synchronized
     def handle_start_game(data):
         """Start the game"""
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
 
-        print(
-            f"🎮 Start game request for room {room_code} by player {player_id}")
 
         if room_code not in snake_rooms:
-            print(f"❌ Room {room_code} not found!")
             emit('snake_error', {'message': 'Room not found!'})
             return
 
@@ -221,15 +196,11 @@ def register_snake_events(socketio):
 
         # Only host can start
         if room['host'] != player_id:
-            print(
-                f"❌ Player {player_id} is not the host. Host is {
-                    room['host']}")
             emit('snake_error', {'message': 'Only host can start the game!'})
             return
 
         # Need at least 2 players
         if len(room['players']) < 2:
-            print(f"❌ Not enough players. Current: {len(room['players'])}")
             emit(
                 'snake_error', {
                     'message': 'Need at least 2 players to start!'})
@@ -240,9 +211,7 @@ def register_snake_events(socketio):
         room['status'] = 'playing'
         room['current_player'] = 0
 
-        print(
-            f"🎮 Game started in room {room_code} with {len(room['players'])} players")
-        print(f"📊 Players: {[p['name'] for p in room['players']]}")
+        logger.info("Snake room %s started with %d players", room_code, len(room['players']))
 
         # Notify all players
         emit('snake_game_started', {
@@ -251,6 +220,7 @@ def register_snake_events(socketio):
         }, room=room_code, include_self=True)
 
     @socketio.on('snake_roll_dice')
+    @snake_rooms.synchronized
     def handle_roll_dice(data):
         """Handle dice roll"""
         room_code = data.get('room_code', '').upper()
@@ -268,7 +238,7 @@ def register_snake_events(socketio):
             emit('snake_error', {'message': 'Not your turn!'})
             return
 
-        print(f"🎲 {current_player['name']} rolled {roll} in room {room_code}")
+        logger.debug("Room %s: %s rolled %s", room_code, current_player['name'], roll)
 
         # Broadcast dice roll
         emit('snake_dice_rolled', {
@@ -328,13 +298,6 @@ def register_snake_events(socketio):
                 'winner_name': current_player['name'],
                 'final_positions': [(p['name'], p['position']) for p in room['players']]
             }, room=room_code, include_self=True)
-
-            # Clean up room after 30 seconds (in background)
-            cleanup_thread = threading.Thread(
-                target=cleanup_room, args=(
-                    socketio, room_code))
-            cleanup_thread.daemon = True
-            cleanup_thread.start()
             return
 
         # Next turn
@@ -347,20 +310,4 @@ def register_snake_events(socketio):
             'current_player_name': next_player['name']
         }, room=room_code, include_self=True)
 
-    @socketio.on('disconnect')
-    def handle_disconnect():
-        """Handle player disconnect"""
-        player_id = request.sid
-
-        # Find and remove player from any room
-        for room_code, room in list(snake_rooms.items()):
-            player = next(
-                (p for p in room['players'] if p['id'] == player_id), None)
-            if player:
-                print(
-                    f"🔌 Player {
-                        player['name']} disconnected from room {room_code}")
-                handle_leave_room({'room_code': room_code})
-                break
-
-    print("✅ Snake & Ladder socket events registered")
+    logger.debug("Snake & Ladder socket events registered")
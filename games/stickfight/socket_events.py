@@ -1,26 +1,25 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import emit
 from flask import request
-import random
-import string
+from utils.event_router import get_router
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
-stickfight_rooms = {}
+stickfight_rooms = RoomStore('stickfight')
 
 COLORS = ['#00f5ff', '#ff00cc', '#ffcc00', '#00ff88']
 
 
 def generate_room_code():
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in stickfight_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('stickfight')
 
 
 def register_stickfight_events(socketio):
+    router = get_router(socketio)
 
-    @socketio.on('create_room')
+    @router.on('create_room', 'stickfight')
     def handle_create_room(data):
-        if data.get('game_type') != 'stickfight':
-            return
         room_code = generate_room_code()
         player_name = data.get('player_name', 'Fighter 1')
         player_id = request.sid
@@ -38,7 +37,7 @@ def register_stickfight_events(socketio):
             'status': 'waiting',
             'max_players': 4
         }
-        join_room(room_code)
+        join_game_room('stickfight', room_code)
         emit('room_created', {
             'room_code': room_code,
             'player_id': player_id,
@@ -48,10 +47,9 @@ def register_stickfight_events(socketio):
             'is_host': True
         })
 
-    @socketio.on('join_room')
+    @router.on('join_room', 'stickfight')
+    @stickfight_rooms.synchronized
     def handle_join_room(data):
-        if data.get('game_type') != 'stickfight':
-            return
         room_code = data.get('room_code', '').upper().strip()
         player_name = data.get('player_name', 'Fighter')
         player_id = request.sid
@@ -75,7 +73,7 @@ def register_stickfight_events(socketio):
             'index': idx,
             'is_host': False
         })
-        join_room(room_code)
+        join_game_room('stickfight', room_code)
 
         emit('room_joined', {
             'room_code': room_code,
@@ -87,10 +85,9 @@ def register_stickfight_events(socketio):
         }, to=player_id)
         emit('player_joined', {'players': room['players']}, room=room_code, include_self=False)
 
-    @socketio.on('start_game')
+    @router.on('start_game', 'stickfight')
+    @stickfight_rooms.synchronized
     def handle_start_game(data):
-        if data.get('game_type') != 'stickfight':
-            return
         room_code = data.get('room_code', '').upper()
         if room_code not in stickfight_rooms:
             emit('error', {'message': 'Room not found'})
@@ -106,6 +103,7 @@ def register_stickfight_events(socketio):
         socketio.emit('game_started', {'players': room['players']}, room=room_code)
 
     @socketio.on('sf_player_state')
+    @stickfight_rooms.synchronized
     def handle_player_state(data):
         """Relay player position/animation state to everyone else."""
         room_code = data.get('room_code', '').upper()
@@ -124,6 +122,7 @@ def register_stickfight_events(socketio):
         }, room=room_code, include_self=False)
 
     @socketio.on('sf_attack_hit')
+    @stickfight_rooms.synchronized
     def handle_attack_hit(data):
         """Host broadcasts an attack hit (damage dealt to a player)."""
         room_code = data.get('room_code', '').upper()
@@ -140,6 +139,7 @@ def register_stickfight_events(socketio):
         }, room=room_code)
 
     @socketio.on('sf_game_over')
+    @stickfight_rooms.synchronized
     def handle_game_over(data):
         room_code = data.get('room_code', '').upper()
         if room_code not in stickfight_rooms:
@@ -154,20 +154,24 @@ def register_stickfight_events(socketio):
             'scores': data.get('scores')
         }, room=room_code)
 
-    @socketio.on('leave_room')
+    @router.on('leave_room', 'stickfight')
+    @stickfight_rooms.synchronized
     def handle_leave_room(data):
-        if data.get('game_type') != 'stickfight':
-            return
         room_code = data.get('room_code', '').upper()
         player_id = request.sid
         if room_code not in stickfight_rooms:
             return
         room = stickfight_rooms[room_code]
         room['players'] = [p for p in room['players'] if p['id'] != player_id]
-        leave_room(room_code)
+        leave_game_room('stickfight', room_code)
         if len(room['players']) == 0:
             del stickfight_rooms[room_code]
         else:
             socketio.emit('player_left', {'players': room['players']}, room=room_code)
 
+    @connections.on_disconnect('stickfight')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
     print('✅ Stick Fight socket events registered')
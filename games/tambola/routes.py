@@ -5,9 +5,11 @@ from . import tambola_bp
 from .game_logic import generate_ticket, verify_win
 from .models import TambolaGame, WinType
 import uuid
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
 # In-memory game storage shared with socket_events
-active_games = {}
+active_games = RoomStore('tambola')
 
 
 @tambola_bp.route('/')
@@ -22,7 +24,7 @@ def create_game():
     data = request.get_json() or {}
     player_name = data.get('player_name', 'Host')
 
-    game_id = uuid.uuid4().hex[:6].upper()
+    game_id = room_codes.allocate('tambola')
     player_id = uuid.uuid4().hex[:8]
 
     ticket = generate_ticket(ticket_id=uuid.uuid4().hex[:8], player_id=player_id)
@@ -11,6 +11,7 @@ def register_tambola_events(socketio):
     from .routes import active_games
 
     @socketio.on('tambola_join')
+    @active_games.synchronized(key='game_id')
     def handle_join(data):
         game_id = data.get('game_id', '').upper()
         player_id = data.get('player_id')
@@ -34,6 +35,7 @@ def register_tambola_events(socketio):
         }, room=f'tambola_{game_id}', include_self=False)
 
     @socketio.on('tambola_start')
+    @active_games.synchronized(key='game_id')
     def handle_start(data):
         game_id = data.get('game_id', '').upper()
         player_id = data.get('player_id')
@@ -59,6 +61,7 @@ def register_tambola_events(socketio):
         }, room=f'tambola_{game_id}', include_self=True)
 
     @socketio.on('tambola_call_number')
+    @active_games.synchronized(key='game_id')
     def handle_call_number(data):
         game_id = data.get('game_id', '').upper()
         player_id = data.get('player_id')
@@ -98,6 +101,7 @@ def register_tambola_events(socketio):
         }, room=f'tambola_{game_id}', include_self=True)
 
     @socketio.on('tambola_mark_number')
+    @active_games.synchronized(key='game_id')
     def handle_mark_number(data):
         game_id = data.get('game_id', '').upper()
         player_id = data.get('player_id')
@@ -116,6 +120,7 @@ def register_tambola_events(socketio):
             emit('tambola_mark_confirmed', {'number': number})
 
     @socketio.on('tambola_claim_win')
+    @active_games.synchronized(key='game_id')
     def handle_claim_win(data):
         game_id = data.get('game_id', '').upper()
         player_id = data.get('player_id')
@@ -164,6 +169,7 @@ def register_tambola_events(socketio):
             })
 
     @socketio.on('tambola_leave')
+    @active_games.synchronized(key='game_id')
     def handle_leave(data):
         game_id = data.get('game_id', '').upper()
         player_id = data.get('player_id')
@@ -1,13 +1,13 @@
 from flask import Blueprint, render_template, jsonify, request, session
 from .game_logic import TicTacToeGame
-import random
-import string
 import uuid
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
 
 tictactoe_bp = Blueprint('tictactoe', __name__)
 
 # Store active games (in production, use Redis or database)
-active_games = {}
+active_games = RoomStore('tictactoe')
 
 
 @tictactoe_bp.route('/')
@@ -36,11 +36,7 @@ def list_rooms():
 
 @tictactoe_bp.route('/create', methods=['POST'])
 def create_game():
-    room_code = ''.join(
-        random.choices(
-            string.ascii_uppercase +
-            string.digits,
-            k=6))
+    room_code = room_codes.allocate('tictactoe')
     game = TicTacToeGame(room_code)
     active_games[room_code] = game
 
@@ -108,7 +104,8 @@ def make_move(room_code):
     if not player_id:
         return jsonify({'success': False, 'error': 'Player not found'}), 400
 
-    result = game.make_move(player_id, data['position'])
+    with active_games.lock(room_code):
+        result = game.make_move(player_id, data['position'])
     return jsonify(result)
 
 
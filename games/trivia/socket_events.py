@@ -1,18 +1,17 @@
-from flask_socketio import emit, join_room, leave_room
-from flask import session
-import random
-import string
+from flask_socketio import emit
+from flask import request
+from utils.player_manager import connections, join_game_room, leave_game_room
+from utils.room_codes import room_codes
+from utils.room_manager import RoomStore
+from utils.server_mode import run_blocking
 
 # Store active trivia rooms
-trivia_rooms = {}
+trivia_rooms = RoomStore('trivia')
 
 
 def generate_room_code():
-    """Generate a unique 4-letter room code"""
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase, k=4))
-        if code not in trivia_rooms:
-            return code
+    """Reserve a room code no other room in any game is using"""
+    return room_codes.allocate('trivia')
 
 
 def register_trivia_events(socketio):
@@ -33,7 +32,7 @@ def register_trivia_events(socketio):
                     'score': 0,
                     'is_host': True,
                     'ready': False,
-                    'sid': session.sid if hasattr(session, 'sid') else None
+                    'sid': request.sid
                 }
             },
             'status': 'waiting',
@@ -46,7 +45,7 @@ def register_trivia_events(socketio):
             'current_question': 0
         }
 
-        join_room(room_code)
+        join_game_room('trivia', room_code)
 
         emit('room_created', {
             'room_code': room_code,
@@ -56,6 +55,7 @@ def register_trivia_events(socketio):
         print(f"✅ Room {room_code} created by {player_name}")
 
     @socketio.on('join_trivia_room')
+    @trivia_rooms.synchronized
     def handle_join_room(data):
         """Join an existing trivia room"""
         room_code = data.get('room_code', '').upper()
@@ -81,10 +81,10 @@ def register_trivia_events(socketio):
             'score': 0,
             'is_host': False,
             'ready': False,
-            'sid': session.sid if hasattr(session, 'sid') else None
+            'sid': request.sid
         }
 
-        join_room(room_code)
+        join_game_room('trivia', room_code)
 
         # Notify the player who joined
         emit('room_joined', {
@@ -95,11 +95,12 @@ def register_trivia_events(socketio):
         # Notify all other players in the room
         emit('player_joined', {
             'players': list(room['players'].values())
-        }, room=room_code, skip_sid=session.sid if hasattr(session, 'sid') else None)
+        }, room=room_code, skip_sid=request.sid)
 
         print(f"✅ {player_name} joined room {room_code}")
 
     @socketio.on('leave_trivia_room')
+    @trivia_rooms.synchronized
     def handle_leave_room(data):
         """Leave a trivia room"""
         room_code = data.get('room_code', '').upper()
@@ -112,10 +113,7 @@ def register_trivia_events(socketio):
         # Find and remove the player
         player_to_remove = None
         for player_name, player_data in room['players'].items():
-            if player_data.get('sid') == (
-                session.sid if hasattr(
-                    session,
-                    'sid') else None):
+            if player_data.get('sid') == request.sid:
                 player_to_remove = player_name
                 break
 
@@ -129,7 +127,7 @@ def register_trivia_events(socketio):
                 room['players'][new_host]['is_host'] = True
                 room['host'] = new_host
 
-            leave_room(room_code)
+            leave_game_room('trivia', room_code)
 
             # If room is empty, delete it
             if not room['players']:
@@ -143,7 +141,13 @@ def register_trivia_events(socketio):
 
                 print(f"👋 {player_to_remove} left room {room_code}")
 
+    @connections.on_disconnect('trivia')
+    def handle_disconnect(room_code):
+        """Drop a disconnected player from their room"""
+        handle_leave_room({'room_code': room_code})
+
     @socketio.on('start_trivia_game')
+    @trivia_rooms.synchronized
     def handle_start_game(data):
         """Start the trivia game (host only)"""
         room_code = data.get('room_code', '').upper()
@@ -169,7 +173,9 @@ def register_trivia_events(socketio):
         from games.trivia.routes import generate_questions_sync
 
         try:
-            questions = generate_questions_sync(
+            questions = run_blocking(
+                socketio,
+                generate_questions_sync,
                 room['settings']['topic'],
                 room['settings']['difficulty'],
                 room['settings']['question_count']
@@ -194,6 +200,7 @@ def register_trivia_events(socketio):
             room['status'] = 'waiting'
 
     @socketio.on('answer_submitted')
+    @trivia_rooms.synchronized
     def handle_answer(data):
         """Handle player answer submission"""
         room_code = data.get('room_code', '').upper()
@@ -206,10 +213,7 @@ def register_trivia_events(socketio):
 
         # Update player score
         for player_name, player_data in room['players'].items():
-            if player_data.get('sid') == (
-                session.sid if hasattr(
-                    session,
-                    'sid') else None):
+            if player_data.get('sid') == request.sid:
                 room['players'][player_name]['score'] = score
                 break
 
@@ -219,6 +223,7 @@ def register_trivia_events(socketio):
         emit('score_update', {'scores': scores}, room=room_code)
 
     @socketio.on('game_finished')
+    @trivia_rooms.synchronized
     def handle_game_finished(data):
         """Handle game completion"""
         room_code = data.get('room_code', '').upper()
@@ -251,30 +256,3 @@ def register_trivia_events(socketio):
         ]
 
         emit('rooms_list', {'rooms': rooms_list})
-
-    @socketio.on('disconnect')
-    def handle_disconnect():
-        """Handle player disconnect"""
-        # Find and remove player from any room they're in
-        for room_code, room in list(trivia_rooms.items()):
-            for player_name, player_data in list(room['players'].items()):
-                if player_data.get('sid') == (
-                    session.sid if hasattr(
-                        session,
-                        'sid') else None):
-                    was_host = player_data['is_host']
-                    del room['players'][player_name]
-
-                    if was_host and room['players']:
-                        new_host = list(room['players'].keys())[0]
-                        room['players'][new_host]['is_host'] = True
-                        room['host'] = new_host
-
-                    if not room['players']:
-                        del trivia_rooms[room_code]
-                    else:
-                        emit('player_left', {
-                            'players': list(room['players'].values())
-                        }, room=room_code)
-
-                    break
@@ -23,6 +23,7 @@ let gameState = {
 const sections = {
     modeSelection: document.getElementById('mode-selection'),
     joinRoom: document.getElementById('join-room-section'),
+    aiGame: document.getElementById('ai-game-section'),
     waitingRoom: document.getElementById('waiting-room'),
     gameScreen: document.getElementById('game-screen')
 };
@@ -37,6 +38,13 @@ function initializeEventListeners() {
     // Mode selection
     cleanup.addEventListener(document.getElementById('create-room-btn'), 'click', createRoom);
     cleanup.addEventListener(document.getElementById('join-room-btn-start'), 'click', showJoinRoom);
+    cleanup.addEventListener(document.getElementById('ai-game-btn-start'), 'click', () => showSection('aiGame'));
+
+    // Play computer
+    document.querySelectorAll('.ai-difficulty-btn').forEach(btn => {
+        cleanup.addEventListener(btn, 'click', () => startAiGame(btn.dataset.difficulty, btn));
+    });
+    cleanup.addEventListener(document.getElementById('ai-back-to-mode-btn'), 'click', backToMode);
     
     // Join room
     const roomCodeInput = document.getElementById('room-code-input');
@@ -124,7 +132,7 @@ function setupSocketListeners() {
 
     const moveMadeHandler = (data) => {
         console.log('Move made:', data);
-        gameState.board = data.board;
+        gameState.board[data.row][data.column] = data.color;
         gameState.currentTurn = data.current_turn;
         renderBoard();
         updateTurnDisplay();
@@ -134,6 +142,10 @@ function setupSocketListeners() {
     const gameOverHandler = (data) => {
         console.log('Game over:', data);
         gameState.gameOver = true;
+        if (data.move) {
+            gameState.board[data.move.row][data.move.column] = data.move.color;
+            renderBoard();
+        }
         
         if (data.winning_cells) {
             highlightWinningCells(data.winning_cells);
@@ -167,6 +179,13 @@ function createRoom() {
     }, createBtn);
 }
 
+function startAiGame(difficulty, btn) {
+    emitWithLoading(socket, 'start_ai_game', {
+        player_name: getUserName('Player'),
+        difficulty: difficulty
+    }, btn);
+}
+
 function showJoinRoom() {
     showSection('joinRoom');
     document.getElementById('room-code-input').focus();
@@ -186,6 +205,7 @@ function joinRoom() {
     
     const joinBtn = document.getElementById('join-room-submit-btn');
     emitWithLoading(socket, 'join_room', {
+        game_type: 'connect4',
         room_code: roomCode,
         player_name: playerName
     }, joinBtn);
@@ -272,7 +292,7 @@ function showCopyFeedback() {
 
 function startGame() {
     console.log('Starting game...');
-    socket.emit('start_game', { room_code: gameState.roomCode });
+    socket.emit('start_game', { game_type: 'connect4', room_code: gameState.roomCode });
 }
 
 function showGameScreen() {
@@ -401,7 +421,7 @@ function exitToMenu() {
 
 function leaveRoom() {
     if (gameState.roomCode) {
-        socket.emit('leave_room', { room_code: gameState.roomCode });
+        socket.emit('leave_room', { game_type: 'connect4', room_code: gameState.roomCode });
     }
     
     resetGameState();
@@ -443,7 +463,7 @@ window.addEventListener('beforeunload', () => {
     console.log('Cleaning up Connect4 resources...');
     cleanup.cleanup();
     if (gameState.roomCode && socket.connected) {
-        socket.emit('leave_room', { room_code: gameState.roomCode });
+        socket.emit('leave_room', { game_type: 'connect4', room_code: gameState.roomCode });
     }
     socket.disconnect();
 });
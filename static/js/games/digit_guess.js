@@ -174,7 +174,7 @@ window.addEventListener('beforeunload', () => {
     console.log('Digit Guess: Cleaning up resources...');
     cleanup.cleanup();
     if (gameState.roomCode && socket.connected) {
-        socket.emit('leave_room', { room_code: gameState.roomCode });
+        socket.emit('leave_room', { game_type: 'digit_guess', room_code: gameState.roomCode });
     }
     socket.disconnect();
 });
@@ -278,12 +278,14 @@ function startGame() {
     }
     
     socket.emit('start_game', {
+        game_type: 'digit_guess',
         room_code: gameState.roomCode
     });
 }
 
 function leaveRoom() {
     socket.emit('leave_room', {
+        game_type: 'digit_guess',
         room_code: gameState.roomCode
     });
     resetGame();
@@ -414,6 +416,7 @@ function submitGuess() {
 function leaveGame() {
     if (confirm('Are you sure you want to leave the game?')) {
         socket.emit('leave_room', {
+            game_type: 'digit_guess',
             room_code: gameState.roomCode
         });
         resetGame();
@@ -452,6 +455,7 @@ function showGameOver(data) {
 
 function playAgain() {
     socket.emit('leave_room', {
+        game_type: 'digit_guess',
         room_code: gameState.roomCode
     });
     resetGame();
@@ -461,6 +465,7 @@ function playAgain() {
 function exitToMenu() {
     if (!gameState.gameOver) {
         socket.emit('leave_room', {
+            game_type: 'digit_guess',
             room_code: gameState.roomCode
         });
     }
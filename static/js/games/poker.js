@@ -29,7 +29,8 @@ let gameState = {
     players: [],
     phase: 'waiting',
     isHost: false,
-    gameStarted: false
+    gameStarted: false,
+    tournamentId: null
 };
 
 // DOM Elements
@@ -101,7 +102,9 @@ function initializeEventListeners() {
     // Mode selection
     const createRoomBtn = document.getElementById('create-room-btn');
     const joinRoomBtnStart = document.getElementById('join-room-btn-start');
+    const createTournamentBtn = document.getElementById('create-tournament-btn');
     if (createRoomBtn) cleanup.addEventListener(createRoomBtn, 'click', createRoom);
+    if (createTournamentBtn) cleanup.addEventListener(createTournamentBtn, 'click', createTournament);
     if (joinRoomBtnStart) cleanup.addEventListener(joinRoomBtnStart, 'click', () => {
         modeSelection.classList.add('hidden');
         joinRoomSection.classList.remove('hidden');
@@ -110,7 +113,9 @@ function initializeEventListeners() {
     // Join room
     const joinRoomSubmitBtn = document.getElementById('join-room-submit-btn');
     const backToModeBtn = document.getElementById('back-to-mode-btn');
+    const joinTournamentSubmitBtn = document.getElementById('join-tournament-submit-btn');
     if (joinRoomSubmitBtn) cleanup.addEventListener(joinRoomSubmitBtn, 'click', joinRoom);
+    if (joinTournamentSubmitBtn) cleanup.addEventListener(joinTournamentSubmitBtn, 'click', joinTournament);
     if (backToModeBtn) cleanup.addEventListener(backToModeBtn, 'click', () => {
         joinRoomSection.classList.add('hidden');
         modeSelection.classList.remove('hidden');
@@ -215,6 +220,12 @@ function initializeSocketEvents() {
         updatePlayersList(data.players);
         showMessage(`${data.player_name} joined the game!`, 'info');
     });
+
+    cleanup.addSocketListener(socket, 'poker_player_left', (data) => {
+        gameState.players = data.players;
+        updatePlayersList(data.players);
+        showMessage(`${data.player_name} left the game`, 'info');
+    });
     
     cleanup.addSocketListener(socket, 'hand_dealt', (data) => {
         console.log('✅ Hand dealt:', data);
@@ -274,7 +285,54 @@ function initializeSocketEvents() {
             'allin': '🔥'
         };
         
-        showMessage(`${actionEmoji[data.action] || ''} ${data.player} ${data.action}${data.amount ? ' $' + data.amount : ''}`, 'info');
+        const timedOut = data.auto ? ' (out of time)' : '';
+        showMessage(`${actionEmoji[data.action] || ''} ${data.player} ${data.action}${data.amount ? ' $' + data.amount : ''}${timedOut}`, 'info');
+    });
+
+    cleanup.addSocketListener(socket, 'tournament_created', (data) => {
+        gameState.tournamentId = data.tournament_id;
+        gameState.isHost = true;
+
+        document.getElementById('display-room-code').textContent = data.tournament_id;
+        document.getElementById('start-game-btn').classList.remove('hidden');
+
+        updateTournamentLobby(data);
+        modeSelection.classList.add('hidden');
+        waitingRoom.classList.remove('hidden');
+
+        showMessage('Tournament created! Share the code with friends.', 'success');
+    });
+
+    cleanup.addSocketListener(socket, 'tournament_update', (data) => {
+        gameState.tournamentId = data.tournament_id;
+        document.getElementById('display-room-code').textContent = data.tournament_id;
+        updateTournamentLobby(data);
+        if (data.status === 'registering') {
+            joinRoomSection.classList.add('hidden');
+            waitingRoom.classList.remove('hidden');
+        } else {
+            showMessage(`🏆 ${data.remaining} left at ${data.tables} table(s), blinds $${data.small_blind}/$${data.big_blind}`, 'info');
+        }
+    });
+
+    cleanup.addSocketListener(socket, 'tournament_table', (data) => {
+        // Tournament seating: actions now go to this table's room
+        gameState.roomCode = data.room_code;
+        showMessage(`🪑 Seated at table ${data.table + 1}`, 'info');
+    });
+
+    cleanup.addSocketListener(socket, 'tournament_bust', (data) => {
+        showMessage(`💀 ${data.player} finished #${data.place}`, 'info');
+    });
+
+    cleanup.addSocketListener(socket, 'tournament_finished', (data) => {
+        showMessage(`🏆 ${data.winner} wins the tournament!`, 'success');
+    });
+
+    cleanup.addSocketListener(socket, 'turn_clock', (data) => {
+        if (gameState.myPosition === data.current_turn) {
+            showMessage(`🎯 It's your turn! ${data.seconds}s to act`, 'success');
+        }
     });
     
     cleanup.addSocketListener(socket, 'next_turn', (data) => {
@@ -320,9 +378,12 @@ function initializeSocketEvents() {
         gameState.players = data.players;
         
         renderGame();
-        showWinner(data.winner, data.pot, data.hands);
+        showWinner(data.winner, data.pot, data.hands, data.hand_name, data.pots);
         
-        document.getElementById('new-hand-btn').classList.remove('hidden');
+        // Tournament tables deal their next hand themselves
+        if (!gameState.tournamentId) {
+            document.getElementById('new-hand-btn').classList.remove('hidden');
+        }
         disableActionButtons();
     });
     
@@ -333,7 +394,10 @@ function initializeSocketEvents() {
         renderGame();
         showMessage(`🏆 ${data.winner} wins $${data.pot}!`, 'success');
         
-        document.getElementById('new-hand-btn').classList.remove('hidden');
+        // Tournament tables deal their next hand themselves
+        if (!gameState.tournamentId) {
+            document.getElementById('new-hand-btn').classList.remove('hidden');
+        }
         disableActionButtons();
     });
     
@@ -372,6 +436,13 @@ function joinRoom() {
 }
 
 function startGame() {
+    if (gameState.tournamentId) {
+        socket.emit('start_poker_tournament', {
+            tournament_id: gameState.tournamentId
+        });
+        return;
+    }
+
     console.log('Starting poker game...');
     
     socket.emit('start_poker_game', {
@@ -379,6 +450,37 @@ function startGame() {
     });
 }
 
+function createTournament() {
+    socket.emit('create_poker_tournament', {
+        player_name: gameState.playerName,
+        starting_chips: gameState.startingChips
+    });
+}
+
+function joinTournament() {
+    const tournamentId = document.getElementById('room-code-input').value.toUpperCase().trim();
+
+    if (!tournamentId || tournamentId.length !== 6) {
+        showMessage('Please enter a valid 6-character tournament code', 'error');
+        return;
+    }
+
+    socket.emit('join_poker_tournament', {
+        tournament_id: tournamentId,
+        player_name: gameState.playerName
+    });
+}
+
+function updateTournamentLobby(summary) {
+    const list = document.getElementById('waiting-players-list');
+    list.innerHTML = `
+        <div class="player-item">
+            <span class="player-name">🏆 ${summary.name}</span>
+            <span class="player-chips">👥 ${summary.entrants} registered</span>
+        </div>
+    `;
+}
+
 function leaveRoom() {
     if (gameState.roomCode) {
         socket.emit('leave_poker_room', {
@@ -771,7 +873,7 @@ function showMessage(message, type) {
     }, 3000);
 }
 
-function showWinner(winner, pot, hands) {
+function showWinner(winner, pot, hands, handName, pots) {
     const announcement = document.createElement('div');
     announcement.className = 'winner-announcement';
     announcement.style.cssText = `
@@ -792,6 +894,10 @@ function showWinner(winner, pot, hands) {
     announcement.innerHTML = `
         <h2 style="color: #FFD700; font-size: 2.5em; margin-bottom: 20px;">🏆 ${winner} Wins!</h2>
         <p style="font-size: 2em; color: #00ff00;">Won $${pot}</p>
+        ${handName ? `<p style="font-size: 1.3em; color: #FFD700;">${handName}</p>` : ''}
+        ${pots && pots.length > 1 ? pots.map((p, i) => `
+            <p style="color: #ccc;">${i === 0 ? 'Main pot' : 'Side pot ' + i}: $${p.amount} → ${p.winners.join(' & ')}</p>
+        `).join('') : ''}
         <div style="margin-top: 30px; text-align: left;">
             <h3 style="color: #00f5ff; margin-bottom: 15px;">Final Hands:</h3>
             ${Object.entries(hands).map(([name, hand]) => `
@@ -49,6 +49,7 @@ let mpRoomCode = null;
 let mpPlayerId = null;
 let mpIsHost = false;
 let mpChipValue = 10;
+let mpPlayers = [];
 
 function initMultiplayer() {
     mpSocket = io();
@@ -149,7 +150,10 @@ function initMultiplayer() {
         if (data.player_id === mpPlayerId) {
             document.getElementById('mp-my-chips').textContent = '$' + data.remaining_chips;
         }
-        renderMpChipsBar(data.players);
+        // Only the bettor's chips change
+        const bettor = mpPlayers.find(p => p.id === data.player_id);
+        if (bettor) bettor.chips = data.remaining_chips;
+        renderMpChipsBar(mpPlayers);
     });
 
     mpSocket.on('wheel_result', data => {
@@ -175,6 +179,7 @@ function initMultiplayer() {
 }
 
 function renderMpPlayers(players, container) {
+    mpPlayers = players;
     const list = container.id === 'multiplayer-waiting'
         ? document.getElementById('mp-players-list')
         : null;
@@ -189,6 +194,7 @@ function renderMpPlayers(players, container) {
 }
 
 function renderMpChipsBar(players) {
+    mpPlayers = players;
     const bar = document.getElementById('mp-players-chips');
     if (!bar) return;
     bar.innerHTML = '';
@@ -202,11 +208,117 @@ function renderMpChipsBar(players) {
 }
 // ─── End multiplayer ─────────────────────────────────────────────────────────
 
+// ─── Live wheel ──────────────────────────────────────────────────────────────
+// One server-driven table: betting opens, the ball spins, the round settles
+let liveChipValue = 10;
+let liveDeadline = null;
+let liveTimerId = null;
+
+function initLiveWheel() {
+    const table = document.getElementById('live-wheel');
+    const modeSelEl = document.getElementById('mode-selection');
+
+    document.getElementById('live-mode-btn').addEventListener('click', () => {
+        const name = prompt('Your name for the live table:', 'Player') || 'Player';
+        mpSocket.emit('join_live_wheel', { player_name: name.trim() || 'Player' });
+    });
+
+    document.getElementById('live-leave-btn').addEventListener('click', () => {
+        mpSocket.emit('leave_live_wheel');
+        clearInterval(liveTimerId);
+        table.classList.add('hidden');
+        modeSelEl.classList.remove('hidden');
+    });
+
+    document.querySelectorAll('.live-chip').forEach(btn => {
+        btn.addEventListener('click', () => {
+            document.querySelectorAll('.live-chip').forEach(b => b.classList.remove('active'));
+            btn.classList.add('active');
+            liveChipValue = parseInt(btn.dataset.value);
+        });
+    });
+
+    document.querySelectorAll('.live-bet-btn').forEach(btn => {
+        btn.addEventListener('click', () => {
+            mpSocket.emit('live_bet', { bet_type: btn.dataset.type, bet_amount: liveChipValue });
+        });
+    });
+
+    mpSocket.on('live_wheel_joined', data => {
+        modeSelEl.classList.add('hidden');
+        table.classList.remove('hidden');
+        document.getElementById('live-chips').textContent = '$' + data.chips;
+        renderLiveHistory(data.history);
+        renderLiveTotals(data.totals);
+        showLivePhase(data);
+        clearInterval(liveTimerId);
+        liveTimerId = setInterval(() => showLivePhase(), 250);
+    });
+
+    mpSocket.on('live_wheel_phase', data => {
+        if (data.phase === 'betting') renderLiveTotals({});
+        if (data.totals) renderLiveTotals(data.totals);
+        showLivePhase(data);
+    });
+
+    mpSocket.on('live_wheel_totals', data => renderLiveTotals(data.totals));
+
+    mpSocket.on('live_bet_placed', data => {
+        document.getElementById('live-chips').textContent = '$' + data.remaining_chips;
+    });
+
+    mpSocket.on('live_wheel_result', data => {
+        const history = document.getElementById('live-history');
+        const colorEmoji = data.color === 'red' ? '🔴' : data.color === 'green' ? '🟢' : '⚫';
+        history.textContent = `${colorEmoji}${data.result} ` + history.textContent;
+    });
+
+    mpSocket.on('live_wheel_settlement', data => {
+        const banner = document.getElementById('live-result-banner');
+        const net = data.won > 0 ? `won $${data.won}` : `lost $${data.staked}`;
+        banner.textContent = `Number ${data.result} (${data.color.toUpperCase()}): you ${net}`;
+        banner.className = 'result-message ' + (data.won > 0 ? 'result-success' : 'result-error');
+        document.getElementById('live-chips').textContent = '$' + data.chips;
+        setTimeout(() => banner.classList.add('hidden'), 5000);
+    });
+}
+
+function showLivePhase(data) {
+    if (data) {
+        liveDeadline = data.deadline;
+        document.getElementById('live-players').textContent = data.players;
+        document.getElementById('live-phase').dataset.phase = data.phase;
+    }
+    const phaseEl = document.getElementById('live-phase');
+    const seconds = liveDeadline ? Math.max(0, Math.ceil(liveDeadline - Date.now() / 1000)) : 0;
+    const labels = { betting: `Bets close in ${seconds}s`, spinning: 'Spinning…', idle: 'Waiting' };
+    phaseEl.textContent = labels[phaseEl.dataset.phase] || '—';
+    document.querySelectorAll('.live-bet-btn').forEach(btn => {
+        btn.disabled = phaseEl.dataset.phase !== 'betting';
+    });
+}
+
+function renderLiveTotals(totals) {
+    document.querySelectorAll('.live-total').forEach(el => {
+        const total = totals[el.dataset.total];
+        el.textContent = total ? `· $${total}` : '';
+    });
+}
+
+function renderLiveHistory(history) {
+    document.getElementById('live-history').textContent = history.map(h => {
+        const colorEmoji = h.color === 'red' ? '🔴' : h.color === 'green' ? '🟢' : '⚫';
+        return `${colorEmoji}${h.result}`;
+    }).join(' ');
+}
+// ─── End live wheel ──────────────────────────────────────────────────────────
+
 function init() {
     try {
         console.log('🎰 Initializing Roulette Casino...');
 
         initMultiplayer();
+        initLiveWheel();
 
         // Cache DOM elements
         modeSelection = document.getElementById('mode-selection');
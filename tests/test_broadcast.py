@@ -0,0 +1,73 @@
+"""
+Test suite for per-recipient payloads
+"""
+from utils.broadcast import emit_personalized, mark_entry, personalize, personalized_payloads
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, event, payload, to=None):
+        self.sent.append((event, payload, to))
+
+
+class TestHelpers:
+    """Shared state with private overlays"""
+
+    def test_personalize_shares_values(self):
+        shared = {'players': [{'id': 'a'}], 'pot': 10}
+        payload = personalize(shared, {'hand': [1, 2]})
+        assert payload == {'players': [{'id': 'a'}], 'pot': 10, 'hand': [1, 2]}
+        assert payload['players'] is shared['players']
+        assert 'hand' not in shared
+
+    def test_mark_entry_copies_only_one_entry(self):
+        entries = [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]
+        marked = mark_entry(entries, 1, is_me=True)
+        assert marked[1] == {'id': 'b', 'is_me': True}
+        assert marked[0] is entries[0] and marked[2] is entries[2]
+        assert 'is_me' not in entries[1]
+
+    def test_payloads_and_emit(self):
+        socketio = FakeSocketIO()
+        players = [{'id': 'sid1', 'role': 'x'}, {'id': 'sid2', 'role': 'y'}]
+        emit_personalized(socketio, 'started', {'n': 2}, players,
+                          lambda p: {'your_role': p['role']}, sid=lambda p: p['id'])
+        assert socketio.sent == [
+            ('started', {'n': 2, 'your_role': 'x'}, 'sid1'),
+            ('started', {'n': 2, 'your_role': 'y'}, 'sid2'),
+        ]
+        assert dict(personalized_payloads({}, ['a'], lambda r: {'me': r})) == {'a': {'me': 'a'}}
+
+
+class TestMafiaStates:
+    """Per-player Mafia states match the single-player view"""
+
+    def test_player_states_match_get_game_state(self):
+        from games.mafia.game_logic import MafiaGame
+        game = MafiaGame('ROOM01')
+        for i in range(6):
+            game.add_player(f'p{i}', f'Player {i}')
+        game.start_game()
+        states = dict(game.player_states())
+        assert set(states) == set(game.players)
+        for pid, state in states.items():
+            assert state == game.get_game_state(pid)
+            roles = [p for p in state['players'] if 'role' in p]
+            assert [p['id'] for p in roles] == [pid]
+        assert all('role' not in p for p in game.get_game_state()['players'])
+
+
+class TestPokerDeal:
+    """hand_dealt carries one player's private view"""
+
+    def test_each_player_sees_only_their_seat(self):
+        from tests.test_poker import start_hand
+        room, clients = start_hand(['A', 'B', 'C'])
+        for seat, client in enumerate(clients):
+            dealt = [m['args'][0] for m in client.get_received() if m['name'] == 'hand_dealt'][-1]
+            assert dealt['your_position'] == seat
+            assert dealt['player_id'] == room['players'][seat]['id']
+            assert len(dealt['hand']) == 2
+            assert [p['is_me'] for p in dealt['players']] == [i == seat for i in range(3)]
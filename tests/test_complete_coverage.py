@@ -289,11 +289,12 @@ class TestTicTacToe:
 class TestUtils:
     """Tests for utility modules"""
     
-    def test_logging_config(self):
+    def test_logging_config(self, tmp_path):
         """Test logging configuration"""
         from utils.logging_config import setup_logging
         from flask import Flask
         app = Flask(__name__)
+        app.config['LOG_FILE'] = str(tmp_path / 'gamelab.log')
         setup_logging(app)
         assert len(app.logger.handlers) > 0
         
@@ -0,0 +1,147 @@
+"""
+Tests for the Connect4 computer opponent
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from games.connect4.ai import (DIFFICULTIES, EXACT, TranspositionTable, choose_move, search,
+                               threats, worker_pool)
+from games.connect4.bitboard import WIDTH, Board
+
+
+def play(columns):
+    board = Board()
+    for column in columns:
+        board.play(column)
+    return board
+
+
+class TestSearchPieces:
+    """Threats and the transposition table"""
+
+    def test_threats_match_winning_moves(self):
+        board = play([3, 3, 2, 2, 4, 6, 1, 4, 4])
+        mine, mask = board.bits[board.turn], board.mask
+        playable = threats(mine, mask) & (mask + sum(1 << c * 7 for c in range(WIDTH)))
+        for column in range(WIDTH):
+            if board.can_play(column):
+                bit = 1 << board.heights[column]
+                assert bool(playable & bit) == board.is_winning_move(column)
+
+    def test_table_prefers_deeper_entries_within_a_search(self):
+        table = TranspositionTable(size=8)
+        table.new_search()
+        table.put(3, 5, 10, EXACT, 2)
+        table.put(11, 2, 20, EXACT, 4)  # same slot, shallower: kept out
+        assert table.get(3)[2] == 10 and table.get(11) is None
+        table.new_search()
+        table.put(11, 2, 20, EXACT, 4)  # older entries give way
+        assert table.get(11)[2] == 20 and table.get(3) is None
+
+
+class TestSearch:
+    """Move choice"""
+
+    def test_takes_the_win(self):
+        board = play([0, 6, 1, 6, 2, 5])
+        assert search(board, depth=4, ms=500)['column'] == 3
+
+    def test_blocks_the_threat(self):
+        board = play([0, 6, 1, 6, 2])
+        assert search(board, depth=4, ms=500)['column'] == 3
+
+    def test_sees_a_double_threat(self):
+        # Red on 2 and 3 of an empty bottom row: playing 1 or 4 threatens both ends
+        board = play([2, 2, 3, 3])
+        result = search(board, depth=6, ms=2000)
+        assert result['column'] in (1, 4) and result['score'] > 900
+
+    def test_stays_within_the_budget(self):
+        start = time.perf_counter()
+        result = search(Board(), depth=42, ms=100)
+        assert time.perf_counter() - start < 0.5
+        assert result['depth'] >= 1 and Board().can_play(result['column'])
+
+    def test_difficulty_levels_deepen(self):
+        levels = [DIFFICULTIES[name] for name in ('easy', 'medium', 'hard')]
+        assert [level['depth'] for level in levels] == sorted(level['depth'] for level in levels)
+        assert [level['ms'] for level in levels] == sorted(level['ms'] for level in levels)
+
+    def test_runs_in_a_worker_process(self):
+        board = play([3, 3])
+        column = worker_pool(1).submit(choose_move, board, 'easy').result(timeout=60)
+        assert board.can_play(column)
+
+
+class TestAiGame:
+    """Single-player rooms"""
+
+    def test_computer_answers_each_move(self, monkeypatch):
+        from app import create_app
+        from games.connect4 import socket_events
+        pool = ThreadPoolExecutor(1)
+        monkeypatch.setattr(socket_events, 'worker_pool', lambda *args: pool)
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+        client = socketio.test_client(app)
+        client.emit('start_ai_game', {'player_name': 'P', 'difficulty': 'easy'})
+        received = client.get_received()
+        assert [m['name'] for m in received] == ['room_created', 'game_started']
+        code = received[0]['args'][0]['room_code']
+        assert received[0]['args'][0]['players'][1]['is_ai']
+
+        client.emit('make_move', {'room_code': code, 'column': 3})
+        moves = []
+        deadline = time.time() + 10
+        while time.time() < deadline and len(moves) < 2:
+            moves += [m['args'][0] for m in client.get_received() if m['name'] == 'move_made']
+            time.sleep(0.02)
+        assert [m['color'] for m in moves] == ['red', 'yellow']
+        assert moves[1]['current_turn'] == 'red'
+
+        room = socket_events.connect4_rooms[code]
+        assert room['game'].moves == 2 and room['current_turn'] == 'red'
+        client.emit('leave_room', {'game_type': 'connect4', 'room_code': code})
+        assert code not in socket_events.connect4_rooms
+
+    def test_stale_search_is_ignored_after_a_restart(self, monkeypatch):
+        from concurrent.futures import Future
+        from app import create_app
+        from games.connect4 import socket_events
+
+        class ManualPool:
+            def __init__(self):
+                self.futures = []
+
+            def submit(self, *args):
+                self.futures.append(Future())
+                return self.futures[-1]
+
+        pool = ManualPool()
+        monkeypatch.setattr(socket_events, 'worker_pool', lambda *args: pool)
+        app, socketio = create_app('development')
+        client = socketio.test_client(app)
+        client.emit('start_ai_game', {'player_name': 'P', 'difficulty': 'easy'})
+        code = client.get_received()[0]['args'][0]['room_code']
+        room = socket_events.connect4_rooms[code]
+
+        client.emit('make_move', {'room_code': code, 'column': 0})
+        client.emit('start_game', {'game_type': 'connect4', 'room_code': code})
+        assert client.get_received()[-1]['args'][0]['message'] == 'Game already in progress!'
+
+        # The game ends and is restarted while the search is still running
+        room['status'] = 'finished'
+        client.emit('start_game', {'game_type': 'connect4', 'room_code': code})
+        client.emit('make_move', {'room_code': code, 'column': 0})
+        pool.futures[0].set_result(6)
+        time.sleep(0.2)
+        # Same move count as when the old search began, but a new game
+        assert room['game'].moves == 1 and room['current_turn'] == 'yellow'
+        client.emit('leave_room', {'game_type': 'connect4', 'room_code': code})
+
+    def test_rejects_unknown_difficulty(self):
+        from app import create_app
+        app, socketio = create_app('development')
+        client = socketio.test_client(app)
+        client.emit('start_ai_game', {'difficulty': 'impossible'})
+        assert client.get_received()[-1]['args'][0]['message'] == 'Unknown difficulty'
@@ -0,0 +1,147 @@
+"""
+Tests for the bitboard Connect4 engine
+"""
+import random
+
+from games.connect4.bitboard import CELLS, HEIGHT, WIDTH, Board
+
+
+def scan_winner(rows):
+    """Every four-cell window, the way the board used to be checked"""
+    for row in range(HEIGHT):
+        for col in range(WIDTH):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(row + i * d_row, col + i * d_col) for i in range(4)]
+                if all(0 <= r < HEIGHT and 0 <= c < WIDTH for r, c in cells):
+                    colors = {rows[r][c] for r, c in cells}
+                    if len(colors) == 1 and None not in colors:
+                        return colors.pop()
+    return None
+
+
+def random_game(rng):
+    """Play random moves until someone wins or the board fills"""
+    board = Board()
+    moves = []
+    while not board.is_full():
+        column = rng.choice([c for c in range(WIDTH) if board.can_play(c)])
+        player = board.turn
+        board.play(column)
+        moves.append(column)
+        if board.won(player):
+            break
+    return board, moves
+
+
+class TestBitboard:
+    """Drops, undo and rendering"""
+
+    def test_pieces_stack_from_the_bottom(self):
+        board = Board()
+        assert board.play(3) == 5
+        assert board.play(3) == 4
+        rows = board.rows()
+        assert rows[5][3] == 'red' and rows[4][3] == 'yellow'
+        assert board.turn == 0 and board.moves == 2
+
+    def test_full_column(self):
+        board = Board()
+        for _ in range(HEIGHT):
+            assert board.can_play(0)
+            board.play(0)
+        assert not board.can_play(0)
+        assert not board.can_play(-1) and not board.can_play(WIDTH)
+
+    def test_undo_restores_the_position(self):
+        board, moves = random_game(random.Random(3))
+        for column in reversed(moves):
+            board.undo(column)
+        assert board.bits == [0, 0] and board.moves == 0
+        assert board.rows() == Board().rows()
+
+    def test_rows_round_trip(self):
+        board, _ = random_game(random.Random(5))
+        again = Board.from_rows(board.rows())
+        assert again.bits == board.bits and again.heights == board.heights
+        assert again.moves == board.moves
+
+    def test_keys_differ_by_position(self):
+        seen = {}
+        rng = random.Random(11)
+        for _ in range(200):
+            board, moves = random_game(rng)
+            for cut in range(len(moves) + 1):
+                position = Board()
+                for column in moves[:cut]:
+                    position.play(column)
+                rows = str(position.rows())
+                assert seen.setdefault(position.key(), rows) == rows
+
+
+class TestBitboardWins:
+    """Shift-and-mask win detection"""
+
+    def test_no_wrap_between_columns(self):
+        rows = [[None] * WIDTH for _ in range(HEIGHT)]
+        # Three at the top of column 0 and one at the bottom of column 1
+        for row in range(HEIGHT):
+            rows[row][0] = 'red' if row < 3 else 'yellow'
+        rows[5][1] = 'red'
+        board = Board.from_rows(rows)
+        assert scan_winner(rows) is None
+        assert not board.won(0) and not board.won(1)
+
+    def test_matches_window_scan(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            board, _ = random_game(rng)
+            rows = board.rows()
+            expected = scan_winner(rows)
+            winner = [c for p, c in enumerate(('red', 'yellow')) if board.won(p)]
+            assert winner == ([expected] if expected else [])
+            if expected:
+                cells = board.winning_cells(('red', 'yellow').index(expected))
+                assert len(cells) == 4 and {rows[r][c] for r, c in cells} == {expected}
+
+    def test_is_winning_move(self):
+        board = Board()
+        for column in (0, 6, 1, 6, 2):
+            board.play(column)
+        # Yellow to move can't win; red threatens column 3
+        assert not any(board.is_winning_move(c) for c in range(WIDTH))
+        board.play(6)
+        assert board.is_winning_move(3) and not board.is_winning_move(4)
+
+    def test_draw_fills_every_cell(self):
+        rng = random.Random(2)
+        board, _ = random_game(rng)
+        while not board.is_full():
+            board, _ = random_game(rng)
+        assert board.moves == CELLS and not board.won(0) and not board.won(1)
+        assert scan_winner(board.rows()) is None
+
+
+class TestConnect4Moves:
+    """Rooms play on the engine and send only the move"""
+
+    def test_moves_are_deltas_and_win_is_detected(self):
+        from app import create_app
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+        red, yellow = socketio.test_client(app), socketio.test_client(app)
+        red.emit('create_room', {'game_type': 'connect4', 'player_name': 'R'})
+        code = red.get_received()[-1]['args'][0]['room_code']
+        yellow.emit('join_room', {'game_type': 'connect4', 'room_code': code, 'player_name': 'Y'})
+        red.emit('start_game', {'game_type': 'connect4', 'room_code': code})
+        red.get_received()
+
+        for client, column in ((red, 0), (yellow, 1), (red, 0), (yellow, 1), (red, 0), (yellow, 1)):
+            client.emit('make_move', {'room_code': code, 'column': column})
+        moves = [m['args'][0] for m in red.get_received() if m['name'] == 'move_made']
+        assert len(moves) == 6 and 'board' not in moves[0]
+        assert moves[0] == {'row': 5, 'column': 0, 'color': 'red', 'current_turn': 'yellow'}
+
+        red.emit('make_move', {'room_code': code, 'column': 0})
+        over = [m['args'][0] for m in yellow.get_received() if m['name'] == 'game_over'][0]
+        assert over['winner'] == 'red' and over['move'] == {'row': 2, 'column': 0, 'color': 'red'}
+        assert sorted(map(tuple, over['winning_cells'])) == [(2, 0), (3, 0), (4, 0), (5, 0)]
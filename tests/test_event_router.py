@@ -0,0 +1,85 @@
+"""
+Test suite for routing shared Socket.IO event names to games
+"""
+import pytest
+
+from utils.event_router import EventRouter, get_router
+from utils.room_manager import RoomStore
+
+
+class FakeSocketIO:
+    """Records handlers the way SocketIO.on does (last one wins)"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event):
+        def decorator(handler):
+            self.handlers[event] = handler
+            return handler
+        return decorator
+
+
+class TestEventRouter:
+    """Dispatching by game_type and by room code"""
+
+    def test_one_dispatcher_per_event(self):
+        sio = FakeSocketIO()
+        router = EventRouter(sio)
+        calls = []
+        router.on('create_room', 'game_a')(lambda data: calls.append('a'))
+        router.on('create_room', 'game_b')(lambda data: calls.append('b'))
+
+        assert list(sio.handlers) == ['create_room']
+        sio.handlers['create_room']({'game_type': 'game_b'})
+        sio.handlers['create_room']({'game_type': 'game_a'})
+        assert calls == ['b', 'a']
+
+    def test_unknown_game_type_is_ignored(self):
+        sio = FakeSocketIO()
+        router = EventRouter(sio)
+        router.on('start_game', 'game_a')(lambda data: 'handled')
+        assert sio.handlers['start_game']({'game_type': 'nope'}) is None
+        assert sio.handlers['start_game'](None) is None
+
+    def test_falls_back_to_room_owner(self):
+        rooms = RoomStore('router_owner')
+        rooms['ROOM42'] = {'players': []}
+        sio = FakeSocketIO()
+        router = EventRouter(sio)
+        router.on('leave_room', 'router_other')(lambda data: 'other')
+        router.on('leave_room', 'router_owner')(lambda data: 'owner')
+
+        assert sio.handlers['leave_room']({'room_code': 'room42'}) == 'owner'
+        assert sio.handlers['leave_room']({'room_code': 'MISSING'}) is None
+
+    def test_get_router_is_per_socketio(self):
+        sio_a, sio_b = FakeSocketIO(), FakeSocketIO()
+        assert get_router(sio_a) is get_router(sio_a)
+        assert get_router(sio_a) is not get_router(sio_b)
+
+
+class TestSharedEventGames:
+    """The five games sharing generic event names each get their events"""
+
+    @pytest.fixture
+    def socketio(self):
+        sio = FakeSocketIO()
+        from games.connect4.socket_events import register_connect4_events
+        from games.pong.socket_events import register_pong_events
+        from games.stickfight.socket_events import register_stickfight_events
+        from games.roadfighter.socket_events import register_roadfighter_events
+        from games.digit_guess.socket_events import register_digit_guess_events
+        for register in (register_connect4_events, register_pong_events,
+                         register_stickfight_events, register_roadfighter_events,
+                         register_digit_guess_events):
+            register(sio)
+        return sio
+
+    @pytest.mark.parametrize('game_type', ['connect4', 'pong', 'stickfight', 'roadfighter', 'digit_guess'])
+    @pytest.mark.parametrize('event', ['create_room', 'join_room', 'start_game', 'leave_room'])
+    def test_every_game_reachable(self, socketio, event, game_type):
+        router = get_router(socketio)
+        handler = router.handler_for(event, {'game_type': game_type})
+        assert handler is not None
+        assert handler.__module__ == f'games.{game_type}.socket_events'
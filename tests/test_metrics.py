@@ -0,0 +1,168 @@
+"""
+Test suite for per-event Socket.IO metrics
+"""
+import pytest
+
+from utils import metrics
+from utils.metrics import (
+    get_stats, instrument_socketio, payload_size, render_metrics, reset_metrics, track
+)
+
+
+class FakeSocketIO:
+    """Records handlers the way SocketIO.on does"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, namespace=None):
+        def decorator(handler):
+            self.handlers[event] = handler
+            return handler
+        return decorator
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+class TestTrack:
+    """Recording calls, errors, latency and payload size"""
+
+    def test_counts_calls_and_payload(self, monkeypatch):
+        monkeypatch.setattr(metrics, 'PAYLOAD_SAMPLE', 1)
+
+        @track('ping', 'test_game')
+        def handler(data):
+            return data['n']
+
+        assert handler({'n': 1}) == 1
+        handler({'n': 22})
+        stats = get_stats('test_game', 'ping').snapshot()
+        assert stats['calls'] == 2
+        assert stats['errors'] == 0
+        assert stats['payloads'] == [len('{"n":1}'), len('{"n":22}')]
+        assert len(stats['latencies']) == 2
+
+    def test_payload_size_is_sampled(self):
+        @track('ping', 'test_game')
+        def handler(data):
+            pass
+
+        for n in range(2 * metrics.PAYLOAD_SAMPLE + 1):
+            handler({'n': n})
+        stats = get_stats('test_game', 'ping').snapshot()
+        assert stats['calls'] == 2 * metrics.PAYLOAD_SAMPLE + 1
+        assert stats['payload_count'] == 3 and len(stats['payloads']) == 3
+
+    def test_counts_errors_and_reraises(self):
+        @track('boom', 'test_game')
+        def handler(data):
+            raise ValueError('bad')
+
+        with pytest.raises(ValueError):
+            handler({})
+        assert get_stats('test_game', 'boom').errors == 1
+
+    def test_extra_arguments_are_trimmed(self):
+        @track('disconnect', 'test_game')
+        def handler():
+            return 'ok'
+
+        # Flask-SocketIO passes a reason to disconnect handlers
+        assert handler('client disconnect') == 'ok'
+        assert get_stats('test_game', 'disconnect').errors == 0
+
+    def test_game_taken_from_module(self):
+        def handler(data):
+            pass
+        handler.__module__ = 'games.poker.socket_events'
+        track('poker_action')(handler)({})
+        assert get_stats('poker', 'poker_action').calls == 1
+
+    def test_payload_size(self):
+        assert payload_size(()) == 0
+        assert payload_size(('abc', b'12', None)) == 5
+
+
+class TestInstrumentSocketIO:
+    """Every registration through socketio.on is timed"""
+
+    def test_handlers_are_wrapped(self):
+        sio = instrument_socketio(FakeSocketIO())
+        calls = []
+
+        @sio.on('make_move')
+        def handle_make_move(data):
+            calls.append(data)
+
+        sio.handlers['make_move']({'column': 3})
+        assert calls == [{'column': 3}]
+        assert get_stats('tests', 'make_move').calls == 1
+
+    def test_instrumenting_twice_is_a_no_op(self):
+        sio = FakeSocketIO()
+        instrument_socketio(sio)
+        on = sio.on
+        instrument_socketio(sio)
+        assert sio.on is on
+
+    def test_routed_events_labelled_by_game(self):
+        from utils.event_router import EventRouter
+        sio = instrument_socketio(FakeSocketIO())
+        router = EventRouter(sio)
+        router.on('create_room', 'pong')(lambda data: None)
+        router.on('create_room', 'connect4')(lambda data: None)
+
+        sio.handlers['create_room']({'game_type': 'pong'})
+        assert get_stats('pong', 'create_room').calls == 1
+        assert get_stats('connect4', 'create_room').calls == 0
+
+
+class TestRenderMetrics:
+    """Prometheus text exposition"""
+
+    def test_render(self):
+        @track('poker_action', 'poker')
+        def handler(data):
+            pass
+
+        for _ in range(10):
+            handler({'action': 'call'})
+        text = render_metrics()
+
+        assert '# TYPE gamelab_socketio_events_total counter' in text
+        assert 'gamelab_socketio_events_total{game="poker",event="poker_action"} 10' in text
+        assert 'gamelab_socketio_event_errors_total{game="poker",event="poker_action"} 0' in text
+        assert 'gamelab_socketio_event_latency_seconds{game="poker",event="poker_action",quantile="0.99"}' in text
+        assert 'gamelab_socketio_event_payload_bytes_count{game="poker",event="poker_action"} 1' in text
+        assert '# TYPE gamelab_rooms gauge' in text
+        assert '# TYPE gamelab_room_code_occupancy gauge' in text
+
+    def test_label_values_are_escaped(self):
+        track('say "hi"', 'test_game')(lambda data: None)({})
+        assert 'event="say \\"hi\\""' in render_metrics()
+
+    def test_metrics_endpoint(self):
+        from app import create_app
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+
+        client = socketio.test_client(app)
+        client.emit('create_poker_room', {'player_name': 'Alice'})
+        client.disconnect()
+
+        response = app.test_client().get('/metrics')
+        assert response.status_code == 404
+
+        app.config['METRICS_TOKEN'] = 's3cret'
+        response = app.test_client().get('/metrics', headers={'Authorization': 'Bearer wrong'})
+        assert response.status_code == 401
+
+        response = app.test_client().get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert 'gamelab_socketio_events_total{game="poker",event="create_poker_room"} 1' in response.get_data(as_text=True)
@@ -0,0 +1,198 @@
+"""
+Test suite for the sid -> rooms connection registry
+"""
+import json
+import pickle
+
+import pytest
+
+from utils.player_manager import ConnectionRegistry, Roster
+
+
+class TestConnectionRegistry:
+    """Reverse index and disconnect dispatch"""
+
+    def test_add_discard_pop(self):
+        registry = ConnectionRegistry()
+        registry.add('sid1', 'poker', 'ABC')
+        registry.add('sid1', 'connect4', 'XYZ')
+        registry.add('sid2', 'poker', 'ABC')
+        assert registry.rooms_of('sid1') == {('poker', 'ABC'), ('connect4', 'XYZ')}
+
+        registry.discard('sid1', 'connect4', 'XYZ')
+        assert registry.rooms_of('sid1') == {('poker', 'ABC')}
+        assert registry.pop('sid1') == {('poker', 'ABC')}
+        assert registry.rooms_of('sid1') == set()
+        assert len(registry) == 1
+
+    def test_disconnect_runs_only_affected_games(self):
+        registry = ConnectionRegistry()
+        calls = []
+        registry.on_disconnect('poker')(lambda code: calls.append(('poker', code)))
+        registry.on_disconnect('pong')(lambda code: calls.append(('pong', code)))
+        registry.add('sid1', 'poker', 'ABC')
+        registry.add('sid2', 'pong', 'P1')
+
+        registry.disconnect('sid1')
+        assert calls == [('poker', 'ABC')]
+        registry.disconnect('sid1')
+        assert calls == [('poker', 'ABC')]
+
+    def test_failing_cleanup_does_not_stop_others(self):
+        registry = ConnectionRegistry()
+        calls = []
+
+        def broken(code):
+            raise RuntimeError('boom')
+
+        registry.on_disconnect('a_game')(broken)
+        registry.on_disconnect('b_game')(lambda code: calls.append(code))
+        registry.add('sid', 'a_game', 'R1')
+        registry.add('sid', 'b_game', 'R2')
+        registry.disconnect('sid')
+        assert calls == ['R2']
+
+    def test_install_registers_one_handler(self):
+        class FakeSocketIO:
+            def __init__(self):
+                self.events = []
+
+            def on(self, event):
+                self.events.append(event)
+                return lambda handler: handler
+
+        sio = FakeSocketIO()
+        registry = ConnectionRegistry()
+        registry.install(sio)
+        registry.install(sio)
+        assert sio.events == ['disconnect']
+
+
+class TestRoster:
+    """Player list with an id -> seat index"""
+
+    def make(self, *ids):
+        return Roster([{'id': pid, 'name': pid.upper()} for pid in ids])
+
+    def test_lookup(self):
+        roster = self.make('a', 'b', 'c')
+        assert roster.seat('b') == 1
+        assert roster.get('c')['name'] == 'C'
+        assert roster.seat('zz') is None
+        assert roster.get('zz') is None
+
+    def test_append_and_discard_keep_seats(self):
+        roster = self.make('a', 'b', 'c')
+        roster.append({'id': 'd', 'name': 'D'})
+        assert roster.seat('d') == 3
+
+        assert roster.discard('b')['name'] == 'B'
+        assert roster.discard('b') is None
+        assert [roster.seat(pid) for pid in 'acd'] == [0, 1, 2]
+        assert roster.seat('b') is None
+
+    def test_every_mutation_reindexes(self):
+        roster = self.make('a', 'b', 'c')
+        roster.pop(0)
+        roster.insert(0, {'id': 'x'})
+        roster.reverse()
+        del roster[0]
+        roster[0] = {'id': 'y'}
+        roster.extend([{'id': 'z'}])
+        assert [p['id'] for p in roster] == ['y', 'x', 'z']
+        assert {pid: roster.seat(pid) for pid in 'abcxyz'} == {
+            'a': None, 'b': None, 'c': None, 'x': 1, 'y': 0, 'z': 2}
+        roster.clear()
+        assert roster.seat('x') is None
+
+    def test_behaves_as_a_list(self):
+        roster = self.make('a', 'b')
+        assert roster == [{'id': 'a', 'name': 'A'}, {'id': 'b', 'name': 'B'}]
+        assert json.loads(json.dumps(roster)) == list(roster)
+
+    def test_pickle_round_trip(self):
+        roster = pickle.loads(pickle.dumps(self.make('a', 'b'), pickle.HIGHEST_PROTOCOL))
+        assert isinstance(roster, Roster)
+        assert roster.seat('b') == 1
+
+
+@pytest.fixture
+def app_and_socketio():
+    from app import create_app
+    app, socketio = create_app('development')
+    app.config['TESTING'] = True
+    return app, socketio
+
+
+class TestDisconnectCleanup:
+    """Dropped sockets are removed from the rooms they were in"""
+
+    def test_connect4_player_removed(self, app_and_socketio):
+        from games.connect4.socket_events import connect4_rooms
+        app, socketio = app_and_socketio
+        host = socketio.test_client(app)
+        guest = socketio.test_client(app)
+
+        host.emit('create_room', {'game_type': 'connect4', 'player_name': 'Host'})
+        room_code = host.get_received()[-1]['args'][0]['room_code']
+        guest.emit('join_room', {'game_type': 'connect4', 'room_code': room_code, 'player_name': 'Guest'})
+        assert len(connect4_rooms[room_code]['players']) == 2
+
+        guest.disconnect()
+        assert [p['name'] for p in connect4_rooms[room_code]['players']] == ['Host']
+
+        host.disconnect()
+        assert room_code not in connect4_rooms
+
+    def test_trivia_removes_the_right_player(self, app_and_socketio):
+        from games.trivia.socket_events import trivia_rooms
+        app, socketio = app_and_socketio
+        host = socketio.test_client(app)
+        guest = socketio.test_client(app)
+
+        host.emit('create_trivia_room', {'player_name': 'Host'})
+        room_code = host.get_received()[-1]['args'][0]['room_code']
+        guest.emit('join_trivia_room', {'room_code': room_code, 'player_name': 'Guest'})
+
+        guest.disconnect()
+        assert list(trivia_rooms[room_code]['players']) == ['Host']
+        host.disconnect()
+        assert room_code not in trivia_rooms
+
+    def test_poker_player_folded_mid_hand(self, app_and_socketio):
+        from games.poker.socket_events import poker_rooms
+        app, socketio = app_and_socketio
+        clients = [socketio.test_client(app) for _ in range(3)]
+
+        clients[0].emit('create_poker_room', {'player_name': 'A'})
+        room_code = clients[0].get_received()[-1]['args'][0]['room_code']
+        for i, client in enumerate(clients[1:], 1):
+            client.emit('join_poker_room', {'room_code': room_code, 'player_name': 'ABC'[i]})
+        clients[0].emit('start_poker_game', {'room_code': room_code})
+
+        clients[2].disconnect()
+        room = poker_rooms[room_code]
+        assert len(room['players']) == 3
+        assert room['players'][2]['folded']
+
+        for client in clients[:2]:
+            client.disconnect()
+
+    def test_seats_follow_lobby_leave_and_host_change(self, app_and_socketio):
+        from games.poker.socket_events import poker_rooms
+        app, socketio = app_and_socketio
+        clients = [socketio.test_client(app) for _ in range(3)]
+
+        clients[0].emit('create_poker_room', {'player_name': 'A'})
+        room_code = clients[0].get_received()[-1]['args'][0]['room_code']
+        for i, client in enumerate(clients[1:], 1):
+            client.emit('join_poker_room', {'room_code': room_code, 'player_name': 'ABC'[i]})
+
+        clients[0].disconnect()
+        players = poker_rooms[room_code]['players']
+        assert [p['name'] for p in players] == ['B', 'C']
+        assert poker_rooms[room_code]['host'] == players[0]['id']
+        assert [players.seat(p['id']) for p in players] == [0, 1]
+
+        for client in clients[1:]:
+            client.disconnect()
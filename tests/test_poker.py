@@ -369,3 +369,191 @@ class TestPokerEdgeCases:
         active_players = [p for p in players if not p['folded']]
         
         assert len(active_players) == 1
+
+
+def start_hand(names):
+    """Create a room, seat ``names`` and start the game; returns (room, clients)"""
+    from app import create_app
+    from games.poker.socket_events import poker_rooms
+    app, socketio = create_app('development')
+    app.config['TESTING'] = True
+    clients = [socketio.test_client(app) for _ in names]
+    clients[0].emit('create_poker_room', {'player_name': names[0]})
+    room_code = clients[0].get_received()[-1]['args'][0]['room_code']
+    for client, name in zip(clients[1:], names[1:]):
+        client.emit('join_poker_room', {'room_code': room_code, 'player_name': name})
+    clients[0].emit('start_poker_game', {'room_code': room_code})
+    return poker_rooms[room_code], clients
+
+
+def rig(room, hands, board):
+    """Replace the dealt hole cards and the cards still to come"""
+    from games.poker.cards import parse_cards
+    for player, hand in zip(room['players'], hands):
+        player['hand'] = parse_cards(hand)
+    room['deck'].cards[:] = bytes(parse_cards(board)) + bytes(
+        c for c in range(52) if c not in parse_cards(board))
+    room['deck'].dealt = 0
+
+
+def check_down(room, clients):
+    """Call/check every street until showdown"""
+    for _ in range(50):
+        if room['phase'] == 'showdown':
+            return
+        seat = room['current_turn']
+        player = room['players'][seat]
+        action = 'call' if player['bet'] < room['current_bet'] else 'check'
+        clients[seat].emit('poker_action', {'room_code': room['code'], 'action': action})
+    raise AssertionError('hand never reached showdown')
+
+
+class TestPokerShowdown:
+    """Hands are evaluated at showdown"""
+
+    def test_best_hand_wins(self):
+        room, clients = start_hand(['A', 'B'])
+        rig(room, ['Ah Ad', 'Kh Kd'], '2c 7s 9h Jd 3c')
+        check_down(room, clients)
+
+        showdown = [m for m in clients[1].get_received() if m['name'] == 'showdown'][-1]['args'][0]
+        assert showdown['winners'] == ['A']
+        assert showdown['hand_name'] == 'One Pair'
+        assert [p['chips'] for p in room['players']] == [1020, 980]
+        for client in clients:
+            client.disconnect()
+
+    def test_tie_splits_the_pot(self):
+        room, clients = start_hand(['A', 'B'])
+        rig(room, ['2h 3d', '2s 3c'], 'As Ks Qd Jc Th')
+        check_down(room, clients)
+
+        assert [p['chips'] for p in room['players']] == [1000, 1000]
+        for client in clients:
+            client.disconnect()
+
+    def test_all_in_side_pot(self):
+        room, clients = start_hand(['A', 'B', 'C'])
+        # Seat 0 acts first with 80 behind; seat 1 (small blind) has 290 more
+        room['players'][0]['chips'] = 80
+        room['players'][1]['chips'] = 290
+        rig(room, ['Ah Ad', 'Kh Kd', 'Qh Qd'], '2c 7s 9h Jd 3c')
+
+        code = room['code']
+        clients[0].emit('poker_action', {'room_code': code, 'action': 'allin'})
+        clients[1].emit('poker_action', {'room_code': code, 'action': 'allin'})
+        clients[2].emit('poker_action', {'room_code': code, 'action': 'call'})
+
+        assert room['phase'] == 'showdown'
+        showdown = [m for m in clients[2].get_received() if m['name'] == 'showdown'][-1]['args'][0]
+        assert [(p['amount'], p['winners']) for p in showdown['pots']] == [
+            (240, ['A']), (440, ['B'])]
+        assert [p['chips'] for p in room['players']] == [240, 440, 700]
+        for client in clients:
+            client.disconnect()
+
+    def test_room_reuses_one_deck(self):
+        from games.poker.cards import Deck
+        room, clients = start_hand(['A', 'B'])
+        deck = room['deck']
+        assert isinstance(deck, Deck)
+        assert len(deck) == 48
+        assert all(isinstance(c, int) for p in room['players'] for c in p['hand'])
+
+        dealt = [m for m in clients[1].get_received() if m['name'] == 'hand_dealt'][-1]['args'][0]
+        assert all(set(card) == {'value', 'suit'} for card in dealt['hand'])
+
+        clients[0].emit('deal_new_hand', {'room_code': room['code']})
+        assert room['deck'] is deck
+        assert len(deck) == 48
+        for client in clients:
+            client.disconnect()
+
+
+class TestPokerDisconnect:
+    """Players who leave a table that is playing"""
+
+    def test_leaving_between_hands_pays_nothing_twice(self):
+        room, clients = start_hand(['A', 'B'])
+        code = room['code']
+        # Heads-up the dealer posts the small blind and folds it to the big blind
+        seat = room['current_turn']
+        clients[seat].emit('poker_action', {'room_code': code, 'action': 'fold'})
+        chips = [p['chips'] for p in room['players']]
+        assert sorted(chips) == [990, 1010] and room['pot'] == 0
+
+        clients[seat].disconnect()
+        assert [p['chips'] for p in room['players']] == [chips[1 - seat]]
+        assert room['status'] == 'waiting'
+        clients[1 - seat].disconnect()
+
+    def test_player_left_broadcast_hides_hole_cards(self):
+        room, clients = start_hand(['A', 'B', 'C'])
+        code = room['code']
+        clients[2].disconnect()
+        clients[room['current_turn']].emit('poker_action', {'room_code': code, 'action': 'fold'})
+        clients[0].get_received()
+
+        clients[0].emit('deal_new_hand', {'room_code': code})
+        left = [m['args'][0] for m in clients[0].get_received() if m['name'] == 'poker_player_left']
+        assert left and left[0]['player_name'] == 'C'
+        assert all('hand' not in p and 'committed' not in p for p in left[0]['players'])
+        for client in clients[:2]:
+            client.disconnect()
+
+    def test_seat_left_mid_hand_goes_at_the_next_deal(self):
+        from games.poker.socket_events import poker_rooms
+        room, clients = start_hand(['A', 'B', 'C'])
+        code = room['code']
+        clients[2].disconnect()
+        assert room['players'][2]['folded'] and len(room['players']) == 3
+
+        # The first of A and B to act folds, leaving the other alone in the hand
+        clients[room['current_turn']].emit('poker_action', {'room_code': code, 'action': 'fold'})
+        assert room['phase'] == 'complete'
+        clients[0].emit('poker_action', {'room_code': code, 'action': 'check'})
+        assert clients[0].get_received()[-1]['args'][0]['message'] == 'No hand in progress'
+
+        clients[0].emit('deal_new_hand', {'room_code': code})
+        assert [p['name'] for p in room['players']] == ['A', 'B']
+        assert room['phase'] == 'preflop' and len(room['players'][1]['hand']) == 2
+        for client in clients[:2]:
+            client.disconnect()
+        assert code not in poker_rooms
+
+
+class TestPokerTurnClock:
+    """An idle player is acted for when their clock runs out"""
+
+    def wait_for(self, condition, timeout=3):
+        import time
+        deadline = time.time() + timeout
+        while time.time() < deadline and not condition():
+            time.sleep(0.02)
+        return condition()
+
+    def test_clock_folds_facing_a_bet(self):
+        room, clients = start_hand(['A', 'B', 'C'])
+        assert room['turn_deadline'] is not None
+        room['turn_seconds'] = 0.2
+        # Seat 0 calls; the clock restarts for seat 1, who owes the small blind
+        clients[0].emit('poker_action', {'room_code': room['code'], 'action': 'call'})
+        assert self.wait_for(lambda: room['players'][1]['folded'])
+        actions = [m['args'][0] for m in clients[2].get_received() if m['name'] == 'player_action']
+        assert actions[-1]['auto'] and actions[-1]['action'] == 'fold'
+
+    def test_clock_checks_when_free(self):
+        room, clients = start_hand(['A', 'B'])
+        room['turn_seconds'] = 0.2
+        # The small blind calls; the big blind may then check
+        clients[room['current_turn']].emit('poker_action', {'room_code': room['code'], 'action': 'call'})
+        assert self.wait_for(lambda: room['phase'] == 'flop')
+        assert not any(p['folded'] for p in room['players'])
+
+    def test_acting_cancels_the_clock(self):
+        from games.poker.socket_events import turn_clocks
+        room, clients = start_hand(['A', 'B'])
+        timer = turn_clocks[room['code']]
+        clients[room['current_turn']].emit('poker_action', {'room_code': room['code'], 'action': 'call'})
+        assert not timer.active
+        assert turn_clocks[room['code']] is not timer
@@ -0,0 +1,157 @@
+"""
+Test suite for live poker equity
+"""
+import random
+import time
+
+import numpy as np
+import pytest
+
+from games.poker.cards import parse_cards
+from games.poker.equity import equity, evaluate_batch
+from games.poker.evaluator import evaluate
+
+
+class TestEvaluateBatch:
+    """Vectorized evaluation matches the scalar evaluator"""
+
+    @pytest.mark.parametrize('size', [5, 6, 7])
+    def test_matches_evaluate(self, size):
+        rng = random.Random(size)
+        hands = [rng.sample(range(52), size) for _ in range(2000)]
+        # Make sure flushes are covered
+        hands += [[card for card in range(52) if card & 3 == suit][:size] for suit in range(4)]
+        assert evaluate_batch(np.array(hands)).tolist() == [evaluate(hand) for hand in hands]
+
+
+class TestEquity:
+    """Exact enumeration and Monte Carlo estimates"""
+
+    def test_aces_against_kings_preflop(self):
+        result = equity([parse_cards('Ah Ad'), parse_cards('Kh Kd')], budget=0.5,
+                        max_trials=20_000, rng=np.random.default_rng(1))
+        assert not result['exact']
+        assert result['trials'] == 20_000
+        assert result['equity'][0] == pytest.approx(0.82, abs=0.02)
+        assert sum(result['equity']) == pytest.approx(1)
+
+    def test_turn_is_exact(self):
+        hands = [parse_cards('Ah Ad'), parse_cards('9c Tc')]
+        result = equity(hands, parse_cards('Jc Qc 2d 3h'))
+        assert result['exact'] and result['trials'] == 44
+        # Any club, K or 8 wins for the draw; the 9c/Tc themselves are gone
+        outs = 9 + 3 + 3
+        assert result['win'][1] == pytest.approx(outs / 44)
+        assert sum(result['equity']) == pytest.approx(1)
+
+    def test_flop_is_exact(self):
+        result = equity([parse_cards('Ah Ad'), parse_cards('Kh Kd')], parse_cards('2c 7s 9h'))
+        assert result['exact'] and result['trials'] == 990
+
+    def test_river_ties_split(self):
+        result = equity([parse_cards('2h 3d'), parse_cards('2s 3c')],
+                        parse_cards('As Ks Qd Jc Th'))
+        assert result['exact'] and result['trials'] == 1
+        assert result['equity'] == [0.5, 0.5]
+        assert result['tie'] == [1.0, 1.0]
+
+    def test_dead_cards_are_not_dealt(self):
+        hands = [parse_cards('Ah Ad'), parse_cards('9c Tc')]
+        result = equity(hands, parse_cards('Jc Qc 2d 3h'), dead=parse_cards('Kc Ks'))
+        assert result['trials'] == 42
+
+    def test_budget_bounds_monte_carlo(self):
+        hands = [parse_cards('Ah Ad'), parse_cards('Kh Kd'), parse_cards('7c 8c')]
+        equity(hands, budget=0.001)  # warm the tables
+        start = time.perf_counter()
+        result = equity(hands, budget=0.005)
+        assert time.perf_counter() - start < 0.05
+        assert result['trials'] >= 1000
+
+
+class TestSpectatorEquity:
+    """Equities go to spectators only"""
+
+    def wait_for_equity(self, watcher):
+        events = []
+        deadline = time.time() + 5
+        while time.time() < deadline and not events:
+            events += [m for m in watcher.get_received() if m['name'] == 'poker_equity']
+            time.sleep(0.01)
+        assert events
+        return events[-1]['args'][0]
+
+    def test_spectator_receives_preflop_table_equity(self):
+        from games.poker.preflop import preflop_equity
+        from tests.test_poker import start_hand
+        room, clients = start_hand(['A', 'B', 'C'])
+        watcher = clients[0].socketio.test_client(clients[0].app)
+        watcher.emit('watch_poker_room', {'room_code': room['code']})
+
+        payload = self.wait_for_equity(watcher)
+        assert payload['phase'] == 'preflop' and payload == room['equity']
+        assert payload['source'] == 'preflop_table' and payload['opponents'] == 2
+        for entry in payload['players']:
+            hand = room['players'][entry['position']]['hand']
+            assert entry['equity'] == round(preflop_equity(hand, 2), 4)
+        for client in clients:
+            assert not [m for m in client.get_received() if m['name'] == 'poker_equity']
+
+    def test_spectator_receives_simulated_equity_after_the_flop(self):
+        from tests.test_poker import start_hand
+        room, clients = start_hand(['A', 'B'])
+        watcher = clients[0].socketio.test_client(clients[0].app)
+        watcher.emit('watch_poker_room', {'room_code': room['code']})
+        watcher.get_received()
+
+        clients[room['current_turn']].emit('poker_action', {'room_code': room['code'], 'action': 'call'})
+        clients[room['current_turn']].emit('poker_action', {'room_code': room['code'], 'action': 'check'})
+        assert room['phase'] == 'flop'
+        payload = self.wait_for_equity(watcher)
+        assert payload['phase'] == 'flop' and payload['source'] == 'simulation'
+        assert sum(p['equity'] for p in payload['players']) == pytest.approx(1, abs=1e-3)
+
+    def test_unwatched_tables_compute_nothing(self, monkeypatch):
+        import games.poker.socket_events as poker_events
+        from tests.test_poker import start_hand
+        calls = []
+        monkeypatch.setattr(poker_events, 'equity', lambda *args: calls.append(args))
+        room, clients = start_hand(['A', 'B'])
+        clients[room['current_turn']].emit('poker_action', {'room_code': room['code'], 'action': 'call'})
+        clients[room['current_turn']].emit('poker_action', {'room_code': room['code'], 'action': 'check'})
+        assert room['phase'] == 'flop'
+        time.sleep(0.1)
+        assert calls == [] and room.get('equity') is None
+        monkeypatch.undo()
+
+        watcher = clients[0].socketio.test_client(clients[0].app)
+        watcher.emit('watch_poker_room', {'room_code': room['code']})
+        watcher.disconnect()
+        assert not room['spectators']
+        for client in clients:
+            client.disconnect()
+
+    def test_players_cannot_watch_their_table(self):
+        from tests.test_poker import start_hand
+        room, clients = start_hand(['A', 'B'])
+        clients[0].get_received()
+        clients[0].emit('watch_poker_room', {'room_code': room['code']})
+        received = clients[0].get_received()
+        assert [m['name'] for m in received] == ['poker_error']
+        for client in clients:
+            client.disconnect()
+
+    def test_watcher_who_sits_down_stops_watching(self):
+        from app import create_app
+        from games.poker.socket_events import spectator_room
+        app, socketio = create_app('development')
+        host, guest = socketio.test_client(app), socketio.test_client(app)
+        host.emit('create_poker_room', {'player_name': 'A'})
+        code = host.get_received()[-1]['args'][0]['room_code']
+        guest.emit('watch_poker_room', {'room_code': code})
+        rooms = socketio.server.manager.rooms['/']
+        assert len(rooms[spectator_room(code)]) == 1
+        guest.emit('join_poker_room', {'room_code': code, 'player_name': 'B'})
+        assert not rooms.get(spectator_room(code))
+        for client in (host, guest):
+            client.disconnect()
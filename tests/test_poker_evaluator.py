@@ -0,0 +1,189 @@
+"""
+Test suite for the poker hand evaluator
+"""
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from games.poker.cards import (
+    Deck, card_from_wire, card_str, card_to_wire, cards_to_wire, parse_card, parse_cards,
+    rank_of, suit_of
+)
+from games.poker.evaluator import (
+    FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, HIGH_CARD, ONE_PAIR, STRAIGHT, STRAIGHT_FLUSH,
+    THREE_OF_A_KIND, TWO_PAIR, best_five, category, describe, evaluate, winners
+)
+
+
+def reference_five(cards):
+    """Straightforward 5-card ranking: (category, tie-break ranks)"""
+    ranks = sorted((rank_of(c) for c in cards), reverse=True)
+    counts = Counter(ranks)
+    flush = len({suit_of(c) for c in cards}) == 1
+    distinct = sorted(counts, reverse=True)
+    straight_high = None
+    if len(distinct) == 5 and distinct[0] - distinct[4] == 4:
+        straight_high = distinct[0]
+    elif distinct == [12, 3, 2, 1, 0]:
+        straight_high = 3
+    # Ranks ordered by (count, rank) for the grouped categories
+    grouped = sorted(counts, key=lambda r: (counts[r], r), reverse=True)
+    shape = sorted(counts.values(), reverse=True)
+
+    if straight_high is not None and flush:
+        return (STRAIGHT_FLUSH, straight_high)
+    if shape == [4, 1]:
+        return (FOUR_OF_A_KIND, *grouped)
+    if shape == [3, 2]:
+        return (FULL_HOUSE, *grouped)
+    if flush:
+        return (FLUSH, *ranks)
+    if straight_high is not None:
+        return (STRAIGHT, straight_high)
+    if shape[0] == 3:
+        return (THREE_OF_A_KIND, *grouped)
+    if shape == [2, 2, 1]:
+        return (TWO_PAIR, *grouped)
+    if shape[0] == 2:
+        return (ONE_PAIR, *grouped)
+    return (HIGH_CARD, *ranks)
+
+
+def reference(cards):
+    """Best 5-card reference ranking of 5-7 cards, by enumerating subsets"""
+    return max(reference_five(five) for five in combinations(cards, 5))
+
+
+def sign(x):
+    return (x > 0) - (x < 0)
+
+
+class TestCards:
+    """Integer card encoding and wire conversion"""
+
+    def test_round_trips(self):
+        for card in range(52):
+            assert card_from_wire(card_to_wire(card)) == card
+            assert parse_card(card_str(card)) == card
+
+    def test_parse(self):
+        assert parse_card('As') == 51 - 3
+        assert parse_card('10♥') == parse_card('Th')
+        assert card_to_wire(parse_card('Kd')) == {'value': 'K', 'suit': '♦'}
+        with pytest.raises(ValueError):
+            parse_card('Zz')
+
+
+class TestEvaluate:
+    """Hand values order hands correctly"""
+
+    @pytest.mark.parametrize('hand, name', [
+        ('As Ks Qs Js Ts 2d 3c', 'Straight Flush'),
+        ('5h 4h 3h 2h Ah Kd Kc', 'Straight Flush'),
+        ('9c 9d 9h 9s 2d 3c 4h', 'Four of a Kind'),
+        ('Kc Kd Kh 2s 2d 3c 4h', 'Full House'),
+        ('2c 7c 9c Jc Kc Ad Ah', 'Flush'),
+        ('5d 6c 7h 8s 9d Ac Ah', 'Straight'),
+        ('Ad 2c 3h 4s 5d 9c Jh', 'Straight'),
+        ('7c 7d 7h Ks 2d 3c 9h', 'Three of a Kind'),
+        ('7c 7d Kh Ks 2d 3c 9h', 'Two Pair'),
+        ('7c 7d Kh Qs 2d 3c 9h', 'One Pair'),
+        ('7c 8d Kh Qs 2d 3c 9h', 'High Card'),
+    ])
+    def test_categories(self, hand, name):
+        assert describe(evaluate(parse_cards(hand))) == name
+
+    def test_kickers_decide(self):
+        board = parse_cards('Ah Kd 7c 4s 2h')
+        assert evaluate(parse_cards('Ac Qh') + board) > evaluate(parse_cards('As Jh') + board)
+
+    def test_wheel_is_the_lowest_straight(self):
+        wheel = evaluate(parse_cards('Ad 2c 3h 4s 5d'))
+        six_high = evaluate(parse_cards('2c 3h 4s 5d 6c'))
+        assert category(wheel) == STRAIGHT
+        assert wheel < six_high
+
+    def test_best_full_house_from_two_trips(self):
+        value = evaluate(parse_cards('2c 2d 2h Ks Kd Kc Ah'))
+        assert value == evaluate(parse_cards('Ks Kd Kc 2c 2d'))
+
+    def test_board_plays_is_a_tie(self):
+        board = parse_cards('As Ks Qs Js Ts')
+        assert winners([parse_cards('2c 3d') + board, parse_cards('4h 5h') + board]) == [0, 1]
+
+    def test_six_cards(self):
+        assert describe(evaluate(parse_cards('Ah Ad Ac 2s 2d 7h'))) == 'Full House'
+
+    def test_best_five(self):
+        hand = parse_cards('As Ks Qs Js Ts 2d 3c')
+        assert sorted(best_five(hand)) == sorted(parse_cards('As Ks Qs Js Ts'))
+
+
+class TestExhaustive:
+    """Against the reference enumerator"""
+
+    def test_every_five_card_hand(self):
+        """All 2,598,960 hands: category frequencies and the 7,462 classes"""
+        classes = {}
+        frequency = Counter()
+        for hand in combinations(range(52), 5):
+            value = evaluate(hand)
+            frequency[category(value)] += 1
+            if value not in classes:
+                classes[value] = reference_five(hand)
+
+        assert frequency == {
+            STRAIGHT_FLUSH: 40, FOUR_OF_A_KIND: 624, FULL_HOUSE: 3744, FLUSH: 5108,
+            STRAIGHT: 10200, THREE_OF_A_KIND: 54912, TWO_PAIR: 123552,
+            ONE_PAIR: 1098240, HIGH_CARD: 1302540,
+        }
+        assert len(classes) == 7462
+        # Distinct values map to distinct reference ranks, in the same order
+        ordered = [classes[value] for value in sorted(classes)]
+        assert ordered == sorted(set(ordered))
+
+    @pytest.mark.parametrize('size', [6, 7])
+    def test_random_hands_match_reference(self, size):
+        rng = random.Random(size)
+        hands = [rng.sample(range(52), size) for _ in range(1000)]
+        values = [evaluate(hand) for hand in hands]
+        refs = [reference(hand) for hand in hands]
+        for i in range(len(hands) - 1):
+            expected = (refs[i] > refs[i + 1]) - (refs[i] < refs[i + 1])
+            assert sign(values[i] - values[i + 1]) == expected, (hands[i], hands[i + 1])
+            assert category(values[i]) == refs[i][0]
+
+
+class TestDeck:
+    """Reusable in-place deck"""
+
+    def test_shuffle_and_deal(self):
+        deck = Deck(random.Random(1))
+        assert len(deck) == 0
+        deck.shuffle()
+        assert sorted(deck.cards) == list(range(52))
+        hole = deck.deal(2)
+        assert len(deck) == 50
+        assert deck.pop() not in hole
+        assert sorted(hole + [deck.cards[2]] + deck.remaining()) == list(range(52))
+
+    def test_empty_deck_raises(self):
+        deck = Deck().shuffle()
+        deck.deal(52)
+        assert not deck
+        with pytest.raises(IndexError):
+            deck.pop()
+
+    def test_pickles_without_the_rng(self):
+        import pickle
+        deck = Deck(random.Random(3)).shuffle()
+        deck.deal(5)
+        copy = pickle.loads(pickle.dumps(deck))
+        assert copy.cards == deck.cards and len(copy) == 47
+        copy.shuffle()
+
+    def test_wire_format(self):
+        assert cards_to_wire(parse_cards('As 10h')) == [
+            {'value': 'A', 'suit': '♠'}, {'value': '10', 'suit': '♥'}]
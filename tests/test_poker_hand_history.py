@@ -0,0 +1,199 @@
+"""
+Test suite for poker hand histories
+"""
+import io
+import json
+
+from games.poker.cards import parse_cards
+from games.poker.hand_history import HandHistory, export, history_files, read_hands
+
+
+def record_hand(history, room_code='ROOM01', number=1):
+    room = {
+        'hand_number': number, 'small_blind': 10, 'big_blind': 20, 'dealer': 0,
+        'players': [
+            {'name': 'Ann', 'chips': 1000, 'hand': parse_cards('Ah Ad')},
+            {'name': 'Bob', 'chips': 800, 'hand': parse_cards('Kh Kd')},
+            {'name': 'Cy', 'chips': 500, 'hand': parse_cards('7c 2d')},
+        ],
+    }
+    history.hand_started(room_code, room)
+    history.action(room_code, 1, 'post', 10)
+    history.action(room_code, 2, 'post', 20)
+    history.action(room_code, 0, 'raise', 60)
+    history.action(room_code, 1, 'call', 50)
+    history.action(room_code, 2, 'fold', 0, auto=True)
+    history.board(room_code, parse_cards('2c 7s 9h'))
+    history.action(room_code, 1, 'check', 0)
+    history.action(room_code, 0, 'raise', 100)
+    history.action(room_code, 1, 'call', 100)
+    history.board(room_code, parse_cards('Jd'))
+    history.board(room_code, parse_cards('3c'))
+    history.action(room_code, 1, 'check', 0)
+    history.action(room_code, 0, 'check', 0)
+    history.result(room_code, {0: 340})
+
+
+class TestRecording:
+    """Binary records round-trip"""
+
+    def test_round_trip(self, tmp_path):
+        history = HandHistory(tmp_path)
+        record_hand(history)
+        assert not list(tmp_path.iterdir())  # buffered until flushed
+        assert history.flush() > 0
+
+        (path,) = history_files(tmp_path)
+        (hand,) = read_hands(path)
+        assert hand['room'] == 'ROOM01' and hand['hand'] == 1
+        assert [p['name'] for p in hand['players']] == ['Ann', 'Bob', 'Cy']
+        assert hand['players'][1]['cards'] == parse_cards('Kh Kd')
+        assert hand['board'] == parse_cards('2c 7s 9h Jd 3c')
+        assert hand['winners'] == [{'seat': 0, 'won': 340}]
+        raise_pre, = [a for a in hand['actions'] if a['action'] == 'raise' and a['street'] == 'preflop']
+        assert raise_pre['to'] == 60
+        assert [a['street'] for a in hand['actions']].count('flop') == 3
+        assert hand['actions'][4]['auto']
+
+    def test_compact(self, tmp_path):
+        history = HandHistory(tmp_path)
+        record_hand(history)
+        # 14 records: about 4 bytes per action
+        assert history.flush() < 120
+
+    def test_rotates_at_hand_boundaries(self, tmp_path):
+        history = HandHistory(tmp_path, max_bytes=250)
+        for number in range(1, 7):
+            record_hand(history, number=number)
+            if number % 2 == 0:
+                history.flush()
+        history.flush()
+        files = history_files(tmp_path)
+        assert len(files) > 1
+        numbers = [hand['hand'] for path in files for hand in read_hands(path)]
+        assert numbers == [1, 2, 3, 4, 5, 6]
+
+    def test_forgotten_rooms_are_pruned(self, tmp_path):
+        history = HandHistory(tmp_path)
+        record_hand(history)
+        history.forget('ROOM01')
+        assert history.flush() > 0  # records already buffered still land
+        assert not history._logs and not history._last_ms and not history._dirty
+
+        # A room code used again continues in a new file
+        record_hand(history, number=2)
+        history.flush()
+        assert [p.name for p in history_files(tmp_path)] == ['00000.phh', '00001.phh']
+
+    def test_sequence_is_found_once_per_room(self, tmp_path, monkeypatch):
+        history = HandHistory(tmp_path)
+        calls = []
+        next_seq = history._next_seq
+        monkeypatch.setattr(history, '_next_seq', lambda room: calls.append(room) or next_seq(room))
+        for number in range(1, 4):
+            record_hand(history, number=number)
+            history.flush()
+        assert calls == ['ROOM01']
+
+    def test_writer_flushes_off_the_timer_wheel(self, tmp_path):
+        import threading
+
+        class FakeSocketIO:
+            async_mode = 'threading'
+
+            def __init__(self):
+                self.tasks = []
+
+            def start_background_task(self, target, *args):
+                self.tasks.append(threading.Thread(target=target, args=args, daemon=True))
+                self.tasks[-1].start()
+
+            def sleep(self, seconds):
+                threading.Event().wait(seconds)
+
+        history = HandHistory(tmp_path, flush_interval=0.01)
+        sio = FakeSocketIO()
+        history.start(sio)
+        history.start(sio)
+        assert len(sio.tasks) == 1
+        record_hand(history)
+        history.stop()
+        sio.tasks[0].join(timeout=2)
+        assert history.bytes_written > 0 and history_files(tmp_path)
+
+    def test_disabled_without_directory(self):
+        history = HandHistory()
+        record_hand(history)
+        assert history.records == 0 and history.flush() == 0
+
+    def test_production_config_does_not_record_by_default(self):
+        from config import Config, ProductionConfig
+        assert ProductionConfig.HAND_HISTORY_DIR == Config.HAND_HISTORY_DIR
+
+
+class TestExport:
+    """Text and JSON lines output"""
+
+    def test_text(self, tmp_path):
+        history = HandHistory(tmp_path)
+        record_hand(history)
+        history.flush()
+        out = io.StringIO()
+        assert export(history_files(tmp_path), out) == 1
+        text = out.getvalue()
+        assert 'Hand #1 (Room ROOM01) - $10/$20' in text
+        assert 'Seat 1: Ann ($1000 in chips) [button]' in text
+        assert 'Bob: posts small blind $10' in text
+        assert 'Ann: raises to $60' in text
+        assert 'Cy: folds (timed out)' in text
+        assert '*** TURN *** [2c 7s 9h] [Jd]' in text
+        assert '*** RIVER *** [2c 7s 9h Jd] [3c]' in text
+        assert 'Ann: shows [Ah Ad] (One Pair)' in text
+        assert 'Ann collected $340 from pot' in text
+
+    def test_jsonl(self, tmp_path):
+        history = HandHistory(tmp_path)
+        record_hand(history, number=1)
+        record_hand(history, number=2)
+        history.flush()
+        out = io.StringIO()
+        export(history_files(tmp_path), out, 'jsonl')
+        hands = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [h['hand'] for h in hands] == [1, 2]
+        assert hands[0]['board'] == ['2c', '7s', '9h', 'Jd', '3c']
+        assert hands[0]['winners'] == [{'seat': 0, 'won': 340, 'name': 'Ann'}]
+
+
+class TestPokerRecording:
+    """Live rooms record their hands"""
+
+    def test_showdown_is_recorded(self, tmp_path, monkeypatch):
+        from games.poker.hand_history import hand_history
+        from tests.test_poker import check_down, rig, start_hand
+        monkeypatch.setattr(hand_history, 'directory', tmp_path)
+        room, clients = start_hand(['A', 'B'])
+        rig(room, ['Ah Ad', 'Kh Kd'], '2c 7s 9h Jd 3c')
+        check_down(room, clients)
+        hand_history.flush()
+
+        hands = [h for path in history_files(tmp_path / room['code']) for h in read_hands(path)]
+        assert len(hands) == 1
+        hand = hands[0]
+        assert hand['board'] == parse_cards('2c 7s 9h Jd 3c')
+        assert [a['action'] for a in hand['actions'][:2]] == ['post', 'post']
+        assert sum(w['won'] for w in hand['winners']) == 40
+
+    def test_disconnect_is_recorded_as_a_fold(self, tmp_path, monkeypatch):
+        from games.poker.hand_history import hand_history
+        from tests.test_poker import start_hand
+        monkeypatch.setattr(hand_history, 'directory', tmp_path)
+        room, clients = start_hand(['A', 'B', 'C'])
+        code = room['code']
+        clients[2].disconnect()
+        hand_history.flush()
+
+        (hand,) = [h for path in history_files(tmp_path / code) for h in read_hands(path)]
+        assert hand['actions'][-1]['seat'] == 2 and hand['actions'][-1]['action'] == 'fold'
+        for client in clients[:2]:
+            client.disconnect()
+        assert code not in hand_history._logs
@@ -0,0 +1,70 @@
+"""
+Test suite for the precomputed preflop equity table
+"""
+import pytest
+
+from games.poker import preflop
+from games.poker.cards import parse_cards
+from games.poker.preflop import class_equity, class_hand, class_name, hand_class, preflop_equity
+
+
+def equity_of(name, opponents=1):
+    index = next(i for i in range(preflop.CLASSES) if class_name(i) == name)
+    return class_equity(index, opponents)
+
+
+class TestHandClasses:
+    """The 169 starting-hand classes"""
+
+    def test_every_hand_maps_to_one_of_169(self):
+        classes = {hand_class(a, b) for a in range(52) for b in range(52) if a != b}
+        assert classes == set(range(169))
+        assert len({class_name(i) for i in classes}) == 169
+
+    def test_order_and_suits(self):
+        ak_suited = parse_cards('As Ks')
+        ak_off = parse_cards('Ks Ad')
+        assert class_name(hand_class(*ak_suited)) == 'AKs'
+        assert class_name(hand_class(*ak_off)) == 'AKo'
+        assert hand_class(*ak_off) == hand_class(*reversed(ak_off))
+        assert class_name(hand_class(*parse_cards('7h 7c'))) == '77'
+
+    def test_representatives(self):
+        for index in range(169):
+            assert hand_class(*class_hand(index)) == index
+
+
+class TestTable:
+    """Lookups against the shipped table"""
+
+    def test_known_heads_up_equities(self):
+        assert equity_of('AA') == pytest.approx(0.852, abs=0.01)
+        assert equity_of('KK') == pytest.approx(0.824, abs=0.01)
+        assert equity_of('AKs') == pytest.approx(0.670, abs=0.01)
+        assert equity_of('72o') == pytest.approx(0.346, abs=0.01)
+
+    def test_equity_falls_with_more_opponents(self):
+        for index in range(169):
+            values = [class_equity(index, n) for n in range(1, 6)]
+            assert values == sorted(values, reverse=True)
+
+    def test_lookup_by_cards(self):
+        assert preflop_equity(parse_cards('Ah Ad'), 3) == equity_of('AA', 3)
+
+    def test_opponents_out_of_range(self):
+        with pytest.raises(ValueError):
+            preflop_equity(parse_cards('Ah Ad'), 6)
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / 'table.bin'
+        equities = [[(i + n) / 400 for n in range(5)] for i in range(169)]
+        preflop.pack(equities, path)
+        assert path.stat().st_size == 8 + 169 * 5 * 2
+        table = preflop.open_table(path)
+        assert class_equity(168, 5, table) == pytest.approx(172 / 400, abs=1e-4)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'table.bin'
+        path.write_bytes(b'x' * 1698)
+        with pytest.raises(ValueError):
+            preflop.open_table(path)
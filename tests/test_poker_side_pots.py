@@ -0,0 +1,77 @@
+"""
+Test suite for poker side pots
+"""
+import random
+
+from games.poker.side_pots import award_pots, build_pots
+
+
+def naive_pots(committed, folded):
+    """One pass per live commitment level"""
+    levels = sorted({c for s, c in committed.items() if s not in folded and c > 0})
+    pots, previous = [], 0
+    for level in levels:
+        amount = sum(min(c, level) - min(c, previous) for c in committed.values())
+        eligible = sorted(s for s, c in committed.items() if s not in folded and c >= level)
+        pots.append({'amount': amount, 'eligible': eligible})
+        previous = level
+    excess = sum(max(0, c - previous) for c in committed.values())
+    if excess:
+        pots[-1]['amount'] += excess
+    return pots
+
+
+class TestBuildPots:
+    """Layering committed chips"""
+
+    def test_single_pot(self):
+        assert build_pots({0: 100, 1: 100, 2: 100}) == [{'amount': 300, 'eligible': [0, 1, 2]}]
+
+    def test_short_all_in_makes_a_side_pot(self):
+        assert build_pots({0: 100, 1: 300, 2: 300}) == [
+            {'amount': 300, 'eligible': [0, 1, 2]},
+            {'amount': 400, 'eligible': [1, 2]},
+        ]
+
+    def test_folded_chips_stay_in_but_cannot_win(self):
+        assert build_pots({0: 50, 1: 100, 2: 200}, folded=[0]) == [
+            {'amount': 250, 'eligible': [1, 2]},
+            {'amount': 100, 'eligible': [2]},
+        ]
+
+    def test_folded_chips_above_every_live_player(self):
+        assert build_pots({0: 300, 1: 100, 2: 100}, folded=[0]) == [
+            {'amount': 500, 'eligible': [1, 2]},
+        ]
+
+    def test_matches_naive_layering(self):
+        rng = random.Random(4)
+        for _ in range(500):
+            seats = rng.randint(2, 9)
+            committed = {s: rng.choice([0, 10, 20, 50, 100, 250, rng.randint(1, 500)])
+                         for s in range(seats)}
+            folded = {s for s in range(seats) if rng.random() < 0.3}
+            if all(s in folded or committed[s] == 0 for s in committed):
+                continue
+            pots = build_pots(committed, folded)
+            assert pots == naive_pots(committed, folded)
+            assert sum(p['amount'] for p in pots) == sum(committed.values())
+
+
+class TestAwardPots:
+    """Paying pots to the best eligible hands"""
+
+    def test_each_pot_goes_to_its_best_eligible_hand(self):
+        pots = [{'amount': 300, 'eligible': [0, 1, 2]}, {'amount': 400, 'eligible': [1, 2]}]
+        won, results = award_pots(pots, {0: 900, 1: 500, 2: 100}, [0, 1, 2])
+        assert won == {0: 300, 1: 400}
+        assert [r['winners'] for r in results] == [[0], [1]]
+
+    def test_odd_chips_go_left_of_the_dealer_first(self):
+        pots = [{'amount': 301, 'eligible': [0, 1, 2]}]
+        won, _ = award_pots(pots, {0: 7, 1: 3, 2: 7}, seat_order=[1, 2, 0])
+        assert won == {2: 151, 0: 150}
+
+    def test_three_way_split(self):
+        won, _ = award_pots([{'amount': 100, 'eligible': [0, 1, 2]}], {0: 1, 1: 1, 2: 1}, [0, 1, 2])
+        assert won == {0: 34, 1: 33, 2: 33}
@@ -0,0 +1,162 @@
+"""
+Test suite for multi-table poker tournaments
+"""
+import random
+import time
+
+import pytest
+
+from games.poker.tournament import Tournament
+
+
+def make_tournament(entrants, table_size=6, **kwargs):
+    tournament = Tournament('T1', table_size=table_size, **kwargs)
+    for i in range(entrants):
+        tournament.register(f'p{i}', f'Player {i}')
+    tournament.start(now=0, rng=random.Random(entrants))
+    return tournament
+
+
+def play_hand(tournament, table_id, rng):
+    """Bust a random player or two (someone always survives)"""
+    table = tournament.tables[table_id]
+    chips = {pid: tournament.players[pid]['chips'] for pid in table.players()}
+    for pid in rng.sample(list(chips), min(len(chips) - 1, rng.choice([0, 0, 1, 1, 2]))):
+        chips[pid] = 0
+    return tournament.hand_finished(table_id, chips)
+
+
+class TestSeating:
+    """Initial seating"""
+
+    def test_seats_evenly_at_fewest_tables(self):
+        tournament = make_tournament(200)
+        sizes = sorted(t.count for t in tournament.tables.values())
+        assert len(sizes) == 34
+        assert sizes[0] >= 5 and sizes[-1] == 6
+        seated = [pid for t in tournament.tables.values() for pid in t.players()]
+        assert sorted(seated) == sorted(tournament.players)
+
+    def test_needs_two_entrants_and_closes_registration(self):
+        tournament = Tournament('T1')
+        tournament.register('a', 'A')
+        with pytest.raises(ValueError):
+            tournament.start()
+        tournament.register('b', 'B')
+        tournament.start()
+        with pytest.raises(ValueError):
+            tournament.register('c', 'C')
+
+    def test_blind_levels(self):
+        tournament = make_tournament(10, level_seconds=600)
+        assert tournament.blinds(now=0) == (10, 20)
+        assert tournament.blinds(now=601) == (15, 30)
+        assert tournament.blinds(now=10 ** 6) == tournament.schedule[-1]
+
+
+class TestBalancing:
+    """Tables stay balanced and break as players bust"""
+
+    def test_plays_down_to_one_winner(self):
+        rng = random.Random(7)
+        tournament = make_tournament(150)
+        while tournament.status == 'running':
+            table_id = rng.choice(list(tournament.tables))
+            play_hand(tournament, table_id, rng)
+            for table in tournament.tables.values():
+                assert table.count <= tournament.table_size
+            seated = sum(t.count for t in tournament.tables.values())
+            assert seated == tournament.remaining or tournament.status == 'finished'
+
+        places = sorted(p['place'] for p in tournament.players.values())
+        assert places == list(range(1, 151))
+        assert tournament.players[tournament.winner]['place'] == 1
+        assert tournament.standings()[0]['place'] == 1
+
+    def test_breaks_the_short_table(self):
+        tournament = make_tournament(12)
+        a, b = tournament.tables.values()
+        # Two players bust at table a: 10 players still fit on two tables
+        victims = a.players()[:2]
+        result = tournament.hand_finished(a.id, {pid: 0 if pid in victims else 1500
+                                                 for pid in a.players()})
+        assert [place for _, place in result['busted']] == [12, 11]
+        assert not result['broken']
+        # Two more at b: 8 players, still two tables, b now the smaller one
+        victims = b.players()[:4]
+        result = tournament.hand_finished(b.id, {pid: 0 if pid in victims else 1500
+                                                 for pid in b.players()})
+        assert tournament.remaining == 6
+        assert result['broken'] and len(result['moves']) == 2
+        assert list(tournament.tables) == [a.id] and a.count == 6
+
+    def test_moves_players_from_a_long_table(self):
+        tournament = make_tournament(18)
+        first = tournament.tables[0]
+        for pid in first.players()[:3]:
+            first.unseat(pid)
+            tournament.players[pid]['place'] = 99
+            tournament.remaining -= 1
+        tournament._push(first)
+        # Table 1 has 6 against table 0's 3: it sends players over
+        result = tournament.hand_finished(1, {pid: 1500 for pid in tournament.tables[1].players()})
+        assert len(result['moves']) == 1
+        assert {m['to'] for m in result['moves']} == {0}
+        counts = sorted(t.count for t in tournament.tables.values())
+        assert counts[-1] - counts[0] <= 2
+
+    def test_busted_together_placed_by_starting_stack(self):
+        tournament = make_tournament(6)
+        table = tournament.tables[0]
+        small, big = table.players()[:2]
+        tournament.players[small]['chips'] = 100
+        tournament.players[big]['chips'] = 900
+        result = tournament.hand_finished(0, {small: 0, big: 0})
+        assert dict(result['busted']) == {small: 6, big: 5}
+
+
+class TestTournamentEvents:
+    """Tables run as poker rooms"""
+
+    def test_tournament_seats_tables_and_plays(self, monkeypatch):
+        from app import create_app
+        from games.poker import tournament_events
+        from games.poker.socket_events import poker_rooms
+        monkeypatch.setattr(tournament_events, 'NEXT_HAND_DELAY', 0.1)
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+        clients = [socketio.test_client(app) for _ in range(8)]
+        clients[0].emit('create_poker_tournament', {'player_name': 'P0', 'table_size': 4})
+        tournament_id = clients[0].get_received()[-1]['args'][0]['tournament_id']
+        for i, client in enumerate(clients[1:], 1):
+            client.emit('join_poker_tournament', {'tournament_id': tournament_id,
+                                                  'player_name': f'P{i}'})
+        clients[0].emit('start_poker_tournament', {'tournament_id': tournament_id})
+
+        tournament = tournament_events.poker_tournaments[tournament_id]
+        assert tournament.status == 'running' and len(tournament.tables) == 2
+        codes = [t.room_code for t in tournament.tables.values()]
+        for code in codes:
+            room = poker_rooms[code]
+            assert room['tournament'] == tournament_id
+            assert room['phase'] == 'preflop' and len(room['players']) == 4
+
+        seated = {}
+        for client in clients:
+            event = [m for m in client.get_received() if m['name'] == 'tournament_table'][-1]
+            code = event['args'][0]['room_code']
+            seated[code] = seated.get(code, 0) + 1
+        assert sorted(seated) == sorted(codes) and set(seated.values()) == {4}
+
+        # Everyone folds to the big blind: the table deals itself the next hand
+        room = poker_rooms[codes[0]]
+        by_sid = {socketio.server.manager.sid_from_eio_sid(c.eio_sid, '/'): c for c in clients}
+        hand = room['hand_number']
+        for _ in range(3):
+            player = room['players'][room['current_turn']]
+            by_sid[player['id']].emit('poker_action', {'room_code': room['code'], 'action': 'fold'})
+        deadline = time.time() + 3
+        while time.time() < deadline and room['hand_number'] == hand:
+            time.sleep(0.02)
+        assert room['hand_number'] == hand + 1
+        assert room['small_blind'] == 10 and len(room['players']) == 4
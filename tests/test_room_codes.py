@@ -0,0 +1,157 @@
+"""
+Test suite for the shared room code allocator
+"""
+import pytest
+
+from utils.room_codes import RoomCodeAllocator
+from utils.room_manager import LocalRedis, RedisBackend, RoomStore
+
+
+class TestPermutation:
+    """Fresh codes come from a bijection over the code space"""
+
+    def test_permutation_is_a_bijection(self):
+        allocator = RoomCodeAllocator(alphabet='ABC', length=5, key=7)
+        values = [allocator.permute(i) for i in range(allocator.capacity)]
+        assert sorted(values) == list(range(allocator.capacity))
+
+    def test_encode(self):
+        allocator = RoomCodeAllocator(alphabet='AB', length=3)
+        assert [allocator.encode(v) for v in range(4)] == ['AAA', 'AAB', 'ABA', 'ABB']
+
+    def test_key_changes_the_order(self):
+        first = [RoomCodeAllocator(key=1).permute(i) for i in range(20)]
+        second = [RoomCodeAllocator(key=2).permute(i) for i in range(20)]
+        assert first != second
+
+
+class TestAllocation:
+    """Unique codes, lazy reuse and occupancy"""
+
+    def test_fills_the_whole_space_without_collisions(self):
+        allocator = RoomCodeAllocator(alphabet='XYZ', length=4)
+        codes = [allocator.allocate('game') for _ in range(allocator.capacity)]
+        assert len(set(codes)) == allocator.capacity
+        with pytest.raises(RuntimeError):
+            allocator.allocate('game')
+
+    def test_default_codes(self):
+        code = RoomCodeAllocator().allocate('poker')
+        assert len(code) == 6
+        assert code.isalnum() and code.isupper()
+
+    def test_freed_codes_wait_before_reuse(self):
+        allocator = RoomCodeAllocator(reuse_after=3600)
+        code = allocator.allocate('poker')
+        assert allocator.release(code)
+        assert allocator.allocate('poker') != code
+
+        allocator.reuse_after = 0
+        assert allocator.allocate('pong') == code
+        assert allocator.owner(code) == 'pong'
+        assert allocator.stats()['reused'] == 1
+
+    def test_exhausted_space_reuses_freed_codes_early(self):
+        allocator = RoomCodeAllocator(alphabet='AB', length=1, reuse_after=3600)
+        first, _ = allocator.allocate('a'), allocator.allocate('a')
+        allocator.release(first)
+        assert allocator.allocate('b') == first
+
+    def test_release_needs_the_owner(self):
+        allocator = RoomCodeAllocator()
+        code = allocator.allocate('poker')
+        assert not allocator.release(code, 'pong')
+        assert not allocator.release('NOPE00')
+        assert allocator.release(code, 'poker')
+        assert not allocator.release(code, 'poker')
+
+    def test_claimed_codes_are_skipped(self):
+        allocator = RoomCodeAllocator(alphabet='AB', length=2, key=3)
+        upcoming = allocator.encode(allocator.permute(0))
+        allocator.claim(upcoming, 'mafia')
+        assert allocator.allocate('poker') != upcoming
+
+    def test_stats(self):
+        allocator = RoomCodeAllocator(alphabet='AB', length=4)
+        for game in ('poker', 'poker', 'pong'):
+            allocator.allocate(game)
+        stats = allocator.stats()
+        assert stats['capacity'] == 16
+        assert stats['in_use'] == 3
+        assert stats['occupancy'] == 3 / 16
+        assert stats['games'] == {'poker': 2, 'pong': 1}
+
+
+class TestSharedAllocation:
+    """Processes sharing a Redis backend walk one permutation"""
+
+    def test_bound_allocators_never_collide(self):
+        backend = RedisBackend(LocalRedis())
+        first, second = RoomCodeAllocator(key=1), RoomCodeAllocator(key=2)
+        first.bind(backend)
+        second.bind(backend)
+        assert first.key == second.key
+
+        codes = [a.allocate('poker') for _ in range(200) for a in (first, second)]
+        assert len(set(codes)) == len(codes)
+
+    def test_any_process_can_release_a_code(self):
+        backend = RedisBackend(LocalRedis())
+        first, second = RoomCodeAllocator(), RoomCodeAllocator()
+        first.bind(backend)
+        second.bind(backend)
+
+        code = first.allocate('poker')
+        assert second.owner(code) == 'poker'
+        assert not second.release(code, 'pong')
+        assert second.release(code, 'poker')
+        assert first.owner(code) is None
+        assert first.stats()['in_use'] == 0
+
+    def test_bound_allocators_skip_claimed_codes(self):
+        backend = RedisBackend(LocalRedis())
+        first, second = RoomCodeAllocator(key=1), RoomCodeAllocator()
+        second.bind(backend)
+        first.bind(backend)
+        taken = first.encode(first.permute(0))
+        second.claim(taken, 'mafia')
+        assert first.allocate('poker') != taken
+        assert first.stats()['games'] == {'mafia': 1, 'poker': 1}
+
+
+class TestRoomStoreIntegration:
+    """Rooms release their code when they go away"""
+
+    def test_deleting_a_room_frees_its_code(self, monkeypatch):
+        import utils.room_manager as room_manager
+        allocator = RoomCodeAllocator()
+        monkeypatch.setattr(room_manager, 'room_codes', allocator)
+
+        rooms = RoomStore('test_codes')
+        code = allocator.allocate('test_codes')
+        rooms[code] = {'status': 'waiting'}
+        assert allocator.owner(code) == 'test_codes'
+
+        del rooms[code]
+        assert allocator.owner(code) is None
+        assert allocator.stats()['free'] == 1
+
+    def test_directly_stored_codes_are_claimed(self, monkeypatch):
+        import utils.room_manager as room_manager
+        allocator = RoomCodeAllocator()
+        monkeypatch.setattr(room_manager, 'room_codes', allocator)
+
+        rooms = RoomStore('test_codes')
+        rooms['MAFIA1'] = {'status': 'waiting'}
+        assert allocator.owner('MAFIA1') == 'test_codes'
+
+    def test_games_share_one_code_space(self):
+        from games.connect4.socket_events import generate_room_code as connect4_code
+        from games.trivia.socket_events import generate_room_code as trivia_code
+        from utils.room_codes import room_codes
+
+        codes = {connect4_code(), trivia_code()}
+        assert len(codes) == 2
+        assert {room_codes.owner(c) for c in codes} == {'connect4', 'trivia'}
+        for code in codes:
+            room_codes.release(code)
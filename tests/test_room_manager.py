@@ -0,0 +1,405 @@
+"""
+Test suite for the shared RoomStore
+"""
+import threading
+
+import pytest
+
+from flask import Flask
+
+from utils.room_manager import (
+    LocalRedis, MemoryBackend, RedisBackend, RoomReaper, RoomStore, all_stores,
+    get_store, init_room_store, room_state, room_stats, set_backend
+)
+
+
+class RecordingBackend(MemoryBackend):
+    """Backend that keeps a copy of every room it is given"""
+
+    def __init__(self):
+        self.data = {}
+
+    def load(self, game, code):
+        return self.data.get((game, code))
+
+    def save(self, game, code, room):
+        self.data[(game, code)] = room
+
+    def delete(self, game, code):
+        self.data.pop((game, code), None)
+
+
+class TestRoomStoreDict:
+    """RoomStore keeps behaving like the dicts it replaced"""
+
+    def test_is_a_dict(self):
+        assert isinstance(RoomStore('test_dict'), dict)
+
+    def test_set_get_contains_delete(self):
+        store = RoomStore('test_basic')
+        store['ABC123'] = {'players': []}
+        assert 'ABC123' in store
+        assert store['ABC123'] == {'players': []}
+        assert store.get('missing') is None
+        del store['ABC123']
+        assert 'ABC123' not in store
+        assert len(store) == 0
+
+    def test_remove_hooks(self):
+        store = RoomStore('test_remove_hooks')
+        removed = []
+        store.on_remove(removed.append)
+        store['A'] = {}
+        store['B'] = {}
+        del store['A']
+        store.pop('B')
+        assert removed == ['A', 'B']
+
+    def test_missing_room_raises_key_error(self):
+        store = RoomStore('test_missing')
+        with pytest.raises(KeyError):
+            store['NOPE']
+
+    def test_pop_and_clear_drop_metadata(self):
+        store = RoomStore('test_pop')
+        store['A'] = {'players': []}
+        store['B'] = {'players': []}
+        store.lock('A')
+        assert store.pop('A')['players'] == []
+        assert 'A' not in store.last_active
+        assert store.pop('A', 'default') == 'default'
+        store.clear()
+        assert not store.created_at
+        assert not store.last_active
+
+
+class TestRoomStoreMetadata:
+    """Locks, timestamps and stats"""
+
+    def test_lock_is_per_room_and_stable(self):
+        store = RoomStore('test_lock')
+        assert store.lock('abc') is store.lock('ABC ')
+        assert store.lock('abc') is not store.lock('xyz')
+
+    def test_unused_locks_are_dropped(self):
+        store = RoomStore('test_lock_table')
+        for n in range(100):
+            with store.lock(f'JOIN_{n}'):
+                pass
+        with store.lock('R'):
+            with store.lock('R'):
+                assert list(store._locks) == ['R']
+        assert store._locks == {}
+
+    def test_synchronized_serializes_a_room(self):
+        store = RoomStore('test_sync')
+        store['R1'] = {'count': 0}
+
+        @store.synchronized
+        def bump(data):
+            room = store[data['room_code']]
+            value = room['count']
+            threading.Event().wait(0.0001)
+            room['count'] = value + 1
+
+        threads = [threading.Thread(target=bump, args=({'room_code': 'R1'},)) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert store['R1']['count'] == 20
+
+    def test_synchronized_custom_key(self):
+        store = RoomStore('test_sync_key')
+
+        @store.synchronized(key='game_id')
+        def handler(data):
+            return store.lock(data['game_id'])._is_owned()
+
+        assert handler({'game_id': 'G1'})
+
+    def test_access_updates_last_active(self):
+        store = RoomStore('test_touch')
+        store['R'] = {}
+        store.last_active['R'] -= 100
+        assert store.idle_seconds('R') >= 100
+        store['R']
+        assert store.idle_seconds('R') < 1
+
+    def test_stats_counts_players(self):
+        store = RoomStore('test_stats')
+        store['A'] = {'players': [{'id': 1}, {'id': 2}]}
+        store['B'] = {'players': {'x': {}}}
+        assert store.stats() == {'game': 'test_stats', 'rooms': 2, 'players': 3}
+
+    def test_registry(self):
+        store = RoomStore('test_registry')
+        assert get_store('test_registry') is store
+        assert 'test_registry' in all_stores()
+        assert room_stats()['total_rooms'] >= 0
+
+
+class TestRoomStoreBackend:
+    """Pluggable backends"""
+
+    def test_backend_write_through_and_load(self):
+        backend = RecordingBackend()
+        set_backend(backend)
+        try:
+            store = RoomStore('test_backend')
+            store['R'] = {'players': []}
+            assert backend.data[('test_backend', 'R')] == {'players': []}
+
+            # Another process's room shows up through the backend
+            backend.data[('test_backend', 'OTHER')] = {'players': ['p']}
+            assert 'OTHER' in store
+            assert store['OTHER'] == {'players': ['p']}
+
+            del store['R']
+            assert ('test_backend', 'R') not in backend.data
+        finally:
+            set_backend(MemoryBackend())
+
+
+@pytest.fixture(params=['local', 'fakeredis'])
+def redis_client(request):
+    """The in-process stand-in, plus fakeredis when it is installed"""
+    if request.param == 'fakeredis':
+        fakeredis = pytest.importorskip('fakeredis')
+        return fakeredis.FakeRedis()
+    return LocalRedis()
+
+
+@pytest.fixture
+def shared_backend(redis_client):
+    backend = RedisBackend(redis_client, prefix='test')
+    set_backend(backend)
+    yield backend
+    set_backend(MemoryBackend())
+
+
+@pytest.fixture
+def locking_backend(shared_backend):
+    """Shared backend whose room locks work (fakeredis needs lupa for them)"""
+    if not isinstance(shared_backend.client, LocalRedis):
+        pytest.importorskip('lupa')
+    return shared_backend
+
+
+class TestSharedBackend:
+    """Rooms shared between processes through a Redis-style backend"""
+
+    def test_from_url_memory(self):
+        backend = RedisBackend.from_url('memory://')
+        assert isinstance(backend.client, LocalRedis)
+        assert backend.shared
+
+    def test_round_trip_keeps_python_types(self, shared_backend):
+        shared_backend.save('g', 'R', {'revealed': {'a'}, 'n': 1})
+        assert shared_backend.load('g', 'R') == {'revealed': {'a'}, 'n': 1}
+        assert shared_backend.codes('g') == ['R']
+        shared_backend.delete('g', 'R')
+        assert shared_backend.load('g', 'R') is None
+
+    def test_other_process_sees_room_and_changes(self, locking_backend):
+        app = Flask(__name__)
+        init_room_store(app)
+        worker_a = RoomStore('test_shared')
+        worker_a['ROOM1'] = {'players': ['host']}
+
+        # A second process has its own store object over the same backend
+        worker_b = RoomStore('test_shared')
+        assert 'ROOM1' in worker_b
+
+        # Mutations made under the room lock are written back when it is released
+        with app.test_request_context():
+            with worker_b.lock('ROOM1'):
+                worker_b['ROOM1']['players'].append('guest')
+                assert worker_b['ROOM1']['players'] == ['host', 'guest']
+            assert worker_a['ROOM1']['players'] == ['host', 'guest']
+
+        del worker_a['ROOM1']
+        assert 'ROOM1' not in worker_b
+        assert len(worker_b) == 0
+
+    def test_enumeration_includes_remote_rooms(self, shared_backend):
+        store = RoomStore('test_shared_list')
+        shared_backend.save('test_shared_list', 'REMOTE', {'players': []})
+        assert list(store.keys()) == ['REMOTE']
+        assert store.stats()['rooms'] == 1
+
+    def test_stats_come_from_backend_counts(self, shared_backend, monkeypatch):
+        store = RoomStore('test_shared_counts')
+        shared_backend.save('test_shared_counts', 'A', {'players': ['x', 'y']})
+        shared_backend.save('test_shared_counts', 'B', {'players': ['z']})
+        monkeypatch.setattr(shared_backend, 'load', lambda game, code: pytest.fail('room loaded'))
+        assert store.stats() == {'game': 'test_shared_counts', 'rooms': 2, 'players': 3}
+
+        shared_backend.delete('test_shared_counts', 'A')
+        assert store.stats()['players'] == 1
+
+    def test_deleted_room_is_not_resurrected(self, locking_backend):
+        app = Flask(__name__)
+        store = RoomStore('test_shared_del')
+        store['R'] = {'players': []}
+        with app.test_request_context():
+            with store.lock('R'):
+                store['R']['players'].append('x')
+                del store['R']
+        assert locking_backend.load('test_shared_del', 'R') is None
+
+    def test_write_back_happens_before_the_lock_is_released(self, locking_backend):
+        app = Flask(__name__)
+        worker_a = RoomStore('test_shared_race')
+        worker_b = RoomStore('test_shared_race')
+        worker_a['R'] = {'count': 0}
+
+        @worker_a.synchronized
+        def bump_a(data):
+            worker_a['R']['count'] += 1
+
+        @worker_b.synchronized
+        def bump_b(data):
+            worker_b['R']['count'] += 1
+
+        def run(handler):
+            for _ in range(20):
+                with app.test_request_context():
+                    handler({'room_code': 'R'})
+
+        threads = [threading.Thread(target=run, args=(h,)) for h in (bump_a, bump_b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert locking_backend.load('test_shared_race', 'R')['count'] == 40
+
+    def test_background_tasks_write_back_on_release(self, locking_backend):
+        """Timer and reaper callbacks run outside any request"""
+        store = RoomStore('test_shared_task')
+        store['R'] = {'count': 0, 'log': []}
+
+        def task():
+            with store.lock('R'):
+                store['R']['count'] += 1
+                with store.lock('R'):
+                    store['R']['log'].append('nested')
+            # Outside the lock the task reads the backend again
+            reads.append(store['R'] is store['R'])
+
+        reads = []
+        thread = threading.Thread(target=task)
+        thread.start()
+        thread.join()
+        assert reads == [False]
+        assert locking_backend.load('test_shared_task', 'R') == {'count': 1, 'log': ['nested']}
+
+    def test_room_lock_is_reentrant(self):
+        set_backend(RedisBackend(LocalRedis()))
+        try:
+            store = RoomStore('test_shared_lock')
+            with store.lock('R'):
+                with store.lock('R'):
+                    pass
+        finally:
+            set_backend(MemoryBackend())
+
+
+class TestRoomReaper:
+    """TTL eviction of idle rooms"""
+
+    def test_room_state(self):
+        class Game:
+            state = 'FINISHED'
+
+        assert room_state({'status': 'waiting'}) == 'waiting'
+        assert room_state({'status': 'betting'}) == 'playing'
+        assert room_state({}) == 'waiting'
+        assert room_state(Game()) == 'finished'
+
+    def test_evicts_only_idle_rooms(self):
+        store = RoomStore('test_reap', ttls={'waiting': 60, 'playing': 600, 'finished': 5})
+        store['IDLE'] = {'status': 'waiting', 'players': []}
+        store['BUSY'] = {'status': 'playing', 'players': []}
+        store['DONE'] = {'status': 'finished', 'players': []}
+        store.last_active['IDLE'] -= 120
+        store.last_active['BUSY'] -= 120
+        store.last_active['DONE'] -= 10
+
+        reaper = RoomReaper()
+        evicted = reaper.sweep()
+
+        assert set(evicted) >= {('test_reap', 'IDLE'), ('test_reap', 'DONE')}
+        assert ('test_reap', 'BUSY') not in evicted
+        assert list(store.keys()) == ['BUSY']
+        stats = reaper.stats()
+        assert stats['evicted'][('test_reap', 'waiting')] == 1
+        assert stats['evicted'][('test_reap', 'finished')] == 1
+        assert stats['sweeps'] == 1
+
+    def test_activity_resets_the_clock(self):
+        store = RoomStore('test_reap_touch', ttls={'waiting': 60})
+        store['R'] = {'status': 'waiting'}
+        store.last_active['R'] -= 120
+        store['R']['players'] = []  # a handler uses the room
+        RoomReaper().sweep()
+        assert 'R' in store
+
+    def test_shared_backend_uses_last_save_time(self):
+        backend = RedisBackend(LocalRedis())
+        set_backend(backend)
+        try:
+            store = RoomStore('test_reap_shared', ttls={'waiting': 60})
+            store['R'] = {'status': 'waiting'}
+            assert store.idle_seconds('R') < 1
+            backend.client.hset('gamelab:active:test_reap_shared', 'R', 0)
+            RoomReaper().sweep()
+            assert backend.load('test_reap_shared', 'R') is None
+        finally:
+            set_backend(MemoryBackend())
+
+    def test_runs_on_a_background_task(self):
+        class FakeSocketIO:
+            def __init__(self):
+                self.tasks = []
+
+            def start_background_task(self, target, *args):
+                self.tasks.append((target, args))
+
+        sio = FakeSocketIO()
+        reaper = RoomReaper()
+        reaper.start(sio)
+        reaper.start(sio)
+        assert len(sio.tasks) == 1
+        reaper.stop()
+
+
+class TestGamesUseRoomStore:
+    """Every game module keeps its rooms in a RoomStore"""
+
+    def test_game_stores_registered(self):
+        import games.poker.socket_events  # noqa: F401
+        import games.connect4.socket_events  # noqa: F401
+        import games.pictionary.socket_events  # noqa: F401
+        import games.snake_ladder.socket_events  # noqa: F401
+        import games.roulette.socket_events  # noqa: F401
+        import games.hangman.socket_events  # noqa: F401
+        import games.mafia.routes  # noqa: F401
+        import games.trivia.socket_events  # noqa: F401
+        import games.canvas_battle.socket_events  # noqa: F401
+        import games.digit_guess.socket_events  # noqa: F401
+        import games.raja_mantri.socket_events  # noqa: F401
+        import games.pong.socket_events  # noqa: F401
+        import games.stickfight.socket_events  # noqa: F401
+        import games.roadfighter.socket_events  # noqa: F401
+        import games.tictactoe.routes  # noqa: F401
+        import games.memory.routes  # noqa: F401
+        import games.tambola.routes  # noqa: F401
+
+        expected = {
+            'poker', 'connect4', 'pictionary', 'snake_ladder', 'roulette',
+            'hangman', 'mafia', 'trivia', 'canvas_battle', 'digit_guess',
+            'raja_mantri', 'pong', 'stickfight', 'roadfighter', 'tictactoe',
+            'memory', 'tambola',
+        }
+        assert expected <= set(all_stores())
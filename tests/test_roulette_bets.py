@@ -0,0 +1,132 @@
+"""
+Tests for the roulette bet table and settlement
+"""
+import random
+
+import numpy as np
+
+from games.roulette.bets import (BET_COUNT, BET_MASKS, BET_TYPES, BETS, PAYOUT_TABLE, PAYOUTS,
+                                 aggregate, bet_index, bet_wins, settle)
+
+
+def reference_wins(bet_type, number):
+    """The original outside-bet rules"""
+    red = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+    return {
+        'red': number in red,
+        'black': number != 0 and number not in red,
+        'zero': number == 0,
+        'even': number != 0 and number % 2 == 0,
+        'odd': number % 2 == 1,
+        'low': 1 <= number <= 18,
+        'high': 19 <= number <= 36,
+        'first12': 1 <= number <= 12,
+        'second12': 13 <= number <= 24,
+        'third12': 25 <= number <= 36,
+    }[bet_type]
+
+
+class TestBetTable:
+    """The precomputed bets"""
+
+    def test_bet_counts(self):
+        kinds = [name.split('-')[0] for name in BET_TYPES]
+        assert kinds.count('straight') == 36  # 0 is 'zero'
+        assert kinds.count('split') == 60
+        assert kinds.count('street') == 14
+        assert kinds.count('corner') == 23
+        assert kinds.count('sixline') == 11
+        assert BET_COUNT == len(set(BET_TYPES)) == 157
+
+    def test_outside_bets_match_original_rules(self):
+        for bet_type in ('red', 'black', 'zero', 'even', 'odd', 'low', 'high',
+                         'first12', 'second12', 'third12'):
+            for number in range(37):
+                assert bet_wins(bet_type, number) == reference_wins(bet_type, number)
+        assert PAYOUTS['red'] == 2 and PAYOUTS['zero'] == 36 and PAYOUTS['first12'] == 3
+        # The old three-argument form still works
+        assert bet_wins('red', 1, 'red') and not bet_wins('black', 1, 'red')
+
+    def test_inside_bet_payouts(self):
+        assert PAYOUTS['straight-17'] == 36
+        assert PAYOUTS['split-17-20'] == 18
+        assert PAYOUTS['street-16-17-18'] == 12
+        assert PAYOUTS['corner-0-1-2-3'] == 9
+        assert PAYOUTS['sixline-16-17-18-19-20-21'] == 6
+        assert PAYOUTS['column2'] == 3
+
+    def test_every_bet_has_the_same_edge(self):
+        """Each bet returns 36 chips over the 37 pockets"""
+        assert (PAYOUT_TABLE.sum(axis=0) == 36).all()
+
+    def test_table_matches_masks(self):
+        for index, (_, numbers) in enumerate(BETS):
+            assert BET_MASKS[index] == sum(1 << n for n in numbers)
+            for number in range(37):
+                assert (PAYOUT_TABLE[number, index] > 0) == bool(BET_MASKS[index] >> number & 1)
+
+    def test_bet_index_accepts_any_order(self):
+        assert bet_index('split-20-17') == bet_index('split-17-20')
+        assert bet_index('straight-0') == bet_index('zero')
+        assert bet_index('split-17-19') is None
+        assert bet_index('corner-1-2-x') is None
+        assert bet_index(None) is None
+
+
+class TestSettlement:
+    """Settlement is one matrix-vector product"""
+
+    def test_settle_matches_per_bet_loop(self):
+        rng = random.Random(7)
+        players = [[{'type': rng.choice(BET_TYPES), 'amount': rng.randint(1, 50)}
+                    for _ in range(rng.randint(0, 30))] for _ in range(50)]
+        stakes = np.array([aggregate(bets) for bets in players])
+        for result in range(37):
+            expected = [sum(b['amount'] * PAYOUTS[b['type']] for b in bets
+                            if bet_wins(b['type'], result)) for bets in players]
+            assert settle(result, stakes).tolist() == expected
+
+    def test_spin_pays_inside_bets(self, monkeypatch):
+        from app import create_app
+        from games.roulette import socket_events
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+        client = socketio.test_client(app)
+        client.emit('create_roulette_room', {'player_name': 'P'})
+        code = client.get_received()[-1]['args'][0]['room_code']
+        client.emit('place_bet', {'room_code': code, 'bet_type': 'split-20-17', 'bet_amount': 10})
+        client.emit('place_bet', {'room_code': code, 'bet_type': 'red', 'bet_amount': 10})
+        client.emit('place_bet', {'room_code': code, 'bet_type': 'split-1-9', 'bet_amount': 10})
+        assert client.get_received()[-1]['args'][0]['message'] == 'Invalid bet type'
+
+        monkeypatch.setattr(socket_events.random, 'randint', lambda a, b: 17)
+        client.emit('spin_wheel', {'room_code': code})
+        result = [m for m in client.get_received() if m['name'] == 'wheel_result'][-1]['args'][0]
+        assert result['result'] == 17 and result['color'] == 'black'
+        assert list(result['player_results'].values())[0] == {'won': 180, 'chips': 1160}
+
+    def test_bets_aggregate_and_broadcast_deltas(self):
+        from app import create_app
+        from games.roulette.bets import BET_INDEX
+        from games.roulette.socket_events import roulette_rooms
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+        host, guest = socketio.test_client(app), socketio.test_client(app)
+        host.emit('create_roulette_room', {'player_name': 'H'})
+        code = host.get_received()[-1]['args'][0]['room_code']
+        guest.emit('join_roulette_room', {'player_name': 'G', 'room_code': code})
+        host.get_received()
+        guest.get_received()
+
+        for _ in range(20):
+            guest.emit('place_bet', {'room_code': code, 'bet_type': 'red', 'bet_amount': 5})
+        guest.emit('place_bet', {'room_code': code, 'bet_type': 'straight-0', 'bet_amount': 5})
+
+        room = roulette_rooms[code]
+        stakes = list(room['current_bets'].values())
+        assert len(stakes) == 1 and stakes[0].shape == (BET_COUNT,)
+        assert stakes[0][BET_INDEX['red']] == 100 and stakes[0][BET_INDEX['zero']] == 5
+        placed = [m['args'][0] for m in host.get_received() if m['name'] == 'bet_placed']
+        assert len(placed) == 21 and 'players' not in placed[-1]
+        assert placed[19]['bet_total'] == 100 and placed[-1]['bet_type'] == 'zero'
+        assert placed[-1]['remaining_chips'] == 895
@@ -0,0 +1,137 @@
+"""
+Tests for the shared live roulette wheel
+"""
+import time
+
+import pytest
+
+from games.roulette.live import STARTING_CHIPS, LiveWheel
+
+
+class FixedRng:
+    def __init__(self, result):
+        self.result = result
+
+    def randrange(self, n):
+        return self.result
+
+
+class TestLiveWheel:
+    """Rounds, bets and settlement"""
+
+    def test_idles_without_players(self):
+        wheel = LiveWheel()
+        assert wheel.open_betting(20) is False and wheel.phase == 'idle'
+        wheel.join('a', 'A')
+        assert wheel.open_betting(20, now=100) is True
+        assert wheel.phase == 'betting' and wheel.round == 1 and wheel.deadline == 120
+
+    def test_bets_only_while_betting(self):
+        wheel = LiveWheel()
+        wheel.join('a', 'A')
+        with pytest.raises(ValueError):
+            wheel.place_bet('a', 'red', 10)
+        wheel.open_betting(20)
+        with pytest.raises(ValueError):
+            wheel.place_bet('b', 'red', 10)
+        with pytest.raises(ValueError):
+            wheel.place_bet('a', 'red', STARTING_CHIPS + 1)
+        with pytest.raises(ValueError):
+            wheel.place_bet('a', 'split-1-9', 10)
+        assert wheel.place_bet('a', 'split-20-17', 10) == ('split-17-20', 10, STARTING_CHIPS - 10)
+        wheel.spin(5)
+        with pytest.raises(ValueError):
+            wheel.place_bet('a', 'red', 10)
+
+    def test_totals_follow_bets_and_leavers(self):
+        wheel = LiveWheel()
+        for sid in 'abc':
+            wheel.join(sid, sid.upper())
+        wheel.open_betting(20)
+        for _ in range(50):
+            wheel.place_bet('a', 'red', 1)
+        wheel.place_bet('b', 'red', 10)
+        wheel.place_bet('c', 'zero', 5)
+        assert wheel.totals_changed
+        assert wheel.totals_snapshot() == {'red': 60, 'zero': 5}
+        assert not wheel.totals_changed
+        wheel.leave('b')
+        assert wheel.totals_changed and wheel.totals_snapshot() == {'red': 50, 'zero': 5}
+
+    def test_settles_only_bettors(self):
+        wheel = LiveWheel()
+        for sid in 'abc':
+            wheel.join(sid, sid.upper())
+        wheel.open_betting(20)
+        wheel.place_bet('a', 'red', 10)
+        wheel.place_bet('a', 'straight-3', 10)
+        wheel.place_bet('b', 'black', 10)
+        assert wheel.spin(5, FixedRng(3)) == 3
+        payouts = wheel.settle()
+        assert payouts == {'a': (20, 380), 'b': (10, 0)}
+        assert wheel.players['a']['chips'] == STARTING_CHIPS - 20 + 380
+        assert wheel.players['c']['chips'] == STARTING_CHIPS
+        assert wheel.totals_snapshot() == {} and list(wheel.history) == [3]
+        assert wheel.state('a')['stakes'] == {}
+
+
+class TestLiveWheelEvents:
+    """The cycle runs itself on the timer wheel"""
+
+    def test_rounds_cycle_and_broadcasts_are_tiered(self, monkeypatch):
+        from app import create_app
+        from games.roulette import live_events
+        monkeypatch.setattr(live_events, 'BETTING_SECONDS', 0.6)
+        monkeypatch.setattr(live_events, 'SPIN_SECONDS', 0.2)
+        monkeypatch.setattr(live_events, 'TOTALS_INTERVAL', 0.2)
+        monkeypatch.setattr(live_events, 'live_wheel', LiveWheel())
+        monkeypatch.setattr(live_events, 'random', FixedRng(17))
+        app, socketio = create_app('development')
+        app.config['TESTING'] = True
+        bettor, watcher = socketio.test_client(app), socketio.test_client(app)
+        bettor.emit('join_live_wheel', {'player_name': 'B'})
+        watcher.emit('join_live_wheel', {'player_name': 'W'})
+        joined = [m for m in watcher.get_received() if m['name'] == 'live_wheel_joined'][0]
+        assert joined['args'][0]['phase'] == 'betting' and joined['args'][0]['chips'] == 1000
+
+        for _ in range(30):
+            bettor.emit('live_bet', {'bet_type': 'black', 'bet_amount': 10})
+        deadline = time.time() + 5
+        while time.time() < deadline and live_events.live_wheel.round < 2:
+            time.sleep(0.02)
+        assert live_events.live_wheel.round >= 2
+
+        watched = [m['name'] for m in watcher.get_received()]
+        assert 'live_bet_placed' not in watched
+        assert 0 < watched.count('live_wheel_totals') <= 4
+        assert 'live_wheel_result' in watched and 'live_wheel_settlement' not in watched
+
+        received = bettor.get_received()
+        assert [m['name'] for m in received].count('live_bet_placed') == 30
+        settlement = [m['args'][0] for m in received if m['name'] == 'live_wheel_settlement'][0]
+        assert settlement['result'] == 17
+        assert settlement['staked'] == 300 and settlement['won'] == 600
+        assert settlement['chips'] == 1300
+
+        bettor.disconnect()
+        watcher.emit('leave_live_wheel', {})
+        assert live_events.live_wheel.players == {}
+
+    def test_refused_behind_a_message_queue(self):
+        from games.roulette.live_events import register_live_wheel_events
+
+        class FakeSocketIO:
+            server_options = {'message_queue': 'redis://localhost:6379/0'}
+
+            def __init__(self):
+                self.handlers = {}
+
+            def on(self, event, namespace=None):
+                def decorator(handler):
+                    self.handlers[event] = handler
+                    return handler
+                return decorator
+
+        sio = FakeSocketIO()
+        register_live_wheel_events(sio)
+        assert list(sio.handlers) == ['join_live_wheel']
@@ -0,0 +1,44 @@
+"""
+Test suite for Socket.IO server mode selection
+"""
+from unittest.mock import Mock, patch
+
+from utils.server_mode import resolve_async_mode, run_blocking, run_options
+
+
+class TestResolveAsyncMode:
+    """Picking a mode from config"""
+
+    def test_default_is_threading(self):
+        assert resolve_async_mode(None) == 'threading'
+        assert resolve_async_mode('') == 'threading'
+
+    def test_unknown_mode_falls_back(self):
+        assert resolve_async_mode('tornado') == 'threading'
+
+    def test_missing_package_falls_back(self):
+        with patch('importlib.util.find_spec', return_value=None):
+            assert resolve_async_mode('eventlet') == 'threading'
+
+    def test_installed_green_mode_is_used(self):
+        with patch('importlib.util.find_spec', return_value=object()):
+            assert resolve_async_mode(' Gevent ') == 'gevent'
+
+
+class TestRunHelpers:
+    """Blocking calls and socketio.run options per mode"""
+
+    def test_run_blocking_calls_directly_in_threading_mode(self):
+        socketio = Mock(async_mode='threading')
+        assert run_blocking(socketio, lambda a, b=0: a + b, 2, b=3) == 5
+
+    def test_run_options(self):
+        assert run_options(Mock(async_mode='threading')) == {'allow_unsafe_werkzeug': True}
+        assert run_options(Mock(async_mode='eventlet')) == {}
+
+    def test_app_uses_configured_mode(self, monkeypatch):
+        from app import create_app
+        from config import DevelopmentConfig
+        monkeypatch.setattr(DevelopmentConfig, 'SOCKETIO_ASYNC_MODE', 'threading')
+        _, socketio = create_app('development')
+        assert socketio.async_mode == 'threading'
@@ -0,0 +1,126 @@
+"""
+Test suite for the shared timer wheel
+"""
+import random
+
+from utils.timer_wheel import TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_wheel(**kwargs):
+    clock = FakeClock()
+    return TimerWheel(tick=1, clock=clock, **kwargs), clock
+
+
+class TestTimerWheel:
+    """Scheduling, cascading and cancelling"""
+
+    def test_fires_after_delay(self):
+        wheel, clock = make_wheel()
+        fired = []
+        wheel.schedule(5, fired.append, 'a')
+        clock.now += 5
+        wheel.advance()
+        assert fired == []
+        clock.now += 1
+        assert wheel.advance() == 1
+        assert fired == ['a']
+        assert wheel.stats()['pending'] == 0
+
+    def test_cancel(self):
+        wheel, clock = make_wheel()
+        fired = []
+        timer = wheel.schedule(3, fired.append, 'a')
+        assert timer.active and timer.cancel()
+        assert not timer.cancel()
+        clock.now += 10
+        wheel.advance()
+        assert fired == [] and wheel.stats()['pending'] == 0
+
+    def test_long_delays_cascade_in_order(self):
+        """Delays across every level (and past the top) fire on their tick"""
+        wheel, clock = make_wheel(slots=8, levels=3)
+        rng = random.Random(4)
+        delays = sorted(rng.randrange(0, 2000) for _ in range(300))
+        fired = []
+        for delay in delays:
+            wheel.schedule(delay, lambda d=delay: fired.append((d, clock.now - 1000)))
+        for _ in range(2100):
+            clock.now += 1
+            wheel.advance()
+        assert len(fired) == len(delays)
+        for delay, when in fired:
+            assert delay < when <= delay + 1
+        assert [d for d, _ in fired] == delays
+
+    def test_catches_up_after_a_stall(self):
+        wheel, clock = make_wheel(slots=4, levels=2)
+        fired = []
+        for delay in (1, 7, 30):
+            wheel.schedule(delay, fired.append, delay)
+        clock.now += 100
+        assert wheel.advance() == 3
+        assert fired == [1, 7, 30]
+
+    def test_callback_errors_are_contained(self):
+        wheel, clock = make_wheel()
+        fired = []
+        wheel.schedule(1, lambda: 1 / 0)
+        wheel.schedule(1, fired.append, 'ok')
+        clock.now += 3
+        assert wheel.advance() == 2
+        assert fired == ['ok']
+
+    def test_many_timers_per_tick_cost(self):
+        """A tick only touches its own bucket, not every pending timer"""
+        wheel, clock = make_wheel()
+        for i in range(10000):
+            wheel.schedule(50 + i % 3000, lambda: None)
+        clock.now += 10
+        assert wheel.advance() == 0
+        assert wheel.stats()['pending'] == 10000
+
+    def test_tasks_run_off_the_wheel(self):
+        """Slow callbacks due on one tick run side by side, not one after another"""
+        import threading
+
+        class Sio:
+            threads = []
+
+            def start_background_task(self, target, *args):
+                thread = threading.Thread(target=target, args=args)
+                thread.start()
+                self.threads.append(thread)
+                return thread
+
+        wheel, clock = make_wheel()
+        wheel._socketio = sio = Sio()
+        both_started = threading.Barrier(2, timeout=2)
+        done = []
+
+        def table(name):
+            both_started.wait()
+            done.append(name)
+
+        wheel.schedule_task(3, table, 'a')
+        wheel.schedule_task(3, table, 'b')
+        clock.now += 4
+        assert wheel.advance() == 2
+        for thread in sio.threads:
+            thread.join(timeout=2)
+        assert sorted(done) == ['a', 'b']
+
+    def test_tasks_run_in_place_before_start(self):
+        wheel, clock = make_wheel()
+        fired = []
+        wheel.schedule_task(1, fired.append, 'a')
+        clock.now += 2
+        wheel.advance()
+        assert fired == ['a']
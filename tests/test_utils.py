@@ -90,78 +90,130 @@ class TestAuthModule:
 
 class TestLoggingConfig:
     """Tests for utils/logging_config.py"""
-    
-    def test_setup_logging_adds_handler(self):
-        """Test that setup_logging adds handler to app"""
-        from utils.logging_config import setup_logging
+
+    @staticmethod
+    def make_app(tmp_path, **config):
         from flask import Flask
-        
         app = Flask(__name__)
+        app.config['LOG_FILE'] = str(tmp_path / 'gamelab.log')
+        app.config.update(config)
+        return app
+
+    def test_setup_logging_adds_handler(self, tmp_path):
+        """Test that setup_logging adds handler to app"""
+        from utils.logging_config import setup_logging
+
+        app = self.make_app(tmp_path)
         initial_handlers = len(app.logger.handlers)
-        
+
         setup_logging(app)
-        
+
         # Should have added at least one handler
         assert len(app.logger.handlers) > initial_handlers
-        
-    def test_setup_logging_sets_log_level(self):
+
+    def test_setup_logging_sets_log_level(self, tmp_path):
         """Test that setup_logging sets INFO log level"""
         from utils.logging_config import setup_logging
-        from flask import Flask
-        
-        app = Flask(__name__)
+
+        app = self.make_app(tmp_path)
         setup_logging(app)
-        
+
         assert app.logger.level == logging.INFO
-        
-    def test_setup_logging_adds_rotating_file_handler(self):
-        """Test that setup_logging adds RotatingFileHandler"""
+
+    def test_setup_logging_adds_rotating_file_handler(self, tmp_path):
+        """Test that setup_logging writes to a RotatingFileHandler"""
         from utils.logging_config import setup_logging
-        from flask import Flask
         from logging.handlers import RotatingFileHandler
-        
-        app = Flask(__name__)
-        setup_logging(app)
-        
-        # Check if any handler is a RotatingFileHandler
+
+        app = self.make_app(tmp_path)
+        listener = setup_logging(app)
+
+        # File writes happen on the queue listener, not the calling thread
         has_rotating_handler = any(
-            isinstance(h, RotatingFileHandler) for h in app.logger.handlers
+            isinstance(h, RotatingFileHandler) for h in listener.handlers
         )
         assert has_rotating_handler
-        
-    def test_logging_handler_format(self):
+
+    def test_logging_handler_format(self, tmp_path):
         """Test that logging handler has correct format"""
         from utils.logging_config import setup_logging
-        from flask import Flask
         from logging.handlers import RotatingFileHandler
-        
-        app = Flask(__name__)
-        setup_logging(app)
-        
+
+        app = self.make_app(tmp_path)
+        listener = setup_logging(app)
+
         # Find the RotatingFileHandler
         rotating_handler = None
-        for handler in app.logger.handlers:
+        for handler in listener.handlers:
             if isinstance(handler, RotatingFileHandler):
                 rotating_handler = handler
                 break
-        
+
         assert rotating_handler is not None
         assert rotating_handler.formatter is not None
-        
-    def test_logging_handler_level(self):
-        """Test that logging handler has INFO level"""
+
+    def test_app_loggers_use_queue_handler(self, tmp_path):
+        """Socket handlers only enqueue records"""
         from utils.logging_config import setup_logging
-        from flask import Flask
-        from logging.handlers import RotatingFileHandler
-        
-        app = Flask(__name__)
+        from logging.handlers import QueueHandler
+        from flask.logging import default_handler
+
+        app = self.make_app(tmp_path)
         setup_logging(app)
+
+        for logger in (app.logger, logging.getLogger('games'), logging.getLogger('utils')):
+            queue_handlers = [h for h in logger.handlers if isinstance(h, QueueHandler)]
+            assert len(queue_handlers) == 1
+            assert default_handler not in logger.handlers
+
+    def test_records_reach_the_file(self, tmp_path):
+        """Queued records are written by the listener"""
+        from utils.logging_config import setup_logging
+
+        app = self.make_app(tmp_path)
+        listener = setup_logging(app)
+        logging.getLogger('games.poker.socket_events').info("Room %s created", 'ABC123')
+        logging.getLogger('games.poker.socket_events').debug("hidden %s", 'detail')
+        listener.stop()
+        listener.start()
+
+        text = (tmp_path / 'gamelab.log').read_text()
+        assert 'Room ABC123 created' in text
+        assert 'hidden' not in text
+
+    def test_debug_level_from_config(self, tmp_path):
+        """LOG_LEVEL gates what is logged"""
+        from utils.logging_config import setup_logging
+
+        app = self.make_app(tmp_path, LOG_LEVEL='debug')
+        setup_logging(app)
+        assert logging.getLogger('games').isEnabledFor(logging.DEBUG)
+
+        setup_logging(self.make_app(tmp_path))
+        assert not logging.getLogger('games').isEnabledFor(logging.DEBUG)
         
-        # Find the RotatingFileHandler
-        for handler in app.logger.handlers:
-            if isinstance(handler, RotatingFileHandler):
-                assert handler.level == logging.INFO
-                break
+    def test_logging_handler_level(self, tmp_path):
+        """The listener's handlers filter at the configured level"""
+        from utils.logging_config import setup_logging
+        from logging.handlers import RotatingFileHandler
+
+        listener = setup_logging(self.make_app(tmp_path, LOG_LEVEL='warning'))
+
+        assert any(isinstance(h, RotatingFileHandler) for h in listener.handlers)
+        assert listener.respect_handler_level
+        assert [h.level for h in listener.handlers] == [logging.WARNING] * len(listener.handlers)
+
+    def test_no_log_file_unless_configured(self, tmp_path, monkeypatch):
+        """Without LOG_FILE only the console handler is attached"""
+        from utils.logging_config import setup_logging
+        from logging.handlers import RotatingFileHandler
+        from flask import Flask
+
+        monkeypatch.chdir(tmp_path)
+        listener = setup_logging(Flask(__name__))
+
+        assert not any(isinstance(h, RotatingFileHandler) for h in listener.handlers)
+        assert not list(tmp_path.iterdir())
 
 
 class TestBaseGame:
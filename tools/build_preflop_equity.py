@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build the preflop equity table for games.poker.preflop.
+
+Simulates each of the 169 starting-hand classes against 1-5 random
+opponents with the vectorized evaluator and writes
+games/poker/data/preflop_equity.bin. With the default 20,000 deals per
+entry the standard error is about 0.35 points; it takes under a minute.
+
+Usage:
+    python tools/build_preflop_equity.py
+    python tools/build_preflop_equity.py --trials 100000 --seed 7
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np  # noqa: E402
+
+from games.poker import preflop  # noqa: E402
+from games.poker.equity import equity_vs_random  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--trials', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', type=Path, default=preflop.TABLE_PATH)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    equities = []
+    for index in range(preflop.CLASSES):
+        hand = preflop.class_hand(index)
+        equities.append([equity_vs_random(hand, opponents, args.trials, rng)
+                         for opponents in range(1, preflop.MAX_OPPONENTS + 1)])
+    preflop.pack(equities, args.output)
+
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.1f}s")
+    for name in ('AA', 'AKs', '72o'):
+        index = next(i for i in range(preflop.CLASSES) if preflop.class_name(i) == name)
+        print(f"{name:>4}  " + '  '.join(f"{e:.3f}" for e in equities[index]))
+
+
+if __name__ == '__main__':
+    main()
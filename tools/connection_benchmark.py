@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Connection benchmark for GameLab2's Socket.IO server modes.
+
+Starts the app (through wsgi.py) once per async mode, opens N idle
+Socket.IO WebSocket clients against it and reports what each connection
+costs the worker: resident memory, OS threads and connect latency. From
+that it estimates how many connections fit in one worker.
+
+Usage:
+    python tools/connection_benchmark.py                       # all modes, 500 clients
+    python tools/connection_benchmark.py --modes threading eventlet --clients 2000
+
+The client is a minimal raw-socket WebSocket implementation so the
+benchmark needs nothing beyond the app's own requirements. Linux only
+(server memory and threads are read from /proc).
+"""
+
+import argparse
+import base64
+import importlib.util
+import json
+import os
+import resource
+import socket
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_PATH = Path(__file__).parent.parent
+MODES = ['threading', 'eventlet', 'gevent']
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def raise_fd_limit():
+    """Each client needs a file descriptor on both ends"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def proc_status(pid):
+    """VmRSS (KB) and thread count of a process"""
+    status = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            status[key] = value.strip()
+    return int(status['VmRSS'].split()[0]), int(status['Threads'])
+
+
+# -- minimal WebSocket / Engine.IO client ------------------------------------
+
+def send_text(sock, text):
+    payload = text.encode()
+    mask = os.urandom(4)
+    header = bytes([0x81])
+    if len(payload) < 126:
+        header += bytes([0x80 | len(payload)])
+    else:
+        header += bytes([0x80 | 126]) + struct.pack('!H', len(payload))
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    sock.sendall(header + mask + masked)
+
+
+def recv_exact(sock, n):
+    data = b''
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError('connection closed')
+        data += chunk
+    return data
+
+
+def recv_text(sock):
+    first, second = recv_exact(sock, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', recv_exact(sock, 8))[0]
+    return recv_exact(sock, length).decode(errors='replace')
+
+
+def open_client(port):
+    """Open a WebSocket and complete the Socket.IO connect handshake"""
+    sock = socket.create_connection(('127.0.0.1', port), timeout=30)
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall((
+        'GET /socket.io/?EIO=4&transport=websocket HTTP/1.1\r\n'
+        f'Host: 127.0.0.1:{port}\r\n'
+        'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+        f'Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n'
+    ).encode())
+    response = b''
+    while b'\r\n\r\n' not in response:
+        chunk = sock.recv(1024)
+        if not chunk:
+            raise ConnectionError('handshake rejected')
+        response += chunk
+    if b' 101 ' not in response.split(b'\r\n', 1)[0]:
+        raise ConnectionError(response.split(b'\r\n', 1)[0].decode())
+
+    recv_text(sock)              # Engine.IO open packet: 0{"sid": ...}
+    send_text(sock, '40')        # Socket.IO connect to the default namespace
+    while not recv_text(sock).startswith('40'):
+        pass
+    return sock
+
+
+# -- benchmark ---------------------------------------------------------------
+
+def start_server(mode, port):
+    env = dict(os.environ, SOCKETIO_ASYNC_MODE=mode, PORT=str(port), FLASK_CONFIG='production')
+    server = subprocess.Popen(
+        [sys.executable, str(BASE_PATH / 'wsgi.py')], cwd=BASE_PATH, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'server exited with code {server.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('server did not start')
+
+
+def bench_mode(mode, clients, memory_mb):
+    port = free_port()
+    server = start_server(mode, port)
+    sockets = []
+    try:
+        time.sleep(1)
+        base_rss, base_threads = proc_status(server.pid)
+
+        latencies = []
+        for _ in range(clients):
+            start = time.perf_counter()
+            try:
+                sockets.append(open_client(port))
+            except OSError as e:
+                print(f"   ⚠️ stopped at {len(sockets)} clients: {e}")
+                break
+            latencies.append(time.perf_counter() - start)
+
+        time.sleep(1)
+        rss, threads = proc_status(server.pid)
+    finally:
+        for sock in sockets:
+            sock.close()
+        server.terminate()
+        server.wait(timeout=10)
+
+    connected = len(sockets)
+    kb_per_conn = (rss - base_rss) / connected if connected else 0
+    threads_per_conn = (threads - base_threads) / connected if connected else 0
+    latencies.sort()
+    fits = int(memory_mb * 1024 / kb_per_conn) if kb_per_conn > 0 else None
+    return {
+        'mode': mode,
+        'connected': connected,
+        'rss_kb_per_connection': round(kb_per_conn, 1),
+        'threads_per_connection': round(threads_per_conn, 2),
+        'connect_p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        'connect_p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+        'connections_per_worker': fits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--memory-mb', type=int, default=512,
+                        help='worker memory budget used for the connections-per-worker estimate')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    fd_limit = raise_fd_limit()
+    if args.clients * 2 + 64 > fd_limit:
+        print(f"⚠️ file descriptor limit is {fd_limit}; some connections may fail")
+
+    results = []
+    for mode in args.modes:
+        if mode != 'threading' and importlib.util.find_spec(mode) is None:
+            print(f"⏭️  {mode}: not installed (pip install {mode})")
+            continue
+        print(f"🔌 {mode}: opening {args.clients} clients...")
+        results.append(bench_mode(mode, args.clients, args.memory_mb))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print()
+    print(f"{'mode':<10} {'clients':>8} {'KB/conn':>9} {'threads/conn':>13} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {f'conns/{args.memory_mb}MB':>12}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['connected']:>8} {r['rss_kb_per_connection']:>9} "
+              f"{r['threads_per_connection']:>13} {r['connect_p50_ms']!s:>8} "
+              f"{r['connect_p99_ms']!s:>8} {r['connections_per_worker']!s:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Export poker hand histories to text or JSON lines.
+
+Reads the binary logs written by games.poker.hand_history (a directory of
+room folders, one room folder, or a single .phh file) and streams every hand
+to stdout or a file, one hand at a time.
+
+Usage:
+    python tools/export_hand_history.py hand_history
+    python tools/export_hand_history.py hand_history/ABC123 --format jsonl -o hands.jsonl
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from games.poker.hand_history import export, history_files  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text')
+    parser.add_argument('-o', '--output', type=Path)
+    args = parser.parse_args()
+
+    paths = history_files(args.path)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            count = export(paths, out, args.format)
+        print(f"Exported {count} hands from {len(paths)} files to {args.output}")
+    else:
+        export(paths, sys.stdout, args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Per-recipient payloads built from one shared state.
+
+Games that send each player a personalized copy of the table (their own
+cards, role or seat) used to rebuild the whole state once per player, so a
+deal cost O(players²) dict building. Here the shared part is built once and
+each recipient gets a shallow copy with only their private fields on top.
+Lists of per-player entries are shared too: ``mark_entry`` copies the list
+(references only) and replaces just the recipient's own entry.
+
+Shared values are referenced by every payload, so treat them as read-only
+once built.
+"""
+
+
+def personalize(shared, private):
+    """``shared`` with ``private`` fields on top, without copying shared values"""
+    payload = dict(shared)
+    payload.update(private)
+    return payload
+
+
+def mark_entry(entries, index, **fields):
+    """Copy of the list ``entries`` with entry ``index`` overlaid by ``fields``"""
+    marked = list(entries)
+    marked[index] = {**entries[index], **fields}
+    return marked
+
+
+def personalized_payloads(shared, recipients, private):
+    """Yield (recipient, payload) with ``private(recipient)`` over ``shared``"""
+    for recipient in recipients:
+        yield recipient, personalize(shared, private(recipient))
+
+
+def emit_personalized(socketio, event, shared, recipients, private, sid=None):
+    """Emit ``event`` to every recipient with their private fields.
+
+    ``sid(recipient)`` gives the socket to send to; by default the
+    recipient is the sid itself.
+    """
+    for recipient, payload in personalized_payloads(shared, recipients, private):
+        socketio.emit(event, payload, to=sid(recipient) if sid else recipient)
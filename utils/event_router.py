@@ -0,0 +1,78 @@
+"""Routing for Socket.IO event names shared by several games.
+
+Connect4, Pong, Stick Fight, Road Fighter and Digit Guess all use the
+generic ``create_room`` / ``join_room`` / ``start_game`` / ``leave_room``
+events. Socket.IO keeps one handler per event name, so instead of each game
+registering (and overwriting) its own, the router registers a single
+dispatcher per event and hands the payload straight to the game named in
+``data['game_type']``. Payloads without a ``game_type`` are routed by the
+store that owns ``data['room_code']``.
+"""
+
+import weakref
+
+from utils.metrics import track
+from utils.room_manager import get_store
+
+# socketio -> EventRouter
+_routers = weakref.WeakKeyDictionary()
+
+
+class EventRouter:
+    """One dispatcher per shared event, O(1) lookup of the game handler"""
+
+    def __init__(self, socketio):
+        self.socketio = socketio
+        self._routes = {}  # event -> {game_type: handler}
+
+    def on(self, event, game_type):
+        """Decorator registering ``handler`` for ``event`` of ``game_type``"""
+        def decorator(handler):
+            routes = self._routes.get(event)
+            if routes is None:
+                routes = self._routes[event] = {}
+                self.socketio.on(event)(self._dispatcher(event, routes))
+            routes[game_type] = track(event, game_type)(handler)
+            return handler
+        return decorator
+
+    def handler_for(self, event, data):
+        """The game handler that should receive ``event`` with ``data``"""
+        routes = self._routes.get(event, {})
+        handler = routes.get(data.get('game_type'))
+        if handler is None:
+            handler = self._route_by_room(routes, data)
+        return handler
+
+    def _dispatcher(self, event, routes):
+        def dispatch(data=None):
+            data = data if isinstance(data, dict) else {}
+            handler = self.handler_for(event, data)
+            if handler is None:
+                return None
+            return handler(data)
+
+        dispatch.__name__ = f'dispatch_{event}'
+        # Timed per game by the routed handlers instead
+        dispatch.skip_metrics = True
+        return dispatch
+
+    @staticmethod
+    def _route_by_room(routes, data):
+        """Fallback for clients that only send a room code"""
+        code = str(data.get('room_code') or '').upper().strip()
+        if not code:
+            return None
+        for game_type, handler in routes.items():
+            store = get_store(game_type)
+            if store is not None and code in store:
+                return handler
+        return None
+
+
+def get_router(socketio):
+    """Return the router attached to ``socketio``, creating it on first use"""
+    router = _routers.get(socketio)
+    if router is None:
+        router = _routers[socketio] = EventRouter(socketio)
+    return router
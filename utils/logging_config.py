@@ -1,13 +1,79 @@
+"""Application logging.
 
+Game modules log through ``logging.getLogger(__name__)``. ``setup_logging``
+gives the ``games`` and ``utils`` loggers (and the Flask app logger) a single
+``QueueHandler``: the calling socket handler only drops the record on a queue,
+and a background ``QueueListener`` does the console and file writes. Loggers
+are level gated, so ``logger.debug(...)`` calls with %-style arguments cost a
+level check and nothing else in production.
+"""
+
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask.logging import default_handler
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Loggers that feed the queue besides the app's own logger
+APP_LOGGERS = ('games', 'utils')
+
+_listener = None
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging(app):
-    handler = RotatingFileHandler('gamelab.log', maxBytes=10000, backupCount=3)
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    
-    # Add handler to app logger
-    app.logger.addHandler(handler)
-    app.logger.setLevel(logging.INFO)
+    """Route app and game logging through a background queue listener.
+
+    Config:
+        LOG_LEVEL      - level name (default INFO; DEBUG for per-action detail)
+        LOG_FILE       - rotating log file (unset: console only)
+        LOG_MAX_BYTES  - size at which the file rotates (default 10 MB)
+    """
+    global _listener
+    _stop_listener()
+
+    level = logging.getLevelName(str(app.config.get('LOG_LEVEL', 'INFO')).upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    log_file = app.config.get('LOG_FILE')
+    if log_file:
+        handlers.append(RotatingFileHandler(
+            log_file,
+            maxBytes=app.config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+            backupCount=3))
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+
+    # queue.Queue (not SimpleQueue) so eventlet/gevent patching applies
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    for logger in [app.logger] + [logging.getLogger(name) for name in APP_LOGGERS]:
+        for old in [h for h in logger.handlers if isinstance(h, QueueHandler) or h is default_handler]:
+            logger.removeHandler(old)
+        logger.addHandler(queue_handler)
+        logger.setLevel(level)
+        if logger is not app.logger:
+            logger.propagate = False
+
+    app.extensions['logging_listener'] = _listener
+    return _listener
+
+
+atexit.register(_stop_listener)
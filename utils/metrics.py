@@ -0,0 +1,278 @@
+"""Per-event Socket.IO metrics.
+
+``instrument_socketio`` wraps ``socketio.on`` so every handler registered by
+the ``register_*_events`` functions is timed without touching the games.
+For each (game, event) pair it records calls, errors, a sliding window of
+recent latencies and the payload size of one call in ``PAYLOAD_SAMPLE``
+(sizing means serializing the payload, too dear to do on every event).
+``render_metrics`` turns that into the Prometheus text exposition format
+served on ``/metrics`` to scrapers holding ``METRICS_TOKEN``. Room and player
+counts come from the room stores, which read a shared backend's counters
+rather than loading every room.
+
+The game label comes from the handler's module (``games.poker.socket_events``
+-> ``poker``); handlers routed through ``utils.event_router`` are labelled
+with the game they were routed to.
+"""
+
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+from utils.room_codes import room_codes
+from utils.room_manager import reaper, room_stats
+
+# Latency/payload quantiles are computed over this many recent calls
+WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+# Payload sizes are measured on one call in this many
+PAYLOAD_SAMPLE = 16
+
+# (game, event) -> EventStats
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class EventStats:
+    """Counters and recent samples for one event of one game"""
+
+    def __init__(self, game, event):
+        self.game = game
+        self.event = event
+        self.calls = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.payload_sum = 0
+        self.payload_count = 0
+        self.latencies = deque(maxlen=WINDOW)
+        self.payloads = deque(maxlen=WINDOW)
+        self._lock = threading.Lock()
+
+    def sample_payload(self):
+        """Whether the next call's payload should be measured"""
+        return self.calls % PAYLOAD_SAMPLE == 0
+
+    def record(self, seconds, payload_bytes=None, failed=False):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.latency_sum += seconds
+            self.latencies.append(seconds)
+            if payload_bytes is not None:
+                self.payload_sum += payload_bytes
+                self.payload_count += 1
+                self.payloads.append(payload_bytes)
+
+    def snapshot(self):
+        """Consistent copy of the counters plus sorted samples"""
+        with self._lock:
+            return {
+                'game': self.game,
+                'event': self.event,
+                'calls': self.calls,
+                'errors': self.errors,
+                'latency_sum': self.latency_sum,
+                'payload_sum': self.payload_sum,
+                'payload_count': self.payload_count,
+                'latencies': sorted(self.latencies),
+                'payloads': sorted(self.payloads),
+            }
+
+
+def get_stats(game, event):
+    """Return (creating on first use) the stats for ``event`` of ``game``"""
+    key = (game, event)
+    stats = _stats.get(key)
+    if stats is None:
+        with _stats_lock:
+            stats = _stats.setdefault(key, EventStats(game, event))
+    return stats
+
+
+def reset_metrics():
+    """Forget every recorded event"""
+    with _stats_lock:
+        _stats.clear()
+
+
+def payload_size(args):
+    """Approximate wire size in bytes of an event's arguments"""
+    size = 0
+    for arg in args:
+        if arg is None:
+            continue
+        if isinstance(arg, (bytes, bytearray)):
+            size += len(arg)
+        elif isinstance(arg, str):
+            size += len(arg.encode())
+        else:
+            try:
+                size += len(json.dumps(arg, separators=(',', ':'), default=str))
+            except (TypeError, ValueError):
+                pass
+    return size
+
+
+def game_of(handler):
+    """Game name for a handler, taken from its module path"""
+    module = getattr(handler, '__module__', '') or ''
+    parts = module.split('.')
+    if len(parts) > 1 and parts[0] == 'games':
+        return parts[1]
+    return parts[0] or 'app'
+
+
+def _max_positional(handler):
+    """How many positional arguments ``handler`` accepts (None = any)"""
+    try:
+        params = inspect.signature(handler).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind == p.VAR_POSITIONAL for p in params):
+        return None
+    return sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in params)
+
+
+def track(event, game=None):
+    """Decorator timing a handler under ``event`` / ``game``"""
+    def decorator(handler):
+        stats = get_stats(game or game_of(handler), event)
+        max_args = _max_positional(handler)
+
+        @wraps(handler)
+        def timed(*args):
+            # Flask-SocketIO retries connect/disconnect handlers with fewer
+            # arguments on TypeError; trim here so that never counts as an error
+            if max_args is not None:
+                args = args[:max_args]
+            payload_bytes = payload_size(args) if stats.sample_payload() else None
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = handler(*args)
+                failed = False
+                return result
+            finally:
+                stats.record(time.perf_counter() - start, payload_bytes, failed)
+
+        timed.metrics_tracked = True
+        return timed
+    return decorator
+
+
+def instrument_socketio(socketio):
+    """Time every handler registered through ``socketio.on`` from now on"""
+    if getattr(socketio, 'metrics_instrumented', False):
+        return socketio
+    original_on = socketio.on
+
+    def on(message, namespace=None):
+        register = original_on(message, namespace)
+
+        def decorator(handler):
+            if getattr(handler, 'metrics_tracked', False) or getattr(handler, 'skip_metrics', False):
+                register(handler)
+                return handler
+            register(track(message)(handler))
+            return handler
+        return decorator
+
+    socketio.on = on
+    socketio.metrics_instrumented = True
+    return socketio
+
+
+def _quantile(samples, q):
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format"""
+    with _stats_lock:
+        snapshots = [s.snapshot() for s in _stats.values()]
+    snapshots.sort(key=lambda s: (s['game'], s['event']))
+
+    lines = [
+        '# HELP gamelab_socketio_events_total Socket.IO events handled.',
+        '# TYPE gamelab_socketio_events_total counter',
+    ]
+    for s in snapshots:
+        lines.append(f"gamelab_socketio_events_total{{{_labels(game=s['game'], event=s['event'])}}} {s['calls']}")
+
+    lines += [
+        '# HELP gamelab_socketio_event_errors_total Socket.IO handlers that raised.',
+        '# TYPE gamelab_socketio_event_errors_total counter',
+    ]
+    for s in snapshots:
+        lines.append(f"gamelab_socketio_event_errors_total{{{_labels(game=s['game'], event=s['event'])}}} {s['errors']}")
+
+    for name, help_text, samples_key, sum_key, count_key in (
+            ('gamelab_socketio_event_latency_seconds', 'Handler latency over recent calls.',
+             'latencies', 'latency_sum', 'calls'),
+            ('gamelab_socketio_event_payload_bytes', 'Event payload size over sampled calls.',
+             'payloads', 'payload_sum', 'payload_count')):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} summary']
+        for s in snapshots:
+            labels = _labels(game=s['game'], event=s['event'])
+            for q in QUANTILES:
+                lines.append(f'{name}{{{labels},quantile="{q}"}} {_quantile(s[samples_key], q):.6g}')
+            lines.append(f'{name}_sum{{{labels}}} {s[sum_key]:.6g}')
+            lines.append(f"{name}_count{{{labels}}} {s[count_key]}")
+
+    rooms = room_stats()
+    lines += [
+        '# HELP gamelab_rooms Live rooms per game.',
+        '# TYPE gamelab_rooms gauge',
+    ]
+    lines += [f"gamelab_rooms{{{_labels(game=g['game'])}}} {g['rooms']}" for g in rooms['games']]
+    lines += [
+        '# HELP gamelab_players Players in live rooms per game.',
+        '# TYPE gamelab_players gauge',
+    ]
+    lines += [f"gamelab_players{{{_labels(game=g['game'])}}} {g['players']}" for g in rooms['games']]
+
+    reaped = reaper.stats()
+    lines += [
+        '# HELP gamelab_rooms_evicted_total Idle rooms evicted by the reaper.',
+        '# TYPE gamelab_rooms_evicted_total counter',
+    ]
+    lines += [f"gamelab_rooms_evicted_total{{{_labels(game=game, state=state)}}} {count}"
+              for (game, state), count in sorted(reaped['evicted'].items())]
+    lines += [
+        '# HELP gamelab_room_reaper_sweep_seconds Duration of the last reaper sweep.',
+        '# TYPE gamelab_room_reaper_sweep_seconds gauge',
+        f"gamelab_room_reaper_sweep_seconds {reaped['last_sweep_seconds']:.6g}",
+    ]
+
+    codes = room_codes.stats()
+    lines += [
+        '# HELP gamelab_room_codes_in_use Room codes currently held, per game.',
+        '# TYPE gamelab_room_codes_in_use gauge',
+    ]
+    lines += [f"gamelab_room_codes_in_use{{{_labels(game=game)}}} {n}"
+              for game, n in sorted(codes['games'].items())]
+    lines += [
+        '# HELP gamelab_room_code_occupancy Fraction of the room code space in use.',
+        '# TYPE gamelab_room_code_occupancy gauge',
+        f"gamelab_room_code_occupancy {codes['occupancy']:.6g}",
+        '# HELP gamelab_room_codes_issued_total Fresh room codes handed out.',
+        '# TYPE gamelab_room_codes_issued_total counter',
+        f"gamelab_room_codes_issued_total {codes['issued']}",
+        '# HELP gamelab_room_codes_reused_total Freed room codes handed out again.',
+        '# TYPE gamelab_room_codes_reused_total counter',
+        f"gamelab_room_codes_reused_total {codes['reused']}",
+    ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,185 @@
+"""Connection registry: which game rooms each Socket.IO client is in.
+
+Games join and leave rooms through ``join_game_room`` / ``leave_game_room``,
+which keep a reverse index of sid -> {(game, room_code)}. A single
+``disconnect`` handler (installed by ``connections.install``) then looks up
+exactly the rooms a dropped client was in and runs each game's cleanup for
+that room, instead of every game scanning all of its rooms and players.
+
+``Roster`` does the same inside a room: a player list that also indexes
+player id -> seat, so handlers find the acting player without a scan.
+"""
+
+import logging
+import threading
+import weakref
+
+from flask import request
+from flask_socketio import join_room, leave_room
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionRegistry:
+    """Reverse index of sid -> (game, room_code) memberships"""
+
+    def __init__(self):
+        self._rooms = {}        # sid -> {(game, room_code)}
+        self._handlers = {}     # game -> disconnect cleanup(room_code)
+        self._lock = threading.Lock()
+        self._installed = weakref.WeakSet()  # socketio instances with the hook
+
+    def add(self, sid, game, room_code):
+        with self._lock:
+            self._rooms.setdefault(sid, set()).add((game, room_code))
+
+    def discard(self, sid, game, room_code):
+        with self._lock:
+            rooms = self._rooms.get(sid)
+            if rooms is not None:
+                rooms.discard((game, room_code))
+                if not rooms:
+                    del self._rooms[sid]
+
+    def rooms_of(self, sid):
+        """The (game, room_code) pairs ``sid`` is in"""
+        with self._lock:
+            return set(self._rooms.get(sid, ()))
+
+    def pop(self, sid):
+        """Forget ``sid`` and return the rooms it was in"""
+        with self._lock:
+            return self._rooms.pop(sid, set())
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def on_disconnect(self, game):
+        """Decorator registering ``game``'s cleanup for one room.
+
+        The handler is called as ``handler(room_code)`` inside the
+        disconnect event, so ``request.sid`` is the client that dropped.
+        """
+        def decorator(handler):
+            self._handlers[game] = handler
+            return handler
+        return decorator
+
+    def disconnect(self, sid):
+        """Run the cleanup of every game room ``sid`` was in"""
+        for game, room_code in sorted(self.pop(sid)):
+            handler = self._handlers.get(game)
+            if handler is None:
+                continue
+            try:
+                handler(room_code)
+            except Exception:
+                logger.exception("Disconnect cleanup failed for %s room %s", game, room_code)
+
+    def install(self, socketio):
+        """Register the single disconnect hook on ``socketio``"""
+        if socketio in self._installed:
+            return
+        self._installed.add(socketio)
+
+        @socketio.on('disconnect')
+        def handle_disconnect():
+            """Clean up only the rooms the dropped client was in"""
+            self.disconnect(request.sid)
+
+
+connections = ConnectionRegistry()
+
+
+class Roster(list):
+    """A room's player list with a player id -> seat index.
+
+    It is still the plain ``room['players']`` list (iteration, seat indexing
+    and JSON all behave the same), but ``seat(sid)`` / ``get(sid)`` are dict
+    lookups instead of a scan over every player. Appending a player indexes
+    the new seat directly; removals and reorders re-number the seats after
+    the change, which only happens on join/leave, never per action.
+    """
+
+    def __init__(self, players=(), key='id'):
+        super().__init__(players)
+        self.key = key
+        self._reindex()
+
+    def __reduce__(self):
+        # Rebuild through __init__ so the index survives the Redis backend
+        return (self.__class__, (list(self), self.key))
+
+    def _reindex(self):
+        self._seats = {player[self.key]: i for i, player in enumerate(self)}
+
+    def seat(self, player_id):
+        """Seat index of ``player_id``, or None"""
+        return self._seats.get(player_id)
+
+    def get(self, player_id, default=None):
+        """The player dict for ``player_id``, or ``default``"""
+        seat = self._seats.get(player_id)
+        return default if seat is None else self[seat]
+
+    def discard(self, player_id):
+        """Remove and return ``player_id``'s player (None if not seated)"""
+        seat = self._seats.get(player_id)
+        return None if seat is None else self.pop(seat)
+
+    def append(self, player):
+        super().append(player)
+        self._seats[player[self.key]] = len(self) - 1
+
+    def extend(self, players):
+        super().extend(players)
+        self._reindex()
+
+    def __iadd__(self, players):
+        self.extend(players)
+        return self
+
+    def insert(self, index, player):
+        super().insert(index, player)
+        self._reindex()
+
+    def pop(self, index=-1):
+        player = super().pop(index)
+        self._reindex()
+        return player
+
+    def remove(self, player):
+        super().remove(player)
+        self._reindex()
+
+    def clear(self):
+        super().clear()
+        self._seats = {}
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reindex()
+
+    def reverse(self):
+        super().reverse()
+        self._reindex()
+
+
+def join_game_room(game, room_code):
+    """Join the Socket.IO room and index it for disconnect cleanup"""
+    join_room(room_code)
+    connections.add(request.sid, game, room_code)
+
+
+def leave_game_room(game, room_code):
+    """Leave the Socket.IO room and drop it from the index"""
+    leave_room(room_code)
+    connections.discard(request.sid, game, room_code)
@@ -0,0 +1,201 @@
+"""Room code allocation shared by every game.
+
+``room_codes.allocate(game)`` hands out 6-character codes that are unique
+across all games, without the retry loop each game used to run against its
+own room dict. Fresh codes come from walking a keyed pseudo-random
+permutation of the whole code space, so the n-th code is computed directly
+and never collides with an earlier one, however full the space is. Codes
+freed by ``release`` (``RoomStore`` calls it when a room is deleted or
+evicted) are queued and only handed out again once they have been free for
+``reuse_after`` seconds, so a stale client can't land in someone else's new
+room straight away.
+
+Bound to a shared room backend, every process walks one permutation and
+code ownership lives in the backend, so a room created by one process can
+free its code from any other. Freed codes are not reused in that mode: the
+shared walk covers the whole space before it would need them.
+"""
+
+import random
+import secrets
+import string
+import threading
+import time
+from collections import deque
+from itertools import count
+
+ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 6
+
+FEISTEL_ROUNDS = 4
+
+
+class RoomCodeAllocator:
+    """Unique room codes: permutation walk for fresh codes, FIFO for freed ones"""
+
+    def __init__(self, alphabet=ALPHABET, length=CODE_LENGTH, reuse_after=300, key=None):
+        self.alphabet = alphabet
+        self.length = length
+        self.capacity = len(alphabet) ** length
+        self.reuse_after = reuse_after
+        # Feistel halves wide enough to cover the code space
+        self._half_bits = (max(self.capacity - 1, 1).bit_length() + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._set_key(secrets.randbits(64) if key is None else key)
+        self._counter = count().__next__
+        self._owners = {}       # code -> game, for every code in use
+        self._per_game = {}     # game -> codes in use
+        self._free = deque()    # (code, released_at), oldest first
+        self.issued = 0         # fresh codes taken from the permutation
+        self.reused = 0
+        self._shared = None     # backend holding ownership once bound
+        self._lock = threading.Lock()
+
+    def _set_key(self, key):
+        self.key = key
+        rng = random.Random(key)
+        self._round_keys = [rng.getrandbits(self._half_bits) for _ in range(FEISTEL_ROUNDS)]
+
+    def bind(self, backend):
+        """Share the permutation key and position through a shared room backend.
+
+        Every server process then walks the same permutation from one
+        counter, so codes stay unique across processes as well as games.
+        """
+        if not getattr(backend, 'shared', False):
+            return
+        with self._lock:
+            self._set_key(backend.shared_value('room_codes:key', self.key))
+            self._counter = lambda: backend.sequence('room_codes')
+            self._shared = backend
+
+    # -- permutation ----------------------------------------------------
+
+    def _round(self, half, round_key):
+        half = (half * 0x9E3779B1 + round_key) & self._half_mask
+        return half ^ (half >> (self._half_bits // 2 + 1))
+
+    def _feistel(self, value):
+        left, right = value >> self._half_bits, value & self._half_mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << self._half_bits) | right
+
+    def permute(self, index):
+        """The ``index``-th position of the permutation of ``range(capacity)``.
+
+        The Feistel network permutes a power-of-two range slightly larger
+        than the code space; walking the cycle until the value lands inside
+        it keeps the mapping a bijection and takes about two steps on average.
+        """
+        value = self._feistel(index)
+        while value >= self.capacity:
+            value = self._feistel(value)
+        return value
+
+    def encode(self, value):
+        """Render a number in ``range(capacity)`` as a code"""
+        base = len(self.alphabet)
+        chars = []
+        for _ in range(self.length):
+            value, digit = divmod(value, base)
+            chars.append(self.alphabet[digit])
+        return ''.join(reversed(chars))
+
+    # -- allocation -----------------------------------------------------
+
+    def allocate(self, game):
+        """Reserve and return a code nobody (in any game) is using"""
+        with self._lock:
+            if self._shared is not None:
+                return self._allocate_shared(game)
+            code = self._take_free(cooled_only=True) or self._take_fresh() or self._take_free()
+            if code is None:
+                raise RuntimeError('All room codes are in use')
+            self._owners[code] = game
+            self._per_game[game] = self._per_game.get(game, 0) + 1
+            return code
+
+    def _allocate_shared(self, game):
+        while True:
+            index = self._counter()
+            if index >= self.capacity:
+                raise RuntimeError('All room codes are in use')
+            self.issued += 1
+            code = self.encode(self.permute(index))
+            # Skip the rare code a room was stored under directly (see claim)
+            if self._shared.claim_code(code, game):
+                return code
+
+    def _take_free(self, cooled_only=False):
+        deadline = time.monotonic() - self.reuse_after
+        while self._free:
+            code, released_at = self._free[0]
+            if cooled_only and released_at > deadline:
+                return None
+            self._free.popleft()
+            if code not in self._owners:
+                self.reused += 1
+                return code
+        return None
+
+    def _take_fresh(self):
+        while True:
+            index = self._counter()
+            if index >= self.capacity:
+                return None
+            self.issued += 1
+            code = self.encode(self.permute(index))
+            # Skip the rare code a room was stored under directly (see claim)
+            if code not in self._owners:
+                return code
+
+    def claim(self, code, game):
+        """Record a code chosen outside the allocator so it is never handed out"""
+        if self._shared is not None:
+            self._shared.claim_code(code, game)
+            return
+        with self._lock:
+            if code not in self._owners:
+                self._owners[code] = game
+                self._per_game[game] = self._per_game.get(game, 0) + 1
+
+    def release(self, code, game=None):
+        """Free ``code`` for later reuse; ignored unless ``game`` holds it"""
+        if self._shared is not None:
+            return self._shared.release_code(code, game)
+        with self._lock:
+            owner = self._owners.get(code)
+            if owner is None or (game is not None and owner != game):
+                return False
+            del self._owners[code]
+            self._per_game[owner] -= 1
+            self._free.append((code, time.monotonic()))
+            return True
+
+    def owner(self, code):
+        """Game currently holding ``code``, or None"""
+        if self._shared is not None:
+            return self._shared.code_owner(code)
+        return self._owners.get(code)
+
+    def stats(self):
+        """Occupancy of the code space, overall and per game"""
+        if self._shared is not None:
+            per_game = self._shared.code_counts()
+        else:
+            with self._lock:
+                per_game = dict(self._per_game)
+        in_use = sum(per_game.values())
+        return {
+            'capacity': self.capacity,
+            'in_use': in_use,
+            'occupancy': in_use / self.capacity,
+            'issued': self.issued,
+            'reused': self.reused,
+            'free': len(self._free),
+            'games': {game: n for game, n in per_game.items() if n},
+        }
+
+
+room_codes = RoomCodeAllocator()
@@ -0,0 +1,739 @@
+"""Shared room storage used by every game module.
+
+Each game keeps its live rooms in a ``RoomStore``. A store still behaves
+like the plain dict the games used before (``code in rooms``,
+``rooms[code]``, ``del rooms[code]``), but it also tracks per-room locks
+and activity timestamps, and registers itself so rooms from every game can
+be counted and enumerated in one place. Where room state physically lives is
+decided by a pluggable backend, and a background ``RoomReaper`` evicts rooms
+that have been idle longer than the TTL for their state.
+"""
+
+import logging
+import pickle
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_app_context
+
+from utils.room_codes import room_codes
+
+logger = logging.getLogger(__name__)
+
+# game name -> RoomStore
+_stores = {}
+_stores_lock = threading.Lock()
+
+# Seconds a room may sit idle in each state before the reaper evicts it
+DEFAULT_TTLS = {'waiting': 30 * 60, 'playing': 60 * 60, 'finished': 5 * 60}
+
+
+class MemoryBackend:
+    """Default backend: rooms only live in this process's memory."""
+
+    # Whether other processes can see and change the same rooms
+    shared = False
+
+    def load(self, game, code):
+        return None
+
+    def save(self, game, code, room):
+        pass
+
+    def delete(self, game, code):
+        pass
+
+    def codes(self, game):
+        return []
+
+    def lock(self, game, code):
+        return None
+
+    def touched(self, game, code):
+        """Wall-clock time of the room's last save, if the backend tracks it"""
+        return None
+
+    def room_counts(self, game):
+        """(rooms, players) for ``game``, if the backend keeps count"""
+        return None
+
+
+class LocalRedis:
+    """In-process stand-in for the small part of the redis client we use.
+
+    Lets the shared backend run (and be tested) without a Redis server;
+    selected with ``ROOM_STORE_URL=memory://``.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._locks = {}
+        self._mutex = threading.Lock()
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, value, nx=False):
+        with self._mutex:
+            if nx and key in self._data:
+                return None
+            self._data[key] = value
+            return True
+
+    def incr(self, key):
+        with self._mutex:
+            self._data[key] = int(self._data.get(key, 0)) + 1
+            return self._data[key]
+
+    def delete(self, *keys):
+        with self._mutex:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def sadd(self, key, *members):
+        with self._mutex:
+            self._data.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members):
+        with self._mutex:
+            self._data.get(key, set()).difference_update(members)
+
+    def smembers(self, key):
+        return set(self._data.get(key, set()))
+
+    def hset(self, key, field, value):
+        with self._mutex:
+            self._data.setdefault(key, {})[field] = value
+
+    def hget(self, key, field):
+        return self._data.get(key, {}).get(field)
+
+    def hsetnx(self, key, field, value):
+        with self._mutex:
+            hash_ = self._data.setdefault(key, {})
+            if field in hash_:
+                return 0
+            hash_[field] = value
+            return 1
+
+    def hincrby(self, key, field, amount=1):
+        with self._mutex:
+            hash_ = self._data.setdefault(key, {})
+            hash_[field] = int(hash_.get(field, 0)) + amount
+            return hash_[field]
+
+    def hgetall(self, key):
+        return dict(self._data.get(key, {}))
+
+    def hdel(self, key, *fields):
+        with self._mutex:
+            hash_ = self._data.get(key, {})
+            return sum(hash_.pop(field, None) is not None for field in fields)
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        with self._mutex:
+            return self._locks.setdefault(name, threading.Lock())
+
+
+class RedisBackend:
+    """Keeps rooms in Redis so several server processes can host them.
+
+    Rooms are pickled (several games store sets, enums or game objects) under
+    ``<prefix>:room:<game>:<code>``; ``<prefix>:codes:<game>`` indexes them and
+    ``<prefix>:active:<game>`` holds each room's last save time so the reaper
+    sees activity from every process. ``<prefix>:players:<game>`` keeps each
+    room's player count, so sizes can be reported without loading every room.
+    """
+
+    shared = True
+
+    def __init__(self, client, prefix='gamelab', lock_timeout=10):
+        self.client = client
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Build a backend from ``redis://...`` or ``memory://``"""
+        if url.startswith('memory://'):
+            return cls(LocalRedis(), **kwargs)
+        import redis  # only needed when rooms are shared across processes
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _key(self, game, code):
+        return f'{self.prefix}:room:{game}:{code}'
+
+    def load(self, game, code):
+        raw = self.client.get(self._key(game, code))
+        return pickle.loads(raw) if raw is not None else None
+
+    def save(self, game, code, room):
+        self.client.set(self._key(game, code), pickle.dumps(room, pickle.HIGHEST_PROTOCOL))
+        self.client.sadd(f'{self.prefix}:codes:{game}', code)
+        self.client.hset(f'{self.prefix}:active:{game}', code, time.time())
+        self.client.hset(f'{self.prefix}:players:{game}', code, _player_count(room))
+
+    def delete(self, game, code):
+        self.client.delete(self._key(game, code))
+        self.client.srem(f'{self.prefix}:codes:{game}', code)
+        self.client.hdel(f'{self.prefix}:active:{game}', code)
+        self.client.hdel(f'{self.prefix}:players:{game}', code)
+
+    def codes(self, game):
+        return [c.decode() if isinstance(c, bytes) else c
+                for c in self.client.smembers(f'{self.prefix}:codes:{game}')]
+
+    def lock(self, game, code):
+        return self.client.lock(f'{self.prefix}:lock:{game}:{code}',
+                                timeout=self.lock_timeout)
+
+    def touched(self, game, code):
+        value = self.client.hget(f'{self.prefix}:active:{game}', code)
+        return float(value) if value is not None else None
+
+    def room_counts(self, game):
+        players = self.client.hgetall(f'{self.prefix}:players:{game}')
+        return len(players), sum(int(n) for n in players.values())
+
+    def sequence(self, name):
+        """Next value (from 0) of a counter shared by every process"""
+        return self.client.incr(f'{self.prefix}:seq:{name}') - 1
+
+    def shared_value(self, name, default):
+        """Integer agreed on by every process; the first writer's ``default`` wins"""
+        key = f'{self.prefix}:{name}'
+        self.client.set(key, default, nx=True)
+        return int(self.client.get(key))
+
+    # Room code ownership, seen and released by every process
+
+    def claim_code(self, code, game):
+        """Record ``game`` as the holder of ``code``; False if someone holds it"""
+        if not self.client.hsetnx(f'{self.prefix}:code_owners', code, game):
+            return False
+        self.client.hincrby(f'{self.prefix}:code_counts', game, 1)
+        return True
+
+    def release_code(self, code, game=None):
+        """Drop ``code``'s holder; ignored unless ``game`` (if given) holds it"""
+        owner = self.code_owner(code)
+        if owner is None or (game is not None and owner != game):
+            return False
+        if not self.client.hdel(f'{self.prefix}:code_owners', code):
+            return False  # released concurrently by another process
+        self.client.hincrby(f'{self.prefix}:code_counts', owner, -1)
+        return True
+
+    def code_owner(self, code):
+        owner = self.client.hget(f'{self.prefix}:code_owners', code)
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+    def code_counts(self):
+        """Codes held per game"""
+        return {(game.decode() if isinstance(game, bytes) else game): int(n)
+                for game, n in self.client.hgetall(f'{self.prefix}:code_counts').items()}
+
+
+class _RoomLock:
+    """Re-entrant lock for one room, held across processes when the backend
+    provides a distributed lock.
+
+    The store only keeps a room's lock while some ``lock()`` call is using
+    it (``users``), so codes that never name a room don't pile up. Outside a
+    request (reaper, timer and background tasks) holding a lock opens a unit
+    of work for the task, so shared rooms changed under it are written back
+    on release just as they are inside an event.
+    """
+
+    def __init__(self, store, code, distributed=None):
+        self._store = store
+        self._code = code
+        self._local = threading.RLock()
+        self._distributed = distributed
+        self._depth = 0
+        self._task_unit = False
+        self.users = 0  # guarded by the store's lock table mutex
+
+    def acquire(self):
+        self._local.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            if self._distributed is not None:
+                self._distributed.acquire()
+            self._task_unit = self._store.backend.shared and _enter_task_unit()
+        return True
+
+    def release(self):
+        try:
+            if self._depth == 1:
+                self._store._write_back(self._code)
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                if self._task_unit:
+                    self._task_unit = False
+                    _exit_task_unit()
+                if self._distributed is not None:
+                    self._distributed.release()
+            self._local.release()
+            self._store._unlock(self)
+
+    def _is_owned(self):
+        return self._local._is_owned()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+_backend = MemoryBackend()
+
+
+def get_backend():
+    """Return the backend shared by all room stores"""
+    return _backend
+
+
+def set_backend(backend):
+    """Switch every room store (existing and future) to ``backend``"""
+    global _backend
+    _backend = backend
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.backend = backend
+
+
+# Unit of work for a background task while it holds room locks
+_task = threading.local()
+
+
+def _current_unit():
+    """Rooms read or written during the current request/socket event.
+
+    With a shared backend every room is loaded fresh once per event and
+    written back when its room lock is released (see ``RoomStore.lock``).
+    Background tasks have a unit only while they hold a room lock.
+    """
+    if not has_app_context():
+        return getattr(_task, 'unit', None)
+    unit = g.get('_room_unit')
+    if unit is None:
+        unit = g._room_unit = {}
+    return unit
+
+
+def _enter_task_unit():
+    """Open (or join) the calling task's unit; False inside a request"""
+    if has_app_context():
+        return False
+    held = getattr(_task, 'held', 0)
+    if not held:
+        _task.unit = {}
+    _task.held = held + 1
+    return True
+
+
+def _exit_task_unit():
+    _task.held -= 1
+    if not _task.held:
+        _task.unit = None
+
+
+def init_room_store(app):
+    """Pick the room backend from config"""
+    url = app.config.get('ROOM_STORE_URL')
+    if url:
+        set_backend(RedisBackend.from_url(url))
+    room_codes.reuse_after = app.config.get('ROOM_CODE_REUSE_AFTER', room_codes.reuse_after)
+    room_codes.bind(_backend)
+
+
+def _normalize_code(code):
+    return str(code or '').upper().strip()
+
+
+def room_state(room):
+    """Collapse a room's status into 'waiting', 'playing' or 'finished'.
+
+    Dict rooms keep it under 'status'/'state'; game objects (tictactoe,
+    memory, mafia, ...) under a ``state``/``phase``/``status`` attribute.
+    """
+    if isinstance(room, dict):
+        status = room.get('status', room.get('state'))
+    else:
+        status = next((getattr(room, attr) for attr in ('state', 'phase', 'status')
+                       if hasattr(room, attr)), None)
+    status = str(getattr(status, 'value', status) or '').lower()
+    if status in ('', 'waiting', 'lobby'):
+        return 'waiting'
+    if status in ('finished', 'ended', 'game_over', 'complete', 'completed'):
+        return 'finished'
+    return 'playing'
+
+
+def _player_count(room):
+    """Count players in a dict-style room or a game object"""
+    players = room.get('players') if isinstance(room, dict) else getattr(room, 'players', None)
+    return len(players) if players is not None else 0
+
+
+class RoomStore(dict):
+    """Dict of room_code -> room with locks, timestamps and a backend.
+
+    The dict contents are this process's working copy of the rooms; the
+    backend is consulted on a miss and written to on every change. ``ttls``
+    overrides the reaper's idle TTLs for this game, by room state.
+    """
+
+    def __init__(self, game, ttls=None):
+        super().__init__()
+        self.game = game
+        self.ttls = dict(ttls or {})
+        self.backend = _backend
+        self._locks = {}
+        self._locks_mutex = threading.Lock()
+        self.created_at = {}
+        self.last_active = {}
+        self._remove_hooks = []
+        with _stores_lock:
+            _stores[game] = self
+
+    # -- dict interface -------------------------------------------------
+
+    def __setitem__(self, code, room):
+        now = time.monotonic()
+        super().__setitem__(code, room)
+        room_codes.claim(code, self.game)
+        self.created_at.setdefault(code, now)
+        self.last_active[code] = now
+        self.backend.save(self.game, code, room)
+        if self.backend.shared:
+            unit = _current_unit()
+            if unit is not None:
+                unit[(self.game, code)] = room
+
+    def __getitem__(self, code):
+        if self.backend.shared:
+            room = self._load_shared(code)
+            if room is None:
+                raise KeyError(code)
+            return room
+        try:
+            room = super().__getitem__(code)
+        except KeyError:
+            room = self._load(code)
+            if room is None:
+                raise
+        self.last_active[code] = time.monotonic()
+        return room
+
+    def __contains__(self, code):
+        if self.backend.shared:
+            return self._load_shared(code) is not None
+        return super().__contains__(code) or self._load(code) is not None
+
+    def get(self, code, default=None):
+        try:
+            return self[code]
+        except KeyError:
+            return default
+
+    def __delitem__(self, code):
+        if self.backend.shared:
+            self._load_shared(code)
+        super().__delitem__(code)
+        self._forget(code)
+
+    def pop(self, code, *default):
+        if code in self:
+            room = super().pop(code)
+            self._forget(code)
+            return room
+        if default:
+            return default[0]
+        raise KeyError(code)
+
+    def clear(self):
+        for code in list(self.keys()):
+            self._forget(code)
+        super().clear()
+
+    # With a shared backend, enumeration reflects rooms hosted by every process
+    def keys(self):
+        self._sync()
+        return super().keys()
+
+    def values(self):
+        self._sync()
+        return super().values()
+
+    def items(self):
+        self._sync()
+        return super().items()
+
+    def __iter__(self):
+        self._sync()
+        return super().__iter__()
+
+    def __len__(self):
+        self._sync()
+        return super().__len__()
+
+    # -- room helpers ---------------------------------------------------
+
+    def lock(self, code):
+        """Return the re-entrant lock guarding a single room.
+
+        With a shared backend the room is written back when the outermost
+        holder releases it, before other processes can take the lock.
+        """
+        code = _normalize_code(code)
+        with self._locks_mutex:
+            lock = self._locks.get(code)
+            if lock is None:
+                lock = self._locks[code] = _RoomLock(self, code, self.backend.lock(self.game, code))
+            lock.users += 1
+        return lock
+
+    def _unlock(self, lock):
+        """Forget a room's lock once nothing is using it"""
+        with self._locks_mutex:
+            lock.users -= 1
+            if lock.users == 0 and self._locks.get(lock._code) is lock:
+                del self._locks[lock._code]
+
+    def _write_back(self, code):
+        """Save the room this event loaded under ``code`` to a shared backend"""
+        unit = _current_unit() if self.backend.shared else None
+        if unit is None:
+            return
+        # Dropped from the event's cache too: after the lock is released
+        # another process may change the room, so it is read fresh next time
+        room = unit.pop((self.game, code), None)
+        if room is not None:
+            self.backend.save(self.game, code, room)
+
+    def synchronized(self, handler=None, key='room_code'):
+        """Decorator that runs a socket handler under the room's lock.
+
+        The room is taken from ``data[key]`` of the first argument, so
+        concurrent events for one room are serialized while different rooms
+        proceed in parallel.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(data=None, *args, **kwargs):
+                code = data.get(key) if isinstance(data, dict) else None
+                with self.lock(code):
+                    return func(data, *args, **kwargs)
+            return wrapper
+
+        if handler is not None:
+            return decorator(handler)
+        return decorator
+
+    def on_remove(self, callback):
+        """Decorator: call ``callback(code)`` whenever a room is removed"""
+        self._remove_hooks.append(callback)
+        return callback
+
+    def touch(self, code):
+        """Mark a room as active now"""
+        if super().__contains__(code):
+            self.last_active[code] = time.monotonic()
+
+    def save(self, code):
+        """Write a room's current state through to the backend"""
+        if super().__contains__(code):
+            self.backend.save(self.game, code, super().__getitem__(code))
+
+    def idle_seconds(self, code):
+        """Seconds since the room was last touched (by any process)"""
+        if self.backend.shared:
+            touched = self.backend.touched(self.game, code)
+            if touched is not None:
+                return time.time() - touched
+        return time.monotonic() - self.last_active.get(code, time.monotonic())
+
+    def stats(self):
+        """Room and player counts for this game"""
+        # A shared backend keeps counts, so no room has to be loaded
+        counts = self.backend.room_counts(self.game)
+        if counts is None:
+            rooms = list(self.values())
+            counts = len(rooms), sum(_player_count(room) for room in rooms)
+        return {
+            'game': self.game,
+            'rooms': counts[0],
+            'players': counts[1],
+        }
+
+    def _load_shared(self, code):
+        """Fetch a room from a shared backend, once per request/event"""
+        unit = _current_unit()
+        if unit is not None and (self.game, code) in unit:
+            return unit[(self.game, code)]
+        room = self.backend.load(self.game, code)
+        if room is None:
+            if super().__contains__(code):
+                super().__delitem__(code)
+            return None
+        super().__setitem__(code, room)
+        now = time.monotonic()
+        self.created_at.setdefault(code, now)
+        self.last_active[code] = now
+        if unit is not None:
+            unit[(self.game, code)] = room
+        return room
+
+    def _sync(self):
+        """Mirror the shared backend's room list into the local dict"""
+        if not self.backend.shared:
+            return
+        codes = set(self.backend.codes(self.game))
+        for code in list(super().keys()):
+            if code not in codes:
+                super().__delitem__(code)
+                self.created_at.pop(code, None)
+                self.last_active.pop(code, None)
+        for code in codes:
+            self._load_shared(code)
+
+    def _load(self, code):
+        room = self.backend.load(self.game, code)
+        if room is not None:
+            super().__setitem__(code, room)
+            now = time.monotonic()
+            self.created_at.setdefault(code, now)
+            self.last_active[code] = now
+        return room
+
+    def _forget(self, code):
+        room_codes.release(code, self.game)
+        self.created_at.pop(code, None)
+        self.last_active.pop(code, None)
+        self.backend.delete(self.game, code)
+        unit = _current_unit() if self.backend.shared else None
+        if unit is not None:
+            unit.pop((self.game, code), None)
+        for callback in self._remove_hooks:
+            callback(code)
+
+
+def get_store(game):
+    """Return the registered store for ``game`` (or None)"""
+    return _stores.get(game)
+
+
+def all_stores():
+    """All registered room stores, keyed by game name"""
+    with _stores_lock:
+        return dict(_stores)
+
+
+def room_stats():
+    """Per-game room/player counts plus totals"""
+    per_game = [store.stats() for store in all_stores().values()]
+    return {
+        'games': per_game,
+        'total_rooms': sum(s['rooms'] for s in per_game),
+        'total_players': sum(s['players'] for s in per_game),
+    }
+
+
+class RoomReaper:
+    """Evicts rooms that have been idle longer than their state's TTL.
+
+    One reaper sweeps every registered store on a background task, so
+    abandoned rooms don't keep a long-running server's memory growing.
+    """
+
+    def __init__(self, ttls=None, interval=30):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.interval = interval
+        self.sweeps = 0
+        self.last_sweep_seconds = 0.0
+        self.evicted = {}  # (game, state) -> count
+        self._running = False
+        self._lock = threading.Lock()
+
+    def ttl_for(self, store, state):
+        return store.ttls.get(state, self.ttls.get(state))
+
+    def _expired(self, store, code):
+        room = dict.get(store, code)
+        if room is None:
+            return None
+        state = room_state(room)
+        ttl = self.ttl_for(store, state)
+        if ttl is None or store.idle_seconds(code) < ttl:
+            return None
+        return state
+
+    def sweep(self):
+        """Evict every expired room now; returns the (game, code) pairs evicted"""
+        start = time.perf_counter()
+        evicted = []
+        for game, store in all_stores().items():
+            for code in list(store.keys()):
+                if self._expired(store, code) is None:
+                    continue
+                with store.lock(code):
+                    # Re-check: a handler may have used the room meanwhile
+                    state = self._expired(store, code)
+                    if state is None:
+                        continue
+                    store.pop(code, None)
+                evicted.append((game, code))
+                with self._lock:
+                    self.evicted[(game, state)] = self.evicted.get((game, state), 0) + 1
+                logger.info("Evicted idle %s room %s (%s)", game, code, state)
+        self.sweeps += 1
+        self.last_sweep_seconds = time.perf_counter() - start
+        return evicted
+
+    def start(self, socketio):
+        """Sweep every ``interval`` seconds on a Socket.IO background task"""
+        if self._running:
+            return
+        self._running = True
+        socketio.start_background_task(self._run, socketio)
+
+    def stop(self):
+        self._running = False
+
+    def _run(self, socketio):
+        while self._running:
+            socketio.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Room reaper sweep failed")
+
+    def stats(self):
+        """Eviction counts per game and state, plus sweep timings"""
+        with self._lock:
+            evicted = dict(self.evicted)
+        return {
+            'sweeps': self.sweeps,
+            'last_sweep_seconds': self.last_sweep_seconds,
+            'evicted': evicted,
+        }
+
+
+reaper = RoomReaper()
+
+
+def start_room_reaper(app, socketio):
+    """Configure the shared reaper from app config and start it once"""
+    reaper.ttls.update({
+        'waiting': app.config.get('ROOM_TTL_WAITING', DEFAULT_TTLS['waiting']),
+        'playing': app.config.get('ROOM_TTL_PLAYING', DEFAULT_TTLS['playing']),
+        'finished': app.config.get('ROOM_TTL_FINISHED', DEFAULT_TTLS['finished']),
+    })
+    reaper.interval = app.config.get('ROOM_REAP_INTERVAL', reaper.interval)
+    reaper.start(socketio)
+    return reaper
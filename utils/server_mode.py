@@ -0,0 +1,75 @@
+"""Socket.IO server mode selection.
+
+``threading`` (the default) gives every connected client an OS thread,
+which caps concurrency long before CPU does. ``eventlet`` and ``gevent``
+serve each client from a green thread instead, so one worker can hold
+thousands of idle WebSocket connections.
+
+Green-thread modes need the standard library monkey patched before anything
+else imports ``socket`` or ``threading``; ``wsgi.py`` does that first thing.
+Calls into libraries that block outside Python sockets (the Gemini client
+for trivia, for example) go through ``run_blocking`` so they run on a real
+OS thread and don't stall every other client on the worker.
+"""
+
+import importlib.util
+import logging
+
+ASYNC_MODES = ('threading', 'eventlet', 'gevent')
+DEFAULT_ASYNC_MODE = 'threading'
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_async_mode(requested=None):
+    """Return the async mode to run with.
+
+    Unknown modes, and green-thread modes whose package is not installed,
+    fall back to ``threading`` so a missing optional dependency never stops
+    the app from starting.
+    """
+    mode = (requested or DEFAULT_ASYNC_MODE).strip().lower()
+    if mode not in ASYNC_MODES:
+        logger.warning("Unknown SOCKETIO_ASYNC_MODE %r, using %s", mode, DEFAULT_ASYNC_MODE)
+        return DEFAULT_ASYNC_MODE
+    if mode != 'threading' and importlib.util.find_spec(mode) is None:
+        logger.warning("%s is not installed, using %s", mode, DEFAULT_ASYNC_MODE)
+        return DEFAULT_ASYNC_MODE
+    return mode
+
+
+def monkey_patch(requested=None):
+    """Patch the standard library for green threads; returns the mode used"""
+    mode = resolve_async_mode(requested)
+    if mode == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+    elif mode == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+    return mode
+
+
+def run_blocking(socketio, func, *args, **kwargs):
+    """Call ``func`` without blocking the worker's event loop.
+
+    In threading mode each client already has its own thread, so ``func`` is
+    simply called. Under eventlet/gevent it runs in the hub's native thread
+    pool while the calling green thread yields.
+    """
+    mode = socketio.async_mode
+    if mode == 'eventlet':
+        from eventlet import tpool
+        return tpool.execute(func, *args, **kwargs)
+    if mode == 'gevent':
+        import gevent
+        return gevent.get_hub().threadpool.apply(func, args, kwargs)
+    return func(*args, **kwargs)
+
+
+def run_options(socketio):
+    """Keyword arguments for ``socketio.run`` suited to the active mode"""
+    if socketio.async_mode == 'threading':
+        # Werkzeug is the only server available without eventlet/gevent
+        return {'allow_unsafe_werkzeug': True}
+    return {}
@@ -0,0 +1,188 @@
+"""Hierarchical timer wheel shared by every room.
+
+Game clocks (turn deadlines, timed rounds) schedule callbacks here instead
+of starting a thread or a sleeping task per room. The wheel has ``levels``
+rings of ``slots`` buckets; level 0 buckets are one ``tick`` wide and each
+level above covers ``slots`` times the span of the one below. Scheduling and
+cancelling are O(1) set operations, and each tick only looks at one level 0
+bucket, plus a higher-level bucket every ``slots`` ticks whose timers cascade
+down. A single background task drives the wheel, so ten thousand table
+clocks cost the same per tick as ten.
+
+Callbacks run one after another on the wheel's task, so they must be quick.
+Work that takes a lock or does real game logic is scheduled with
+``schedule_task``: the wheel only starts a background task for it when it
+fires, and rooms due on the same tick are handled concurrently.
+
+Timers are in-process: with a shared room backend, callbacks must re-check
+the room state they were scheduled for, since another process may have
+moved the room on.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """Handle for a scheduled callback; ``cancel()`` before it fires"""
+
+    __slots__ = ('expires', 'callback', 'args', 'wheel', 'bucket')
+
+    def __init__(self, wheel, expires, callback, args):
+        self.wheel = wheel
+        self.expires = expires  # tick
+        self.callback = callback
+        self.args = args
+        self.bucket = None
+
+    @property
+    def active(self):
+        return self.bucket is not None
+
+    def cancel(self):
+        """Stop the timer; returns False if it already fired or was cancelled"""
+        return self.wheel.cancel(self)
+
+
+class TimerWheel:
+    """Schedules callbacks ``delay`` seconds ahead, to ``tick`` precision."""
+
+    def __init__(self, tick=0.1, slots=64, levels=4, clock=time.monotonic):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.origin = clock()
+        self.current = 0  # ticks processed so far
+        self.wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self.pending = 0
+        self.fired = 0
+        self._lock = threading.Lock()
+        self._running = False
+        self._socketio = None
+
+    def _ticks(self, now):
+        return int((now - self.origin) / self.tick)
+
+    def _place(self, timer, earliest):
+        expires = max(timer.expires, earliest)
+        delta = expires - self.current
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots or level == self.levels - 1:
+                # Past the top level's range: park in its furthest bucket and
+                # let cascading bring it back round
+                bucket_tick = min(expires, self.current + span * (self.slots - 1))
+                timer.bucket = self.wheels[level][(bucket_tick // span) % self.slots]
+                timer.bucket.add(timer)
+                return
+            span *= self.slots
+
+    def schedule(self, delay, callback, *args):
+        """Call ``callback(*args)`` after ``delay`` seconds; returns a Timer"""
+        with self._lock:
+            timer = Timer(self, self._ticks(self.clock() + delay) + 1, callback, args)
+            self._place(timer, self.current + 1)
+            self.pending += 1
+        return timer
+
+    def schedule_task(self, delay, callback, *args):
+        """Like ``schedule``, but ``callback`` runs on its own background task"""
+        return self.schedule(delay, self._spawn, callback, args)
+
+    def _spawn(self, callback, args):
+        if self._socketio is None:
+            # Not started (tests driving ``advance`` by hand): run in place
+            return callback(*args)
+        self._socketio.start_background_task(self._call, callback, args)
+
+    @staticmethod
+    def _call(callback, args):
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Timer task %r failed", callback)
+
+    def cancel(self, timer):
+        with self._lock:
+            if timer.bucket is None:
+                return False
+            timer.bucket.discard(timer)
+            timer.bucket = None
+            self.pending -= 1
+            return True
+
+    def _step(self, due):
+        """Process the next tick, collecting expired timers into ``due``"""
+        self.current += 1
+        # Cascade every level whose ring just wrapped, top-down so timers can
+        # fall more than one level in the same tick
+        span = self.slots
+        cascade = []
+        for level in range(1, self.levels):
+            if self.current % span:
+                break
+            cascade.append((level, (self.current // span) % self.slots))
+            span *= self.slots
+        for level, index in reversed(cascade):
+            bucket = self.wheels[level][index]
+            self.wheels[level][index] = set()
+            for timer in bucket:
+                self._place(timer, self.current)
+
+        index = self.current % self.slots
+        bucket = self.wheels[0][index]
+        ready = [timer for timer in bucket if timer.expires <= self.current]
+        for timer in ready:
+            bucket.discard(timer)
+            timer.bucket = None
+            due.append(timer)
+
+    def advance(self, now=None):
+        """Fire every timer due by ``now`` (default: the clock); returns how many fired"""
+        due = []
+        with self._lock:
+            target = self._ticks(self.clock() if now is None else now)
+            while self.current < target:
+                self._step(due)
+            self.pending -= len(due)
+            self.fired += len(due)
+        for timer in due:
+            try:
+                timer.callback(*timer.args)
+            except Exception:
+                logger.exception("Timer callback %r failed", timer.callback)
+        return len(due)
+
+    def start(self, socketio):
+        """Drive the wheel from one Socket.IO background task"""
+        if self._running:
+            return
+        self._running = True
+        self._socketio = socketio
+        socketio.start_background_task(self._run, socketio)
+
+    def stop(self):
+        self._running = False
+
+    def _run(self, socketio):
+        while self._running:
+            socketio.sleep(self.tick)
+            self.advance()
+
+    def stats(self):
+        return {'pending': self.pending, 'fired': self.fired, 'tick': self.tick}
+
+
+timer_wheel = TimerWheel()
+
+
+def start_timer_wheel(app, socketio):
+    """Configure the shared wheel from app config and start it once"""
+    if not timer_wheel._running:
+        timer_wheel.tick = app.config.get('TIMER_WHEEL_TICK', timer_wheel.tick)
+    timer_wheel.start(socketio)
+    return timer_wheel
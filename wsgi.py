@@ -0,0 +1,30 @@
+"""Production entry point.
+
+Green-thread modes (SOCKETIO_ASYNC_MODE=eventlet|gevent) must patch the
+standard library before anything else is imported, so this module does that
+first and only then builds the app.
+
+    SOCKETIO_ASYNC_MODE=eventlet python wsgi.py
+    SOCKETIO_ASYNC_MODE=eventlet gunicorn -k eventlet -w 1 wsgi:app
+
+Worker processes started with ``spawn`` (the Connect 4 AI pool) re-run the
+parent's main module as ``__mp_main__``; they must not patch, or start
+another server's reaper, timer wheel and backend connections.
+"""
+import os
+
+if __name__ != '__mp_main__':
+    from utils.server_mode import monkey_patch
+
+    monkey_patch(os.environ.get('SOCKETIO_ASYNC_MODE'))
+
+    from app import create_app  # noqa: E402
+    from utils.server_mode import run_options  # noqa: E402
+
+    app, socketio = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    print(f"🚀 Games Hub on port {port} ({socketio.async_mode} mode)")
+    socketio.run(app, host='0.0.0.0', port=port, **run_options(socketio))